@@ -3,6 +3,9 @@ import sqlite3
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
+from core.db import connection
+from core.movimientos import ACTIVACION
+from core.servicios import MovimientoRequest, aplicar_movimientos
 import datetime
 
 
@@ -14,21 +17,16 @@ def activacion_poliza():
         # Cargar pólizas desde la base de datos
         polizas = []
         try:
-            conn = sqlite3.connect(DB_FILE)
-            cur = conn.cursor()
-            cur.execute("SELECT id, numero_poliza, estado FROM polizas ORDER BY id DESC")
-            rows = cur.fetchall()
-            for r in rows:
-                pid, numero, estado = r[0], r[1], r[2] if len(r) > 2 else None
-                label = f"{numero} ({estado})" if estado else f"{numero}"
-                polizas.append((pid, label))
+            with connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT id, numero_poliza, estado FROM polizas ORDER BY id DESC")
+                rows = cur.fetchall()
+                for r in rows:
+                    pid, numero, estado = r[0], r[1], r[2] if len(r) > 2 else None
+                    label = f"{numero} ({estado})" if estado else f"{numero}"
+                    polizas.append((pid, label))
         except Exception as e:
             st.error(f"Error al leer la base de datos: {e}")
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
         if not polizas:
             st.info("No hay pólizas registradas en la base de datos.")
@@ -48,69 +46,18 @@ def activacion_poliza():
 
             poliza_id = selected[0]
 
-            # comprobar estado actual desde la base de datos para garantizar consistencia
-            estado_actual = None
-            cliente_id = None
-            try:
-                conn2 = sqlite3.connect(DB_FILE)
-                cur2 = conn2.cursor()
-                cur2.execute("SELECT estado, cliente_id FROM polizas WHERE id = ?", (poliza_id,))
-                row = cur2.fetchone()
-                if row:
-                    estado_actual = row[0]
-                    cliente_id = row[1]
-            except Exception as e:
-                st.error(f"Error comprobando estado de la póliza: {e}")
-                return
-            finally:
-                try:
-                    conn2.close()
-                except Exception:
-                    pass
-
-            if estado_actual == 'Activa':
-                st.info(f"La póliza ya está en estado 'Activa'. (id={poliza_id})")
-                return
-
-            # Insertar movimiento y actualizar el estado de la póliza dentro de una transacción
-            try:
-                conn3 = sqlite3.connect(DB_FILE)
-                cur3 = conn3.cursor()
-
-                fecha_mov = datetime.date.today().strftime("%Y-%m-%d")
-
-                # Insertar nuevo movimiento con estado 'Aplicado' porque se está activando inmediatamente
-                cur3.execute(
-                    """
-                    INSERT INTO movimientos_poliza (codigo_movimiento, poliza_id, cliente_id, fecha_movimiento, tipo_movimiento, estado, observaciones)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        codigo_movimiento,
-                        poliza_id,
-                        cliente_id,
-                        fecha_mov,
-                        'Activación de póliza',
-                        'Aplicado',
-                        f'Generado por UI Activación de Póliza el {fecha_mov}'
-                    )
-                )
-
-                # Actualizar estado de la póliza a 'Activa'
-                cur3.execute("UPDATE polizas SET estado = ? WHERE id = ?", ('Activa', poliza_id))
-
-                conn3.commit()
+            # El motor valida el estado actual y aplica movimiento y estado en una
+            # única transacción (core/servicios.py)
+            fecha_mov = datetime.date.today().strftime("%Y-%m-%d")
+            resultado = aplicar_movimientos(
+                [MovimientoRequest(poliza_id, ACTIVACION, {
+                    'codigo_movimiento': codigo_movimiento,
+                    'observaciones': f'Generado por UI Activación de Póliza el {fecha_mov}',
+                })],
+                usuario_id=st.session_state.get('user_id'),
+            )
+            if resultado.rechazados:
+                st.error(f"Error al crear movimiento/actualizar póliza: {resultado.rechazados[0].motivo}")
+            else:
                 st.success(f"Movimiento '{codigo_movimiento}' creado y póliza (id={poliza_id}) activada.")
                 st.rerun()
-
-            except Exception as e:
-                try:
-                    conn3.rollback()
-                except Exception:
-                    pass
-                st.error(f"Error al crear movimiento/actualizar póliza: {e}")
-            finally:
-                try:
-                    conn3.close()
-                except Exception:
-                    pass
\ No newline at end of file
@@ -1,6 +1,8 @@
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
+from core.db import connection, unit_of_work
+from core.consultas import POLIZAS_POR_ESTADO
 import datetime
 
 
@@ -18,19 +20,14 @@ def anexo_aclaratorio():
     # Obtener pólizas activas (se mostrarán dentro del expander)
     polizas_activas = []
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cur = conn.cursor()
-        cur.execute("SELECT id, numero_poliza FROM polizas WHERE estado = 'Activa' ORDER BY id DESC")
-        rows = cur.fetchall()
-        for r in rows:
-            polizas_activas.append((r[0], r[1]))
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(POLIZAS_POR_ESTADO, ('Activa',))
+            rows = cur.fetchall()
+            for r in rows:
+                polizas_activas.append((r[0], r[1]))
     except Exception as e:
         st.error(f"Error al leer pólizas activas: {e}")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     with st.expander('Anexo Aclaratorio', expanded=True):
         codigo_movimiento = st.text_input('Código de nuevo movimiento', help='Código identificador para el anexo aclaratorio')
@@ -55,65 +52,43 @@ def anexo_aclaratorio():
 
             poliza_id = selected_poliza[0]
 
-            # Obtener cliente_id de la póliza
-            cliente_id = None
-            try:
-                conn2 = sqlite3.connect(DB_FILE)
-                cur2 = conn2.cursor()
-                cur2.execute('SELECT cliente_id FROM polizas WHERE id = ?', (poliza_id,))
-                r = cur2.fetchone()
-                if r:
-                    cliente_id = r[0]
-            except Exception as e:
-                st.error(f'Error obteniendo datos de la póliza: {e}')
-                return
-            finally:
-                try:
-                    conn2.close()
-                except Exception:
-                    pass
-
             fecha_mov = datetime.date.today().strftime('%Y-%m-%d')
 
             # Insertar movimiento y actualizar observaciones de la póliza
             try:
-                conn3 = sqlite3.connect(DB_FILE)
-                cur3 = conn3.cursor()
-
-                cur3.execute(
-                    '''
-                    INSERT INTO movimientos_poliza (codigo_movimiento, poliza_id, cliente_id, fecha_movimiento, tipo_movimiento, estado, observaciones)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''',
-                    (
-                        codigo_movimiento,
-                        poliza_id,
-                        cliente_id,
-                        fecha_mov,
-                        'Anexo Aclaratorio',
-                        'Aplicado',
-                        f'Anexo aclaratorio creado por UI el {fecha_mov}: {observaciones}'
+                # Todas las escrituras del movimiento en una única transacción
+                with unit_of_work() as conn3:
+                    cur3 = conn3.cursor()
+                    # cliente_id de la póliza, leído en la misma transacción
+                    cur3.execute('SELECT cliente_id FROM polizas WHERE id = ?', (poliza_id,))
+                    r = cur3.fetchone()
+                    cliente_id = r[0] if r else None
+
+                    cur3.execute(
+                        '''
+                        INSERT INTO movimientos_poliza (codigo_movimiento, poliza_id, cliente_id, fecha_movimiento, tipo_movimiento, estado, observaciones)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ''',
+                        (
+                            codigo_movimiento,
+                            poliza_id,
+                            cliente_id,
+                            fecha_mov,
+                            'Anexo Aclaratorio',
+                            'Aplicado',
+                            f'Anexo aclaratorio creado por UI el {fecha_mov}: {observaciones}'
+                        )
                     )
-                )
 
-                # Reemplazar (cambiar) la columna observaciones de la póliza
-                cur3.execute('UPDATE polizas SET observaciones = ? WHERE id = ?', (observaciones, poliza_id))
-
-                conn3.commit()
-                st.success(f"Anexo aclaratorio '{codigo_movimiento}' creado y observaciones de la póliza actualizadas.")
-                st.rerun()
+                    # Reemplazar (cambiar) la columna observaciones de la póliza
+                    cur3.execute('UPDATE polizas SET observaciones = ? WHERE id = ?', (observaciones, poliza_id))
 
             except Exception as e:
-                try:
-                    conn3.rollback()
-                except Exception:
-                    pass
+                # unit_of_work ya hizo rollback de toda la operación
                 st.error(f'Error al crear anexo/actualizar póliza: {e}')
-            finally:
-                try:
-                    conn3.close()
-                except Exception:
-                    pass
+            else:
+                st.success(f"Anexo aclaratorio '{codigo_movimiento}' creado y observaciones de la póliza actualizadas.")
+                st.rerun()
 
 
 __all__ = ['anexo_aclaratorio']
@@ -1,7 +1,9 @@
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
-import datetime
+from core.db import connection
+from core.movimientos import CANCELACION
+from core.servicios import MovimientoRequest, aplicar_movimientos
 
 
 def cancelacion_poliza():
@@ -20,23 +22,18 @@ def cancelacion_poliza():
         # Cargar pólizas
         polizas = []
         try:
-            conn = sqlite3.connect(DB_FILE)
-            cur = conn.cursor()
-            cur.execute("SELECT id, numero_poliza, estado FROM polizas ORDER BY id DESC")
-            rows = cur.fetchall()
-            for r in rows:
-                pid = r[0]
-                numero = r[1] if len(r) > 1 else str(r[0])
-                estado = r[2] if len(r) > 2 else None
-                label = f"{numero} ({estado})" if estado else f"{numero}"
-                polizas.append((pid, label))
+            with connection() as conn:
+                cur = conn.cursor()
+                cur.execute("SELECT id, numero_poliza, estado FROM polizas ORDER BY id DESC")
+                rows = cur.fetchall()
+                for r in rows:
+                    pid = r[0]
+                    numero = r[1] if len(r) > 1 else str(r[0])
+                    estado = r[2] if len(r) > 2 else None
+                    label = f"{numero} ({estado})" if estado else f"{numero}"
+                    polizas.append((pid, label))
         except Exception as e:
             st.error(f'Error leyendo pólizas: {e}')
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
 
         if not polizas:
             st.info('No hay pólizas registradas en la base de datos.')
@@ -51,60 +48,13 @@ def cancelacion_poliza():
 
             poliza_id = selected[0]
 
-            # Obtener cliente_id (si existe)
-            cliente_id = None
-            try:
-                conn2 = sqlite3.connect(DB_FILE)
-                cur2 = conn2.cursor()
-                cur2.execute('SELECT cliente_id FROM polizas WHERE id = ?', (poliza_id,))
-                r = cur2.fetchone()
-                if r:
-                    cliente_id = r[0]
-            except Exception as e:
-                st.error(f'Error obteniendo cliente de la póliza: {e}')
-                return
-            finally:
-                try:
-                    conn2.close()
-                except Exception:
-                    pass
-
-            # Insertar movimiento y actualizar póliza en la misma transacción
-            try:
-                conn3 = sqlite3.connect(DB_FILE)
-                cur3 = conn3.cursor()
-
-                fecha_mov = datetime.date.today().strftime('%Y-%m-%d')
-
-                cur3.execute(
-                    '''
-                    INSERT INTO movimientos_poliza (codigo_movimiento, poliza_id, cliente_id, fecha_movimiento, tipo_movimiento, estado)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                    ''',
-                    (
-                        codigo_movimiento,
-                        poliza_id,
-                        cliente_id,
-                        fecha_mov,
-                        'Cancelación',
-                        'Aplicado',
-                    )
-                )
-
-                # Actualizar estado de la póliza a 'Cancelada'
-                cur3.execute("UPDATE polizas SET estado = ? WHERE id = ?", ('Cancelada', poliza_id))
-
-                conn3.commit()
+            # Movimiento y estado de la póliza en una única transacción (core/servicios.py)
+            resultado = aplicar_movimientos(
+                [MovimientoRequest(poliza_id, CANCELACION, {'codigo_movimiento': codigo_movimiento})],
+                usuario_id=st.session_state.get('user_id'),
+            )
+            if resultado.rechazados:
+                st.error(f'Error registrando la cancelación: {resultado.rechazados[0].motivo}')
+            else:
                 st.success(f"Cancelación registrada (codigo={codigo_movimiento}) y póliza id={poliza_id} marcada como 'Cancelada'.")
                 st.rerun()
-            except Exception as e:
-                try:
-                    conn3.rollback()
-                except Exception:
-                    pass
-                st.error(f'Error registrando la cancelación: {e}')
-            finally:
-                try:
-                    conn3.close()
-                except Exception:
-                    pass
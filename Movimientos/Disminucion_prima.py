@@ -1,6 +1,12 @@
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
+from core.db import connection
+from core.consultas import POLIZAS_POR_ESTADO
+from core.migrations import get_columns
+from core.money import TASA_IVA, TASA_SCVS, TASA_SEGURO_CAMPESINO, Money, calcular_desglose
+from core.movimientos import DISMINUCION_PRIMA
+from core.servicios import MovimientoRequest, aplicar_movimientos
 import datetime
 
 
@@ -17,19 +23,14 @@ def disminucion_prima():
     # Load active policies
     polizas_activas = []
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cur = conn.cursor()
-        cur.execute("SELECT id, numero_poliza FROM polizas WHERE estado = 'Activa' ORDER BY id DESC")
-        rows = cur.fetchall()
-        for r in rows:
-            polizas_activas.append((r[0], r[1]))
+        with connection() as conn:
+            cur = conn.cursor()
+            cur.execute(POLIZAS_POR_ESTADO, ('Activa',))
+            rows = cur.fetchall()
+            for r in rows:
+                polizas_activas.append((r[0], r[1]))
     except Exception as e:
         st.error(f"Error al leer pólizas activas: {e}")
-    finally:
-        try:
-            conn.close()
-        except Exception:
-            pass
 
     st.header('Disminución de Prima')
 
@@ -44,101 +45,76 @@ def disminucion_prima():
 
     # Read current premium for the selected policy
     prima_actual = None
+    sel_col = None
     try:
-        conn2 = sqlite3.connect(DB_FILE)
-        cur2 = conn2.cursor()
-        cur2.execute("PRAGMA table_info(polizas)")
-        cols = [c[1] for c in cur2.fetchall()]
-        sel_col = None
-        if 'prima_neta' in cols:
-            sel_col = 'prima_neta'
-        elif 'prima' in cols:
-            sel_col = 'prima'
-
-        if sel_col:
-            cur2.execute(f"SELECT {sel_col} FROM polizas WHERE id = ?", (selected[0],))
-            r = cur2.fetchone()
-            if r:
-                prima_actual = r[0]
+        with connection() as conn2:
+            cur2 = conn2.cursor()
+            # Columnas conocidas de polizas (cacheadas tras las migraciones)
+            cols = get_columns("polizas")
+            if 'prima_neta' in cols:
+                sel_col = 'prima_neta'
+            elif 'prima' in cols:
+                sel_col = 'prima'
+
+            if sel_col:
+                cur2.execute(f"SELECT {sel_col} FROM polizas WHERE id = ?", (selected[0],))
+                r = cur2.fetchone()
+                if r:
+                    prima_actual = r[0]
     except Exception as e:
         st.error(f"Error leyendo prima actual: {e}")
-    finally:
-        try:
-            conn2.close()
-        except Exception:
-            pass
+
+    # Montos en centavos exactos (Money) en lugar de float
+    prima_actual_m = Money.parse(prima_actual)
 
     # Display current premium in the main area
-    try:
-        prima_display = f"{float(prima_actual):,.2f}" if prima_actual not in (None, '') else 'N/A'
-    except Exception:
+    if prima_actual_m is not None:
+        prima_display = prima_actual_m.format()
+    else:
         prima_display = str(prima_actual) if prima_actual not in (None, '') else 'N/A'
 
     st.write(f"**Prima actual:** {prima_display}")
 
     # Input for new premium
-    default_prima = 0.0
-    try:
-        if prima_actual not in (None, ''):
-            default_prima = float(prima_actual)
-    except Exception:
-        default_prima = 0.0
+    default_prima = float(prima_actual_m) if prima_actual_m is not None else 0.0
 
     nueva_prima = st.number_input('Nueva prima', min_value=0.0, value=default_prima, step=1.0, format='%.2f')
 
-    # --- CÁLCULO DE TASAS, SUBTOTAL, IVA Y TOTAL A CAMBIAR ---
-    try:
-        contrib_scvs_pct = 0.5
-        seguro_campesino_pct = 0.5
-        contrib_scvs_amount = float(nueva_prima) * contrib_scvs_pct / 100.0
-        seguro_campesino_amount = float(nueva_prima) * seguro_campesino_pct / 100.0
-    except Exception:
-        contrib_scvs_pct = 0.5
-        seguro_campesino_pct = 0.5
-        contrib_scvs_amount = 0.0
-        seguro_campesino_amount = 0.0
-
     derecho_emision = st.number_input('Derecho de emisión', min_value=0.0, value=0.0, step=0.01, format='%.2f', help='Ingrese el monto del derecho de emisión')
     otros_cargos = st.number_input('Otros cargos', min_value=0.0, value=0.0, step=0.01, format='%.2f', help='Ingrese otros cargos aplicables')
 
-    subtotal = float(nueva_prima) + contrib_scvs_amount + seguro_campesino_amount + float(derecho_emision) + float(otros_cargos)
-
-    st.write(f"Contribución SCVS ({contrib_scvs_pct}%): {contrib_scvs_amount:,.2f}")
-    st.write(f"Seguro Campesino ({seguro_campesino_pct}%): {seguro_campesino_amount:,.2f}")
-    st.write(f"Derecho de emisión: {float(derecho_emision):,.2f}")
-    st.write(f"Otros cargos: {float(otros_cargos):,.2f}")
-    st.write(f"**Subtotal (prima + cargos): {subtotal:,.2f}**")
+    # --- CÁLCULO DE TASAS, SUBTOTAL, IVA Y TOTAL A CAMBIAR ---
+    # Contribuciones 0.5% SCVS y 0.5% Seguro Campesino e IVA 15%, redondeados al centavo
+    desglose = calcular_desglose(nueva_prima, derecho_emision, otros_cargos)
+    nueva_prima_m = desglose['prima']
+    total_prima = desglose['total']
 
-    # IVA y total
-    try:
-        iva_pct = 15.0
-        iva_amount = subtotal * iva_pct / 100.0
-        total_prima = subtotal + iva_amount
-    except Exception:
-        iva_pct = 15.0
-        iva_amount = 0.0
-        total_prima = subtotal
+    st.write(f"Contribución SCVS ({TASA_SCVS}%): {desglose['contrib_scvs'].format()}")
+    st.write(f"Seguro Campesino ({TASA_SEGURO_CAMPESINO}%): {desglose['seguro_campesino'].format()}")
+    st.write(f"Derecho de emisión: {desglose['derecho_emision'].format()}")
+    st.write(f"Otros cargos: {desglose['otros_cargos'].format()}")
+    st.write(f"**Subtotal (prima + cargos): {desglose['subtotal'].format()}**")
 
-    st.write(f"IVA ({iva_pct}%): {iva_amount:,.2f}")
-    st.write(f"**Total prima a aplicar (subtotal + IVA): {total_prima:,.2f}**")
+    st.write(f"IVA ({TASA_IVA}%): {desglose['iva'].format()}")
+    st.write(f"**Total prima a aplicar (subtotal + IVA): {total_prima.format()}**")
 
     # Validation: new premium must be strictly less than current (only allowed if current > 0)
     can_apply = False
-    if prima_actual in (None, '') or float(prima_actual) == 0:
+    if not prima_actual_m:
         st.warning('No existe una prima previa válida para disminuir. Operación no permitida.')
         can_apply = False
     else:
         try:
-            prior = float(prima_actual)
-            if nueva_prima < prior:
-                pct = (prior - nueva_prima) / prior * 100.0
+            prior = prima_actual_m
+            if nueva_prima_m < prior:
+                pct = (prior - nueva_prima_m).cents / prior.cents * 100.0
                 st.success(f'Disminución de prima: {pct:.2f}%')
                 can_apply = True
-            elif nueva_prima == prior:
+            elif nueva_prima_m == prior:
                 st.info('La nueva prima es igual a la prima actual; no hay cambio.')
                 can_apply = False
             else:
-                pct = (nueva_prima - prior) / prior * 100.0
+                pct = (nueva_prima_m - prior).cents / prior.cents * 100.0
                 st.error(f'La nueva prima es mayor que la actual (incremento de {pct:.2f}%). Para aumentos use la función de Aumento de Prima.')
                 can_apply = False
         except Exception:
@@ -148,7 +124,7 @@ def disminucion_prima():
     # Campos para nota de crédito (se generan cuando hay disminución)
     st.markdown('### Nota de crédito (se generará si procede)')
     generar_nota = st.checkbox('Generar nota de crédito para el cliente', value=True, help='Se creará una nota de crédito vinculada al movimiento y a la póliza cuando se aplique la disminución.')
-    numero_nota_raw = st.text_input('Número de nota de crédito', value=f"NC-{datetime.date.today().strftime('%Y%m%d')}-", help='Código o número de la nota de crédito')
+    numero_nota_raw = st.text_input('Número de nota de crédito', placeholder='Vacío = número automático (NC-AAAAMMDD-00001)', help='Código o número de la nota de crédito; si se deja vacío se asigna el siguiente de la secuencia')
     fecha_nota = st.date_input('Fecha de emisión de la nota de crédito', value=datetime.date.today())
     motivo_nota = st.text_area('Motivo de la nota de crédito', value=f'Disminución de prima de {prima_display}', help='Motivo o descripción de la nota de crédito')
 
@@ -161,101 +137,22 @@ def disminucion_prima():
         if not codigo_movimiento:
             st.warning('Introduzca un código para el movimiento antes de aplicar la disminución de prima.')
             return
-        try:
-            conn3 = sqlite3.connect(DB_FILE)
-            cur3 = conn3.cursor()
-
-            # Obtener cliente_id para el INSERT en movimientos_poliza
-            cliente_id = None
-            try:
-                cur3.execute('SELECT cliente_id FROM polizas WHERE id = ?', (selected[0],))
-                rcli = cur3.fetchone()
-                if rcli:
-                    cliente_id = rcli[0]
-            except Exception:
-                cliente_id = None
-
-            fecha_mov = datetime.date.today().strftime('%Y-%m-%d')
-
-            # Insertar movimiento en movimientos_poliza (estado 'Aplicado' porque se aplica inmediatamente)
-            cur3.execute(
-                '''
-                INSERT INTO movimientos_poliza (codigo_movimiento, poliza_id, cliente_id, fecha_movimiento, tipo_movimiento, estado, prima_nueva)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    codigo_movimiento,
-                    selected[0],
-                    cliente_id,
-                    fecha_mov,
-                    'Disminucion de Prima',
-                    'Aplicado',
-                    nueva_prima,
-                )
-            )
-
-            movimiento_id = cur3.lastrowid
-
-            # Si se solicita, crear una nota de crédito vinculada al movimiento
-            if generar_nota:
-                try:
-                    # Normalizar numero_nota a NULL si está vacío para evitar UNIQUE con cadena vacía
-                    numero_nota = numero_nota_raw.strip() if numero_nota_raw and str(numero_nota_raw).strip() else None
-                    fecha_nota_str = fecha_nota.strftime('%Y-%m-%d') if fecha_nota else None
-                    monto_neto = float(nueva_prima)
-                    impuestos = contrib_scvs_amount + seguro_campesino_amount + float(derecho_emision) + float(otros_cargos)
-                    iva_val = float(iva_amount)
-                    total = float(total_prima)
-
-                    cur3.execute(
-                        '''
-                        INSERT INTO notas_de_credito (numero_nota, factura_id, poliza_id, movimiento_id, cliente_id, fecha_emision, monto_neto, impuestos, iva, total, motivo, estado, fecha_registro)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''',
-                        (
-                            numero_nota,
-                            None,
-                            selected[0],
-                            movimiento_id,
-                            cliente_id,
-                            fecha_nota_str,
-                            monto_neto,
-                            impuestos,
-                            iva_val,
-                            total,
-                            motivo_nota,
-                            'Emitida',
-                            datetime.date.today().strftime('%Y-%m-%d')
-                        )
-                    )
-                except Exception as ne:
-                    st.warning(f'No se pudo crear la nota de crédito automáticamente: {ne}')
-
-            # Detectar columna de prima y actualizar la póliza con total_prima
-            cur3.execute("PRAGMA table_info(polizas)")
-            cols_all = [c[1] for c in cur3.fetchall()]
-            prima_col = None
-            if 'prima_neta' in cols_all:
-                prima_col = 'prima_neta'
-            elif 'prima' in cols_all:
-                prima_col = 'prima'
-
-            if not prima_col:
-                st.error('La tabla polizas no contiene columna de prima para actualizar.')
-                conn3.rollback()
-                return
-
-            cur3.execute(f"UPDATE polizas SET {prima_col} = ? WHERE id = ?", (total_prima, selected[0]))
-            conn3.commit()
-            st.success(f'Prima actualizada a {total_prima:,.2f} (incluye cargos e IVA) en {prima_col} para la póliza {selected[1]} (id={selected[0]}).')
-        except Exception as e:
-            try:
-                conn3.rollback()
-            except Exception:
-                pass
-            st.error(f'Error actualizando prima: {e}')
-        finally:
-            try:
-                conn3.close()
-            except Exception:
-                pass
+        # Movimiento, nota de crédito y póliza se escriben en una única transacción (core/servicios.py)
+        resultado = aplicar_movimientos(
+            [MovimientoRequest(selected[0], DISMINUCION_PRIMA, {
+                'codigo_movimiento': codigo_movimiento,
+                'prima': str(nueva_prima_m),
+                'derecho_emision': str(desglose['derecho_emision']),
+                'otros_cargos': str(desglose['otros_cargos']),
+                'emitir_documento': generar_nota,
+                'numero_documento': (numero_nota_raw or '').strip() or None,
+                'fecha_documento': fecha_nota,
+                'motivo': motivo_nota,
+            })],
+            usuario_id=st.session_state.get('user_id'),
+            generar_pdf=True,
+        )
+        if resultado.rechazados:
+            st.error(f'Error actualizando prima: {resultado.rechazados[0].motivo}')
+        else:
+            st.success(f'Prima neta actualizada a {nueva_prima_m.format()} (total con cargos e IVA {total_prima.format()}) para la póliza {selected[1]} (id={selected[0]}).')
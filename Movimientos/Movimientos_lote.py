@@ -0,0 +1,87 @@
+import streamlit as st
+from core.consultas import POLIZAS_POR_ESTADO
+from core.db import connection
+from core.movimientos import AUMENTO_PRIMA, AUMENTO_SUMA, CANCELACION, DISMINUCION_PRIMA, DISMINUCION_SUMA
+from core.servicios import MovimientoRequest, aplicar_movimientos
+
+
+def movimientos_en_lote():
+    """Expander para aplicar un mismo movimiento a muchas pólizas (core/movimientos.py).
+
+    Caso típico: indexación anual de sumas aseguradas de una cartera colectiva.
+    Se eligen las pólizas Activas (todas o de una aseguradora), el tipo de
+    movimiento y los porcentajes; el motor valida cada póliza, escribe los
+    movimientos con códigos MOV-000001... y reporta las pólizas rechazadas.
+    """
+
+    with st.expander('Movimientos en lote', expanded=True):
+        tipo = st.selectbox(
+            'Tipo de movimiento',
+            [AUMENTO_SUMA, DISMINUCION_SUMA, AUMENTO_PRIMA, DISMINUCION_PRIMA, CANCELACION],
+        )
+
+        # Pólizas activas con su aseguradora, en una sola lectura
+        try:
+            with connection() as conn:
+                aseguradoras = conn.execute("SELECT id, razon_social FROM aseguradoras ORDER BY razon_social").fetchall()
+                polizas = conn.execute(POLIZAS_POR_ESTADO, ('Activa',)).fetchall()
+        except Exception as e:
+            st.error(f'Error al leer pólizas activas: {e}')
+            return
+
+        aseguradora = st.selectbox(
+            'Aseguradora', [(None, 'Todas')] + aseguradoras, format_func=lambda x: x[1]
+        )
+        candidatas = [
+            (p[0], p[1]) for p in polizas
+            if aseguradora[0] is None or str(p[2]) == str(aseguradora[0])
+        ]
+        if not candidatas:
+            st.info('No hay pólizas ACTIVAS para los filtros elegidos.')
+            return
+        seleccion = st.multiselect(
+            'Pólizas (vacío = todas las filtradas)', candidatas, format_func=lambda x: x[1]
+        )
+        destino = seleccion or candidatas
+
+        params = {}
+        if tipo in (AUMENTO_SUMA, DISMINUCION_SUMA):
+            pct = st.number_input('Variación de la suma asegurada (%)', min_value=0.0, value=5.0, step=0.5, format='%.2f')
+            params['porcentaje_suma'] = pct if tipo == AUMENTO_SUMA else -pct
+        if tipo != CANCELACION:
+            pct_prima = st.number_input('Variación de la prima (%)', min_value=0.0, value=0.0 if tipo in (AUMENTO_SUMA, DISMINUCION_SUMA) else 5.0, step=0.5, format='%.2f')
+            if pct_prima:
+                params['porcentaje_prima'] = pct_prima if tipo in (AUMENTO_SUMA, AUMENTO_PRIMA) else -pct_prima
+            params['emitir_documento'] = st.checkbox(
+                'Emitir factura / nota de crédito por cada póliza', value=False,
+                help='Factura en los aumentos y nota de crédito en las disminuciones de prima',
+            )
+        observaciones = st.text_input('Observaciones', value='')
+        if observaciones:
+            params['observaciones'] = observaciones
+
+        st.write(f"**Pólizas a procesar:** {len(destino)}")
+        if st.button('Aplicar movimientos en lote'):
+            avance = st.empty()
+            try:
+                resumen = aplicar_movimientos(
+                    [MovimientoRequest(pid, tipo, dict(params)) for pid, _ in destino],
+                    usuario_id=st.session_state.get('user_id'),
+                    progreso=lambda n: avance.info(f'⏳ {n} de {len(destino)} pólizas procesadas...'),
+                    generar_pdf=True,
+                )
+            except Exception as e:
+                avance.empty()
+                st.error(f'Error aplicando los movimientos: {e}')
+                return
+            avance.empty()
+            st.success(
+                f"{resumen.aplicados} movimientos aplicados, {resumen.documentos} documentos emitidos, "
+                f"{len(resumen.rechazados)} rechazados. Los PDF se generan en segundo plano."
+            )
+            if resumen.rechazados:
+                numeros = dict(candidatas)
+                st.dataframe([
+                    {'poliza': numeros.get(r.poliza_id, r.poliza_id), 'tipo': r.tipo_movimiento, 'motivo': r.motivo}
+                    for r in resumen.rechazados[:500]
+                ])
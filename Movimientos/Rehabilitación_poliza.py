@@ -1,7 +1,10 @@
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
-import datetime
+from core.db import connection
+from core.consultas import POLIZAS_POR_ESTADO
+from core.movimientos import REHABILITACION
+from core.servicios import MovimientoRequest, aplicar_movimientos
 
 
 def rehabilitacion_poliza():
@@ -20,19 +23,14 @@ def rehabilitacion_poliza():
 		# Cargar pólizas con estado Cancelada
 		polizas_canceladas = []
 		try:
-			conn = sqlite3.connect(DB_FILE)
-			cur = conn.cursor()
-			cur.execute("SELECT id, numero_poliza FROM polizas WHERE estado = 'Cancelada' ORDER BY id DESC")
-			rows = cur.fetchall()
-			for r in rows:
-				polizas_canceladas.append((r[0], r[1]))
+			with connection() as conn:
+				cur = conn.cursor()
+				cur.execute(POLIZAS_POR_ESTADO, ('Cancelada',))
+				rows = cur.fetchall()
+				for r in rows:
+					polizas_canceladas.append((r[0], r[1]))
 		except Exception as e:
 			st.error(f"Error al leer pólizas canceladas: {e}")
-		finally:
-			try:
-				conn.close()
-			except Exception:
-				pass
 
 		if not polizas_canceladas:
 			st.info('No hay pólizas con estado "Cancelada".')
@@ -47,60 +45,14 @@ def rehabilitacion_poliza():
 
 			poliza_id = selected[0]
 
-			# Obtener cliente_id (si existe)
-			cliente_id = None
-			try:
-				conn2 = sqlite3.connect(DB_FILE)
-				cur2 = conn2.cursor()
-				cur2.execute('SELECT cliente_id FROM polizas WHERE id = ?', (poliza_id,))
-				r = cur2.fetchone()
-				if r:
-					cliente_id = r[0]
-			except Exception as e:
-				st.error(f'Error obteniendo cliente de la póliza: {e}')
-				return
-			finally:
-				try:
-					conn2.close()
-				except Exception:
-					pass
-
-			# Insertar movimiento y actualizar estado en la misma transacción
-			try:
-				conn3 = sqlite3.connect(DB_FILE)
-				cur3 = conn3.cursor()
-
-				fecha_mov = datetime.date.today().strftime('%Y-%m-%d')
-
-				cur3.execute(
-					'''
-					INSERT INTO movimientos_poliza (codigo_movimiento, poliza_id, cliente_id, fecha_movimiento, tipo_movimiento, estado)
-					VALUES (?, ?, ?, ?, ?, ?)
-					''',
-					(
-						codigo_movimiento,
-						poliza_id,
-						cliente_id,
-						fecha_mov,
-						'Rehabilitación',
-						'Aplicado',
-					)
-				)
-
-				cur3.execute("UPDATE polizas SET estado = ? WHERE id = ?", ('Activa', poliza_id))
-
-				conn3.commit()
+			# Movimiento y estado de la póliza en una única transacción (core/servicios.py)
+			resultado = aplicar_movimientos(
+				[MovimientoRequest(poliza_id, REHABILITACION, {'codigo_movimiento': codigo_movimiento})],
+				usuario_id=st.session_state.get('user_id'),
+			)
+			if resultado.rechazados:
+				st.error(f'Error al reactivar la póliza: {resultado.rechazados[0].motivo}')
+			else:
 				st.success(f'Póliza id={poliza_id} reactivada a estado Activa (movimiento={codigo_movimiento}).')
 				st.rerun()
-			except Exception as e:
-				try:
-					conn3.rollback()
-				except Exception:
-					pass
-				st.error(f'Error al reactivar la póliza: {e}')
-			finally:
-				try:
-					conn3.close()
-				except Exception:
-					pass
 
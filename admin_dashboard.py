@@ -5,6 +5,9 @@ import os
 # Agregar el directorio actual al path para importar módulos
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from core.migrations import run_migrations  # Tablas de resumen (migración 15)
+from dashboards.kpi_cartera import mostrar_kpis_cartera  # KPI de cartera
+
 # Importar el CRUD de ramos
 try:
     from crud.ramos_crud import show_ramos_crud
@@ -104,60 +107,9 @@ def show_dashboard_home():
     """Mostrar la página principal del dashboard"""
     st.title("🏠 Dashboard Principal")
     
-    # Métricas principales
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="📋 Total Pólizas",
-            value="1,234",
-            delta="12"
-        )
-    
-    with col2:
-        st.metric(
-            label="👥 Clientes Activos", 
-            value="856",
-            delta="23"
-        )
-    
-    with col3:
-        st.metric(
-            label="🛡️ Ramos Activos",
-            value="40",
-            delta="2"
-        )
-    
-    with col4:
-        st.metric(
-            label="💰 Ingresos del Mes",
-            value="$125,430",
-            delta="8.2%"
-        )
-    
-    st.markdown("---")
-    
-    # Gráficos y información adicional
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("📈 Tendencias de Ventas")
-        st.line_chart({
-            'Enero': 100,
-            'Febrero': 120,
-            'Marzo': 140,
-            'Abril': 110,
-            'Mayo': 160
-        })
-    
-    with col2:
-        st.subheader("🏆 Top Ramos de Seguros")
-        st.bar_chart({
-            'Vehículos': 45,
-            'Vida Individual': 32,
-            'Multiriesgo Hogar': 28,
-            'Responsabilidad Civil': 22
-        })
+    # Métricas y gráficos desde las tablas de resumen (core/cartera.py)
+    run_migrations()
+    mostrar_kpis_cartera()
 
 def show_users_management():
     """Gestión de usuarios"""
@@ -10,15 +10,16 @@ import streamlit as st  # Framework principal para la interfaz web
 import sqlite3  # Manejo de base de datos SQLite
 import jwt  # JSON Web Tokens para autenticación segura
 import datetime  # Manejo de fechas y tiempos
-import bcrypt  # Encriptación de contraseñas con hash
 import base64  # Codificación de imágenes para mostrar en web
 import os  # Operaciones del sistema operativo
 import importlib  # Importación dinámica de módulos
 
 # Importación de módulos personalizados del proyecto
 from dbconfig import DB_FILE, SECRET_KEY  # Configuración de BD y clave secreta
+from core.db import get_connection  # Pool de conexiones SQLite compartido
+from core.autenticacion import autenticar  # Verificación de credenciales y rehash bcrypt
 from crud.user_crud import create_user, read_users, update_user, delete_user, get_user_details  # Operaciones CRUD de usuarios
-from database_config import initialize_database  # Inicialización de la base de datos
+from core.migrations import run_migrations  # Migraciones de esquema (una vez por proceso)
 from user_dashboard import user_dashboard  # Dashboard de usuario genérico
 
 # ============================================================================
@@ -93,49 +94,32 @@ def authenticate(username, password):
     Retorna:
         str: Token JWT si la autenticación es exitosa, None en caso contrario
     """
-    # Conectar a la base de datos SQLite
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    # Buscar usuario en la tabla users por nombre de usuario
-    cursor.execute("SELECT * FROM users WHERE username=?", (username,))
-    user = cursor.fetchone()  # Obtener el primer resultado (o None)
-    conn.close()  # Cerrar conexión inmediatamente
-
-    # Verificar si el usuario existe en la base de datos
-    if not user:
-        st.error("Usuario no encontrado.")
+    # Verificar credenciales (solo username, password y role; si el hash tiene
+    # otro costo que dbconfig.BCRYPT_COSTO se vuelve a cifrar)
+    user, error = autenticar(username, password)
+    if error:
+        st.error(error)
         return None
 
-    # Asegurar que la contraseña almacenada esté en formato bytes para bcrypt
-    # La contraseña está en la posición 2 del tuple (user[2])
-    stored_password = user[2].encode() if isinstance(user[2], str) else user[2]
-
-    # Verificar la contraseña usando bcrypt (compara hash almacenado con contraseña ingresada)
-    if bcrypt.checkpw(password.encode(), stored_password):
-        try:
-            # Generar token JWT con información del usuario
-            token = jwt.encode(
-                {
-                    "username": user[1],  # Nombre de usuario (posición 1)
-                    "role": user[3],  # Rol del usuario (posición 3)
-                    "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=1)  # Expiración en 1 hora
-                },
-                SECRET_KEY,  # Clave secreta para firmar el token
-                algorithm="HS256"  # Algoritmo de encriptación HS256
-            )
-            # Guardar información del usuario en la sesión de Streamlit
-            st.session_state["username"] = user[1]
-            st.session_state["token"] = token
-            return token
-        except Exception as e:
-            # Capturar cualquier error en la generación del token
-            st.error(f"Error al generar el token: {e}")
-            return None
-
-    # Si la contraseña no coincide, mostrar error
-    st.error("Contraseña incorrecta.")
-    return None
+    try:
+        # Generar token JWT con información del usuario
+        token = jwt.encode(
+            {
+                "username": user["username"],  # Nombre de usuario
+                "role": user["role"],  # Rol del usuario
+                "exp": datetime.datetime.utcnow() + datetime.timedelta(hours=1)  # Expiración en 1 hora
+            },
+            SECRET_KEY,  # Clave secreta para firmar el token
+            algorithm="HS256"  # Algoritmo de encriptación HS256
+        )
+        # Guardar información del usuario en la sesión de Streamlit
+        st.session_state["username"] = user["username"]
+        st.session_state["token"] = token
+        return token
+    except Exception as e:
+        # Capturar cualquier error en la generación del token
+        st.error(f"Error al generar el token: {e}")
+        return None
 
 # ============================================================================
 # FUNCIÓN: login_page
@@ -184,7 +168,7 @@ def login_page():
         # Expander con el formulario de login
         with st.expander("Iniciar Sesión como :orange[usuario]"):
             # Obtener lista de usuarios disponibles desde la base de datos
-            conn = sqlite3.connect(DB_FILE)
+            conn = get_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT username FROM users")  # Consultar todos los nombres de usuario
             user_list = [row[0] for row in cursor.fetchall()]  # Convertir resultados a lista
@@ -302,15 +286,11 @@ def get_dashboard_for_role(role):
 def main():
     """
     Controla el flujo principal de la aplicación:
-    1. Inicializa la base de datos
-    2. Verifica si existe una sesión activa (token JWT)
-    3. Decodifica el token para obtener información del usuario
-    4. Redirige al dashboard correspondiente según el rol del usuario
-    5. Si no hay sesión, muestra la página de login
+    1. Verifica si existe una sesión activa (token JWT)
+    2. Decodifica el token para obtener información del usuario
+    3. Redirige al dashboard correspondiente según el rol del usuario
+    4. Si no hay sesión, muestra la página de login
     """
-    # Inicializar la base de datos (crear tablas si no existen)
-    initialize_database()
-    
     # Verificar si existe un token de sesión en st.session_state
     if "token" in st.session_state:
         try:
@@ -365,7 +345,8 @@ def main():
 # PUNTO DE ENTRADA DE LA APLICACIÓN
 # ============================================================================
 if __name__ == "__main__":
-    # Inicializar la base de datos al arrancar la aplicación
-    initialize_database()
+    # Aplicar migraciones pendientes: solo trabaja en el primer render del proceso,
+    # los reruns de Streamlit encuentran la base ya migrada y retornan al instante
+    run_migrations()
     # Ejecutar la función principal
     main()
@@ -0,0 +1 @@
+# Archivo init para el módulo core (infraestructura compartida: acceso a datos, migraciones)
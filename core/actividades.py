@@ -0,0 +1,214 @@
+# ============================================================================
+# CATÁLOGO CIIU DE ACTIVIDADES ECONÓMICAS - core/actividades.py
+# ============================================================================
+# Tabla de referencia `actividades_economicas` (código, sección, división,
+# descripción; migración 14) cargada desde assets/actividad_economica.py, con
+# búsqueda por prefijo de código ("A0113"), filtro por sección y búsqueda por
+# descripción sin tildes (índice FTS5 `actividades_fts`, como clients_fts).
+# Los formularios de clientes leen solo las N coincidencias de la búsqueda en
+# lugar de las 1.849 actividades. No depende de Streamlit.
+#
+# En `clients.actividad_economica` se sigue guardando "código<TAB>descripción",
+# el formato de la lista original.
+# ============================================================================
+
+# Importaciones necesarias
+import re  # Reconocer códigos y términos
+
+from core.catalogos import catalogo, invalidar  # Caché de las secciones
+from core.clientes import consulta_fts  # Términos como prefijos (AND)
+from core.db import connection, unit_of_work  # Pool de conexiones y transacciones
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+LIMITE_RESULTADOS = 20  # Coincidencias que muestra el selector
+
+# Secciones de la CIIU Rev. 4 (más las de uso del SRI: V, W, X)
+SECCIONES = {
+    "A": "Agricultura, ganadería, silvicultura y pesca",
+    "B": "Explotación de minas y canteras",
+    "C": "Industrias manufactureras",
+    "D": "Suministro de electricidad, gas, vapor y aire acondicionado",
+    "E": "Distribución de agua, alcantarillado y gestión de desechos",
+    "F": "Construcción",
+    "G": "Comercio al por mayor y al por menor; reparación de vehículos",
+    "H": "Transporte y almacenamiento",
+    "I": "Alojamiento y servicio de comidas",
+    "J": "Información y comunicación",
+    "K": "Actividades financieras y de seguros",
+    "L": "Actividades inmobiliarias",
+    "M": "Actividades profesionales, científicas y técnicas",
+    "N": "Servicios administrativos y de apoyo",
+    "O": "Administración pública y defensa",
+    "P": "Enseñanza",
+    "Q": "Salud humana y asistencia social",
+    "R": "Artes, entretenimiento y recreación",
+    "S": "Otras actividades de servicios",
+    "T": "Hogares como empleadores",
+    "U": "Organizaciones extraterritoriales",
+    "V": "Sin actividad económica",
+    "W": "Relación de dependencia, sector privado",
+    "X": "Relación de dependencia, sector público",
+}
+
+_CODIGO = re.compile(r"^[A-Za-z]?\d+$|^[A-Za-z]$")  # "A0113", "0113", "A"
+
+_SELECT = "SELECT a.codigo, a.descripcion FROM actividades_economicas a"
+
+
+# ============================================================================
+# FORMATO DEL VALOR GUARDADO EN clients
+# ============================================================================
+def valor_actividad(fila):
+    """(codigo, descripcion) -> "código<TAB>descripción" (valor de clients.actividad_economica)."""
+    return f"{fila[0]}\t{fila[1]}"
+
+
+def codigo_de(valor):
+    """Código de un valor guardado ("A011111\tCULTIVO DE TRIGO" -> "A011111"), o None."""
+    if not valor:
+        return None
+    return str(valor).split("\t", 1)[0].strip() or None
+
+
+def etiqueta_actividad(fila):
+    """Texto visible en el selector: "A011111 · CULTIVO DE TRIGO"."""
+    return f"{fila[0]} · {fila[1]}"
+
+
+# ============================================================================
+# BÚSQUEDA
+# ============================================================================
+def consulta_actividades(texto="", seccion=None, limite=LIMITE_RESULTADOS, fts=True):
+    """
+    Construye la consulta de buscar_actividades()
+
+    Parámetros:
+        texto (str): "A0113" / "0113" (prefijo de código) o palabras ("cultivo maiz");
+                     vacío retorna las primeras actividades (de la sección)
+        seccion (str): Letra de la sección CIIU, o None para todas
+        limite (int): Máximo de resultados
+        fts (bool): Si la base tiene el índice actividades_fts
+
+    Retorna:
+        tuple: (consulta SQL, parámetros)
+    """
+    texto = (texto or "").strip()
+    filtro, parametros = ("a.seccion = ?", [seccion.upper()]) if seccion else ("1", [])
+    if _CODIGO.match(texto):
+        # Prefijo con letra: rango del índice de la clave primaria (GLOB 'A0113*');
+        # sin letra se busca en todas las secciones ("0113" -> '?0113*')
+        patron = texto.upper() if texto[0].isalpha() else f"?{texto}"
+        return (
+            f"{_SELECT} WHERE a.codigo GLOB ? AND {filtro} ORDER BY a.codigo LIMIT ?",
+            (f"{patron}*", *parametros, limite),
+        )
+    match = consulta_fts(texto)
+    if match is None:
+        return f"{_SELECT} WHERE {filtro} ORDER BY a.codigo LIMIT ?", (*parametros, limite)
+    if fts:
+        return (
+            f"""{_SELECT}
+                JOIN actividades_fts f ON f.rowid = a.rowid
+                WHERE actividades_fts MATCH ? AND {filtro}
+                ORDER BY bm25(actividades_fts)
+                LIMIT ?""",
+            (match, *parametros, limite),
+        )
+    # Sin FTS5: LIKE sobre la descripción (distingue tildes)
+    return (
+        f"{_SELECT} WHERE a.descripcion LIKE ? AND {filtro} ORDER BY a.codigo LIMIT ?",
+        (f"%{texto}%", *parametros, limite),
+    )
+
+
+def buscar_actividades(texto="", seccion=None, limite=LIMITE_RESULTADOS, db_file=None):
+    """
+    Busca actividades por prefijo de código o por palabras de la descripción (sin tildes)
+
+    Parámetros:
+        texto (str): Código o descripción (ver consulta_actividades)
+        seccion (str): Letra de la sección CIIU, o None para todas
+        limite (int): Máximo de resultados
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        list: Tuplas (codigo, descripcion); por código o por relevancia (bm25)
+    """
+    with connection(db_file) as conn:
+        fts = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'actividades_fts'").fetchone() is not None
+        return conn.execute(*consulta_actividades(texto, seccion, limite, fts)).fetchall()
+
+
+def actividad_por_codigo(codigo, db_file=None):
+    """
+    Retorna (codigo, descripcion) de una actividad, o None si no existe
+
+    Acepta también un valor guardado en clients ("código<TAB>descripción").
+    """
+    codigo = codigo_de(codigo)
+    if not codigo:
+        return None
+    with connection(db_file) as conn:
+        return conn.execute(f"{_SELECT} WHERE a.codigo = ?", (codigo,)).fetchone()
+
+
+@catalogo(tablas=("actividades_economicas",))
+def secciones(db_file=None):
+    """
+    Secciones con actividades registradas
+
+    Retorna:
+        list: Tuplas (letra, nombre, cantidad de actividades)
+    """
+    with connection(db_file) as conn:
+        filas = conn.execute(
+            "SELECT seccion, COUNT(*) FROM actividades_economicas WHERE seccion IS NOT NULL GROUP BY seccion ORDER BY seccion"
+        ).fetchall()
+    return [(letra, SECCIONES.get(letra, letra), cantidad) for letra, cantidad in filas]
+
+
+# ============================================================================
+# CARGA DEL CATÁLOGO
+# ============================================================================
+def _fila(linea):
+    """Línea "A011111<TAB>CULTIVO DE TRIGO" -> (codigo, seccion, division, descripcion)."""
+    codigo, _, descripcion = linea.partition("\t")
+    codigo = codigo.strip()
+    seccion = codigo[0] if codigo[:1].isalpha() else None
+    division = codigo[1:3] if seccion and len(codigo) >= 3 else None
+    return codigo, seccion, division, descripcion.strip()
+
+
+def cargar_catalogo(conn, opciones=None):
+    """
+    Inserta o actualiza el catálogo desde assets/actividad_economica.py y reconstruye su índice
+
+    Parámetros:
+        conn (sqlite3.Connection): Conexión dentro de la transacción de quien llama
+        opciones (list): Líneas "código<TAB>descripción" (por defecto la lista del proyecto)
+
+    Retorna:
+        int: Actividades cargadas
+    """
+    if opciones is None:
+        from assets.actividad_economica import actividad_economica_options as opciones
+    filas = [_fila(linea) for linea in opciones if linea.strip()]
+    conn.executemany(
+        """INSERT INTO actividades_economicas (codigo, seccion, division, descripcion) VALUES (?, ?, ?, ?)
+           ON CONFLICT (codigo) DO UPDATE SET
+               seccion = excluded.seccion, division = excluded.division, descripcion = excluded.descripcion""",
+        filas,
+    )
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'actividades_fts'").fetchone():
+        conn.execute("INSERT INTO actividades_fts (actividades_fts) VALUES ('rebuild')")
+    return len(filas)
+
+
+def recargar_catalogo(db_file=None):
+    """Vuelve a cargar el catálogo (p. ej. tras actualizar assets/actividad_economica.py)."""
+    with unit_of_work(db_file) as conn:
+        cantidad = cargar_catalogo(conn)
+    invalidar("actividades_economicas")
+    return cantidad
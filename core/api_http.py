@@ -0,0 +1,252 @@
+# ============================================================================
+# ENDPOINT HTTP/JSON LOCAL - core/api_http.py
+# ============================================================================
+# Expone core/servicios.py por HTTP con la librería estándar
+# (http.server.ThreadingHTTPServer, un hilo por petición sobre el pool de
+# conexiones de core/db.py), para integraciones y trabajos por lotes que no
+# deben pasar por los reruns de Streamlit. Se inicia con
+# scripts/servidor_api.py y escucha por defecto solo en 127.0.0.1.
+#
+# Rutas:
+#   GET    /salud
+#   GET    /clientes?q=texto&limite=20
+#   POST   /clientes                      ClienteRequest
+#   PATCH  /clientes?correo=x@y.com       {columna: valor}
+#   DELETE /clientes/<id>
+#   GET    /clientes/<id>/polizas?categoria=Vehicular
+#   POST   /desglose                      DesgloseRequest
+#   POST   /movimientos                   {"emitir_documentos", "generar_pdf", "movimientos": [...]}
+#
+# Cada petición debe enviar "Authorization: Bearer <token>"; el token
+# pertenece a un usuario de la tabla users y los movimientos se registran a
+# su nombre (el cuerpo no puede elegir otro usuario_id). Sin token el
+# servidor solo arranca con sin_autenticacion=True (--sin-autenticacion), y
+# entonces los movimientos quedan sin usuario.
+# ============================================================================
+
+# Importaciones necesarias
+import hmac  # Comparación del token en tiempo constante
+import json  # Cuerpos de petición y respuesta
+import logging  # Errores internos (no se envían al cliente)
+import re  # Rutas con parámetros
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Servidor estándar
+from urllib.parse import parse_qs, urlparse  # Parámetros de consulta
+
+from core import servicios  # Lógica de negocio sin Streamlit
+from core.db import connection  # Usuario dueño del token
+
+MAX_CUERPO = 10 * 1024 * 1024  # Tamaño máximo de un cuerpo JSON (bytes)
+
+_log = logging.getLogger(__name__)
+
+
+class ErrorPeticion(Exception):
+    """Petición inválida; se responde con `estado` y el mensaje."""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# ============================================================================
+# OPERACIONES (una por ruta)
+# ============================================================================
+def _estado_respuesta(respuesta):
+    return 200 if respuesta.ok else 400
+
+
+def _entero(consulta, nombre, defecto):
+    """Parámetro entero de la consulta; un valor no numérico es un error 400."""
+    valor = consulta.get(nombre, [defecto])[0]
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        raise ErrorPeticion(400, f"El parámetro {nombre} debe ser un número entero")
+
+
+def _buscar_clientes(servidor, consulta, cuerpo):
+    limite = _entero(consulta, "limite", servicios.LIMITE_RESULTADOS)
+    return 200, servicios.a_dict(servicios.buscar_clientes(consulta.get("q", [""])[0], limite, servidor.db_file))
+
+
+def _crear_cliente(servidor, consulta, cuerpo):
+    try:
+        solicitud = servicios.ClienteRequest.desde_dict(cuerpo)
+    except TypeError as e:
+        raise ErrorPeticion(400, f"Datos de cliente incompletos: {e}")
+    respuesta = servicios.crear_cliente(solicitud, servidor.db_file)
+    return (201 if respuesta.ok else 400), servicios.a_dict(respuesta)
+
+
+def _actualizar_cliente(servidor, consulta, cuerpo):
+    if "correo" not in consulta:
+        raise ErrorPeticion(400, "Falta el parámetro correo")
+    respuesta = servicios.actualizar_cliente(consulta["correo"][0], cuerpo, servidor.db_file)
+    return _estado_respuesta(respuesta), servicios.a_dict(respuesta)
+
+
+def _eliminar_cliente(servidor, consulta, cuerpo, cliente_id):
+    respuesta = servicios.eliminar_cliente(int(cliente_id), servidor.db_file)
+    return (200 if respuesta.ok else 404), servicios.a_dict(respuesta)
+
+
+def _polizas_de_cliente(servidor, consulta, cuerpo, cliente_id):
+    categoria = consulta.get("categoria", [None])[0]
+    return 200, servicios.a_dict(servicios.polizas_de_cliente(int(cliente_id), categoria, servidor.db_file))
+
+
+def _desglose(servidor, consulta, cuerpo):
+    try:
+        solicitud = servicios.DesgloseRequest(**cuerpo)
+    except TypeError as e:
+        raise ErrorPeticion(400, f"Solicitud de desglose inválida: {e}")
+    return 200, servicios.a_dict(servicios.desglose_prima(solicitud))
+
+
+def _movimientos(servidor, consulta, cuerpo):
+    try:
+        solicitudes = [servicios.MovimientoRequest(**m) for m in cuerpo.get("movimientos", [])]
+    except TypeError as e:
+        raise ErrorPeticion(400, f"Movimiento inválido: {e}")
+    if "usuario_id" in cuerpo:
+        raise ErrorPeticion(400, "usuario_id no se acepta en el cuerpo: se toma del token")
+    resultado = servicios.aplicar_movimientos(
+        solicitudes,
+        usuario_id=servidor.usuario_id,
+        emitir_documentos=bool(cuerpo.get("emitir_documentos", False)),
+        generar_pdf=bool(cuerpo.get("generar_pdf", False)),
+        db_file=servidor.db_file,
+    )
+    return 200, servicios.a_dict(resultado)
+
+
+# (método, patrón de ruta, operación); los grupos del patrón se pasan como argumentos
+RUTAS = [
+    ("GET", r"/salud", lambda servidor, consulta, cuerpo: (200, {"ok": True})),
+    ("GET", r"/clientes", _buscar_clientes),
+    ("POST", r"/clientes", _crear_cliente),
+    ("PATCH", r"/clientes", _actualizar_cliente),
+    ("DELETE", r"/clientes/(\d+)", _eliminar_cliente),
+    ("GET", r"/clientes/(\d+)/polizas", _polizas_de_cliente),
+    ("POST", r"/desglose", _desglose),
+    ("POST", r"/movimientos", _movimientos),
+]
+_RUTAS = [(metodo, re.compile(f"^{patron}/?$"), operacion) for metodo, patron, operacion in RUTAS]
+
+
+# ============================================================================
+# SERVIDOR
+# ============================================================================
+class ManejadorAPI(BaseHTTPRequestHandler):
+    """Traduce cada petición HTTP a una operación de RUTAS y responde JSON."""
+
+    server_version = "MillenialBrokerAPI/1.0"
+
+    def _responder(self, estado, datos):
+        cuerpo = json.dumps(datos, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _leer_cuerpo(self):
+        try:
+            longitud = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            raise ErrorPeticion(400, "Content-Length inválido")
+        if longitud > MAX_CUERPO:
+            raise ErrorPeticion(413, "Cuerpo demasiado grande")
+        if not longitud:
+            return {}
+        try:
+            cuerpo = json.loads(self.rfile.read(longitud))
+        except (ValueError, UnicodeDecodeError):
+            raise ErrorPeticion(400, "El cuerpo no es JSON válido")
+        if not isinstance(cuerpo, dict):
+            raise ErrorPeticion(400, "El cuerpo debe ser un objeto JSON")
+        return cuerpo
+
+    def _despachar(self, metodo):
+        try:
+            token = self.server.token
+            if token:
+                recibido = self.headers.get("Authorization", "")
+                if not hmac.compare_digest(recibido.encode(), f"Bearer {token}".encode()):
+                    raise ErrorPeticion(401, "Token inválido")
+            url = urlparse(self.path)
+            for metodo_ruta, patron, operacion in _RUTAS:
+                coincidencia = patron.match(url.path)
+                if metodo_ruta == metodo and coincidencia:
+                    estado, datos = operacion(
+                        self.server, parse_qs(url.query), self._leer_cuerpo(), *coincidencia.groups()
+                    )
+                    return self._responder(estado, datos)
+            raise ErrorPeticion(404, f"Ruta no encontrada: {metodo} {url.path}")
+        except ErrorPeticion as e:
+            self._responder(e.estado, {"ok": False, "mensaje": str(e)})
+        except Exception:
+            # El detalle queda en el log del servidor; el cliente recibe un mensaje fijo
+            _log.exception("Error interno en %s %s", metodo, self.path)
+            self._responder(500, {"ok": False, "mensaje": "Error interno del servidor"})
+
+    def do_GET(self):
+        self._despachar("GET")
+
+    def do_POST(self):
+        self._despachar("POST")
+
+    def do_PATCH(self):
+        self._despachar("PATCH")
+
+    def do_DELETE(self):
+        self._despachar("DELETE")
+
+    def log_message(self, formato, *args):
+        if self.server.verbose:
+            super().log_message(formato, *args)
+
+
+def _id_de_usuario(username, db_file=None):
+    """Id del usuario (tabla users) con ese username, o None si no existe."""
+    with connection(db_file) as conn:
+        fila = conn.execute("SELECT id FROM users WHERE username = ?", (username,)).fetchone()
+    return fila[0] if fila else None
+
+
+def crear_servidor(host="127.0.0.1", puerto=8765, db_file=None, token=None, usuario=None,
+                   sin_autenticacion=False, verbose=False):
+    """
+    Crea el servidor HTTP (sin iniciarlo)
+
+    Parámetros:
+        host (str): Interfaz de escucha (por defecto solo local)
+        puerto (int): Puerto TCP (0 = uno libre)
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+        token (str): Token Bearer exigido en cada petición
+        usuario (str): Username (tabla users) dueño del token; registra los movimientos
+        sin_autenticacion (bool): Permitir arrancar sin token (peticiones anónimas)
+        verbose (bool): Registrar cada petición en stderr
+
+    Retorna:
+        ThreadingHTTPServer: Llamar a serve_forever() para atender peticiones
+
+    Lanza:
+        ValueError: Sin token y sin sin_autenticacion, o token sin un usuario existente
+    """
+    usuario_id = None
+    if token:
+        if not usuario:
+            raise ValueError("El token debe pertenecer a un usuario (usuario=username)")
+        usuario_id = _id_de_usuario(usuario, db_file)
+        if usuario_id is None:
+            raise ValueError(f"El usuario {usuario} no existe")
+    elif not sin_autenticacion:
+        raise ValueError("Se requiere un token; para arrancar sin autenticación use sin_autenticacion=True")
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorAPI)
+    servidor.daemon_threads = True
+    servidor.db_file = db_file
+    servidor.token = token
+    servidor.usuario_id = usuario_id
+    servidor.verbose = verbose
+    return servidor
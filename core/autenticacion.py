@@ -0,0 +1,165 @@
+# ============================================================================
+# AUTENTICACIÓN Y POLÍTICA DE CONTRASEÑAS - core/autenticacion.py
+# ============================================================================
+# Hash bcrypt con un costo configurable (dbconfig.BCRYPT_COSTO) en lugar del
+# valor por defecto de bcrypt.gensalt(), y verificación de credenciales sin
+# Streamlit para app1.authenticate y los benchmarks.
+#
+#   - calibrar_costo() mide bcrypt en este equipo y elige el mayor costo cuyo
+#     hash tarda menos que la latencia objetivo de un inicio de sesión
+#     (scripts/calibrar_bcrypt.py lo ejecuta y mide inicios concurrentes).
+#   - autenticar() lee solo username, password y role del usuario y, si la
+#     contraseña es correcta pero el hash guardado tiene otro costo, la vuelve
+#     a cifrar con el costo vigente (rehash transparente al iniciar sesión).
+# ============================================================================
+
+# Importaciones necesarias
+import sqlite3  # Errores al guardar el nuevo hash
+import statistics  # Mediana de las mediciones
+import time  # Duración de cada hash
+
+import bcrypt  # Hash de contraseñas
+
+from core.consultas import USUARIO_PARA_LOGIN  # Columnas mínimas del usuario
+from core.db import connection, unit_of_work  # Pool de conexiones y transacciones
+from dbconfig import BCRYPT_COSTO, LATENCIA_LOGIN_MS  # Política de hash vigente
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+COSTO_MINIMO = 10  # Nunca se calibra por debajo de este costo
+COSTO_MAXIMO = 16  # Cada punto de costo duplica el tiempo del hash
+
+
+# ============================================================================
+# HASH Y VERIFICACIÓN
+# ============================================================================
+def hashear(password, costo=None):
+    """
+    Cifra una contraseña con bcrypt
+
+    Parámetros:
+        password (str): Contraseña en texto plano
+        costo (int): Factor de trabajo (por defecto dbconfig.BCRYPT_COSTO)
+
+    Retorna:
+        str: Hash bcrypt ("$2b$12$...")
+    """
+    salt = bcrypt.gensalt(rounds=costo or BCRYPT_COSTO)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("ascii")
+
+
+def costo_de(hash_guardado):
+    """Costo de un hash bcrypt ("$2b$12$..." -> 12), o None si no tiene ese formato."""
+    if isinstance(hash_guardado, bytes):
+        hash_guardado = hash_guardado.decode("ascii", errors="replace")
+    partes = str(hash_guardado or "").split("$")
+    if len(partes) < 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+def verificar(password, hash_guardado, costo=None):
+    """
+    Compara una contraseña con su hash y decide si hay que volver a cifrarla
+
+    Parámetros:
+        password (str): Contraseña ingresada
+        hash_guardado (str | bytes): users.password (texto o BLOB, según cómo se guardó)
+        costo (int): Costo vigente (por defecto dbconfig.BCRYPT_COSTO)
+
+    Retorna:
+        tuple: (True si coincide, nuevo hash con el costo vigente o None si no hace falta)
+    """
+    if not hash_guardado:
+        return False, None
+    guardado = hash_guardado.encode("ascii") if isinstance(hash_guardado, str) else hash_guardado
+    try:
+        correcta = bcrypt.checkpw(password.encode("utf-8"), guardado)
+    except ValueError:
+        # Hash con formato inválido o contraseña de más de 72 bytes
+        return False, None
+    costo = costo or BCRYPT_COSTO
+    if correcta and costo_de(guardado) != costo:
+        return True, hashear(password, costo)
+    return correcta, None
+
+
+def autenticar(username, password, db_file=None, costo=None):
+    """
+    Verifica las credenciales de un usuario
+
+    Si la contraseña es correcta y el hash tiene otro costo que el vigente,
+    guarda el nuevo hash. Un fallo al guardarlo (p. ej. base bloqueada) no
+    impide el inicio de sesión: se reintenta en el siguiente.
+
+    Parámetros:
+        username (str): Nombre de usuario
+        password (str): Contraseña ingresada
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+        costo (int): Costo vigente (por defecto dbconfig.BCRYPT_COSTO)
+
+    Retorna:
+        tuple: ({"username", "role"} o None, mensaje de error o None)
+    """
+    with connection(db_file) as conn:
+        fila = conn.execute(USUARIO_PARA_LOGIN, (username,)).fetchone()
+    if not fila:
+        return None, "Usuario no encontrado."
+
+    usuario, hash_guardado, rol = fila
+    correcta, nuevo_hash = verificar(password, hash_guardado, costo)
+    if not correcta:
+        return None, "Contraseña incorrecta."
+
+    if nuevo_hash:
+        try:
+            with unit_of_work(db_file) as conn:
+                # Solo si nadie cambió la contraseña mientras se verificaba
+                conn.execute(
+                    "UPDATE users SET password = ? WHERE username = ? AND password = ?",
+                    (nuevo_hash, usuario, hash_guardado),
+                )
+        except sqlite3.Error:
+            pass
+    return {"username": usuario, "role": rol}, None
+
+
+# ============================================================================
+# CALIBRACIÓN
+# ============================================================================
+def tiempo_hash(costo, repeticiones=3):
+    """Mediana en milisegundos de bcrypt.hashpw con un costo dado en este equipo."""
+    tiempos = []
+    for _ in range(max(1, repeticiones)):
+        inicio = time.perf_counter()
+        bcrypt.hashpw(b"calibracion", bcrypt.gensalt(rounds=costo))
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def calibrar_costo(objetivo_ms=LATENCIA_LOGIN_MS, minimo=COSTO_MINIMO, maximo=COSTO_MAXIMO, repeticiones=3):
+    """
+    Elige el mayor costo cuyo hash no supera la latencia objetivo
+
+    Mide desde `minimo` hacia arriba y se detiene en el primer costo que la
+    supera (el siguiente tardaría el doble). Si ni el mínimo cumple el
+    objetivo se retorna igualmente el mínimo.
+
+    Parámetros:
+        objetivo_ms (float): Tiempo máximo de verificación por inicio de sesión
+        minimo (int): Costo más bajo aceptable
+        maximo (int): Costo más alto a probar
+        repeticiones (int): Mediciones por costo (se toma la mediana)
+
+    Retorna:
+        tuple: (costo elegido, {costo: ms medidos})
+    """
+    mediciones = {}
+    elegido = minimo
+    for costo in range(minimo, maximo + 1):
+        mediciones[costo] = tiempo_hash(costo, repeticiones)
+        if mediciones[costo] > objetivo_ms:
+            break
+        elegido = costo
+    return elegido, mediciones
@@ -0,0 +1,52 @@
+# ============================================================================
+# CARGA DIFERIDA DE MÓDULOS - core/carga_diferida.py
+# ============================================================================
+# Los dashboards y menús importan cada módulo CRUD (y sus dependencias
+# pesadas: pandas, PyMuPDF, reportlab) recién cuando el usuario lo abre, en
+# lugar de hacerlo todo al arrancar. cargar("crud.poliza_crud:crud_polizas")
+# importa una sola vez por proceso (importlib guarda el módulo en
+# sys.modules) y registra cuánto tardó la primera importación.
+#
+# scripts/perfil_arranque.py mide el tiempo de importación de cada dashboard
+# y comprueba que no arrastre dependencias pesadas.
+# ============================================================================
+
+# Importaciones necesarias
+import importlib  # Importación por nombre
+import sys  # Módulos ya importados
+import threading  # Lock del registro de tiempos
+import time  # Duración de la primera importación
+
+_tiempos = {}  # {módulo: segundos de la primera importación en este proceso}
+_lock = threading.Lock()
+
+
+def cargar(ruta):
+    """
+    Importa un módulo en el primer uso y retorna el atributo pedido
+
+    Parámetros:
+        ruta (str): "paquete.modulo:atributo" (p. ej. "crud.client_crud:crud_clientes")
+
+    Retorna:
+        object: El atributo (normalmente la función que dibuja la página)
+    """
+    nombre, _, atributo = ruta.partition(":")
+    if nombre in sys.modules:
+        return getattr(sys.modules[nombre], atributo)
+    inicio = time.perf_counter()
+    modulo = importlib.import_module(nombre)
+    with _lock:
+        _tiempos.setdefault(nombre, time.perf_counter() - inicio)
+    return getattr(modulo, atributo)
+
+
+def tiempos_de_carga():
+    """
+    Tiempo de la primera importación de cada módulo cargado con cargar()
+
+    Retorna:
+        dict: {módulo: segundos}, de mayor a menor
+    """
+    with _lock:
+        return dict(sorted(_tiempos.items(), key=lambda item: item[1], reverse=True))
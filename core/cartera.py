@@ -0,0 +1,190 @@
+# ============================================================================
+# RESUMEN DE CARTERA Y FACTURACIÓN - core/cartera.py
+# ============================================================================
+# Tablas de totales por (aseguradora, ramo, estado, mes) para los KPI de los
+# dashboards, que así leen unas decenas de grupos en lugar de recorrer
+# `polizas` y `facturas` completas:
+#
+#   - resumen_cartera: pólizas, prima neta, suma asegurada y total (centavos)
+#   - resumen_facturacion: facturas, monto neto y total (centavos); la
+#     aseguradora y el ramo son los de la póliza de la factura
+#
+# Se mantienen con triggers (migración 15, en core/migrations.py), porque
+# pólizas y facturas se escriben desde muchos módulos (CRUD, Movimientos,
+# ingestas): cada INSERT, DELETE o UPDATE de una columna de la clave o de un
+# monto resta la fila anterior de su grupo y suma la nueva. Los grupos que quedan en cero se
+# borran. El mes es el de fecha_emision (o fecha_inicio / fecha_registro).
+#
+# reconstruir() los recalcula desde cero y diferencias() los compara con las
+# tablas vivas (scripts/reconstruir_resumenes.py).
+# ============================================================================
+
+# Importaciones necesarias
+from core.db import connection  # Pool de conexiones
+
+# ============================================================================
+# DEFINICIÓN DE LOS RESÚMENES
+# ============================================================================
+CLAVE = ("aseguradora_id", "ramo_id", "estado", "mes")
+
+# Columnas de montos de cada resumen; el contador va primero
+MEDIDAS_CARTERA = ("polizas", "prima_neta_centavos", "suma_asegurada_centavos", "total_centavos")
+MEDIDAS_FACTURACION = ("facturas", "monto_neto_centavos", "total_centavos")
+
+
+def _clave_poliza(p):
+    """Expresiones de la clave para una fila de polizas con alias `p` (new, old o la tabla)."""
+    return (
+        f"ifnull({p}.aseguradora_id, 0)",
+        f"ifnull({p}.ramo_id, 0)",
+        f"ifnull({p}.estado, '')",
+        f"substr(coalesce(nullif({p}.fecha_emision, ''), {p}.fecha_inicio, ''), 1, 7)",
+    )
+
+
+def _montos_poliza(p):
+    return (
+        "1",
+        f"ifnull({p}.prima_neta_centavos, 0)",
+        f"ifnull({p}.suma_asegurada_centavos, 0)",
+        f"ifnull({p}.total_centavos, 0)",
+    )
+
+
+def _clave_factura(f, aseguradora, ramo):
+    """Clave de una factura `f`; aseguradora y ramo son expresiones de su póliza."""
+    return (
+        f"ifnull({aseguradora}, 0)",
+        f"ifnull({ramo}, 0)",
+        f"ifnull({f}.estado, '')",
+        f"substr(coalesce(nullif({f}.fecha_emision, ''), {f}.fecha_registro, ''), 1, 7)",
+    )
+
+
+def _montos_factura(f):
+    # Las facturas guardan REAL: se redondea cada una a centavos
+    return (
+        "1",
+        f"CAST(round(ifnull({f}.monto_neto, 0) * 100) AS INTEGER)",
+        f"CAST(round(ifnull({f}.total, 0) * 100) AS INTEGER)",
+    )
+
+
+# ============================================================================
+# RECÁLCULO DESDE LAS TABLAS VIVAS
+# ============================================================================
+def _consulta_cartera():
+    """Totales de resumen_cartera calculados desde polizas."""
+    columnas = _clave_poliza("p") + tuple(f"SUM({m})" for m in _montos_poliza("p"))
+    return f"SELECT {', '.join(columnas)} FROM polizas p GROUP BY 1, 2, 3, 4"
+
+
+def _consulta_facturacion():
+    """Totales de resumen_facturacion calculados desde facturas y la póliza de cada una."""
+    columnas = _clave_factura("f", "p.aseguradora_id", "p.ramo_id") + tuple(
+        f"SUM({m})" for m in _montos_factura("f")
+    )
+    return (
+        f"SELECT {', '.join(columnas)} FROM facturas f LEFT JOIN polizas p ON p.id = f.poliza_id "
+        "GROUP BY 1, 2, 3, 4"
+    )
+
+
+RESUMENES = {
+    "resumen_cartera": (MEDIDAS_CARTERA, _consulta_cartera),
+    "resumen_facturacion": (MEDIDAS_FACTURACION, _consulta_facturacion),
+}
+
+
+def reconstruir(conn):
+    """
+    Vacía los resúmenes y los recalcula desde polizas y facturas
+
+    Parámetros:
+        conn (sqlite3.Connection): Conexión dentro de la transacción de quien llama
+
+    Retorna:
+        dict: {tabla: grupos}
+    """
+    grupos = {}
+    for tabla, (medidas, consulta) in RESUMENES.items():
+        conn.execute(f"DELETE FROM {tabla}")
+        conn.execute(f"INSERT INTO {tabla} ({', '.join(CLAVE + medidas)}) {consulta()}")
+        grupos[tabla] = conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+    return grupos
+
+
+def diferencias(conn):
+    """
+    Compara los resúmenes guardados con los calculados desde las tablas vivas
+
+    Retorna:
+        dict: {tabla: [(clave, guardado, calculado), ...]} solo con los grupos distintos
+    """
+    resultado = {}
+    for tabla, (medidas, consulta) in RESUMENES.items():
+        guardado = {
+            fila[:4]: fila[4:]
+            for fila in conn.execute(f"SELECT {', '.join(CLAVE + medidas)} FROM {tabla}")
+        }
+        calculado = {fila[:4]: fila[4:] for fila in conn.execute(consulta())}
+        distintos = [
+            (clave, guardado.get(clave), calculado.get(clave))
+            for clave in sorted(set(guardado) | set(calculado), key=repr)
+            if guardado.get(clave) != calculado.get(clave)
+        ]
+        if distintos:
+            resultado[tabla] = distintos
+    return resultado
+
+
+# ============================================================================
+# LECTURA PARA LOS KPI
+# ============================================================================
+def kpis_cartera(meses=12, db_file=None):
+    """
+    Totales para el widget de KPI, leídos solo de las tablas de resumen
+
+    Parámetros:
+        meses (int): Meses más recientes de las series mensuales
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {
+            "por_estado": [(estado, polizas, prima_neta, suma_asegurada, total)],
+            "por_aseguradora": [(nombre, polizas, prima_neta)] de pólizas activas, de mayor a menor prima,
+            "prima_por_mes": [(mes, polizas, prima_neta)] ascendente,
+            "facturacion_por_mes": [(mes, facturas, total)] ascendente,
+        }
+        Montos en centavos.
+    """
+    with connection(db_file) as conn:
+        por_estado = conn.execute(
+            """SELECT estado, SUM(polizas), SUM(prima_neta_centavos), SUM(suma_asegurada_centavos), SUM(total_centavos)
+               FROM resumen_cartera GROUP BY estado ORDER BY SUM(polizas) DESC"""
+        ).fetchall()
+        por_aseguradora = conn.execute(
+            """SELECT CASE WHEN r.aseguradora_id = 0 THEN 'Sin aseguradora'
+                           ELSE coalesce(a.nombre_comercial, a.razon_social, 'Aseguradora #' || r.aseguradora_id) END,
+                      SUM(r.polizas),
+                      SUM(r.prima_neta_centavos)
+               FROM resumen_cartera r LEFT JOIN aseguradoras a ON a.id = r.aseguradora_id
+               WHERE r.estado = 'Activa'
+               GROUP BY r.aseguradora_id ORDER BY SUM(r.prima_neta_centavos) DESC"""
+        ).fetchall()
+        prima_por_mes = conn.execute(
+            """SELECT mes, SUM(polizas), SUM(prima_neta_centavos) FROM resumen_cartera
+               WHERE mes <> '' GROUP BY mes ORDER BY mes DESC LIMIT ?""",
+            (meses,),
+        ).fetchall()
+        facturacion_por_mes = conn.execute(
+            """SELECT mes, SUM(facturas), SUM(total_centavos) FROM resumen_facturacion
+               WHERE mes <> '' GROUP BY mes ORDER BY mes DESC LIMIT ?""",
+            (meses,),
+        ).fetchall()
+    return {
+        "por_estado": por_estado,
+        "por_aseguradora": por_aseguradora,
+        "prima_por_mes": prima_por_mes[::-1],
+        "facturacion_por_mes": facturacion_por_mes[::-1],
+    }
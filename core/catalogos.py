@@ -0,0 +1,135 @@
+# ============================================================================
+# CACHÉ DE CATÁLOGOS - core/catalogos.py
+# ============================================================================
+# Caché por proceso para los datos de referencia de los selectores (ramos,
+# aseguradoras, sucursales, agrupadoras, usuarios/ejecutivos). Estos catálogos
+# cambian pocas veces al mes pero se leen en cada rerun de los formularios.
+#
+# Invalidación versionada: cada tabla tiene un número de versión que los
+# CRUD que escriben en ella incrementan con invalidar("tabla") después del
+# commit. Una entrada guardada con versiones viejas se descarta en la
+# siguiente lectura. Un TTL acota lo que puede tardar en verse un cambio
+# hecho por otro proceso (scripts, otra instancia de Streamlit).
+# ============================================================================
+
+# Importaciones necesarias
+import functools  # wraps para conservar nombre y docstring de los loaders
+import threading  # Lock para versiones y estadísticas
+import time  # Reloj monotónico para el TTL
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+TTL_SEGUNDOS = 300  # Vida máxima de una entrada aunque nadie la invalide
+
+# ============================================================================
+# ESTADO DEL PROCESO
+# ============================================================================
+_lock = threading.Lock()
+_versiones = {}  # {tabla: versión}
+_entradas = {}  # {(catálogo, args): (tablas, versiones, instante, valor)}
+_estadisticas = {}  # {catálogo: {"aciertos": n, "fallos": n, "invalidaciones": n}}
+
+
+def _version(tablas):
+    return tuple(_versiones.get(t, 0) for t in tablas)
+
+
+def _stats(nombre):
+    return _estadisticas.setdefault(nombre, {"aciertos": 0, "fallos": 0, "invalidaciones": 0})
+
+
+# ============================================================================
+# DECORADOR: catalogo
+# ============================================================================
+def catalogo(tablas, ttl=TTL_SEGUNDOS):
+    """
+    Cachea el resultado de una función de lectura de catálogo
+
+    Parámetros:
+        tablas (tuple): Tablas de las que depende el resultado; invalidar()
+                        cualquiera de ellas descarta las entradas
+        ttl (int): Segundos máximos de vida de una entrada
+
+    Uso:
+        @catalogo(tablas=("ramos_seguros",))
+        def get_ramos_options():
+            ...
+
+    El resultado se comparte entre sesiones: la función debe retornar datos
+    que nadie modifique (listas de tuplas) y sus argumentos deben ser hashables.
+    """
+    tablas = tuple(tablas)
+
+    def decorador(func):
+        nombre = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def envoltura(*args):
+            clave = (nombre, args)
+            ahora = time.monotonic()
+            with _lock:
+                version = _version(tablas)
+                entrada = _entradas.get(clave)
+                if entrada is not None and entrada[1] == version and ahora - entrada[2] < ttl:
+                    _stats(nombre)["aciertos"] += 1
+                    return entrada[3]
+                _stats(nombre)["fallos"] += 1
+
+            # La lectura se hace fuera del lock para no bloquear otras sesiones
+            valor = func(*args)
+
+            with _lock:
+                # Si alguien invalidó mientras leíamos, no guardar un valor ya viejo
+                if _version(tablas) == version:
+                    _entradas[clave] = (tablas, version, ahora, valor)
+            return valor
+
+        envoltura.tablas = tablas
+        return envoltura
+
+    return decorador
+
+
+# ============================================================================
+# INVALIDACIÓN Y ESTADÍSTICAS
+# ============================================================================
+def invalidar(*tablas):
+    """
+    Marca como modificadas las tablas indicadas (llamar después del commit)
+
+    Parámetros:
+        *tablas (str): Nombres de tabla, p. ej. invalidar("aseguradoras", "sucursales")
+    """
+    with _lock:
+        for tabla in tablas:
+            _versiones[tabla] = _versiones.get(tabla, 0) + 1
+        # Limpiar las entradas afectadas y contar la invalidación por catálogo
+        for clave, entrada in list(_entradas.items()):
+            if entrada[1] != _version(entrada[0]):
+                del _entradas[clave]
+                _stats(clave[0])["invalidaciones"] += 1
+
+
+def estadisticas():
+    """
+    Retorna aciertos, fallos, invalidaciones y tasa de aciertos por catálogo
+
+    Retorna:
+        dict: {catálogo: {"aciertos", "fallos", "invalidaciones", "tasa_aciertos"}}
+    """
+    with _lock:
+        resultado = {}
+        for nombre, datos in _estadisticas.items():
+            total = datos["aciertos"] + datos["fallos"]
+            resultado[nombre] = {**datos, "tasa_aciertos": datos["aciertos"] / total if total else 0.0}
+        return resultado
+
+
+def limpiar():
+    """Vacía la caché y las estadísticas (p. ej. tras reset_database)."""
+    with _lock:
+        _entradas.clear()
+        _estadisticas.clear()
+        for tabla in list(_versiones):
+            _versiones[tabla] += 1
@@ -0,0 +1,131 @@
+# ============================================================================
+# BÚSQUEDA DE CLIENTES - core/clientes.py
+# ============================================================================
+# Búsqueda de texto completo sobre la tabla `clients` con un índice FTS5
+# (`clients_fts`, migración 7) que cubre nombres, apellidos, razón social,
+# número de documento, RUC, correo y teléfonos. Los triggers de la migración
+# lo mantienen sincronizado con cualquier INSERT/UPDATE/DELETE, de modo que
+# los selectores de cliente leen solo los N mejores resultados en lugar de
+# cargar la tabla completa. No depende de Streamlit.
+# ============================================================================
+
+# Importaciones necesarias
+import re  # Separar el texto de búsqueda en términos
+
+from core.db import connection  # Pool de conexiones compartido
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+LIMITE_RESULTADOS = 20  # Coincidencias que muestra un selector
+
+# Columnas de `clients` indexadas en `clients_fts` (en este orden)
+COLUMNAS_FTS = (
+    "nombres", "apellidos", "razon_social", "numero_documento", "numero_ruc",
+    "correo_electronico", "telefono_movil", "telefono_fijo",
+)
+
+_TERMINO = re.compile(r"\w+", re.UNICODE)
+
+_SELECT_CLIENTE = "SELECT c.id, c.tipo_cliente, c.nombres, c.apellidos, c.razon_social, c.numero_documento FROM clients c"
+
+
+# ============================================================================
+# FUNCIÓN: etiqueta_cliente
+# Texto visible de un cliente en los selectores
+# ============================================================================
+def etiqueta_cliente(fila):
+    """
+    Construye la etiqueta de un cliente
+
+    Parámetros:
+        fila (tuple): (id, tipo_cliente, nombres, apellidos, razon_social, numero_documento)
+
+    Retorna:
+        str: "Razón Social (Persona Jurídica) [ID: 7]" o "Nombres Apellidos (Persona Natural) [ID: 7]"
+    """
+    cliente_id, tipo, nombres, apellidos, razon_social, documento = fila
+    if tipo == "Persona Jurídica":
+        nombre = f"{razon_social or ''} (Persona Jurídica)"
+    else:
+        nombre = f"{(nombres or '').strip()} {(apellidos or '').strip()} (Persona Natural)"
+    if documento:
+        nombre += f" - {documento}"
+    return f"{nombre} [ID: {cliente_id}]"
+
+
+def consulta_fts(texto):
+    """
+    Convierte el texto del usuario en una expresión MATCH de FTS5
+
+    Cada palabra se busca como prefijo ("mar lop" encuentra "María López") y
+    todas deben aparecer. Las comillas y operadores del usuario se descartan.
+
+    Retorna:
+        str: Expresión MATCH, o None si el texto no tiene términos
+    """
+    terminos = _TERMINO.findall(texto or "")
+    if not terminos:
+        return None
+    return " AND ".join(f'"{t}"*' for t in terminos)
+
+
+def fts_disponible(conn):
+    """True si la base tiene el índice clients_fts (SQLite compilado con FTS5)."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'clients_fts'"
+    ).fetchone() is not None
+
+
+# ============================================================================
+# FUNCIÓN: buscar_clientes
+# Los N clientes que mejor coinciden con el texto
+# ============================================================================
+def buscar_clientes(texto, limite=LIMITE_RESULTADOS, db_file=None):
+    """
+    Busca clientes por nombre, razón social, documento, RUC, correo o teléfono
+
+    Parámetros:
+        texto (str): Texto escrito por el usuario; vacío retorna los clientes más recientes
+        limite (int): Máximo de resultados
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        list: Tuplas (id, etiqueta) ordenadas por relevancia (bm25)
+    """
+    match = consulta_fts(texto)
+    with connection(db_file) as conn:
+        if match is None:
+            rows = conn.execute(f"{_SELECT_CLIENTE} ORDER BY c.id DESC LIMIT ?", (limite,)).fetchall()
+        elif fts_disponible(conn):
+            rows = conn.execute(
+                f"""{_SELECT_CLIENTE}
+                    JOIN clients_fts f ON f.rowid = c.id
+                    WHERE clients_fts MATCH ?
+                    ORDER BY bm25(clients_fts)
+                    LIMIT ?""",
+                (match, limite),
+            ).fetchall()
+        else:
+            # Sin FTS5: LIKE por el primer término sobre las mismas columnas
+            patron = f"%{_TERMINO.findall(texto)[0]}%"
+            condicion = " OR ".join(f"c.{col} LIKE ?" for col in COLUMNAS_FTS)
+            rows = conn.execute(
+                f"{_SELECT_CLIENTE} WHERE {condicion} ORDER BY c.id DESC LIMIT ?",
+                (*[patron] * len(COLUMNAS_FTS), limite),
+            ).fetchall()
+    return [(row[0], etiqueta_cliente(row)) for row in rows]
+
+
+def cliente_por_id(cliente_id, db_file=None):
+    """
+    Retorna (id, etiqueta) de un cliente, o None si no existe
+
+    Se usa para mostrar la selección actual (p. ej. al modificar una póliza)
+    aunque no esté entre los resultados de la búsqueda.
+    """
+    if cliente_id in (None, ""):
+        return None
+    with connection(db_file) as conn:
+        row = conn.execute(f"{_SELECT_CLIENTE} WHERE c.id = ?", (cliente_id,)).fetchone()
+    return (row[0], etiqueta_cliente(row)) if row else None
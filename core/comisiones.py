@@ -0,0 +1,338 @@
+# ============================================================================
+# MOTOR DE COMISIONES - core/comisiones.py
+# ============================================================================
+# Comisión del bróker por póliza según la tasa de su aseguradora y ramo:
+#
+#   - `tasas_comision` guarda la tasa en puntos básicos (1250 = 12,50 %) por
+#     (aseguradora, ramo, vigente_desde); ramo_id = 0 es la tasa general de
+#     la aseguradora para ramos sin tasa propia. A cada póliza se le aplica
+#     la última tasa vigente a su fecha de emisión.
+#   - calcular_comisiones() lee la cartera (prima neta en centavos) y los
+#     totales de facturas y notas de crédito por póliza, busca las tasas con
+#     pandas.merge_asof y calcula en columnas int64 de NumPy:
+#       devengada = prima neta × tasa (pólizas que no están en borrador/anuladas)
+#       facturada = (facturas − notas de crédito no anuladas) × tasa
+#       cobrada   = facturas cobradas × tasa
+#     El resultado queda en `comisiones`, una fila por póliza.
+#   - Triggers sobre polizas, movimientos_poliza, facturas y notas_de_credito
+#     anotan en `comisiones_pendientes` las pólizas tocadas;
+#     recalcular_pendientes() recalcula solo esas.
+#
+# Las tablas y los triggers los crea la migración 17 (core/migrations.py),
+# así arrancar la aplicación no importa pandas. El cierre de mes
+# (scripts/calcular_comisiones.py --completo) recalcula toda la cartera.
+# No depende de Streamlit.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha del cálculo y vigencias
+import json  # Listas de pólizas como un solo parámetro (json_each)
+import time  # Duración del cálculo
+
+import numpy as np  # Aritmética entera vectorizada
+import pandas as pd  # Lectura tipada y búsqueda de tasas por fecha
+
+from core.db import connection, unit_of_work  # Pool de conexiones y transacciones
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+ESTADOS_SIN_COMISION = ("Borrador", "Anulada")  # Pólizas que no devengan comisión
+ESTADOS_COBRADOS = ("Pagada", "Cobrada")  # Facturas cuyo valor ya se cobró
+ESTADO_ANULADO = "Anulada"  # Facturas y notas de crédito que no cuentan
+VIGENCIA_INICIAL = "1900-01-01"  # vigente_desde de una tasa sin fecha
+TAMANO_LOTE = 5000  # Filas por executemany al guardar resultados
+
+COLUMNAS_RESULTADO = (
+    "poliza_id", "aseguradora_id", "ramo_id", "mes", "tasa_bp", "prima_neta_centavos",
+    "devengada_centavos", "facturada_centavos", "cobrada_centavos",
+)
+
+
+# ============================================================================
+# TASAS
+# ============================================================================
+def tasa_a_bp(tasa):
+    """Porcentaje ("12.5", 12.5) -> puntos básicos (1250)."""
+    return int(round(float(str(tasa).replace(",", ".")) * 100))
+
+
+def listar_tasas(db_file=None):
+    """
+    Tasas registradas con los nombres de aseguradora y ramo
+
+    Retorna:
+        list: Tuplas (aseguradora_id, aseguradora, ramo_id, ramo, vigente_desde, tasa_bp)
+    """
+    with connection(db_file) as conn:
+        return conn.execute(
+            """SELECT t.aseguradora_id, coalesce(a.nombre_comercial, a.razon_social), t.ramo_id,
+                      CASE WHEN t.ramo_id = 0 THEN 'Todos los ramos' ELSE r.nombre END,
+                      t.vigente_desde, t.tasa_bp
+               FROM tasas_comision t
+               LEFT JOIN aseguradoras a ON a.id = t.aseguradora_id
+               LEFT JOIN ramos_seguros r ON r.id = t.ramo_id
+               ORDER BY 2, 4, t.vigente_desde DESC"""
+        ).fetchall()
+
+
+def guardar_tasa(aseguradora_id, ramo_id, tasa, vigente_desde=None, db_file=None):
+    """
+    Registra o corrige una tasa y marca sus pólizas para recalcular
+
+    Parámetros:
+        aseguradora_id (int): Aseguradora
+        ramo_id (int): Ramo (0 o None = tasa general de la aseguradora)
+        tasa (float | str): Porcentaje de comisión (12.5 = 12,50 %)
+        vigente_desde (str): Fecha "AAAA-MM-DD" desde la que aplica (por defecto siempre)
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        tuple: (True/False, mensaje)
+    """
+    try:
+        tasa_bp = tasa_a_bp(tasa)
+    except (TypeError, ValueError):
+        return False, f"Tasa no válida: {tasa}"
+    if not 0 <= tasa_bp <= 10000:
+        return False, "La tasa debe estar entre 0 y 100 %."
+    ramo_id = int(ramo_id or 0)
+    with unit_of_work(db_file) as conn:
+        conn.execute(
+            """INSERT INTO tasas_comision (aseguradora_id, ramo_id, vigente_desde, tasa_bp) VALUES (?, ?, ?, ?)
+               ON CONFLICT (aseguradora_id, ramo_id, vigente_desde) DO UPDATE SET tasa_bp = excluded.tasa_bp""",
+            (aseguradora_id, ramo_id, vigente_desde or VIGENCIA_INICIAL, tasa_bp),
+        )
+        # REPLACE da un id nuevo a las pólizas ya marcadas: no se pierden si hay un cálculo en curso
+        conn.execute(
+            """INSERT OR REPLACE INTO comisiones_pendientes (poliza_id)
+               SELECT id FROM polizas WHERE aseguradora_id = ? AND (? = 0 OR ramo_id = ?)""",
+            (aseguradora_id, ramo_id, ramo_id),
+        )
+    return True, "Tasa guardada."
+
+
+# ============================================================================
+# CÁLCULO VECTORIZADO
+# ============================================================================
+def _filtro(ids, columna):
+    """Cláusula WHERE para una lista de pólizas (o ninguna si se calcula toda la cartera)."""
+    if ids is None:
+        return "", ()
+    return f"WHERE {columna} IN (SELECT value FROM json_each(?))", (json.dumps(ids),)
+
+
+def _dia(fechas):
+    """Serie de fechas "AAAA-MM-DD" -> enteros AAAAMMDD (0 si falta), para merge_asof."""
+    dias = pd.to_numeric(fechas.fillna("").astype(str).str.replace("-", "", regex=False).str[:8], errors="coerce")
+    return dias.fillna(0).astype("int64")
+
+
+def _leer(conn, ids):
+    """DataFrames de pólizas (con totales de facturas y notas) y de tasas."""
+    filtro, parametros = _filtro(ids, "p.id")
+    polizas = pd.read_sql_query(
+        f"""SELECT p.id AS poliza_id,
+                   CAST(ifnull(nullif(p.aseguradora_id, ''), 0) AS INTEGER) AS aseguradora_id,
+                   CAST(ifnull(nullif(p.ramo_id, ''), 0) AS INTEGER) AS ramo_id,
+                   coalesce(nullif(p.fecha_emision, ''), p.fecha_inicio) AS fecha,
+                   p.estado,
+                   ifnull(p.prima_neta_centavos, 0) AS prima
+            FROM polizas p {filtro}""",
+        conn, params=parametros,
+    )
+    anulado = f"'{ESTADO_ANULADO}'"
+    cobrados = ", ".join(f"'{e}'" for e in ESTADOS_COBRADOS)
+    filtro, parametros = _filtro(ids, "poliza_id")
+    facturas = pd.read_sql_query(
+        f"""SELECT poliza_id,
+                   SUM(CASE WHEN ifnull(estado, '') <> {anulado} THEN CAST(round(ifnull(monto_neto, 0) * 100) AS INTEGER) ELSE 0 END) AS facturado,
+                   SUM(CASE WHEN estado IN ({cobrados}) THEN CAST(round(ifnull(monto_neto, 0) * 100) AS INTEGER) ELSE 0 END) AS cobrado
+            FROM facturas {filtro or 'WHERE poliza_id IS NOT NULL'} GROUP BY poliza_id""",
+        conn, params=parametros,
+    )
+    notas = pd.read_sql_query(
+        f"""SELECT poliza_id,
+                   SUM(CASE WHEN ifnull(estado, '') <> {anulado} THEN CAST(round(ifnull(monto_neto, 0) * 100) AS INTEGER) ELSE 0 END) AS acreditado
+            FROM notas_de_credito {filtro or 'WHERE poliza_id IS NOT NULL'} GROUP BY poliza_id""",
+        conn, params=parametros,
+    )
+    tasas = pd.read_sql_query("SELECT aseguradora_id, ramo_id, vigente_desde, tasa_bp FROM tasas_comision", conn)
+    return polizas, facturas, notas, tasas
+
+
+def _buscar_tasas(polizas, tasas):
+    """
+    Tasa vigente de cada póliza: la de su (aseguradora, ramo) o, si no hay, la general
+    de la aseguradora (ramo 0); la más reciente con vigente_desde <= fecha de emisión.
+
+    Retorna:
+        numpy.ndarray: Tasa en puntos básicos por póliza (0 sin tasa), en el orden de `polizas`
+    """
+    if tasas.empty or polizas.empty:
+        return np.zeros(len(polizas), dtype="int64")
+    tasas = tasas.assign(dia=_dia(tasas["vigente_desde"])).astype({"aseguradora_id": "int64", "ramo_id": "int64"})
+    tasas = tasas.sort_values("dia")[["dia", "aseguradora_id", "ramo_id", "tasa_bp"]]
+    claves = polizas[["aseguradora_id", "ramo_id"]].astype("int64").assign(dia=_dia(polizas["fecha"]), orden=np.arange(len(polizas)))
+    claves = claves.sort_values("dia")
+
+    propia = pd.merge_asof(claves, tasas, on="dia", by=["aseguradora_id", "ramo_id"], direction="backward")
+    general = pd.merge_asof(
+        claves.assign(ramo_id=0), tasas, on="dia", by=["aseguradora_id", "ramo_id"], direction="backward"
+    )
+    tasa = propia["tasa_bp"].fillna(general["tasa_bp"]).fillna(0).to_numpy(dtype="int64")
+    resultado = np.empty(len(polizas), dtype="int64")
+    resultado[propia["orden"].to_numpy()] = tasa
+    return resultado
+
+
+def _comision(base, tasa_bp):
+    """Centavos × puntos básicos, redondeado al centavo (mitad hacia arriba)."""
+    return (base * tasa_bp + 5000) // 10000
+
+
+def calcular(polizas, facturas, notas, tasas):
+    """
+    Calcula las comisiones de un conjunto de pólizas (sin tocar la base)
+
+    Retorna:
+        pandas.DataFrame: Columnas COLUMNAS_RESULTADO, montos en centavos (int64)
+    """
+    df = polizas.merge(facturas, on="poliza_id", how="left").merge(notas, on="poliza_id", how="left")
+    tasa = _buscar_tasas(df, tasas)
+    prima = df["prima"].fillna(0).to_numpy(dtype="int64")
+    facturado = df["facturado"].fillna(0).to_numpy(dtype="int64") - df["acreditado"].fillna(0).to_numpy(dtype="int64")
+    cobrado = df["cobrado"].fillna(0).to_numpy(dtype="int64")
+    devenga = ~df["estado"].isin(ESTADOS_SIN_COMISION).to_numpy()
+    return pd.DataFrame({
+        "poliza_id": df["poliza_id"].astype("int64"),
+        "aseguradora_id": df["aseguradora_id"].astype("int64"),
+        "ramo_id": df["ramo_id"].astype("int64"),
+        "mes": df["fecha"].fillna("").astype(str).str[:7],
+        "tasa_bp": tasa,
+        "prima_neta_centavos": prima,
+        "devengada_centavos": np.where(devenga, _comision(prima, tasa), 0),
+        "facturada_centavos": _comision(facturado, tasa),
+        "cobrada_centavos": _comision(cobrado, tasa),
+    })
+
+
+def _guardar(conn, resultado, ids):
+    """Reemplaza las filas de `comisiones` de las pólizas calculadas."""
+    ahora = datetime.datetime.now().isoformat(timespec="seconds")
+    if ids is None:
+        conn.execute("DELETE FROM comisiones")
+    else:
+        # Pólizas borradas: ya no tienen comisión
+        conn.execute("DELETE FROM comisiones WHERE poliza_id IN (SELECT value FROM json_each(?))", (json.dumps(ids),))
+    columnas = [resultado[c].tolist() for c in COLUMNAS_RESULTADO]  # tolist() -> int/str de Python
+    filas = [(*fila, ahora) for fila in zip(*columnas)]
+    marcas = ", ".join("?" * (len(COLUMNAS_RESULTADO) + 1))
+    for inicio in range(0, len(filas), TAMANO_LOTE):
+        conn.executemany(
+            f"INSERT INTO comisiones ({', '.join(COLUMNAS_RESULTADO)}, fecha_calculo) VALUES ({marcas})",
+            filas[inicio:inicio + TAMANO_LOTE],
+        )
+
+
+def calcular_comisiones(poliza_ids=None, db_file=None):
+    """
+    Calcula y guarda las comisiones de toda la cartera o de algunas pólizas
+
+    Parámetros:
+        poliza_ids (list): Pólizas a recalcular; None = toda la cartera (cierre de mes)
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {"polizas", "devengada", "facturada", "cobrada" (centavos), "segundos"}
+    """
+    inicio = time.perf_counter()
+    ids = None if poliza_ids is None else sorted({int(i) for i in poliza_ids})
+    with connection(db_file) as conn:
+        # Marcas anteriores a la lectura: las posteriores (id mayor) quedan para la próxima vez
+        ultima_marca = conn.execute("SELECT ifnull(max(id), 0) FROM comisiones_pendientes").fetchone()[0]
+        datos = _leer(conn, ids)
+    resultado = calcular(*datos)
+    with unit_of_work(db_file, immediate=True) as conn:
+        _guardar(conn, resultado, ids)
+        if ids is None:
+            conn.execute("DELETE FROM comisiones_pendientes WHERE id <= ?", (ultima_marca,))
+    return {
+        "polizas": len(resultado),
+        "devengada": int(resultado["devengada_centavos"].sum()),
+        "facturada": int(resultado["facturada_centavos"].sum()),
+        "cobrada": int(resultado["cobrada_centavos"].sum()),
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def pendientes(db_file=None):
+    """Cantidad de pólizas marcadas para recalcular."""
+    with connection(db_file) as conn:
+        return conn.execute("SELECT COUNT(*) FROM comisiones_pendientes").fetchone()[0]
+
+
+def recalcular_pendientes(db_file=None):
+    """
+    Recalcula solo las pólizas tocadas desde el último cálculo
+
+    Solo se borran las marcas leídas (por id): una póliza marcada de nuevo
+    mientras se calcula recibe otro id (INSERT OR REPLACE, migración 17) y
+    queda para la siguiente llamada.
+
+    Retorna:
+        dict: Como calcular_comisiones(), con "polizas" = pólizas recalculadas
+    """
+    with connection(db_file) as conn:
+        marcas = conn.execute("SELECT id, poliza_id FROM comisiones_pendientes").fetchall()
+    if not marcas:
+        return {"polizas": 0, "devengada": 0, "facturada": 0, "cobrada": 0, "segundos": 0.0}
+    resumen = calcular_comisiones([poliza_id for _, poliza_id in marcas], db_file)
+    with unit_of_work(db_file) as conn:
+        conn.execute(
+            "DELETE FROM comisiones_pendientes WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps([marca_id for marca_id, _ in marcas]),),
+        )
+    return resumen
+
+
+# ============================================================================
+# REPORTES
+# ============================================================================
+def consulta_resumen(agrupar_por="aseguradora", mes=None):
+    """
+    Consulta de totales de comisión por aseguradora o por ramo
+
+    Retorna:
+        tuple: (sql, parámetros)
+    """
+    if agrupar_por == "ramo":
+        columna, nombre, union = "c.ramo_id", "coalesce(g.nombre, 'Sin ramo')", "LEFT JOIN ramos_seguros g ON g.id = c.ramo_id"
+    else:
+        columna = "c.aseguradora_id"
+        nombre = "coalesce(g.nombre_comercial, g.razon_social, 'Sin aseguradora')"
+        union = "LEFT JOIN aseguradoras g ON g.id = c.aseguradora_id"
+    filtro, parametros = ("WHERE c.mes = ?", (mes,)) if mes else ("", ())
+    return (
+        f"""SELECT {nombre}, COUNT(*), SUM(c.prima_neta_centavos), SUM(c.devengada_centavos),
+                   SUM(c.facturada_centavos), SUM(c.cobrada_centavos)
+            FROM comisiones c {union} {filtro}
+            GROUP BY {columna} ORDER BY SUM(c.devengada_centavos) DESC""",
+        parametros,
+    )
+
+
+def resumen_comisiones(agrupar_por="aseguradora", mes=None, db_file=None):
+    """
+    Totales de comisión por aseguradora o por ramo
+
+    Parámetros:
+        agrupar_por (str): "aseguradora" o "ramo"
+        mes (str): "AAAA-MM" de emisión, o None para toda la cartera
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        list: Tuplas (nombre, pólizas, prima neta, devengada, facturada, cobrada) en centavos
+    """
+    with connection(db_file) as conn:
+        return conn.execute(*consulta_resumen(agrupar_por, mes)).fetchall()
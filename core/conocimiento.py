@@ -0,0 +1,205 @@
+# ============================================================================
+# BÚSQUEDA EN LA BASE DE CONOCIMIENTO - core/conocimiento.py
+# ============================================================================
+# Índice de recuperación local (sin APIs externas) sobre los manuales del
+# proyecto: Base_conocimiento_proceso_admin.pdf y los .md/.pdf de docs/.
+#
+#   - El texto se divide en fragmentos de ~TAMANO_FRAGMENTO palabras con
+#     solapamiento, por página (PDF, texto de core/texto_pdf.py) o por
+#     sección (Markdown).
+#   - Los fragmentos se guardan en `conocimiento_fragmentos` con un índice
+#     FTS5 (`conocimiento_fts`, migración 13) que ordena por bm25, el mismo
+#     mecanismo de la búsqueda de clientes (core/clientes.py).
+#   - actualizar_indice() compara el SHA-256 de cada archivo con el indexado
+#     y solo vuelve a fragmentar los que cambiaron, se agregaron o se borraron.
+#     Los patrones de FUENTES se resuelven contra la carpeta del proyecto
+#     (RAIZ), no contra el directorio de trabajo: Streamlit lanzado desde otra
+#     carpeta no debe dar por borrados los manuales.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha de indexado
+import glob  # Archivos de docs/
+import os  # Rutas relativas y extensiones
+import re  # Términos, encabezados y palabras
+
+from core.db import connection, unit_of_work  # Pool de conexiones y transacciones
+from core.texto_pdf import huella_pdf, paginas_pdf  # Huella de archivos y texto de PDF en caché
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # Carpeta del proyecto
+FUENTES = ("Base_conocimiento_proceso_admin.pdf", "docs/**/*.md", "docs/**/*.pdf")  # Relativos a RAIZ
+TAMANO_FRAGMENTO = 120  # Palabras por fragmento
+SOLAPAMIENTO = 30  # Palabras compartidas entre fragmentos consecutivos
+RESULTADOS = 5  # Fragmentos por pregunta
+
+_TERMINO = re.compile(r"\w+", re.UNICODE)
+_ENCABEZADO = re.compile(r"^#{1,6}\s+(.*)$", re.MULTILINE)
+
+# Palabras vacías que no aportan a la búsqueda en preguntas en español
+PALABRAS_VACIAS = frozenset("""
+    como cual cuales cuando donde que quien quienes para por con sin una uno unos unas los las del
+    al el la lo le les se su sus es son ser esta este esto estos estas hay hacer puedo debo mi me
+    en de y o a un ya mas muy tambien sobre entre desde hasta cómo cuál cuáles cuándo dónde qué quién
+    más también está están
+""".split())
+
+
+# ============================================================================
+# FRAGMENTACIÓN
+# ============================================================================
+def fragmentar(texto, tamano=TAMANO_FRAGMENTO, solapamiento=SOLAPAMIENTO):
+    """
+    Divide un texto en ventanas de `tamano` palabras que se solapan
+
+    Retorna:
+        list: Fragmentos de texto (sin fragmentos vacíos)
+    """
+    palabras = texto.split()
+    paso = max(1, tamano - solapamiento)
+    return [
+        " ".join(palabras[inicio:inicio + tamano])
+        for inicio in range(0, max(len(palabras) - solapamiento, 1), paso)
+        if palabras[inicio:inicio + tamano]
+    ]
+
+
+def _secciones_markdown(texto):
+    """Pares (encabezado, contenido) de un Markdown; el texto previo al primer encabezado va con el nombre del archivo."""
+    posiciones = [(m.start(), m.group(1).strip()) for m in _ENCABEZADO.finditer(texto)]
+    cortes = [(0, None)] + posiciones + [(len(texto), None)]
+    return [
+        (titulo, texto[inicio:fin])
+        for (inicio, titulo), (fin, _) in zip(cortes, cortes[1:])
+        if texto[inicio:fin].strip()
+    ]
+
+
+def fragmentos_de(ruta, db_file=None):
+    """
+    Fragmentos de un archivo con su ubicación
+
+    Retorna:
+        list: Tuplas (ubicacion, texto); ubicacion es "página N" o el título de la sección
+    """
+    if ruta.lower().endswith(".pdf"):
+        return [
+            (f"página {numero}", fragmento)
+            for numero, pagina in enumerate(paginas_pdf(ruta, db_file=db_file), start=1)
+            for fragmento in fragmentar(pagina)
+        ]
+    with open(ruta, encoding="utf-8", errors="replace") as archivo:
+        texto = archivo.read()
+    return [
+        (titulo or os.path.basename(ruta), fragmento)
+        for titulo, seccion in _secciones_markdown(texto)
+        for fragmento in fragmentar(seccion)
+    ]
+
+
+# ============================================================================
+# ÍNDICE
+# ============================================================================
+def archivos_fuente(patrones=FUENTES, raiz=RAIZ):
+    """Rutas relativas a `raiz` (separador /) de los archivos que cubre el índice."""
+    rutas = set()
+    for patron in patrones:
+        rutas.update(
+            ruta.replace(os.sep, "/")
+            for ruta in glob.glob(patron, root_dir=raiz, recursive=True)
+            if os.path.isfile(os.path.join(raiz, ruta))
+        )
+    return sorted(rutas)
+
+
+def actualizar_indice(patrones=FUENTES, db_file=None, raiz=RAIZ):
+    """
+    Indexa los archivos nuevos o modificados y quita los que ya no existen
+
+    Parámetros:
+        patrones (tuple): Rutas o patrones glob relativos a `raiz`
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+        raiz (str): Carpeta de los manuales (por defecto la del proyecto)
+
+    Retorna:
+        dict: {"indexados": [rutas], "sin_cambios": n, "eliminados": [rutas]}
+    """
+    rutas = archivos_fuente(patrones, raiz)
+    with connection(db_file) as conn:
+        indexadas = dict(conn.execute("SELECT ruta, huella FROM conocimiento_fuentes").fetchall())
+
+    huellas = {ruta: huella_pdf(os.path.join(raiz, ruta)) for ruta in rutas}
+    cambiadas = [ruta for ruta in rutas if indexadas.get(ruta) != huellas[ruta]]
+    eliminadas = sorted(set(indexadas) - set(rutas))
+    resumen = {"indexados": cambiadas, "sin_cambios": len(rutas) - len(cambiadas), "eliminados": eliminadas}
+    if not cambiadas and not eliminadas:
+        return resumen
+
+    # Fragmentar fuera de la transacción (la extracción de PDF puede tardar)
+    nuevos = {ruta: fragmentos_de(os.path.join(raiz, ruta), db_file) for ruta in cambiadas}
+    ahora = datetime.datetime.now().isoformat(timespec="seconds")
+    with unit_of_work(db_file, immediate=True) as conn:
+        for ruta in eliminadas + cambiadas:
+            conn.execute("DELETE FROM conocimiento_fragmentos WHERE fuente = ?", (ruta,))
+            conn.execute("DELETE FROM conocimiento_fuentes WHERE ruta = ?", (ruta,))
+        for ruta, fragmentos in nuevos.items():
+            conn.executemany(
+                "INSERT INTO conocimiento_fragmentos (fuente, ubicacion, texto) VALUES (?, ?, ?)",
+                [(ruta, ubicacion, texto) for ubicacion, texto in fragmentos],
+            )
+            conn.execute(
+                "INSERT INTO conocimiento_fuentes (ruta, huella, fragmentos, fecha_indexado) VALUES (?, ?, ?, ?)",
+                (ruta, huellas[ruta], len(fragmentos), ahora),
+            )
+    return resumen
+
+
+def consulta_fts(pregunta):
+    """
+    Expresión MATCH de FTS5 para una pregunta en lenguaje natural
+
+    A diferencia de la búsqueda de clientes, basta con que aparezca alguno de
+    los términos (OR); bm25 pone primero los fragmentos con más coincidencias.
+
+    Retorna:
+        str: Expresión MATCH, o None si la pregunta no tiene términos útiles
+    """
+    terminos = [t for t in _TERMINO.findall((pregunta or "").lower()) if len(t) > 2 and t not in PALABRAS_VACIAS]
+    if not terminos:
+        return None
+    return " OR ".join(f'"{t}"*' for t in dict.fromkeys(terminos))
+
+
+def buscar(pregunta, k=RESULTADOS, db_file=None):
+    """
+    Los k fragmentos que mejor responden a una pregunta
+
+    Parámetros:
+        pregunta (str): Texto del usuario
+        k (int): Máximo de fragmentos
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        list: Tuplas (fuente, ubicacion, texto, puntaje) de la más relevante a la menos
+    """
+    match = consulta_fts(pregunta)
+    if match is None:
+        return []
+    with connection(db_file) as conn:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'conocimiento_fts'").fetchone():
+            return conn.execute(
+                """SELECT f.fuente, f.ubicacion, f.texto, -bm25(conocimiento_fts)
+                   FROM conocimiento_fts JOIN conocimiento_fragmentos f ON f.id = conocimiento_fts.rowid
+                   WHERE conocimiento_fts MATCH ?
+                   ORDER BY bm25(conocimiento_fts)
+                   LIMIT ?""",
+                (match, k),
+            ).fetchall()
+        # Sin FTS5: LIKE por el término más largo
+        termino = max(_TERMINO.findall(match), key=len)
+        return conn.execute(
+            "SELECT fuente, ubicacion, texto, 0 FROM conocimiento_fragmentos WHERE texto LIKE ? LIMIT ?",
+            (f"%{termino}%", k),
+        ).fetchall()
@@ -0,0 +1,224 @@
+# ============================================================================
+# CONSULTAS DE LAS RUTAS CALIENTES - core/consultas.py
+# ============================================================================
+# SQL compartido por los módulos CRUD, Movimientos y dashboards para las
+# pantallas de listas y detalle. Centralizarlo permite que test_query_plans.py
+# verifique con EXPLAIN QUERY PLAN que cada consulta usa un índice
+# (ver INDICES en core/migrations.py) y nunca recorre la tabla completa.
+# ============================================================================
+
+# ============================================================================
+# USUARIOS
+# ============================================================================
+# Inicio de sesión: solo las columnas que se verifican (índice único de username)
+USUARIO_PARA_LOGIN = "SELECT username, password, role FROM users WHERE username = ?"
+
+# ============================================================================
+# PÓLIZAS
+# ============================================================================
+# Pólizas de un cliente (Back Office, siniestros)
+POLIZAS_POR_CLIENTE = "SELECT id, numero_poliza FROM polizas WHERE cliente_id = ?"
+
+# Selectores de Movimientos: pólizas en un estado, las más recientes primero
+# (aseguradora_id para el filtro de Movimientos en lote)
+POLIZAS_POR_ESTADO = "SELECT id, numero_poliza, aseguradora_id FROM polizas WHERE estado = ? ORDER BY id DESC"
+
+# Estado y montos actuales de una lista de pólizas (JSON en un solo parámetro);
+# el motor de movimientos en lote la ejecuta una vez por lote
+POLIZAS_PARA_MOVIMIENTO = (
+    "SELECT id, numero_poliza, cliente_id, estado, suma_asegurada, prima_neta FROM polizas "
+    "WHERE id IN (SELECT value FROM json_each(?))"
+)
+
+# Pólizas que vencen dentro de un rango de fechas (renovaciones)
+POLIZAS_POR_VENCER = (
+    "SELECT id, numero_poliza, fecha_fin FROM polizas "
+    "WHERE fecha_fin BETWEEN ? AND ? ORDER BY fecha_fin"
+)
+
+def polizas_de_cliente(cliente_id, categoria=None):
+    """
+    Construye la consulta de las pólizas de un cliente, opcionalmente de una categoría de ramo
+
+    Una póliza pertenece a la categoría si su ramo principal (polizas.ramo_id)
+    o alguno de sus ramos en poliza_ramos tiene esa ramos_seguros.categoria.
+
+    Parámetros:
+        cliente_id (int): ID del cliente (polizas.cliente_id, indexado)
+        categoria (str): 'Vehicular' o 'Vida/Salud' (opcional)
+
+    Retorna:
+        tuple: (consulta SQL, lista de parámetros); filas (id, numero_poliza, ramo_id,
+               estado, aseguradora, ramos)
+    """
+    query = """
+        SELECT p.id, p.numero_poliza, p.ramo_id, p.estado,
+               COALESCE(a.razon_social, 'Sin aseguradora') AS aseguradora,
+               COALESCE(r.nombre, (
+                   SELECT group_concat(r2.nombre, ', ')
+                   FROM poliza_ramos pr JOIN ramos_seguros r2 ON r2.id = pr.ramo_id
+                   WHERE pr.poliza_id = p.id
+               )) AS ramos
+        FROM polizas p
+        LEFT JOIN aseguradoras a ON a.id = p.aseguradora_id
+        LEFT JOIN ramos_seguros r ON r.id = p.ramo_id
+        WHERE p.cliente_id = ?
+    """
+    params = [cliente_id]
+
+    if categoria:
+        query += """
+            AND (r.categoria = ? OR EXISTS (
+                SELECT 1 FROM poliza_ramos pr JOIN ramos_seguros r3 ON r3.id = pr.ramo_id
+                WHERE pr.poliza_id = p.id AND r3.categoria = ?
+            ))
+        """
+        params.extend([categoria, categoria])
+
+    query += " ORDER BY p.numero_poliza"
+    return query, params
+
+
+# Totales de cartera por estado, exactos en centavos (columnas *_centavos, migración 4)
+TOTALES_CARTERA_POR_ESTADO = """
+    SELECT estado, COUNT(*), SUM(prima_neta_centavos), SUM(suma_asegurada_centavos), SUM(total_centavos)
+    FROM polizas
+    GROUP BY estado
+"""
+
+# ============================================================================
+# CLIENTES
+# ============================================================================
+# Documentos de una lista (JSON en un solo parámetro) que ya están registrados;
+# la importación masiva la ejecuta una vez por lote
+DOCUMENTOS_EXISTENTES = (
+    "SELECT numero_documento FROM clients "
+    "WHERE numero_documento IN (SELECT value FROM json_each(?))"
+)
+
+# Clientes de una lista de documentos: {numero_documento: id} para la ingesta de bordereaux
+CLIENTES_POR_DOCUMENTO = (
+    "SELECT numero_documento, id FROM clients "
+    "WHERE numero_documento IN (SELECT value FROM json_each(?))"
+)
+
+# ============================================================================
+# INGESTA DE BORDEREAUX (core/ingesta_polizas.py), una consulta por lote
+# ============================================================================
+# Aseguradoras por RUC (aseguradoras.identificacion es UNIQUE)
+ASEGURADORAS_POR_IDENTIFICACION = (
+    "SELECT identificacion, id FROM aseguradoras "
+    "WHERE identificacion IN (SELECT value FROM json_each(?))"
+)
+
+# Pólizas ya registradas con alguno de los números (numero_poliza es UNIQUE)
+POLIZAS_POR_NUMERO = (
+    "SELECT numero_poliza, id FROM polizas "
+    "WHERE numero_poliza IN (SELECT value FROM json_each(?))"
+)
+
+# ============================================================================
+# MOVIMIENTOS
+# ============================================================================
+# Historial de movimientos de una póliza (pestaña Documentos de la ficha)
+MOVIMIENTOS_POR_POLIZA = """
+    SELECT m.id, m.codigo_movimiento, m.tipo_movimiento, m.estado, m.fecha_movimiento
+    FROM movimientos_poliza m
+    WHERE m.poliza_id = ?
+    ORDER BY m.fecha_movimiento DESC
+"""
+
+# Últimos movimientos registrados (lista de movimiento_crud)
+MOVIMIENTOS_RECIENTES = (
+    "SELECT id, codigo_movimiento, tipo_movimiento, estado, fecha_movimiento "
+    "FROM movimientos_poliza ORDER BY fecha_movimiento DESC LIMIT ?"
+)
+
+# ============================================================================
+# FACTURAS Y NOTAS DE CRÉDITO
+# ============================================================================
+# Facturas de una póliza (pestaña Documentos de la ficha)
+FACTURAS_POR_POLIZA = """
+    SELECT numero_factura, fecha_emision, total, estado
+    FROM facturas WHERE poliza_id = ?
+"""
+
+# Facturas ligadas a un movimiento o a su póliza (detalle de movimiento)
+FACTURAS_POR_MOVIMIENTO_O_POLIZA = (
+    "SELECT id, numero_factura, poliza_id, fecha_emision, monto_neto, impuestos, iva, total, estado "
+    "FROM facturas WHERE movimiento_id = ? OR poliza_id = ?"
+)
+
+# Notas de crédito ligadas a un movimiento o a su póliza
+NOTAS_POR_MOVIMIENTO_O_POLIZA = (
+    "SELECT id, numero_nota, factura_id, poliza_id, monto_neto, impuestos, iva, total, motivo, estado "
+    "FROM notas_de_credito WHERE movimiento_id = ? OR poliza_id = ?"
+)
+
+# Facturas y notas de crédito emitidas por una lista de movimientos (JSON en
+# un solo parámetro); la generación de PDF en segundo plano las busca por lote
+FACTURAS_DE_MOVIMIENTOS = (
+    "SELECT id FROM facturas WHERE movimiento_id IN (SELECT value FROM json_each(?))"
+)
+NOTAS_DE_MOVIMIENTOS = (
+    "SELECT id FROM notas_de_credito WHERE movimiento_id IN (SELECT value FROM json_each(?))"
+)
+
+
+def notas_por_movimiento_o_facturas(num_facturas):
+    """
+    Notas de crédito ligadas a un movimiento o a cualquiera de sus facturas
+
+    Parámetros:
+        num_facturas (int): Cantidad de IDs de factura que se pasarán como parámetros
+
+    Retorna:
+        str: Consulta con un placeholder para el movimiento y uno por factura
+    """
+    placeholders = ",".join("?" for _ in range(num_facturas))
+    return (
+        "SELECT id, numero_nota, factura_id, poliza_id, monto_neto, impuestos, iva, total, motivo, estado "
+        f"FROM notas_de_credito WHERE movimiento_id = ? OR factura_id IN ({placeholders})"
+    )
+
+
+# ============================================================================
+# SINIESTROS
+# ============================================================================
+def siniestros_filtrados(tipo_siniestro=None, estado=None):
+    """
+    Construye la consulta de la lista de siniestros con filtros opcionales
+
+    Parámetros:
+        tipo_siniestro (str): 'Vehicular' o 'Vida/Salud' (opcional)
+        estado (str): Estado del siniestro (opcional)
+
+    Retorna:
+        tuple: (consulta SQL, lista de parámetros)
+    """
+    query = """
+        SELECT s.*, p.numero_poliza, c.nombres, c.apellidos
+        FROM siniestros s
+        LEFT JOIN polizas p ON s.poliza_id = p.id
+        LEFT JOIN clients c ON s.cliente_id = c.id
+        WHERE 1=1
+    """
+    params = []
+
+    if tipo_siniestro:
+        query += " AND s.tipo_siniestro = ?"
+        params.append(tipo_siniestro)
+
+    if estado:
+        query += " AND s.estado = ?"
+        params.append(estado)
+
+    query += " ORDER BY s.fecha_siniestro DESC"
+    return query, params
+
+
+# ============================================================================
+# SUCURSALES
+# ============================================================================
+# Sucursales de una aseguradora (selector del formulario de pólizas)
+SUCURSALES_POR_ASEGURADORA = "SELECT id, nombre FROM sucursales WHERE aseguradora_id = ?"
@@ -0,0 +1,227 @@
+# ============================================================================
+# CAPA DE ACCESO A DATOS - core/db.py
+# ============================================================================
+# Pool de conexiones SQLite por proceso y unidad de trabajo transaccional.
+# Todas las conexiones se abren una sola vez con PRAGMAs ajustados (WAL,
+# synchronous=NORMAL, busy_timeout, cache_size, mmap_size) y se reutilizan
+# entre reruns de Streamlit en lugar de abrir/cerrar el archivo en cada consulta.
+# ============================================================================
+
+# Importaciones necesarias
+import os  # Para detectar cambios de proceso (fork)
+import queue  # Cola thread-safe para las conexiones libres
+import sqlite3  # Librería para manejar SQLite
+import threading  # Locks para la creación de pools
+from contextlib import contextmanager  # Context managers para conexiones y transacciones
+
+from dbconfig import DB_FILE  # Ruta del archivo de base de datos
+
+# ============================================================================
+# CONSTANTES DE CONFIGURACIÓN DEL POOL
+# ============================================================================
+POOL_SIZE = 8  # Número máximo de conexiones inactivas que se conservan por proceso
+BUSY_TIMEOUT_MS = 5000  # Espera máxima ante "database is locked" antes de fallar
+
+# PRAGMAs aplicados a cada conexión nueva (el orden importa: journal_mode primero)
+PRAGMAS = (
+    ("journal_mode", "WAL"),  # Lectores y escritor concurrentes sin bloquearse
+    ("synchronous", "NORMAL"),  # Seguro con WAL y mucho más rápido que FULL
+    ("busy_timeout", BUSY_TIMEOUT_MS),  # Reintentar en vez de fallar inmediatamente
+    ("cache_size", -20000),  # ~20 MB de caché de páginas por conexión
+    ("mmap_size", 268435456),  # 256 MB de lectura mapeada en memoria
+    ("temp_store", "MEMORY"),  # Tablas temporales y ordenamientos en memoria
+)
+
+
+# ============================================================================
+# CLASE: PooledConnection
+# Conexión SQLite que vuelve al pool al llamar close()
+# ============================================================================
+class PooledConnection(sqlite3.Connection):
+    """
+    Conexión sqlite3 normal (compatible con cursores, pandas.read_sql_query, etc.)
+    cuyo close() la devuelve al pool en lugar de cerrar el archivo.
+    Así el código existente con el patrón connect/close sigue funcionando.
+    """
+
+    _pool = None  # Pool dueño de la conexión (se asigna al crearla)
+    _en_pool = False  # True mientras la conexión está guardada en el pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.release(self)
+        else:
+            super().close()
+
+    def close_physical(self):
+        """Cierra realmente la conexión (usado por el pool al descartarla)."""
+        self._pool = None
+        super().close()
+
+
+# ============================================================================
+# CLASE: ConnectionPool
+# Pool de conexiones por archivo de base de datos y por proceso
+# ============================================================================
+class ConnectionPool:
+    """
+    Mantiene hasta `size` conexiones inactivas listas para reutilizar.
+    Si todas están en uso se abre una conexión adicional; al devolverla,
+    si el pool ya está lleno, se cierra.
+    """
+
+    def __init__(self, db_file, size=POOL_SIZE):
+        self.db_file = db_file
+        self.size = size
+        self.pid = os.getpid()
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def _open(self):
+        """Abre una conexión física nueva con los PRAGMAs de rendimiento."""
+        conn = sqlite3.connect(
+            self.db_file,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,  # Streamlit ejecuta cada sesión en su propio hilo
+            factory=PooledConnection,
+        )
+        for pragma, value in PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}={value}")
+        conn._pool = self
+        return conn
+
+    def acquire(self):
+        """Obtiene una conexión libre del pool (o abre una nueva)."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            return self._open()
+        conn._en_pool = False
+        return conn
+
+    def release(self, conn):
+        """Devuelve una conexión al pool descartando cualquier transacción pendiente."""
+        if conn._en_pool:
+            return  # close() llamado dos veces: ya está en el pool
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            conn._en_pool = True
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn._en_pool = False
+            conn.close_physical()
+
+    def close_all(self):
+        """Cierra todas las conexiones inactivas del pool."""
+        while True:
+            try:
+                self._idle.get_nowait().close_physical()
+            except queue.Empty:
+                break
+
+
+# ============================================================================
+# REGISTRO DE POOLS POR PROCESO
+# ============================================================================
+_pools = {}  # {ruta_absoluta: ConnectionPool}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_file=None):
+    """
+    Retorna el pool del proceso actual para el archivo indicado
+
+    Parámetros:
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        ConnectionPool: Pool compartido por todo el proceso
+    """
+    path = os.path.abspath(db_file or DB_FILE)
+    pool = _pools.get(path)
+    if pool is None or pool.pid != os.getpid():
+        with _pools_lock:
+            pool = _pools.get(path)
+            # Tras un fork las conexiones heredadas no son válidas: crear un pool nuevo
+            if pool is None or pool.pid != os.getpid():
+                pool = ConnectionPool(path)
+                _pools[path] = pool
+    return pool
+
+
+def close_pools():
+    """Cierra todas las conexiones inactivas (útil antes de borrar el archivo de BD)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
+
+
+# ============================================================================
+# FUNCIÓN: get_connection
+# Reemplazo directo de sqlite3.connect(DB_FILE)
+# ============================================================================
+def get_connection(db_file=None):
+    """
+    Obtiene una conexión del pool. Llamar a close() la devuelve al pool.
+
+    Parámetros:
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        PooledConnection: Conexión lista para usar
+    """
+    return get_pool(db_file).acquire()
+
+
+# ============================================================================
+# CONTEXT MANAGER: connection
+# Préstamo de una conexión para lecturas
+# ============================================================================
+@contextmanager
+def connection(db_file=None):
+    """
+    Presta una conexión del pool durante el bloque `with` y la devuelve al salir.
+
+    Uso:
+        with connection() as conn:
+            rows = conn.execute("SELECT ...").fetchall()
+    """
+    conn = get_connection(db_file)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+# ============================================================================
+# CONTEXT MANAGER: unit_of_work
+# Transacción única: commit al salir del bloque, rollback si hay excepción
+# ============================================================================
+@contextmanager
+def unit_of_work(db_file=None, immediate=False):
+    """
+    Ejecuta el bloque dentro de una única transacción con un solo commit.
+
+    Parámetros:
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+        immediate (bool): Si es True usa BEGIN IMMEDIATE para tomar el lock de
+                          escritura al inicio (evita errores de "database is locked"
+                          al promover una lectura a escritura)
+
+    Uso:
+        with unit_of_work() as conn:
+            conn.execute("INSERT ...")
+            conn.execute("UPDATE ...")
+    """
+    conn = get_connection(db_file)
+    try:
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,441 @@
+# ============================================================================
+# GENERACIÓN DE DOCUMENTOS PDF - core/documentos.py
+# ============================================================================
+# Renderiza con reportlab los PDF de movimientos (anexos), facturas y notas
+# de crédito a partir de PLANTILLAS y guarda la ruta en la columna
+# `pdf_documento` de cada tabla.
+#
+#   - Los datos de cada lote se leen con una sola consulta (json_each).
+#   - El renderizado corre en un pool de procesos (ProcessPoolExecutor, un
+#     proceso por núcleo): los workers no tocan la base, solo reciben un dict
+#     y escriben el archivo.
+#   - Las rutas se escriben de vuelta en la base desde el proceso principal
+#     con un único executemany por lote.
+#
+# encolar() lo hace en segundo plano (las páginas de Streamlit no esperan);
+# generar_documentos() es la versión síncrona para lotes y
+# scripts/generar_documentos.py. Como nadie espera los trabajos en segundo
+# plano, sus errores se registran en el log y en fallos(); si el pool de
+# procesos se rompe (un worker murió) se crea uno nuevo y se reintenta.
+# ============================================================================
+
+# Importaciones necesarias
+import collections  # Últimos fallos en segundo plano
+import datetime  # Fecha de cada fallo
+import json  # Lista de IDs como un solo parámetro (json_each)
+import logging  # Errores de los trabajos en segundo plano
+import multiprocessing  # Contexto "spawn" para los workers
+import os  # Rutas de los PDF
+import re  # Nombres de archivo seguros
+import threading  # Lock del pool compartido
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor  # Workers
+from concurrent.futures.process import BrokenProcessPool  # Worker muerto: hay que recrear el pool
+
+from core.consultas import FACTURAS_DE_MOVIMIENTOS, NOTAS_DE_MOVIMIENTOS  # Documentos de un lote
+from core.db import connection, unit_of_work  # Lectura de datos y escritura de rutas
+from core.money import Money  # Montos formateados
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+DIRECTORIO_DOCUMENTOS = "documentos"  # Carpeta raíz de los PDF (relativa, como DB_FILE)
+LOGO = os.path.join("assets", "logo.png")
+TAMANO_LOTE = 200  # Documentos leídos y escritos por vez
+FALLOS_MAXIMOS = 100  # Fallos en segundo plano que se conservan para fallos()
+
+MOVIMIENTO = "movimiento"
+FACTURA = "factura"
+NOTA_CREDITO = "nota_credito"
+
+# Consulta de los datos de cada tipo: columnas con alias usados por las plantillas
+_CONSULTAS = {
+    MOVIMIENTO: """
+        SELECT m.id, m.codigo_movimiento AS numero, m.tipo_movimiento, m.fecha_movimiento AS fecha,
+               m.estado, m.suma_asegurada_nueva, m.prima_nueva, m.scvs, m.seguro_campesino,
+               m.derecho_emision, m.subtotal_prima, m.iva_amount, m.prima_total_con_iva, m.observaciones,
+               p.numero_poliza, a.razon_social AS aseguradora,
+               c.tipo_cliente, c.nombres, c.apellidos, c.razon_social, c.numero_documento
+        FROM movimientos_poliza m
+        LEFT JOIN polizas p ON p.id = m.poliza_id
+        LEFT JOIN aseguradoras a ON a.id = p.aseguradora_id
+        LEFT JOIN clients c ON c.id = m.cliente_id
+        WHERE m.id IN (SELECT value FROM json_each(?))
+    """,
+    FACTURA: """
+        SELECT f.id, f.numero_factura AS numero, f.fecha_emision AS fecha, f.estado,
+               f.monto_neto, f.impuestos, f.iva, f.total,
+               p.numero_poliza, a.razon_social AS aseguradora,
+               c.tipo_cliente, c.nombres, c.apellidos, c.razon_social, c.numero_documento
+        FROM facturas f
+        LEFT JOIN polizas p ON p.id = f.poliza_id
+        LEFT JOIN aseguradoras a ON a.id = p.aseguradora_id
+        LEFT JOIN clients c ON c.id = f.cliente_id
+        WHERE f.id IN (SELECT value FROM json_each(?))
+    """,
+    NOTA_CREDITO: """
+        SELECT n.id, n.numero_nota AS numero, n.fecha_emision AS fecha, n.estado, n.motivo,
+               n.monto_neto, n.impuestos, n.iva, n.total, fa.numero_factura,
+               p.numero_poliza, a.razon_social AS aseguradora,
+               c.tipo_cliente, c.nombres, c.apellidos, c.razon_social, c.numero_documento
+        FROM notas_de_credito n
+        LEFT JOIN facturas fa ON fa.id = n.factura_id
+        LEFT JOIN polizas p ON p.id = n.poliza_id
+        LEFT JOIN aseguradoras a ON a.id = p.aseguradora_id
+        LEFT JOIN clients c ON c.id = n.cliente_id
+        WHERE n.id IN (SELECT value FROM json_each(?))
+    """,
+}
+
+# Tabla y carpeta de cada tipo
+TABLAS = {
+    MOVIMIENTO: ("movimientos_poliza", "movimientos"),
+    FACTURA: ("facturas", "facturas"),
+    NOTA_CREDITO: ("notas_de_credito", "notas_credito"),
+}
+
+# Plantillas: título, campos del encabezado y filas de montos (etiqueta, clave)
+PLANTILLAS = {
+    MOVIMIENTO: {
+        "titulo": "Anexo de póliza",
+        "campos": [
+            ("Código", "numero"), ("Tipo de movimiento", "tipo_movimiento"), ("Fecha", "fecha"),
+            ("Póliza", "numero_poliza"), ("Aseguradora", "aseguradora"), ("Cliente", "cliente"),
+            ("Documento", "numero_documento"), ("Estado", "estado"), ("Observaciones", "observaciones"),
+        ],
+        "montos": [
+            ("Nueva suma asegurada", "suma_asegurada_nueva"), ("Nueva prima neta", "prima_nueva"),
+            ("Contribución SCVS", "scvs"), ("Seguro Campesino", "seguro_campesino"),
+            ("Derecho de emisión", "derecho_emision"), ("Subtotal", "subtotal_prima"),
+            ("IVA", "iva_amount"), ("Total", "prima_total_con_iva"),
+        ],
+    },
+    FACTURA: {
+        "titulo": "Factura",
+        "campos": [
+            ("Número", "numero"), ("Fecha de emisión", "fecha"), ("Póliza", "numero_poliza"),
+            ("Aseguradora", "aseguradora"), ("Cliente", "cliente"), ("Documento", "numero_documento"),
+            ("Estado", "estado"),
+        ],
+        "montos": [("Prima neta", "monto_neto"), ("Impuestos y cargos", "impuestos"), ("IVA", "iva"), ("Total", "total")],
+    },
+    NOTA_CREDITO: {
+        "titulo": "Nota de crédito",
+        "campos": [
+            ("Número", "numero"), ("Fecha de emisión", "fecha"), ("Factura", "numero_factura"),
+            ("Póliza", "numero_poliza"), ("Aseguradora", "aseguradora"), ("Cliente", "cliente"),
+            ("Documento", "numero_documento"), ("Motivo", "motivo"), ("Estado", "estado"),
+        ],
+        "montos": [("Prima neta", "monto_neto"), ("Impuestos y cargos", "impuestos"), ("IVA", "iva"), ("Total", "total")],
+    },
+}
+
+
+# ============================================================================
+# RENDERIZADO (se ejecuta en los procesos del pool; no usa la base)
+# ============================================================================
+def _nombre_archivo(texto):
+    """Número de documento como nombre de archivo seguro."""
+    return re.sub(r"[^\w.-]+", "_", str(texto or "")).strip("_") or "sin_numero"
+
+
+def ruta_documento(tipo, datos, directorio=DIRECTORIO_DOCUMENTOS):
+    """Ruta del PDF de un documento: documentos/<carpeta>/<número>_<id>.pdf"""
+    return os.path.join(directorio, TABLAS[tipo][1], f"{_nombre_archivo(datos.get('numero'))}_{datos['id']}.pdf")
+
+
+def renderizar(tipo, datos, ruta):
+    """
+    Dibuja el PDF de un documento con su plantilla
+
+    Parámetros:
+        tipo (str): MOVIMIENTO, FACTURA o NOTA_CREDITO
+        datos (dict): Fila de _CONSULTAS[tipo] más la clave "cliente"
+        ruta (str): Archivo de salida
+
+    Retorna:
+        tuple: (id del documento, ruta)
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Image, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    plantilla = PLANTILLAS[tipo]
+    estilos = getSampleStyleSheet()
+    elementos = []
+    if os.path.exists(LOGO):
+        elementos.append(Image(LOGO, width=4 * cm, height=2 * cm, kind="proportional"))
+    elementos.append(Paragraph(f"{plantilla['titulo']} {datos.get('numero') or ''}", estilos["Title"]))
+    elementos.append(Spacer(1, 0.4 * cm))
+
+    campos = [
+        [etiqueta, Paragraph(str(datos[clave]), estilos["Normal"])]
+        for etiqueta, clave in plantilla["campos"] if datos.get(clave) not in (None, "")
+    ]
+    tabla = Table(campos, colWidths=[5 * cm, 11 * cm])
+    tabla.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("LINEBELOW", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+    ]))
+    elementos += [tabla, Spacer(1, 0.6 * cm)]
+
+    montos = [
+        [etiqueta, Money.of(datos[clave]).format()]
+        for etiqueta, clave in plantilla["montos"] if datos.get(clave) is not None
+    ]
+    if montos:
+        tabla = Table(montos, colWidths=[11 * cm, 5 * cm])
+        tabla.setStyle(TableStyle([
+            ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+            ("BACKGROUND", (0, -1), (-1, -1), colors.whitesmoke),
+            ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+            ("LINEABOVE", (0, -1), (-1, -1), 0.5, colors.black),
+        ]))
+        elementos.append(tabla)
+
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    # Escribir a un temporal y renombrar: nunca queda un PDF a medias con la ruta final
+    temporal = f"{ruta}.tmp"
+    SimpleDocTemplate(temporal, pagesize=A4, title=f"{plantilla['titulo']} {datos.get('numero') or ''}").build(elementos)
+    os.replace(temporal, ruta)
+    return datos["id"], ruta
+
+
+def _renderizar_lote(tipo, lote, directorio):
+    """Renderiza varios documentos en un worker (menos overhead de IPC por documento)."""
+    resultados = []
+    for datos in lote:
+        try:
+            resultados.append(renderizar(tipo, datos, ruta_documento(tipo, datos, directorio)))
+        except Exception as e:
+            resultados.append((datos["id"], e))
+    return resultados
+
+
+# ============================================================================
+# LECTURA Y ESCRITURA EN LA BASE (proceso principal)
+# ============================================================================
+def _cargar_datos(conn, tipo, ids):
+    """Una consulta por lote: dict de datos por documento, con el nombre del cliente."""
+    cursor = conn.execute(_CONSULTAS[tipo], (json.dumps(list(ids)),))
+    columnas = [d[0] for d in cursor.description]
+    filas = []
+    for fila in cursor.fetchall():
+        datos = dict(zip(columnas, fila))
+        if datos.get("tipo_cliente") == "Persona Jurídica":
+            datos["cliente"] = datos.get("razon_social")
+        else:
+            datos["cliente"] = " ".join(filter(None, [datos.get("nombres"), datos.get("apellidos")])) or None
+        filas.append(datos)
+    return filas
+
+
+def pendientes(tipo, limite=None, db_file=None):
+    """
+    IDs de documentos sin PDF generado
+
+    Retorna:
+        list: IDs con pdf_documento vacío, en orden
+    """
+    tabla = TABLAS[tipo][0]
+    consulta = f"SELECT id FROM {tabla} WHERE pdf_documento IS NULL OR pdf_documento = '' ORDER BY id"
+    with connection(db_file) as conn:
+        if limite:
+            return [r[0] for r in conn.execute(f"{consulta} LIMIT ?", (limite,))]
+        return [r[0] for r in conn.execute(consulta)]
+
+
+def generar_documentos(tipo, ids=None, procesos=None, directorio=DIRECTORIO_DOCUMENTOS,
+                       ejecutor=None, progreso=None, db_file=None):
+    """
+    Genera en paralelo los PDF de `ids` (por defecto todos los pendientes) y guarda sus rutas
+
+    Parámetros:
+        tipo (str): MOVIMIENTO, FACTURA o NOTA_CREDITO
+        ids (list): Documentos a generar (None = pendientes())
+        procesos (int): Workers del pool propio (por defecto uno por núcleo)
+        directorio (str): Carpeta raíz de los PDF
+        ejecutor (Executor): Pool ya creado (p. ej. el compartido de encolar())
+        progreso (callable): Opcional, se llama con los documentos procesados tras cada lote
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {"generados": n, "errores": [(id, mensaje)]}
+    """
+    ids = pendientes(tipo, db_file=db_file) if ids is None else list(ids)
+    resumen = {"generados": 0, "errores": []}
+    if not ids:
+        return resumen
+
+    propio = ejecutor is None
+    if propio:
+        ejecutor = _crear_pool(procesos)
+    tabla = TABLAS[tipo][0]
+    try:
+        for inicio in range(0, len(ids), TAMANO_LOTE):
+            with connection(db_file) as conn:
+                datos = _cargar_datos(conn, tipo, ids[inicio:inicio + TAMANO_LOTE])
+            # Reparto en trozos (unos cuatro por núcleo) para equilibrar la carga de los workers
+            trozo = max(1, -(-len(datos) // ((os.cpu_count() or 1) * 4)))
+            futuros = [
+                ejecutor.submit(_renderizar_lote, tipo, datos[i:i + trozo], directorio)
+                for i in range(0, len(datos), trozo)
+            ]
+            rutas = []
+            for futuro in futuros:
+                for documento_id, resultado in futuro.result():
+                    if isinstance(resultado, Exception):
+                        resumen["errores"].append((documento_id, str(resultado)))
+                    else:
+                        rutas.append((resultado, documento_id))
+            with unit_of_work(db_file) as conn:
+                conn.executemany(f"UPDATE {tabla} SET pdf_documento = ? WHERE id = ?", rutas)
+            resumen["generados"] += len(rutas)
+            if progreso:
+                progreso(min(inicio + TAMANO_LOTE, len(ids)))
+    finally:
+        if propio:
+            ejecutor.shutdown()
+    return resumen
+
+
+def generar_de_movimientos(movimiento_ids, ejecutor=None, db_file=None):
+    """
+    Genera los anexos de `movimiento_ids` y las facturas / notas de crédito que emitieron
+
+    Retorna:
+        dict: {tipo: resumen de generar_documentos()}
+    """
+    movimiento_ids = list(movimiento_ids)
+    with connection(db_file) as conn:
+        parametro = (json.dumps(movimiento_ids),)
+        facturas = [r[0] for r in conn.execute(FACTURAS_DE_MOVIMIENTOS, parametro)]
+        notas = [r[0] for r in conn.execute(NOTAS_DE_MOVIMIENTOS, parametro)]
+    propio = ejecutor is None
+    if propio:
+        ejecutor = _crear_pool()
+    try:
+        return {
+            tipo: generar_documentos(tipo, ids, ejecutor=ejecutor, db_file=db_file)
+            for tipo, ids in ((MOVIMIENTO, movimiento_ids), (FACTURA, facturas), (NOTA_CREDITO, notas))
+        }
+    finally:
+        if propio:
+            ejecutor.shutdown()
+
+
+# ============================================================================
+# GENERACIÓN EN SEGUNDO PLANO
+# ============================================================================
+_log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_procesos = None  # Pool de procesos compartido (renderizado)
+_despachador = None  # Hilo que lee datos, reparte el trabajo y escribe las rutas
+_fallos = collections.deque(maxlen=FALLOS_MAXIMOS)  # Errores de los trabajos que nadie espera
+
+
+def _crear_pool(procesos=None):
+    # "spawn": los workers no heredan hilos ni conexiones SQLite del proceso de Streamlit
+    return ProcessPoolExecutor(max_workers=procesos or os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+
+
+def _pools():
+    """Pool de procesos y despachador compartidos, creados en el primer uso."""
+    global _procesos, _despachador
+    with _lock:
+        if _procesos is None:
+            _procesos = _crear_pool()
+            _despachador = ThreadPoolExecutor(max_workers=1, thread_name_prefix="documentos")
+        return _procesos, _despachador
+
+
+def _con_pool(funcion, *args, **kwargs):
+    """
+    Ejecuta `funcion` con el pool de procesos compartido (en el hilo despachador)
+
+    Si el pool está roto (BrokenProcessPool: un worker murió) lo reemplaza
+    por uno nuevo y reintenta una vez; los documentos ya guardados solo se
+    vuelven a dibujar.
+    """
+    global _procesos
+    for intento in range(2):
+        procesos, _ = _pools()
+        try:
+            return funcion(*args, ejecutor=procesos, **kwargs)
+        except BrokenProcessPool:
+            with _lock:
+                if _procesos is procesos:
+                    _procesos = _crear_pool()
+            procesos.shutdown(wait=False)
+            _log.warning("Pool de documentos roto; se creó uno nuevo")
+            if intento:
+                raise
+
+
+def _registrar_fallo(tarea, error):
+    _log.error("Generación de documentos (%s): %s", tarea, error)
+    _fallos.append({
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"), "tarea": tarea, "error": error,
+    })
+
+
+def _al_terminar(tarea):
+    """Callback del futuro: registra la excepción o los documentos con error del resumen."""
+    def registrar(futuro):
+        if futuro.cancelled():
+            return
+        error = futuro.exception()
+        if error is not None:
+            _registrar_fallo(tarea, f"{type(error).__name__}: {error}")
+            return
+        resultado = futuro.result()
+        # generar_documentos() retorna un resumen; generar_de_movimientos(), uno por tipo
+        resumenes = resultado.items() if "errores" not in resultado else [(tarea, resultado)]
+        for tipo, resumen in resumenes:
+            for documento_id, mensaje in resumen["errores"]:
+                _registrar_fallo(f"{tipo} {documento_id}", mensaje)
+    return registrar
+
+
+def fallos():
+    """Últimos fallos de la generación en segundo plano (el más reciente al final)."""
+    return list(_fallos)
+
+
+def encolar(tipo, ids, db_file=None):
+    """
+    Programa la generación de PDF sin bloquear a quien llama (p. ej. una página de Streamlit)
+
+    Parámetros:
+        tipo (str): MOVIMIENTO, FACTURA o NOTA_CREDITO
+        ids (list): Documentos a generar
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        Future: Se resuelve con el resumen de generar_documentos(); los errores
+                también quedan en el log y en fallos()
+    """
+    _, despachador = _pools()
+    futuro = despachador.submit(_con_pool, generar_documentos, tipo, list(ids), db_file=db_file)
+    futuro.add_done_callback(_al_terminar(tipo))
+    return futuro
+
+
+def encolar_movimientos(movimiento_ids, db_file=None):
+    """Como encolar(), para los anexos de un lote de movimientos y sus facturas / notas de crédito."""
+    _, despachador = _pools()
+    futuro = despachador.submit(_con_pool, generar_de_movimientos, list(movimiento_ids), db_file=db_file)
+    futuro.add_done_callback(_al_terminar("movimientos"))
+    return futuro
+
+
+def detener(esperar=True):
+    """Cierra los pools de segundo plano (al terminar un script o en pruebas)."""
+    global _procesos, _despachador
+    with _lock:
+        if _despachador is not None:
+            _despachador.shutdown(wait=esperar)
+            _procesos.shutdown(wait=esperar)
+        _procesos = _despachador = None
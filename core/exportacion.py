@@ -0,0 +1,298 @@
+# ============================================================================
+# EXPORTACIÓN DE TABLAS - core/exportacion.py
+# ============================================================================
+# Exporta clientes, pólizas, facturas, movimientos o ramos a CSV o XLSX sin
+# cargar la tabla en memoria:
+#
+#   - filas() es un generador: recorre el cursor de SQLite con fetchmany()
+#     y entrega lotes de TAMANO_LOTE filas, con las columnas pedidas y los
+#     filtros aplicados en la consulta.
+#   - Los escritores consumen los lotes y los escriben al archivo a medida
+#     que llegan (csv.writer; openpyxl en modo write_only para XLSX), así la
+#     memoria no crece con el tamaño de la tabla.
+#   - El archivo se escribe con otro nombre y se renombra al terminar: nunca
+#     se descarga un archivo a medias.
+#
+# iniciar_exportacion() corre la exportación en segundo plano (las páginas de
+# Streamlit no esperan) y estado_exportacion() informa el avance y la ruta
+# del archivo para descargarlo; exportar() es la versión síncrona. Antes de
+# cada exportación nueva, limpiar_exportaciones() borra de exportaciones/ los
+# archivos de más de DIAS_CONSERVACION días y los que excedan ARCHIVOS_MAXIMOS.
+# ============================================================================
+
+# Importaciones necesarias
+import csv  # Escritura CSV por filas
+import datetime  # Nombre del archivo y hora de los trabajos
+import itertools  # Identificador de los trabajos
+import os  # Rutas de los archivos
+import threading  # Lock del registro de trabajos
+import time  # Duración de la exportación
+from concurrent.futures import ThreadPoolExecutor  # Trabajos en segundo plano
+
+from core.db import connection  # Pool de conexiones
+from core.migrations import get_columns  # Columnas conocidas de cada tabla
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+DIRECTORIO_EXPORTACIONES = "exportaciones"  # Carpeta de los archivos (relativa, como DB_FILE)
+TAMANO_LOTE = 1000  # Filas leídas del cursor y escritas por vez
+FORMATOS = ("csv", "xlsx")
+OPERADORES = ("=", "<>", "<", "<=", ">", ">=", "LIKE")  # Operadores permitidos en los filtros
+TRABAJOS_MAXIMOS = 1  # Exportaciones simultáneas en segundo plano
+DIAS_CONSERVACION = 7  # Antigüedad máxima de un archivo en exportaciones/
+ARCHIVOS_MAXIMOS = 50  # Archivos que se conservan en exportaciones/ (los más recientes)
+
+# Tablas exportables y su orden (clave estable para recorrerlas)
+TABLAS = {
+    "clients": "Clientes",
+    "polizas": "Pólizas",
+    "facturas": "Facturas",
+    "notas_de_credito": "Notas de crédito",
+    "movimientos_poliza": "Movimientos",
+    "siniestros": "Siniestros",
+    "ramos_seguros": "Ramos de seguros",
+}
+
+
+# ============================================================================
+# LECTURA POR LOTES
+# ============================================================================
+def consulta_exportacion(tabla, columnas=None, filtros=(), db_file=None):
+    """
+    Construye la consulta de una exportación, validando tabla, columnas y filtros
+
+    Parámetros:
+        tabla (str): Una de TABLAS
+        columnas (list): Columnas a exportar (por defecto todas)
+        filtros (list): Tuplas (columna, operador, valor); operador en OPERADORES
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        tuple: (consulta SQL, parámetros, columnas)
+
+    Lanza:
+        ValueError: Tabla, columna u operador no permitidos
+    """
+    if tabla not in TABLAS:
+        raise ValueError(f"La tabla {tabla} no se puede exportar.")
+    existentes = get_columns(tabla, db_file)
+    columnas = list(columnas or existentes)
+    desconocidas = [c for c in columnas + [f[0] for f in filtros] if c not in existentes]
+    if desconocidas:
+        raise ValueError(f"Columnas desconocidas en {tabla}: {', '.join(desconocidas)}")
+    condiciones, parametros = [], []
+    for columna, operador, valor in filtros:
+        if operador not in OPERADORES:
+            raise ValueError(f"Operador no permitido: {operador}")
+        condiciones.append(f'"{columna}" {operador} ?')
+        parametros.append(valor)
+    donde = f" WHERE {' AND '.join(condiciones)}" if condiciones else ""
+    # Orden por rowid: el recorrido natural de la tabla, sin ordenar en memoria
+    seleccion = ", ".join(f'"{c}"' for c in columnas)
+    consulta = f"SELECT {seleccion} FROM {tabla}{donde} ORDER BY rowid"
+    return consulta, parametros, columnas
+
+
+def filas(tabla, columnas=None, filtros=(), tamano_lote=TAMANO_LOTE, db_file=None):
+    """
+    Generador de lotes de filas de una tabla
+
+    Parámetros:
+        tabla, columnas, filtros: Como consulta_exportacion()
+        tamano_lote (int): Filas por lote
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        generator: Listas de tuplas de a lo sumo `tamano_lote` filas
+    """
+    consulta, parametros, _ = consulta_exportacion(tabla, columnas, filtros, db_file)
+    with connection(db_file) as conn:
+        cursor = conn.execute(consulta, parametros)
+        try:
+            while True:
+                lote = cursor.fetchmany(tamano_lote)
+                if not lote:
+                    return
+                yield lote
+        finally:
+            cursor.close()
+
+
+# ============================================================================
+# ESCRITORES
+# ============================================================================
+def escribir_csv(ruta, columnas, lotes):
+    """Escribe los lotes en un CSV (UTF-8 con BOM, para que Excel lea las tildes). Retorna las filas escritas."""
+    total = 0
+    with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(columnas)
+        for lote in lotes:
+            escritor.writerows(lote)
+            total += len(lote)
+    return total
+
+
+def escribir_xlsx(ruta, columnas, lotes):
+    """Escribe los lotes en un XLSX con openpyxl en modo write_only. Retorna las filas escritas."""
+    from openpyxl import Workbook  # Solo al exportar a Excel
+
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet("Datos")
+    hoja.append(columnas)
+    total = 0
+    for lote in lotes:
+        for fila in lote:
+            hoja.append(fila)
+        total += len(lote)
+    libro.save(ruta)
+    return total
+
+
+ESCRITORES = {"csv": escribir_csv, "xlsx": escribir_xlsx}
+
+
+def ruta_exportacion(tabla, formato, directorio=DIRECTORIO_EXPORTACIONES):
+    """Ruta del archivo de una exportación nueva: exportaciones/<tabla>_<fecha y hora>.<formato>."""
+    marca = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return os.path.join(directorio, f"{tabla}_{marca}.{formato}")
+
+
+def exportar(tabla, formato="csv", columnas=None, filtros=(), ruta=None, avance=None, db_file=None):
+    """
+    Exporta una tabla a CSV o XLSX por lotes
+
+    Parámetros:
+        tabla, columnas, filtros: Como consulta_exportacion()
+        formato (str): "csv" o "xlsx"
+        ruta (str): Archivo de destino (por defecto ruta_exportacion())
+        avance (callable): Recibe las filas escritas hasta el momento, tras cada lote
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {"ruta", "filas", "segundos"}
+    """
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato no soportado: {formato}")
+    inicio = time.perf_counter()
+    _, _, columnas = consulta_exportacion(tabla, columnas, filtros, db_file)
+    ruta = ruta or ruta_exportacion(tabla, formato)
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+
+    def lotes():
+        escritas = 0
+        for lote in filas(tabla, columnas, filtros, db_file=db_file):
+            yield lote
+            escritas += len(lote)
+            if avance:
+                avance(escritas)
+
+    temporal = f"{ruta}.parcial"
+    try:
+        total = ESCRITORES[formato](temporal, columnas, lotes())
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return {"ruta": ruta, "filas": total, "segundos": time.perf_counter() - inicio}
+
+
+def limpiar_exportaciones(directorio=DIRECTORIO_EXPORTACIONES, dias=DIAS_CONSERVACION, maximo=ARCHIVOS_MAXIMOS):
+    """
+    Borra las exportaciones viejas: las de más de `dias` días y, de las
+    restantes, las que excedan las `maximo` más recientes
+
+    Retorna:
+        list: Rutas borradas
+    """
+    if not os.path.isdir(directorio):
+        return []
+    limite = time.time() - dias * 86400
+    archivos = sorted(
+        (entrada for entrada in os.scandir(directorio) if entrada.is_file()),
+        key=lambda entrada: entrada.stat().st_mtime, reverse=True,
+    )
+    # Los .parcial son exportaciones en curso: solo se borran por antigüedad
+    terminados = [a for a in archivos if not a.name.endswith(".parcial")]
+    viejos = {a.path for a in archivos if a.stat().st_mtime < limite}
+    viejos.update(a.path for a in terminados[maximo:])
+    borrados = []
+    for ruta in sorted(viejos):
+        try:
+            os.remove(ruta)
+        except OSError:  # Borrado por otro proceso o en uso
+            continue
+        borrados.append(ruta)
+    return borrados
+
+
+# ============================================================================
+# EXPORTACIONES EN SEGUNDO PLANO
+# ============================================================================
+_lock = threading.Lock()
+_ejecutor = None  # Hilos de exportación, creados en el primer uso
+_trabajos = {}  # {id: dict con tabla, formato, estado, filas, ruta, error, inicio}
+_ids = itertools.count(1)
+
+
+def _ejecutar(trabajo_id, tabla, formato, columnas, filtros, db_file):
+    def avance(escritas):
+        _trabajos[trabajo_id]["filas"] = escritas
+
+    _trabajos[trabajo_id]["estado"] = "En proceso"
+    try:
+        resumen = exportar(tabla, formato, columnas, filtros, avance=avance, db_file=db_file)
+    except Exception as e:
+        _trabajos[trabajo_id].update(estado="Error", error=str(e))
+        raise
+    _trabajos[trabajo_id].update(estado="Terminada", filas=resumen["filas"], ruta=resumen["ruta"])
+    return resumen
+
+
+def iniciar_exportacion(tabla, formato="csv", columnas=None, filtros=(), db_file=None):
+    """
+    Programa una exportación sin bloquear a quien llama (p. ej. una página de Streamlit)
+
+    Parámetros:
+        Como exportar()
+
+    Retorna:
+        int: Identificador del trabajo para estado_exportacion()
+    """
+    global _ejecutor
+    # Validar antes de encolar: los errores de formato y columnas se ven en la página
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato no soportado: {formato}")
+    consulta_exportacion(tabla, columnas, filtros, db_file)
+    limpiar_exportaciones()
+    with _lock:
+        if _ejecutor is None:
+            _ejecutor = ThreadPoolExecutor(max_workers=TRABAJOS_MAXIMOS, thread_name_prefix="exportaciones")
+        trabajo_id = next(_ids)
+        _trabajos[trabajo_id] = {
+            "id": trabajo_id, "tabla": tabla, "formato": formato, "estado": "En cola", "filas": 0,
+            "ruta": None, "error": None, "inicio": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        _ejecutor.submit(_ejecutar, trabajo_id, tabla, formato, list(columnas or []), list(filtros), db_file)
+    return trabajo_id
+
+
+def estado_exportacion(trabajo_id):
+    """Copia del estado de un trabajo (None si no existe en este proceso)."""
+    trabajo = _trabajos.get(trabajo_id)
+    return dict(trabajo) if trabajo else None
+
+
+def exportaciones():
+    """Trabajos de exportación de este proceso, del más reciente al más antiguo."""
+    return [dict(trabajo) for _, trabajo in sorted(_trabajos.items(), reverse=True)]
+
+
+def detener(esperar=True):
+    """Cierra el hilo de exportaciones (al terminar un script o en pruebas)."""
+    global _ejecutor
+    with _lock:
+        if _ejecutor is not None:
+            _ejecutor.shutdown(wait=esperar)
+        _ejecutor = None
@@ -0,0 +1,218 @@
+# ============================================================================
+# IMPORTACIÓN MASIVA DE CLIENTES - core/importacion_clientes.py
+# ============================================================================
+# Carga de clientes desde CSV o XLSX (p. ej. los empleados asegurados de un
+# grupo corporativo) sin pasar fila por fila por create_client():
+#   1. El archivo se lee por lotes de TAMANO_LOTE filas (no se carga entero).
+#   2. Cada lote se valida con operaciones vectorizadas de pandas (longitud de
+#      cédula/RUC, formato de correo, nombre obligatorio).
+#   3. Los duplicados se descartan con una sola consulta por lote contra
+#      clients.numero_documento y con un conjunto de los ya vistos en el archivo.
+#   4. Las filas válidas se insertan con executemany dentro de una única
+#      transacción para todo el archivo.
+# Las filas rechazadas quedan en un reporte con número de fila y motivo.
+# No depende de Streamlit.
+# ============================================================================
+
+# Importaciones necesarias
+import csv  # Reporte de errores descargable
+import datetime  # Fecha de registro por defecto
+import io  # Reporte en memoria
+import json  # Lista de documentos como un solo parámetro (json_each)
+
+import pandas as pd  # Validación vectorizada por lote
+
+from core.consultas import DOCUMENTOS_EXISTENTES  # Deduplicación por lote
+from core.db import unit_of_work  # Transacción única de la importación
+from core.migrations import get_columns  # Columnas actuales de clients
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+TAMANO_LOTE = 1000  # Filas leídas, validadas e insertadas por vez
+
+PERSONA_JURIDICA = ("persona juridica", "empresa")  # tipo_cliente sin tildes ni mayúsculas
+_LONGITUD_DOCUMENTO = {"cedula": 10, "ruc": 13}
+_PATRON_CORREO = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+
+
+# ============================================================================
+# LECTURA POR LOTES
+# ============================================================================
+def _lotes_xlsx(archivo, tamano):
+    """Lee la primera hoja de un XLSX en modo streaming (openpyxl read_only)."""
+    from openpyxl import load_workbook  # Dependencia de pandas para Excel
+
+    libro = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        filas = libro.active.iter_rows(values_only=True)
+        encabezados = [str(v).strip() if v is not None else "" for v in next(filas, ())]
+        ancho = len(encabezados)
+        lote = []
+        for fila in filas:
+            valores = ["" if v is None else str(v) for v in fila][:ancho]
+            lote.append(valores + [""] * (ancho - len(valores)))
+            if len(lote) == tamano:
+                yield pd.DataFrame(lote, columns=encabezados)
+                lote = []
+        if lote:
+            yield pd.DataFrame(lote, columns=encabezados)
+    finally:
+        libro.close()
+
+
+def leer_lotes(archivo, nombre_archivo, tamano=TAMANO_LOTE):
+    """
+    Itera el archivo en DataFrames de hasta `tamano` filas, todo como texto
+
+    Parámetros:
+        archivo: Ruta o archivo abierto (p. ej. el de st.file_uploader)
+        nombre_archivo (str): Nombre para distinguir .csv de .xlsx
+        tamano (int): Filas por lote
+    """
+    if nombre_archivo.lower().endswith((".xlsx", ".xlsm")):
+        yield from _lotes_xlsx(archivo, tamano)
+    else:
+        yield from pd.read_csv(
+            archivo, dtype=str, keep_default_na=False, chunksize=tamano,
+            encoding="utf-8-sig", sep=None, engine="python",
+        )
+
+
+# ============================================================================
+# VALIDACIÓN VECTORIZADA
+# ============================================================================
+def _sin_tildes(serie):
+    return serie.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").str.lower()
+
+
+def validar_lote(lote, columnas):
+    """
+    Normaliza y valida un lote de filas
+
+    Parámetros:
+        lote (DataFrame): Filas del archivo; el índice es el número de fila del archivo
+        columnas (list): Columnas de `clients` que se importan
+
+    Retorna:
+        tuple: (DataFrame normalizado con `columnas`, Series con el motivo de rechazo
+                de cada fila; "" si la fila es válida)
+    """
+    lote = lote.reindex(columns=columnas, fill_value="").fillna("").astype(str)
+    lote = lote.apply(lambda serie: serie.str.strip())
+
+    # Excel guarda cédulas y RUC como número: quita ".0" y recupera el cero inicial
+    tipo_doc = _sin_tildes(lote["tipo_documento"])
+    doc = lote["numero_documento"].str.replace(r"\.0$", "", regex=True)
+    for tipo, longitud in _LONGITUD_DOCUMENTO.items():
+        recortado = (tipo_doc == tipo) & doc.str.fullmatch(r"\d+") & (doc.str.len() == longitud - 1)
+        doc = doc.mask(recortado, doc.str.zfill(longitud))
+    lote["numero_documento"] = doc
+
+    juridica = _sin_tildes(lote["tipo_cliente"]).isin(PERSONA_JURIDICA)
+    correo = lote["correo_electronico"]
+
+    reglas = [
+        (doc == "", "Número de documento vacío"),
+        ((tipo_doc == "cedula") & ~doc.str.fullmatch(r"\d{10}"), "La cédula debe tener exactamente 10 dígitos"),
+        ((tipo_doc == "ruc") & ~doc.str.fullmatch(r"\d{13}"), "El RUC debe tener exactamente 13 dígitos"),
+        ((correo != "") & ~correo.str.fullmatch(_PATRON_CORREO), "Correo electrónico inválido"),
+        (juridica & (lote["razon_social"] == ""), "Razón social vacía (Persona Jurídica)"),
+        (~juridica & (lote["nombres"] == ""), "Nombres vacíos (Persona Natural)"),
+    ]
+    errores = pd.Series("", index=lote.index)
+    for mascara, mensaje in reglas:
+        errores = errores.mask(mascara, errores + "; " + mensaje)
+    return lote, errores.str.lstrip("; ")
+
+
+def _documentos_existentes(conn, documentos):
+    """Una consulta por lote: cuáles de `documentos` ya están en clients."""
+    rows = conn.execute(DOCUMENTOS_EXISTENTES, (json.dumps(list(documentos)),)).fetchall()
+    return {row[0] for row in rows}
+
+
+# ============================================================================
+# FUNCIÓN: importar_clientes
+# ============================================================================
+def importar_clientes(archivo, nombre_archivo, tamano=TAMANO_LOTE, progreso=None, db_file=None):
+    """
+    Importa clientes desde un CSV/XLSX cuyos encabezados son columnas de `clients`
+
+    Parámetros:
+        archivo: Ruta o archivo abierto
+        nombre_archivo (str): Nombre del archivo (.csv o .xlsx)
+        tamano (int): Filas por lote
+        progreso (callable): Opcional, se llama con las filas procesadas tras cada lote
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {"filas", "insertados", "duplicados", "errores": [(fila, documento, motivo)],
+               "columnas_ignoradas": [encabezados que no son columnas de clients]}
+    """
+    columnas = [col for col in get_columns("clients", db_file) if col != "id"]
+    conocidas = set(columnas)
+    hoy = datetime.date.today().strftime("%Y-%m-%d")
+    resumen = {"filas": 0, "insertados": 0, "duplicados": 0, "errores": [], "columnas_ignoradas": []}
+    vistos = set()  # Documentos ya importados desde este archivo
+    fila_inicial = 2  # La fila 1 del archivo son los encabezados
+
+    with unit_of_work(db_file, immediate=True) as conn:
+        for lote in leer_lotes(archivo, nombre_archivo, tamano):
+            lote.columns = [str(c).strip().lower() for c in lote.columns]
+            if resumen["filas"] == 0:
+                resumen["columnas_ignoradas"] = [c for c in lote.columns if c and c not in conocidas]
+            lote.index = range(fila_inicial, fila_inicial + len(lote))
+            fila_inicial += len(lote)
+            resumen["filas"] += len(lote)
+
+            lote, errores = validar_lote(lote, columnas)
+            rechazadas = errores != ""
+            resumen["errores"].extend(
+                zip(lote.index[rechazadas], lote.loc[rechazadas, "numero_documento"], errores[rechazadas])
+            )
+            validas = lote[~rechazadas]
+
+            # Duplicados: contra la base (una consulta) y contra el propio archivo
+            existentes = _documentos_existentes(conn, set(validas["numero_documento"]))
+            repetido_archivo = validas["numero_documento"].duplicated() | validas["numero_documento"].isin(vistos)
+            duplicado = validas["numero_documento"].isin(existentes) | repetido_archivo
+            for fila, documento in validas.loc[duplicado, "numero_documento"].items():
+                motivo = "Documento repetido en el archivo" if repetido_archivo[fila] else "Ya existe un cliente con ese documento"
+                resumen["errores"].append((fila, documento, motivo))
+            resumen["duplicados"] += int(duplicado.sum())
+
+            nuevas = validas[~duplicado].copy()
+            nuevas["fecha_registro"] = nuevas["fecha_registro"].mask(nuevas["fecha_registro"] == "", hoy)
+            # Vacíos como NULL, igual que los formularios
+            nuevas = nuevas.astype(object).where(nuevas != "", None)
+            conn.executemany(
+                f"INSERT INTO clients ({', '.join(columnas)}) VALUES ({', '.join('?' for _ in columnas)})",
+                nuevas.itertuples(index=False, name=None),
+            )
+            vistos.update(nuevas["numero_documento"])
+            resumen["insertados"] += len(nuevas)
+            if progreso:
+                progreso(resumen["filas"])
+
+    resumen["errores"].sort()
+    return resumen
+
+
+def reporte_errores_csv(errores, encabezados=("fila", "numero_documento", "motivo")):
+    """
+    Reporte de filas rechazadas en formato CSV
+
+    Parámetros:
+        errores (list): Tuplas (fila, documento, motivo) de importar_clientes()
+                        (o de otra carga masiva, con sus propios encabezados)
+        encabezados (tuple): Primera fila del reporte
+
+    Retorna:
+        str: Contenido CSV con los encabezados y una fila por error
+    """
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    escritor.writerow(encabezados)
+    escritor.writerows(errores)
+    return salida.getvalue()
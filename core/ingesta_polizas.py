@@ -0,0 +1,402 @@
+# ============================================================================
+# INGESTA MASIVA DE PÓLIZAS - core/ingesta_polizas.py
+# ============================================================================
+# Carga de pólizas desde los bordereaux (planillas CSV/XLSX) que exportan las
+# aseguradoras, sin pasar por el asistente de crud_polizas():
+#   1. Los encabezados del archivo se traducen a campos de `polizas` con
+#      MAPEO_PREDETERMINADO (o un mapeo propio {encabezado: campo}).
+#   2. El archivo se lee por lotes (core/importacion_clientes.leer_lotes).
+#   3. Clientes, aseguradoras y pólizas ya registradas se resuelven con una
+#      consulta por lote (json_each) y los ramos con un diccionario en memoria.
+#   4. Los montos de la factura (contribuciones, subtotal, IVA, total) se
+#      calculan con core.money.calcular_desglose.
+#   5. Cada lote se inserta con executemany en su propia transacción junto con
+#      el punto de control en `ingestas_polizas` (migración 10): si el proceso
+#      se interrumpe, volver a cargar el mismo archivo continúa desde la
+#      primera fila no confirmada.
+# Las filas rechazadas quedan en `ingestas_polizas_errores`. No depende de
+# Streamlit.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fechas de la ingesta y de las vigencias
+import hashlib  # Huella del archivo para reanudar
+import json  # Listas como un solo parámetro (json_each)
+
+import pandas as pd  # Validación vectorizada por lote
+
+from core.consultas import (  # Resolución por lote
+    ASEGURADORAS_POR_IDENTIFICACION,
+    CLIENTES_POR_DOCUMENTO,
+    POLIZAS_POR_NUMERO,
+)
+from core.db import connection, unit_of_work  # Transacción por lote
+from core.importacion_clientes import leer_lotes  # Lectura por lotes CSV/XLSX
+from core.migrations import get_columns  # Columnas actuales de polizas
+from core.money import MONTOS_POLIZA, calcular_desglose, centavos, centavos_de
+from core.polizas import _normalizar  # Encabezados y ramos sin tildes
+from core.secuencias import siguiente_numero_factura  # Números de factura
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+TAMANO_LOTE = 500  # Filas por transacción (y por punto de control)
+
+EN_CURSO = "En curso"
+COMPLETADA = "Completada"
+
+ESTADO_PREDETERMINADO = "Emitida"
+
+# Campo de destino -> encabezados habituales en los bordereaux (sin tildes, minúsculas)
+MAPEO_PREDETERMINADO = {
+    "numero_poliza": ("numero_poliza", "numero de poliza", "no. poliza", "nro poliza", "n poliza", "poliza"),
+    "documento_cliente": (
+        "documento_cliente", "numero_documento", "cedula/ruc", "cedula", "ruc",
+        "identificacion asegurado", "identificacion cliente", "documento",
+    ),
+    "identificacion_aseguradora": (
+        "identificacion_aseguradora", "ruc aseguradora", "ruc_aseguradora", "aseguradora_ruc",
+    ),
+    "ramo": ("ramo", "ramo_seguro", "producto"),
+    "fecha_emision": ("fecha_emision", "fecha de emision", "emision"),
+    "fecha_inicio": ("fecha_inicio", "vigencia desde", "inicio vigencia", "desde"),
+    "fecha_fin": ("fecha_fin", "vigencia hasta", "fin vigencia", "hasta"),
+    "suma_asegurada": ("suma_asegurada", "suma asegurada", "valor asegurado"),
+    "prima_neta": ("prima_neta", "prima neta", "prima"),
+    "derechos_emision": ("derechos_emision", "derechos de emision", "d. emision"),
+    "numero_factura": ("numero_factura", "no. factura", "factura"),
+    "estado": ("estado", "estado poliza"),
+    "tipo_poliza": ("tipo_poliza", "tipo de poliza"),
+    "cobertura": ("cobertura",),
+}
+
+CAMPOS_OBLIGATORIOS = ("numero_poliza", "documento_cliente", "ramo", "fecha_inicio", "fecha_fin", "prima_neta")
+
+
+# ============================================================================
+# MAPEO DE COLUMNAS
+# ============================================================================
+def _clave(encabezado):
+    """Encabezado comparable: sin tildes, mayúsculas ni símbolos de número."""
+    return _normalizar(str(encabezado)).replace("°", "").replace("º", "")
+
+
+def mapear_columnas(encabezados, mapeo=None):
+    """
+    Decide a qué campo va cada encabezado del archivo
+
+    Parámetros:
+        encabezados (list): Encabezados tal como vienen en el archivo
+        mapeo (dict): Opcional, {encabezado: campo} que prevalece sobre el predeterminado;
+                      un campo None descarta esa columna
+
+    Retorna:
+        dict: {encabezado: campo} solo para los encabezados reconocidos
+    """
+    alias = {a: campo for campo, nombres in MAPEO_PREDETERMINADO.items() for a in nombres}
+    propio = {_clave(k): v for k, v in (mapeo or {}).items()}
+    resultado, usados = {}, set()
+    for encabezado in encabezados:
+        clave = _clave(encabezado)
+        campo = propio[clave] if clave in propio else alias.get(clave)
+        # Un campo se toma del primer encabezado que lo nombra
+        if campo and campo not in usados:
+            resultado[encabezado] = campo
+            usados.add(campo)
+    return resultado
+
+
+# ============================================================================
+# PUNTOS DE CONTROL
+# ============================================================================
+def huella_archivo(archivo):
+    """SHA-256 del contenido; identifica el archivo al reanudar una ingesta."""
+    digest = hashlib.sha256()
+    if isinstance(archivo, str):
+        with open(archivo, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                digest.update(bloque)
+        return digest.hexdigest()
+    posicion = archivo.tell()
+    for bloque in iter(lambda: archivo.read(1 << 20), b""):
+        digest.update(bloque if isinstance(bloque, bytes) else bloque.encode("utf-8"))
+    archivo.seek(posicion)
+    return digest.hexdigest()
+
+
+def _abrir_ingesta(nombre_archivo, huella, usuario_id, db_file):
+    """Retorna la fila de ingestas_polizas del archivo, creándola si no existe."""
+    ahora = datetime.datetime.now().isoformat(timespec="seconds")
+    with unit_of_work(db_file, immediate=True) as conn:
+        conn.execute(
+            """INSERT OR IGNORE INTO ingestas_polizas
+               (archivo, huella, usuario_id, estado, fecha_inicio, fecha_actualizacion)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (nombre_archivo, huella, usuario_id, EN_CURSO, ahora, ahora),
+        )
+        return conn.execute(
+            "SELECT id, filas_procesadas, insertadas, rechazadas, estado FROM ingestas_polizas WHERE huella = ?",
+            (huella,),
+        ).fetchone()
+
+
+# ============================================================================
+# VALIDACIÓN Y RESOLUCIÓN POR LOTE
+# ============================================================================
+# Formatos de fecha aceptados en los bordereaux
+_FECHA_ISO = r"^\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?$"  # 2025-01-02 (con hora: celda datetime)
+_FECHA_DIA_MES = r"^\d{1,2}[/-]\d{1,2}[/-]\d{4}$"  # 02/01/2025 = 2 de enero
+_SERIAL_EXCEL = r"^\d+(?:\.\d+)?$"  # 45678 = días desde 1899-12-30
+
+
+def _fechas(serie):
+    """
+    Texto a AAAA-MM-DD; inválidas -> ""
+
+    Cada formato se lee con su propia regla, sin adivinar: ISO (con hora
+    opcional, como llegan las celdas datetime de openpyxl) como año-mes-día,
+    dd/mm/aaaa con el día primero y los números como serial de Excel. Una
+    fecha imposible (2025-13-01) queda vacía.
+    """
+    fechas = pd.Series(pd.NaT, index=serie.index, dtype="datetime64[ns]")
+    iso = serie.str.match(_FECHA_ISO)
+    fechas[iso] = pd.to_datetime(serie[iso].str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    dia_mes = serie.str.match(_FECHA_DIA_MES)
+    fechas[dia_mes] = pd.to_datetime(
+        serie[dia_mes].str.replace("-", "/"), format="%d/%m/%Y", errors="coerce"
+    )
+    serial = serie.str.match(_SERIAL_EXCEL)
+    fechas[serial] = pd.to_datetime(
+        pd.to_numeric(serie[serial]), unit="D", origin="1899-12-30", errors="coerce"
+    )
+    return fechas.dt.strftime("%Y-%m-%d").fillna("")
+
+
+def _resolver(conn, consulta, valores):
+    """Una consulta por lote: {valor: id} para los valores registrados."""
+    rows = conn.execute(consulta, (json.dumps(sorted(set(valores) - {""})),)).fetchall()
+    return {valor: id_ for valor, id_ in rows}
+
+
+def preparar_lote(conn, lote, ramos, aseguradora_id=None):
+    """
+    Normaliza un lote mapeado y resuelve clientes, aseguradoras y ramos
+
+    Parámetros:
+        conn: Conexión con la transacción del lote
+        lote (DataFrame): Columnas = campos de MAPEO_PREDETERMINADO; índice = fila del archivo
+        ramos (dict): {nombre normalizado: id} de ramos_seguros
+        aseguradora_id (int): Aseguradora de todo el archivo si no trae su identificación
+
+    Retorna:
+        tuple: (DataFrame con cliente_id, aseguradora_id y ramo_id resueltos,
+                Series con el motivo de rechazo; "" si la fila es válida)
+    """
+    lote = lote.reindex(columns=list(MAPEO_PREDETERMINADO), fill_value="").fillna("").astype(str)
+    lote = lote.apply(lambda serie: serie.str.strip())
+    # Excel guarda documentos como número: quita ".0"
+    for campo in ("documento_cliente", "identificacion_aseguradora", "numero_poliza"):
+        lote[campo] = lote[campo].str.replace(r"\.0$", "", regex=True)
+    reglas = [(lote[campo] == "", f"Campo obligatorio vacío: {campo}") for campo in CAMPOS_OBLIGATORIOS]
+    for campo in ("fecha_emision", "fecha_inicio", "fecha_fin"):
+        original = lote[campo]
+        lote[campo] = _fechas(original)
+        lote[f"_{campo}_invalida"] = (original != "") & (lote[campo] == "")
+
+    lote["cliente_id"] = lote["documento_cliente"].map(
+        _resolver(conn, CLIENTES_POR_DOCUMENTO, lote["documento_cliente"])
+    )
+    lote["aseguradora_id"] = lote["identificacion_aseguradora"].map(
+        _resolver(conn, ASEGURADORAS_POR_IDENTIFICACION, lote["identificacion_aseguradora"])
+    )
+    if aseguradora_id is not None:
+        lote["aseguradora_id"] = lote["aseguradora_id"].mask(lote["identificacion_aseguradora"] == "", aseguradora_id)
+    lote["ramo_id"] = lote["ramo"].map(lambda nombre: ramos.get(_normalizar(nombre)))
+    existentes = _resolver(conn, POLIZAS_POR_NUMERO, lote["numero_poliza"])
+    prima = lote["prima_neta"].map(centavos)
+
+    reglas += [(lote[f"_{campo}_invalida"], f"Fecha inválida: {campo}") for campo in ("fecha_emision", "fecha_inicio", "fecha_fin")]
+    reglas += [
+        ((lote["documento_cliente"] != "") & lote["cliente_id"].isna(), "Cliente no registrado"),
+        (lote["aseguradora_id"].isna(), "Aseguradora no registrada"),
+        ((lote["ramo"] != "") & lote["ramo_id"].isna(), "Ramo desconocido"),
+        ((lote["prima_neta"] != "") & prima.isna(), "Prima neta no numérica"),
+        ((lote["fecha_inicio"] != "") & (lote["fecha_fin"] != "") & (lote["fecha_fin"] < lote["fecha_inicio"]),
+         "La vigencia termina antes de empezar"),
+        (lote["numero_poliza"].isin(existentes), "Ya existe una póliza con ese número"),
+    ]
+    errores = pd.Series("", index=lote.index)
+    for mascara, mensaje in reglas:
+        errores = errores.mask(mascara.fillna(False).astype(bool), errores + "; " + mensaje)
+    return lote, errores.str.lstrip("; ")
+
+
+def _filas_poliza(validas, usuario_id, hoy):
+    """Registros completos de `polizas` con el desglose de facturación calculado."""
+    filas = []
+    for fila in validas.itertuples():
+        desglose = calcular_desglose(fila.prima_neta, fila.derechos_emision)
+        datos = {
+            "numero_poliza": fila.numero_poliza,
+            "cliente_id": int(fila.cliente_id),
+            "usuario_id": usuario_id,
+            "aseguradora_id": int(fila.aseguradora_id),
+            "ramo_id": int(fila.ramo_id),
+            "tipo_poliza": fila.tipo_poliza or fila.ramo,
+            "cobertura": fila.cobertura or fila.ramo,
+            "fecha_emision": fila.fecha_emision or hoy,
+            "fecha_inicio": fila.fecha_inicio,
+            "fecha_fin": fila.fecha_fin,
+            "estado": fila.estado or ESTADO_PREDETERMINADO,
+            "suma_asegurada": fila.suma_asegurada,
+            "prima": str(desglose["prima"]),
+            "prima_neta": str(desglose["prima"]),
+            "contrib_scvs": str(desglose["contrib_scvs"]),
+            "ssoc_camp": str(desglose["seguro_campesino"]),
+            "derechos_emision": str(desglose["derecho_emision"]),
+            "subtotal": str(desglose["subtotal"]),
+            "iva_15": str(desglose["iva"]),
+            "total": str(desglose["total"]),
+            "numero_factura": fila.numero_factura,
+        }
+        datos.update(centavos_de(datos, MONTOS_POLIZA))
+        filas.append((datos, desglose))
+    return filas
+
+
+# ============================================================================
+# FUNCIÓN: ingestar_polizas
+# ============================================================================
+def ingestar_polizas(archivo, nombre_archivo, usuario_id, mapeo=None, aseguradora_id=None,
+                     facturar=True, tamano=TAMANO_LOTE, progreso=None, db_file=None):
+    """
+    Carga las pólizas de un bordereau con transacciones por lote reanudables
+
+    Volver a llamar con el mismo archivo (misma huella SHA-256) continúa desde
+    el último lote confirmado; si la ingesta ya terminó no inserta nada.
+
+    Parámetros:
+        archivo: Ruta o archivo abierto en modo binario (p. ej. el de st.file_uploader)
+        nombre_archivo (str): Nombre del archivo (.csv o .xlsx)
+        usuario_id (int): Usuario que registra las pólizas (polizas.usuario_id)
+        mapeo (dict): Opcional, {encabezado del archivo: campo de MAPEO_PREDETERMINADO}
+        aseguradora_id (int): Aseguradora de todo el archivo si no trae su identificación
+        facturar (bool): Crear la factura de cada póliza con el desglose calculado
+        tamano (int): Filas por lote (y por punto de control)
+        progreso (callable): Opcional, se llama con las filas procesadas tras cada lote
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {"ingesta_id", "filas", "insertadas", "rechazadas", "reanudada_desde",
+               "completada_antes", "columnas": {encabezado: campo}, "errores": [(fila, numero_poliza, motivo)]}
+    """
+    huella = huella_archivo(archivo)
+    ingesta_id, procesadas, insertadas, rechazadas, estado = _abrir_ingesta(
+        nombre_archivo, huella, usuario_id, db_file
+    )
+    resumen = {
+        "ingesta_id": ingesta_id, "filas": procesadas, "insertadas": insertadas,
+        "rechazadas": rechazadas, "reanudada_desde": procesadas,
+        "completada_antes": estado == COMPLETADA, "columnas": {}, "errores": [],
+    }
+    if estado == COMPLETADA:
+        resumen["errores"] = errores_de_ingesta(ingesta_id, db_file)
+        return resumen
+
+    columnas = [col for col in get_columns("polizas", db_file) if col != "id"]
+    hoy = datetime.date.today().strftime("%Y-%m-%d")
+    with connection(db_file) as conn:
+        ramos = {_normalizar(nombre): ramo_id for ramo_id, nombre in conn.execute("SELECT id, nombre FROM ramos_seguros")}
+
+    fila_inicial = 2  # La fila 1 del archivo son los encabezados
+    for lote in leer_lotes(archivo, nombre_archivo, tamano):
+        if not resumen["columnas"]:
+            resumen["columnas"] = mapear_columnas(lote.columns, mapeo)
+        lote.index = range(fila_inicial, fila_inicial + len(lote))
+        fila_inicial += len(lote)
+        # Filas ya confirmadas en una ejecución anterior
+        lote = lote[lote.index >= procesadas + 2]
+        if lote.empty:
+            continue
+        lote = lote[list(resumen["columnas"])].rename(columns=resumen["columnas"])
+
+        with unit_of_work(db_file, immediate=True) as conn:
+            lote, errores = preparar_lote(conn, lote, ramos, aseguradora_id)
+            repetida = lote["numero_poliza"].duplicated() & (errores == "")
+            errores = errores.mask(repetida, "Número de póliza repetido en el archivo")
+            rechazo = errores != ""
+            validas = lote[~rechazo]
+
+            filas = _filas_poliza(validas, usuario_id, hoy)
+            if facturar:
+                for datos, _ in filas:
+                    if not datos["numero_factura"]:
+                        fecha = datetime.date.fromisoformat(datos["fecha_emision"])
+                        datos["numero_factura"] = siguiente_numero_factura(fecha, conn=conn)
+            conn.executemany(
+                f"INSERT INTO polizas ({', '.join(columnas)}) VALUES ({', '.join('?' for _ in columnas)})",
+                [[datos.get(col, "") for col in columnas] for datos, _ in filas],
+            )
+            ids = _resolver(conn, POLIZAS_POR_NUMERO, [datos["numero_poliza"] for datos, _ in filas])
+
+            # Un ramo por póliza (nro_ramo 1) con la prima y suma asegurada del bordereau
+            conn.executemany(
+                """INSERT INTO poliza_ramos (poliza_id, nro_ramo, ramo_id, suma_asegurada, prima,
+                                             suma_asegurada_centavos, prima_centavos)
+                   VALUES (?, 1, ?, ?, ?, ?, ?)""",
+                [
+                    (ids[datos["numero_poliza"]], datos["ramo_id"], datos["suma_asegurada"], datos["prima_neta"],
+                     datos["suma_asegurada_centavos"], datos["prima_neta_centavos"])
+                    for datos, _ in filas
+                ],
+            )
+
+            if facturar:
+                conn.executemany(
+                    """INSERT INTO facturas (numero_factura, poliza_id, cliente_id, fecha_emision,
+                                             monto_neto, impuestos, iva, total, estado, fecha_registro)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'Emitida', ?)""",
+                    [
+                        (datos["numero_factura"], ids[datos["numero_poliza"]], datos["cliente_id"],
+                         datos["fecha_emision"], float(d["prima"]), float(d["impuestos"]),
+                         float(d["iva"]), float(d["total"]), hoy)
+                        for datos, d in filas
+                    ],
+                )
+
+            conn.executemany(
+                "INSERT INTO ingestas_polizas_errores (ingesta_id, fila, numero_poliza, motivo) VALUES (?, ?, ?, ?)",
+                [(ingesta_id, int(fila), lote.at[fila, "numero_poliza"], errores[fila]) for fila in lote.index[rechazo]],
+            )
+            # Punto de control en la misma transacción que los datos del lote
+            resumen["filas"] = int(lote.index[-1]) - 1
+            resumen["insertadas"] += len(filas)
+            resumen["rechazadas"] += int(rechazo.sum())
+            conn.execute(
+                """UPDATE ingestas_polizas
+                   SET filas_procesadas = ?, insertadas = ?, rechazadas = ?, fecha_actualizacion = ?
+                   WHERE id = ?""",
+                (resumen["filas"], resumen["insertadas"], resumen["rechazadas"],
+                 datetime.datetime.now().isoformat(timespec="seconds"), ingesta_id),
+            )
+        if progreso:
+            progreso(resumen["filas"])
+
+    with unit_of_work(db_file) as conn:
+        conn.execute("UPDATE ingestas_polizas SET estado = ? WHERE id = ?", (COMPLETADA, ingesta_id))
+    resumen["errores"] = errores_de_ingesta(ingesta_id, db_file)
+    return resumen
+
+
+def errores_de_ingesta(ingesta_id, db_file=None):
+    """
+    Filas rechazadas de una ingesta
+
+    Retorna:
+        list: Tuplas (fila, numero_poliza, motivo) ordenadas por fila
+    """
+    with connection(db_file) as conn:
+        return conn.execute(
+            "SELECT fila, numero_poliza, motivo FROM ingestas_polizas_errores WHERE ingesta_id = ? ORDER BY fila",
+            (ingesta_id,),
+        ).fetchall()
@@ -0,0 +1,1364 @@
+# ============================================================================
+# MIGRACIONES DE ESQUEMA - core/migrations.py
+# ============================================================================
+# Motor de migraciones versionadas. Cada migración se aplica una sola vez y
+# queda registrada en la tabla `schema_version`. El runner se ejecuta al
+# arrancar el proceso; las rutas calientes (páginas, movimientos) ya no hacen
+# PRAGMA/ALTER por render y usan el conjunto de columnas cacheado de
+# get_columns().
+#
+# Para cambiar el esquema: añadir una función _mNNN_descripcion al final y
+# registrarla en MIGRATIONS con el siguiente número de versión. Nunca editar
+# una migración ya publicada.
+#
+# Las migraciones no importan los módulos de funcionalidad (core/money.py,
+# core/cartera.py, ...): el DDL y los rellenos quedan copiados aquí tal como
+# eran al publicarse, para que un cambio posterior en esos módulos no altere
+# lo que crea una migración en una base nueva.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha de aplicación de cada migración
+import os  # Normalización de rutas de base de datos
+import re  # Números finales de los códigos e ID en tomador_nombre
+import sqlite3  # OperationalError al comprobar FTS5
+import threading  # Evitar ejecuciones concurrentes del runner
+import unicodedata  # Comparar nombres sin tildes
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation  # Montos heredados a centavos
+
+from core.db import connection, unit_of_work  # Pool de conexiones compartido
+from dbconfig import DB_FILE  # Ruta del archivo de base de datos
+
+
+# ============================================================================
+# UTILIDADES PARA LAS MIGRACIONES
+# ============================================================================
+def _table_columns(conn, table):
+    """Lista de columnas actuales de una tabla (solo se usa dentro de migraciones)."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+
+
+def _add_columns(conn, table, columns):
+    """
+    Agrega a `table` las columnas que falten
+
+    Parámetros:
+        conn: Conexión dentro de la transacción de la migración
+        table (str): Nombre de la tabla
+        columns (list): Lista de tuplas (nombre, definición SQL)
+    """
+    existing = set(_table_columns(conn, table))
+    for name, definition in columns:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+# ============================================================================
+# MIGRACIÓN 1: Esquema base
+# Tablas que antes creaban dbconfig.initialize_database(),
+# database_config.initialize_database() y aseguradora_crud.ensure_sucursales_table()
+# ============================================================================
+def _m001_esquema_base(conn):
+    # Aseguradoras: compañías de seguros
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS aseguradoras (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único autoincrementable
+            tipo_contribuyente TEXT,  -- Tipo de contribuyente fiscal
+            tipo_identificacion TEXT,  -- Tipo de documento (RUC, Cédula, etc.)
+            identificacion TEXT UNIQUE,  -- Número de identificación (único)
+            razon_social TEXT,  -- Nombre legal de la empresa
+            nombre_comercial TEXT,  -- Nombre comercial
+            pais TEXT,  -- País de origen
+            representante_legal TEXT,  -- Nombre del representante legal
+            aniversario TEXT,  -- Fecha de aniversario
+            web TEXT,  -- Sitio web
+            correo_electronico TEXT  -- Email de contacto
+        )
+    ''')
+
+    # Sucursales: puntos de atención de las aseguradoras
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS sucursales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único de la sucursal
+            aseguradora_id INTEGER NOT NULL,  -- ID de la aseguradora (clave foránea)
+            nombre TEXT NOT NULL,  -- Nombre de la sucursal
+            ciudad TEXT,  -- Ciudad donde se ubica
+            direccion TEXT,  -- Dirección completa
+            telefono TEXT,  -- Teléfono de contacto
+            email TEXT,  -- Email de contacto
+            FOREIGN KEY (aseguradora_id) REFERENCES aseguradoras(id)
+        )
+    ''')
+
+    # Clientes: personas naturales y jurídicas
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único del cliente
+            tipo_cliente TEXT,  -- Persona Natural o Jurídica
+            nombres TEXT,  -- Nombres del cliente
+            apellidos TEXT,  -- Apellidos del cliente
+            razon_social TEXT,  -- Razón social (para empresas)
+            tipo_documento TEXT,  -- Tipo de documento de identidad
+            numero_documento TEXT,  -- Número de documento
+            fecha_nacimiento TEXT,  -- Fecha de nacimiento
+            nacionalidad TEXT,  -- Nacionalidad
+            sexo TEXT,  -- Sexo (M/F/Otro)
+            estado_civil TEXT,  -- Estado civil
+            correo_electronico TEXT,  -- Email
+            telefono_movil TEXT,  -- Teléfono móvil
+            telefono_fijo TEXT,  -- Teléfono fijo
+            direccion_domicilio TEXT,  -- Dirección completa
+            provincia TEXT,  -- Provincia
+            ciudad TEXT,  -- Ciudad
+            codigo_postal TEXT,  -- Código postal
+            ocupacion_profesion TEXT,  -- Ocupación o profesión
+            empresa_trabajo TEXT,  -- Empresa donde trabaja
+            tipo_empresa TEXT,  -- Tipo de empresa
+            ingresos_mensuales TEXT,  -- Rango de ingresos mensuales
+            nivel_educacion TEXT,  -- Nivel educativo
+            fumador TEXT,  -- Si es fumador (Sí/No)
+            actividades_riesgo TEXT,  -- Actividades de riesgo que realiza
+            historial_medico TEXT,  -- Historial médico relevante
+            historial_siniestros TEXT,  -- Historial de siniestros previos
+            vehiculos_registrados TEXT,  -- Vehículos registrados
+            propiedades TEXT,  -- Propiedades que posee
+            tipo_contribuyente TEXT,  -- Tipo de contribuyente
+            numero_ruc TEXT,  -- Número RUC
+            representante_legal_id INTEGER,  -- ID del representante legal
+            observaciones_legales TEXT,  -- Observaciones legales
+            canal_preferido_contacto TEXT,  -- Canal preferido de contacto
+            notas_adicionales TEXT,  -- Notas adicionales
+            fecha_registro TEXT,  -- Fecha de registro en el sistema
+            ultima_actualizacion TEXT  -- Última fecha de actualización
+        )
+    ''')
+
+    # Roles del sistema y bitácora de cambios de roles
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS roles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único del rol
+            name TEXT UNIQUE NOT NULL  -- Nombre del rol (único)
+        )
+    ''')
+    if conn.execute("SELECT COUNT(*) FROM roles").fetchone()[0] == 0:
+        conn.executemany("INSERT INTO roles (name) VALUES (?)", [("admin",), ("user",)])
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS role_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            role_name TEXT NOT NULL,
+            action TEXT NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    # Usuarios del sistema
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único del usuario
+            username TEXT UNIQUE,  -- Nombre de usuario (único)
+            password TEXT,  -- Contraseña encriptada con bcrypt
+            role TEXT,  -- Rol del usuario
+            correo TEXT,  -- Email del usuario
+            nombres TEXT,  -- Nombres del usuario
+            apellidos TEXT,  -- Apellidos del usuario
+            telefono TEXT,  -- Teléfono de contacto
+            fecha_registro TEXT,  -- Fecha de registro
+            ultima_actualizacion TEXT,  -- Última actualización
+            company_id INTEGER REFERENCES companies(id)  -- Relación con empresa
+        )
+    ''')
+
+    # Empresas/agencias (agrupadores)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS companies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único
+            name TEXT UNIQUE NOT NULL,  -- Nombre de la empresa (único)
+            address TEXT,  -- Dirección
+            phone TEXT,  -- Teléfono
+            email TEXT  -- Email
+        )
+    ''')
+
+    # Ramos de seguros y relación aseguradora-ramos
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS ramos_seguros (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT UNIQUE NOT NULL,
+            descripcion TEXT
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS aseguradora_ramos (
+            aseguradora_id INTEGER NOT NULL,  -- ID de la aseguradora
+            ramo_id INTEGER NOT NULL,  -- ID del ramo
+            PRIMARY KEY (aseguradora_id, ramo_id),  -- Clave primaria compuesta
+            FOREIGN KEY (aseguradora_id) REFERENCES aseguradoras (id),
+            FOREIGN KEY (ramo_id) REFERENCES ramos_seguros (id)
+        )
+    ''')
+
+    # Pólizas de seguro (las columnas adicionales llegan en la migración 2)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS polizas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único de la póliza
+            numero_poliza TEXT UNIQUE NOT NULL,  -- Número de póliza (único)
+            cliente_id INTEGER NOT NULL,  -- ID del cliente (clave foránea)
+            usuario_id INTEGER NOT NULL,  -- ID del usuario que creó la póliza
+            tipo_poliza TEXT NOT NULL,  -- Tipo de póliza
+            cobertura TEXT NOT NULL,  -- Descripción de cobertura
+            prima TEXT NOT NULL,  -- Monto de la prima
+            fecha_inicio TEXT NOT NULL,  -- Fecha de inicio de vigencia
+            fecha_fin TEXT NOT NULL,  -- Fecha de fin de vigencia
+            estado TEXT NOT NULL,  -- Estado actual (Activa, Cancelada, etc.)
+            FOREIGN KEY (cliente_id) REFERENCES clients (id),
+            FOREIGN KEY (usuario_id) REFERENCES users (id)
+        )
+    ''')
+
+    # Relación entre pólizas y ramos de seguro
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS poliza_ramos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único
+            poliza_id INTEGER NOT NULL,  -- ID de la póliza
+            nro_ramo INTEGER NOT NULL,  -- Número de ramo
+            ramo_id INTEGER NOT NULL,  -- ID del ramo de seguro
+            suma_asegurada TEXT,  -- Suma asegurada para este ramo
+            prima TEXT,  -- Prima específica del ramo
+            observaciones TEXT,  -- Observaciones específicas
+            FOREIGN KEY (poliza_id) REFERENCES polizas (id),
+            FOREIGN KEY (ramo_id) REFERENCES ramos_seguros (id)
+        )
+    ''')
+
+    # Movimientos (anexos, cancelaciones, rehabilitaciones...) de las pólizas
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS movimientos_poliza (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único del movimiento
+            codigo_movimiento TEXT UNIQUE,  -- Código único del movimiento
+            poliza_id INTEGER,  -- ID de la póliza afectada
+            cliente_id INTEGER,  -- ID del cliente
+            fecha_movimiento TEXT,  -- Fecha del movimiento
+            tipo_movimiento TEXT,  -- Tipo (Aumento, Disminución, Cancelación, etc.)
+            estado TEXT DEFAULT 'Proceso',  -- Estado del movimiento
+            suma_asegurada_nueva REAL,  -- Nueva suma asegurada (si aplica)
+            prima_nueva REAL,  -- Nueva prima (si aplica)
+            direccion_nueva TEXT,  -- Nueva dirección (si aplica)
+            pdf_documento TEXT,  -- Ruta del documento PDF generado
+            observaciones TEXT,  -- Observaciones adicionales
+            usuario_id INTEGER,  -- Usuario que realizó el movimiento
+            fecha_registro TEXT DEFAULT CURRENT_TIMESTAMP,  -- Fecha de registro
+            FOREIGN KEY(poliza_id) REFERENCES polizas(id),
+            FOREIGN KEY(cliente_id) REFERENCES clients(id),
+            FOREIGN KEY(usuario_id) REFERENCES users(id)
+        )
+    ''')
+
+    # Facturas emitidas
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS facturas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único de la factura
+            numero_factura TEXT UNIQUE,  -- Número de factura (único)
+            poliza_id INTEGER,  -- ID de la póliza relacionada
+            movimiento_id INTEGER,  -- ID del movimiento relacionado
+            cliente_id INTEGER,  -- ID del cliente
+            fecha_emision TEXT,  -- Fecha de emisión
+            monto_neto REAL,  -- Monto neto
+            impuestos REAL,  -- Impuestos
+            iva REAL,  -- IVA
+            total REAL,  -- Total a pagar
+            estado TEXT DEFAULT 'Emitida',  -- Estado de la factura
+            pdf_documento TEXT,  -- Ruta del PDF de la factura
+            fecha_registro TEXT DEFAULT CURRENT_TIMESTAMP,  -- Fecha de registro
+            FOREIGN KEY(poliza_id) REFERENCES polizas(id),
+            FOREIGN KEY(movimiento_id) REFERENCES movimientos_poliza(id),
+            FOREIGN KEY(cliente_id) REFERENCES clients(id)
+        )
+    ''')
+
+    # Notas de crédito emitidas
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS notas_de_credito (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único
+            numero_nota TEXT UNIQUE,  -- Número de nota de crédito (único)
+            factura_id INTEGER,  -- ID de la factura relacionada
+            poliza_id INTEGER,  -- ID de la póliza
+            movimiento_id INTEGER,  -- ID del movimiento
+            cliente_id INTEGER,  -- ID del cliente
+            fecha_emision TEXT,  -- Fecha de emisión
+            monto_neto REAL,  -- Monto neto
+            impuestos REAL,  -- Impuestos
+            iva REAL,  -- IVA
+            total REAL,  -- Total
+            motivo TEXT,  -- Motivo de la nota de crédito
+            estado TEXT DEFAULT 'Emitida',  -- Estado
+            pdf_documento TEXT,  -- Ruta del PDF
+            fecha_registro TEXT DEFAULT CURRENT_TIMESTAMP,  -- Fecha de registro
+            FOREIGN KEY(factura_id) REFERENCES facturas(id),
+            FOREIGN KEY(poliza_id) REFERENCES polizas(id),
+            FOREIGN KEY(movimiento_id) REFERENCES movimientos_poliza(id),
+            FOREIGN KEY(cliente_id) REFERENCES clients(id)
+        )
+    ''')
+
+    # Siniestros (vehiculares y de vida/salud)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS siniestros (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            codigo_siniestro TEXT UNIQUE NOT NULL,
+            poliza_id INTEGER NOT NULL,
+            cliente_id INTEGER,
+            tipo_siniestro TEXT NOT NULL,  -- 'Vehicular' o 'Vida/Salud'
+            fecha_siniestro DATE NOT NULL,
+            fecha_registro DATE DEFAULT CURRENT_DATE,
+            estado TEXT DEFAULT 'En Proceso',  -- 'En Proceso', 'En Reparación', 'Cerrado', 'Rechazado', 'En Revisión', 'Aprobado', 'Pagado'
+
+            -- Campos específicos para siniestros vehiculares
+            placa_vehiculo TEXT,
+            lugar_siniestro TEXT,
+            tipo_dano TEXT,  -- 'Choque', 'Robo', 'Incendio', 'Vandalismo', 'Otro'
+            taller_id INTEGER,
+
+            -- Campos específicos para siniestros de vida/salud
+            tipo_cobertura TEXT,  -- 'Hospitalización', 'Cirugía', 'Emergencia', 'Consulta', 'Fallecimiento'
+            centro_medico TEXT,
+            diagnostico TEXT,
+
+            -- Campos comunes
+            descripcion TEXT,
+            monto_estimado REAL,
+            monto_reclamado REAL,
+            monto_aprobado REAL,
+            observaciones TEXT,
+            documentos_adjuntos TEXT,  -- JSON con rutas de archivos
+
+            -- Usuario que registró el siniestro
+            usuario_registro_id INTEGER,
+
+            -- Timestamps
+            fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (poliza_id) REFERENCES polizas(id) ON DELETE CASCADE,
+            FOREIGN KEY (cliente_id) REFERENCES clients(id),
+            FOREIGN KEY (usuario_registro_id) REFERENCES users(id)
+        )
+    ''')
+
+    # Talleres y clínicas/hospitales (proveedores de siniestros)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS talleres (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            ruc TEXT,
+            telefono TEXT,
+            email TEXT,
+            direccion TEXT,
+            ciudad TEXT,
+            especialidad TEXT,
+            estado TEXT DEFAULT 'Activo',  -- 'Activo', 'Inactivo'
+            observaciones TEXT,
+            fecha_registro DATE DEFAULT CURRENT_DATE
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS clinicas_hospitales (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            ruc TEXT,
+            telefono TEXT,
+            email TEXT,
+            direccion TEXT,
+            ciudad TEXT,
+            tipo TEXT,  -- 'Clínica', 'Hospital', 'Centro Médico'
+            especialidades TEXT,  -- JSON con lista de especialidades
+            estado TEXT DEFAULT 'Activo',  -- 'Activo', 'Inactivo'
+            observaciones TEXT,
+            fecha_registro DATE DEFAULT CURRENT_DATE
+        )
+    ''')
+
+
+# ============================================================================
+# MIGRACIÓN 2: Columnas agregadas con el tiempo
+# Sustituye los ALTER TABLE que se ejecutaban en cada render de crud_polizas()
+# y en los distintos initialize_database()
+# ============================================================================
+def _m002_columnas_adicionales(conn):
+    _add_columns(conn, "clients", [
+        ("correo_empresa", "TEXT DEFAULT ''"),
+        ("sector_mercado", "TEXT DEFAULT ''"),
+        ("tipo_empresa_categoria", "TEXT DEFAULT ''"),
+        ("tipo_persona_juridica", "TEXT DEFAULT ''"),
+        ("subactividad_economica", "TEXT DEFAULT ''"),
+        ("pagina_web", "TEXT DEFAULT ''"),
+        ("fecha_aniversario", "TEXT DEFAULT ''"),
+        ("contacto_autorizado_id", "TEXT DEFAULT ''"),
+        ("actividad_economica", "TEXT"),
+        ("provincia_ecuador", "TEXT"),
+        ("provincia_extranjero", "TEXT"),
+    ])
+
+    _add_columns(conn, "aseguradoras", [
+        ("sucursal", "TEXT"),
+    ])
+
+    _add_columns(conn, "polizas", [
+        # Datos generales
+        ("vigencia", "TEXT"),
+        ("suma_asegurada", "TEXT"),
+        ("deducible", "TEXT"),
+        ("tipo_riesgo", "TEXT"),
+        ("sucursal", "TEXT"),
+        ("tipo_facturacion", "TEXT"),
+        ("agrupadora_id", "INTEGER"),
+        ("aseguradora_id", "INTEGER"),
+        ("ramo_id", "INTEGER"),
+        ("fecha_emision", "TEXT"),
+        ("linea_negocio", "TEXT"),
+        ("numero_anexo", "TEXT"),
+        ("tipo_anexo", "TEXT"),
+        ("ejecutivo_comercial_id", "INTEGER"),
+        ("observaciones", "TEXT"),
+        ("beneficiario", "TEXT"),
+        ("tipo_renovacion", "TEXT"),
+        ("tipo_movimiento", "TEXT"),
+        ("tomador_nombre", "TEXT"),
+        ("sucursal_id", "INTEGER"),
+        ("anexos", ""),
+        ("anexos_poliza", "TEXT"),
+        ("gestion_cobro", "TEXT"),
+        ("agrupadora", "INTEGER"),
+        ("asegurado_contratante", "TEXT"),
+        ("id_beneficiario", "TEXT"),
+        ("direccion", "TEXT"),
+        ("contenido", "TEXT"),
+        # Datos de facturación
+        ("numero_factura", "TEXT"),
+        ("moneda", "TEXT"),
+        ("clausulas_particulares", "TEXT"),
+        ("prima_neta", "TEXT"),
+        ("contrib_scvs", "TEXT"),
+        ("derechos_emision", "TEXT"),
+        ("ssoc_camp", "TEXT"),
+        ("subtotal", "TEXT"),
+        ("iva_15", "TEXT"),
+        ("csolidaria_2", "TEXT"),
+        ("financiacion", "TEXT"),
+        ("otros_iva", "TEXT"),
+        ("total", "TEXT"),
+        ("formas_de_pago", "TEXT"),
+        ("cuotas", "TEXT"),
+        ("valor_cuota_inicial", "TEXT"),
+        ("valor_cuotas_financiadas", "TEXT"),
+        ("fecha_factura", "TEXT"),
+    ])
+
+    _add_columns(conn, "movimientos_poliza", [
+        ("scvs", "REAL"),
+        ("seguro_campesino", "REAL"),
+        ("derecho_emision", "REAL"),
+        ("otros_cargos", "REAL"),
+        ("subtotal_prima", "REAL"),
+        ("iva_rate", "REAL"),
+        ("iva_amount", "REAL"),
+        ("prima_total_con_iva", "REAL"),
+    ])
+
+
+# ============================================================================
+# MIGRACIÓN 3: Índices secundarios para las rutas calientes
+# Cada índice corresponde a una consulta de core/consultas.py; las pruebas de
+# test_query_plans.py fallan si alguna vuelve a recorrer la tabla completa.
+# ============================================================================
+INDICES = [
+    # Pólizas: búsqueda por cliente, listas por estado y vencimientos
+    ("idx_polizas_cliente_id", "polizas", "cliente_id"),
+    ("idx_polizas_estado", "polizas", "estado"),
+    ("idx_polizas_fecha_fin", "polizas", "fecha_fin"),
+    # Movimientos: historial de una póliza (ya ordenado) y lista de recientes
+    ("idx_movimientos_poliza_fecha", "movimientos_poliza", "poliza_id, fecha_movimiento"),
+    ("idx_movimientos_fecha", "movimientos_poliza", "fecha_movimiento"),
+    # Facturas por póliza y por movimiento
+    ("idx_facturas_poliza_id", "facturas", "poliza_id"),
+    ("idx_facturas_movimiento_id", "facturas", "movimiento_id"),
+    # Notas de crédito: las consultas combinan factura, movimiento y póliza con OR,
+    # y SQLite solo usa MULTI-INDEX OR si todas las ramas tienen índice
+    ("idx_notas_credito_factura_id", "notas_de_credito", "factura_id"),
+    ("idx_notas_credito_movimiento_id", "notas_de_credito", "movimiento_id"),
+    ("idx_notas_credito_poliza_id", "notas_de_credito", "poliza_id"),
+    # Siniestros: filtros por tipo (con o sin estado) y solo por estado
+    ("idx_siniestros_tipo_estado", "siniestros", "tipo_siniestro, estado"),
+    ("idx_siniestros_estado", "siniestros", "estado"),
+    # Sucursales de una aseguradora
+    ("idx_sucursales_aseguradora_id", "sucursales", "aseguradora_id"),
+]
+
+
+def _m003_indices_consultas(conn):
+    for nombre, tabla, columnas in INDICES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+
+
+# ============================================================================
+# MIGRACIÓN 4: Montos en centavos enteros
+# SQLite no permite cambiar el tipo de una columna sin recrear la tabla, y los
+# formularios siguen escribiendo las columnas TEXT; por eso cada monto recibe
+# una columna gemela INTEGER `<columna>_centavos` (ver core/money.py) que se
+# rellena aquí y que mantienen poliza_crud, Movimientos y Back Office.
+# ============================================================================
+_M004_MONTOS = {
+    "polizas": ("prima", "prima_neta", "suma_asegurada", "subtotal", "iva_15", "total"),
+    "poliza_ramos": ("prima", "suma_asegurada"),
+}
+
+
+def _m004_centavos(valor):
+    """Texto heredado ("$1,250.50 USD") -> centavos enteros, como Money.parse al publicar la migración."""
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, int):
+        return valor * 100
+    if isinstance(valor, float):
+        valor = repr(valor)
+    texto = "".join(c for c in str(valor) if c.isdigit() or c in ".-")
+    if not texto:
+        return None
+    try:
+        monto = Decimal(texto)
+    except InvalidOperation:
+        return None
+    if not monto.is_finite():
+        return None
+    return int((monto * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _m004_montos_en_centavos(conn):
+    conn.create_function("_m004_centavos", 1, _m004_centavos, deterministic=True)
+    for tabla, columnas in _M004_MONTOS.items():
+        _add_columns(conn, tabla, [(f"{col}_centavos", "INTEGER") for col in columnas])
+        for col in columnas:
+            conn.execute(
+                f"UPDATE {tabla} SET {col}_centavos = _m004_centavos({col}) "
+                f"WHERE {col}_centavos IS NOT _m004_centavos({col})"
+            )
+
+
+# ============================================================================
+# MIGRACIÓN 5: Índices para el listado paginado de pólizas
+# core/polizas.listar_polizas ordena por (fecha_inicio, id) y pagina por
+# keyset; con estos índices cada página se lee en orden sin ordenar la tabla.
+# ============================================================================
+INDICES_LISTADO_POLIZAS = [
+    ("idx_polizas_fecha_inicio_id", "polizas", "fecha_inicio, id"),
+    ("idx_polizas_estado_fecha_inicio", "polizas", "estado, fecha_inicio, id"),
+]
+
+
+def _m005_indices_listado_polizas(conn):
+    for nombre, tabla, columnas in INDICES_LISTADO_POLIZAS:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+
+
+# ============================================================================
+# MIGRACIÓN 6: Secuencias de numeración
+# Contadores de core/secuencias.py para pólizas internas, siniestros,
+# facturas y notas de crédito; cada uno arranca en el mayor número ya usado.
+# ============================================================================
+_M006_ORIGENES = {
+    "poliza": ("polizas", "numero_poliza", "PRG-"),
+    "siniestro_vehicular": ("siniestros", "codigo_siniestro", "SIN-VEH-"),
+    "siniestro_salud": ("siniestros", "codigo_siniestro", "SIN-SAL-"),
+    "factura": ("facturas", "numero_factura", "F-"),
+    "nota_credito": ("notas_de_credito", "numero_nota", "NC-"),
+}
+
+_NUMERO_FINAL = re.compile(r"(\d+)\s*$")
+
+
+def _ultimo_numero(conn, tabla, columna, prefijo):
+    """Mayor número final entre los códigos `prefijo%` de tabla.columna (0 si no hay)."""
+    maximo = 0
+    for (codigo,) in conn.execute(f"SELECT {columna} FROM {tabla} WHERE {columna} LIKE ?", (f"{prefijo}%",)):
+        match = _NUMERO_FINAL.search(codigo or "")
+        if match:
+            maximo = max(maximo, int(match.group(1)))
+    return maximo
+
+
+def _m006_secuencias(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS secuencias (
+            nombre TEXT PRIMARY KEY,  -- Nombre de la secuencia (p. ej. 'factura')
+            valor INTEGER NOT NULL DEFAULT 0  -- Último número entregado
+        )
+    ''')
+    for nombre, origen in _M006_ORIGENES.items():
+        conn.execute(
+            "INSERT OR IGNORE INTO secuencias (nombre, valor) VALUES (?, ?)",
+            (nombre, _ultimo_numero(conn, *origen)),
+        )
+
+
+# ============================================================================
+# MIGRACIÓN 7: Índice FTS5 de clientes
+# clients_fts y sus triggers (ver core/clientes.py) para los selectores de
+# cliente con búsqueda. Si SQLite no trae FTS5 la migración no crea nada y
+# buscar_clientes() usa LIKE.
+# ============================================================================
+_M007_COLUMNAS = (
+    "nombres", "apellidos", "razon_social", "numero_documento", "numero_ruc",
+    "correo_electronico", "telefono_movil", "telefono_fijo",
+)
+
+
+def _m007_busqueda_clientes(conn):
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._prueba_fts5 USING fts5(x)")
+    except sqlite3.OperationalError:
+        return
+    conn.execute("DROP TABLE temp._prueba_fts5")
+    # Índice de contenido externo: guarda solo los términos, el texto se lee
+    # de `clients`; unicode61 con remove_diacritics ignora tildes
+    columnas = ", ".join(_M007_COLUMNAS)
+    nuevos = ", ".join(f"new.{col}" for col in _M007_COLUMNAS)
+    viejos = ", ".join(f"old.{col}" for col in _M007_COLUMNAS)
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+            {columnas},
+            content='clients', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS clients_fts_ai AFTER INSERT ON clients BEGIN
+            INSERT INTO clients_fts (rowid, {columnas}) VALUES (new.id, {nuevos});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS clients_fts_ad AFTER DELETE ON clients BEGIN
+            INSERT INTO clients_fts (clients_fts, rowid, {columnas}) VALUES ('delete', old.id, {viejos});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS clients_fts_au AFTER UPDATE ON clients BEGIN
+            INSERT INTO clients_fts (clients_fts, rowid, {columnas}) VALUES ('delete', old.id, {viejos});
+            INSERT INTO clients_fts (rowid, {columnas}) VALUES (new.id, {nuevos});
+        END
+    """)
+    conn.execute("INSERT INTO clients_fts (clients_fts) VALUES ('rebuild')")
+
+
+# ============================================================================
+# MIGRACIÓN 8: Pólizas por cliente y categoría de ramo
+# ramos_seguros.categoria ('Vehicular', 'Vida/Salud') para filtrar en SQL las
+# pólizas de un cliente (core/consultas.polizas_de_cliente), índice de
+# poliza_ramos por póliza y reparación de cliente_id en pólizas heredadas.
+# ============================================================================
+INDICES_POLIZAS_CLIENTE = [
+    ("idx_poliza_ramos_poliza_id", "poliza_ramos", "poliza_id"),
+]
+
+
+_M008_CATEGORIAS = {
+    "Vehicular": ("vehicul", "auto", "carro"),
+    "Vida/Salud": ("vida", "salud", "medic", "hospital", "accidentes personales", "dental"),
+}
+
+_ID_EN_TOMADOR = re.compile(r"\[ID:\s*(\d+)\]")
+
+
+def _m008_normalizar(texto):
+    """Minúsculas sin tildes ni espacios repetidos."""
+    texto = unicodedata.normalize("NFKD", texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return " ".join(texto.lower().split())
+
+
+def _m008_categoria(nombre):
+    """Categoría de un ramo según su nombre ("Vehículos" -> "Vehicular"), o None."""
+    nombre = _m008_normalizar(nombre)
+    for categoria, claves in _M008_CATEGORIAS.items():
+        if any(clave in nombre for clave in claves):
+            return categoria
+    return None
+
+
+def _m008_reparar_cliente_id(conn, escribir=True):
+    """
+    Completa polizas.cliente_id a partir de tomador_nombre ("... [ID: 49]" o
+    el nombre exacto sin tildes cuando corresponde a un único cliente).
+    También la usa core/polizas.reparar_cliente_id.
+
+    Retorna:
+        tuple: (lista de (poliza_id, cliente_id) reparadas, lista de (poliza_id, tomador_nombre) sin resolver)
+    """
+    clientes = conn.execute("SELECT id, nombres, apellidos, razon_social FROM clients").fetchall()
+    ids = {c[0] for c in clientes}
+    por_nombre = {}
+    for cliente_id, nombres, apellidos, razon_social in clientes:
+        for nombre in {_m008_normalizar(f"{nombres or ''} {apellidos or ''}"), _m008_normalizar(razon_social)}:
+            if nombre:
+                por_nombre.setdefault(nombre, set()).add(cliente_id)
+
+    pendientes = conn.execute("""
+        SELECT id, tomador_nombre FROM polizas
+        WHERE cliente_id IS NULL OR cliente_id = ''
+           OR cliente_id NOT IN (SELECT id FROM clients)
+    """).fetchall()
+    reparadas, sin_resolver = [], []
+    for poliza_id, tomador in pendientes:
+        cliente_id = None
+        match = _ID_EN_TOMADOR.search(tomador or "")
+        if match and int(match.group(1)) in ids:
+            cliente_id = int(match.group(1))
+        else:
+            # Quitar la etiqueta "(Persona Natural)" / "(Persona Jurídica)" del selector
+            candidatos = por_nombre.get(_m008_normalizar(re.sub(r"\(.*?\)|\[.*?\]", "", tomador or "")), set())
+            if len(candidatos) == 1:
+                cliente_id = next(iter(candidatos))
+        if cliente_id is None:
+            sin_resolver.append((poliza_id, tomador))
+        else:
+            reparadas.append((poliza_id, cliente_id))
+
+    if escribir and reparadas:
+        conn.executemany(
+            "UPDATE polizas SET cliente_id = ? WHERE id = ?",
+            [(cliente_id, poliza_id) for poliza_id, cliente_id in reparadas],
+        )
+    return reparadas, sin_resolver
+
+
+def _m008_polizas_por_cliente(conn):
+    _add_columns(conn, "ramos_seguros", [("categoria", "TEXT")])
+    ramos = conn.execute("SELECT id, nombre FROM ramos_seguros").fetchall()
+    conn.executemany(
+        "UPDATE ramos_seguros SET categoria = ? WHERE id = ?",
+        [(_m008_categoria(nombre), ramo_id) for ramo_id, nombre in ramos],
+    )
+    for nombre, tabla, columnas in INDICES_POLIZAS_CLIENTE:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+    _m008_reparar_cliente_id(conn)
+
+
+# ============================================================================
+# MIGRACIÓN 9: Índice de clientes por número de documento
+# La importación masiva (core/importacion_clientes.py) busca los documentos
+# ya registrados con una consulta por lote.
+# ============================================================================
+INDICES_CLIENTES = [
+    ("idx_clients_numero_documento", "clients", "numero_documento"),
+]
+
+
+def _m009_indice_documento_clientes(conn):
+    for nombre, tabla, columnas in INDICES_CLIENTES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+
+
+# ============================================================================
+# MIGRACIÓN 10: Ingesta de bordereaux
+# Puntos de control de core/ingesta_polizas.py (una fila por archivo,
+# identificado por su SHA-256) y las filas rechazadas de cada ingesta.
+# ============================================================================
+def _m010_ingestas_polizas(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS ingestas_polizas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único
+            archivo TEXT NOT NULL,  -- Nombre del archivo cargado
+            huella TEXT NOT NULL UNIQUE,  -- SHA-256 del contenido
+            usuario_id INTEGER,  -- Usuario que inició la ingesta
+            filas_procesadas INTEGER NOT NULL DEFAULT 0,  -- Filas confirmadas (punto de control)
+            insertadas INTEGER NOT NULL DEFAULT 0,  -- Pólizas creadas
+            rechazadas INTEGER NOT NULL DEFAULT 0,  -- Filas con error
+            estado TEXT NOT NULL,  -- 'En curso' o 'Completada'
+            fecha_inicio TEXT,  -- Fecha/hora de la primera carga
+            fecha_actualizacion TEXT,  -- Fecha/hora del último lote confirmado
+            FOREIGN KEY (usuario_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS ingestas_polizas_errores (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único
+            ingesta_id INTEGER NOT NULL,  -- Ingesta a la que pertenece
+            fila INTEGER NOT NULL,  -- Fila del archivo (1 = encabezados)
+            numero_poliza TEXT,  -- Número de póliza de la fila
+            motivo TEXT NOT NULL,  -- Motivo del rechazo
+            FOREIGN KEY (ingesta_id) REFERENCES ingestas_polizas (id)
+        )
+    ''')
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ingestas_errores_ingesta_id ON ingestas_polizas_errores (ingesta_id, fila)"
+    )
+
+
+# ============================================================================
+# MIGRACIÓN 11: Secuencia de códigos de movimiento
+# Códigos MOV-000001 para los movimientos en lote (core/movimientos.py).
+# ============================================================================
+def _m011_secuencia_movimientos(conn):
+    conn.execute(
+        "INSERT OR IGNORE INTO secuencias (nombre, valor) VALUES (?, ?)",
+        ("movimiento", _ultimo_numero(conn, "movimientos_poliza", "codigo_movimiento", "MOV-")),
+    )
+
+
+# ============================================================================
+# MIGRACIÓN 12: Caché de texto de PDF
+# Texto por página de los PDF (core/texto_pdf.py), indexado por el SHA-256
+# del contenido del archivo.
+# ============================================================================
+def _m012_textos_pdf(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS textos_pdf (
+            huella TEXT PRIMARY KEY,  -- SHA-256 del contenido
+            archivo TEXT,  -- Nombre del archivo la primera vez que se extrajo
+            paginas INTEGER NOT NULL,  -- Número de páginas
+            fecha_extraccion TEXT  -- Fecha/hora de la extracción
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS textos_pdf_paginas (
+            huella TEXT NOT NULL,  -- Archivo (textos_pdf.huella)
+            pagina INTEGER NOT NULL,  -- Número de página (desde 0)
+            texto TEXT NOT NULL,  -- Texto extraído
+            PRIMARY KEY (huella, pagina),
+            FOREIGN KEY (huella) REFERENCES textos_pdf (huella)
+        )
+    ''')
+
+
+# ============================================================================
+# MIGRACIÓN 13: Índice de la base de conocimiento
+# Fragmentos de los manuales y su índice FTS5 (core/conocimiento.py). Sin
+# FTS5 solo se crean las tablas y la búsqueda usa LIKE.
+# ============================================================================
+def _m013_conocimiento(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS conocimiento_fuentes (
+            ruta TEXT PRIMARY KEY,  -- Archivo relativo a la carpeta del proyecto
+            huella TEXT NOT NULL,  -- SHA-256 del contenido indexado
+            fragmentos INTEGER NOT NULL,  -- Fragmentos generados
+            fecha_indexado TEXT  -- Fecha/hora del último indexado
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS conocimiento_fragmentos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único (rowid de conocimiento_fts)
+            fuente TEXT NOT NULL,  -- Archivo (conocimiento_fuentes.ruta)
+            ubicacion TEXT,  -- Página o sección
+            texto TEXT NOT NULL  -- Fragmento
+        )
+    ''')
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_conocimiento_fragmentos_fuente ON conocimiento_fragmentos (fuente)"
+    )
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._prueba_fts5 USING fts5(x)")
+    except sqlite3.OperationalError:
+        return
+    conn.execute("DROP TABLE temp._prueba_fts5")
+    # Contenido externo, como clients_fts: el texto se lee de conocimiento_fragmentos
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS conocimiento_fts USING fts5(
+            texto,
+            content='conocimiento_fragmentos', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS conocimiento_fts_ai AFTER INSERT ON conocimiento_fragmentos BEGIN
+            INSERT INTO conocimiento_fts (rowid, texto) VALUES (new.id, new.texto);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS conocimiento_fts_ad AFTER DELETE ON conocimiento_fragmentos BEGIN
+            INSERT INTO conocimiento_fts (conocimiento_fts, rowid, texto) VALUES ('delete', old.id, old.texto);
+        END
+    """)
+
+
+# ============================================================================
+# MIGRACIÓN 14: Catálogo CIIU de actividades económicas
+# actividades_economicas (código, sección, división, descripción) cargada
+# desde assets/actividad_economica.py, con índice FTS5 de la descripción
+# (core/actividades.py). Sin FTS5 la búsqueda por descripción usa LIKE.
+# ============================================================================
+def _m014_fila(linea):
+    """Línea "A011111<TAB>CULTIVO DE TRIGO" -> (codigo, seccion, division, descripcion)."""
+    codigo, _, descripcion = linea.partition("\t")
+    codigo = codigo.strip()
+    seccion = codigo[0] if codigo[:1].isalpha() else None
+    division = codigo[1:3] if seccion and len(codigo) >= 3 else None
+    return codigo, seccion, division, descripcion.strip()
+
+
+def _m014_actividades_economicas(conn):
+    from assets.actividad_economica import actividad_economica_options  # Datos del catálogo (lista grande)
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS actividades_economicas (
+            codigo TEXT PRIMARY KEY,  -- Código CIIU ("A011111")
+            seccion TEXT,  -- Letra de la sección ("A")
+            division TEXT,  -- Dos dígitos de la división ("01")
+            descripcion TEXT NOT NULL  -- Descripción oficial
+        )
+    ''')
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_actividades_seccion_codigo ON actividades_economicas (seccion, codigo)"
+    )
+    conn.executemany(
+        """INSERT INTO actividades_economicas (codigo, seccion, division, descripcion) VALUES (?, ?, ?, ?)
+           ON CONFLICT (codigo) DO UPDATE SET
+               seccion = excluded.seccion, division = excluded.division, descripcion = excluded.descripcion""",
+        [_m014_fila(linea) for linea in actividad_economica_options if linea.strip()],
+    )
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp._prueba_fts5 USING fts5(x)")
+    except sqlite3.OperationalError:
+        return
+    conn.execute("DROP TABLE temp._prueba_fts5")
+    # Contenido externo sobre la descripción; el catálogo solo cambia con
+    # core/actividades.cargar_catalogo(), que reconstruye el índice (sin triggers)
+    conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS actividades_fts USING fts5(
+                descripcion,
+                content='actividades_economicas', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    conn.execute("INSERT INTO actividades_fts (actividades_fts) VALUES ('rebuild')")
+
+
+# ============================================================================
+# MIGRACIÓN 15: Resúmenes de cartera y facturación
+# Totales por (aseguradora, ramo, estado, mes) mantenidos con triggers sobre
+# polizas y facturas (core/cartera.py), para los KPI de los dashboards.
+# ============================================================================
+_M015_CLAVE = ("aseguradora_id", "ramo_id", "estado", "mes")
+_M015_MEDIDAS_CARTERA = ("polizas", "prima_neta_centavos", "suma_asegurada_centavos", "total_centavos")
+_M015_MEDIDAS_FACTURACION = ("facturas", "monto_neto_centavos", "total_centavos")
+_M015_COLUMNAS_POLIZA = (
+    "aseguradora_id", "ramo_id", "estado", "fecha_emision", "fecha_inicio",
+    "prima_neta_centavos", "suma_asegurada_centavos", "total_centavos",
+)
+_M015_COLUMNAS_FACTURA = ("poliza_id", "estado", "fecha_emision", "fecha_registro", "monto_neto", "total")
+
+
+def _m015_clave_poliza(p):
+    return (
+        f"ifnull({p}.aseguradora_id, 0)",
+        f"ifnull({p}.ramo_id, 0)",
+        f"ifnull({p}.estado, '')",
+        f"substr(coalesce(nullif({p}.fecha_emision, ''), {p}.fecha_inicio, ''), 1, 7)",
+    )
+
+
+def _m015_montos_poliza(p):
+    return (
+        "1",
+        f"ifnull({p}.prima_neta_centavos, 0)",
+        f"ifnull({p}.suma_asegurada_centavos, 0)",
+        f"ifnull({p}.total_centavos, 0)",
+    )
+
+
+def _m015_clave_factura(f, aseguradora, ramo):
+    return (
+        f"ifnull({aseguradora}, 0)",
+        f"ifnull({ramo}, 0)",
+        f"ifnull({f}.estado, '')",
+        f"substr(coalesce(nullif({f}.fecha_emision, ''), {f}.fecha_registro, ''), 1, 7)",
+    )
+
+
+def _m015_montos_factura(f):
+    # Las facturas guardan REAL: se redondea cada una a centavos
+    return (
+        "1",
+        f"CAST(round(ifnull({f}.monto_neto, 0) * 100) AS INTEGER)",
+        f"CAST(round(ifnull({f}.total, 0) * 100) AS INTEGER)",
+    )
+
+
+def _m015_upsert(tabla, medidas, clave, montos, signo):
+    """INSERT ... ON CONFLICT que suma (signo=1) o resta (signo=-1) una fila a su grupo."""
+    valores = ", ".join((*clave, *(f"{signo} * {m}" for m in montos)))
+    sumas = ", ".join(f"{m} = {m} + excluded.{m}" for m in medidas)
+    return (
+        f"INSERT INTO {tabla} ({', '.join(_M015_CLAVE + medidas)}) VALUES ({valores}) "
+        f"ON CONFLICT ({', '.join(_M015_CLAVE)}) DO UPDATE SET {sumas};"
+    )
+
+
+def _m015_limpiar(tabla, contador, clave):
+    """Borra el grupo de `clave` si se quedó sin filas."""
+    condicion = " AND ".join(f"{c} = {e}" for c, e in zip(_M015_CLAVE, clave))
+    return f"DELETE FROM {tabla} WHERE {condicion} AND {contador} = 0;"
+
+
+def _m015_mover_facturas(poliza, signo, aseguradora, ramo):
+    """Suma o resta todas las facturas de una póliza a los grupos de (aseguradora, ramo)."""
+    clave = _m015_clave_factura("f", aseguradora, ramo)
+    montos = ", ".join(f"{signo} * SUM({m})" for m in _m015_montos_factura("f"))
+    sumas = ", ".join(f"{m} = {m} + excluded.{m}" for m in _M015_MEDIDAS_FACTURACION)
+    return (
+        f"INSERT INTO resumen_facturacion ({', '.join(_M015_CLAVE + _M015_MEDIDAS_FACTURACION)}) "
+        f"SELECT {', '.join(clave)}, {montos} FROM facturas f WHERE f.poliza_id = {poliza}.id "
+        f"GROUP BY 3, 4 ON CONFLICT ({', '.join(_M015_CLAVE)}) DO UPDATE SET {sumas};"
+    )
+
+
+def _m015_triggers():
+    """{nombre: cuerpo} de los triggers que mantienen resumen_cartera y resumen_facturacion."""
+    cartera, facturacion = _M015_MEDIDAS_CARTERA, _M015_MEDIDAS_FACTURACION
+    sumar_p = _m015_upsert("resumen_cartera", cartera, _m015_clave_poliza("new"), _m015_montos_poliza("new"), 1)
+    restar_p = (
+        _m015_upsert("resumen_cartera", cartera, _m015_clave_poliza("old"), _m015_montos_poliza("old"), -1)
+        + _m015_limpiar("resumen_cartera", "polizas", _m015_clave_poliza("old"))
+    )
+    # La aseguradora y el ramo de una factura son los de su póliza
+    clave_new = _m015_clave_factura(
+        "new", "(SELECT aseguradora_id FROM polizas WHERE id = new.poliza_id)",
+        "(SELECT ramo_id FROM polizas WHERE id = new.poliza_id)",
+    )
+    clave_old = _m015_clave_factura(
+        "old", "(SELECT aseguradora_id FROM polizas WHERE id = old.poliza_id)",
+        "(SELECT ramo_id FROM polizas WHERE id = old.poliza_id)",
+    )
+    sumar_f = _m015_upsert("resumen_facturacion", facturacion, clave_new, _m015_montos_factura("new"), 1)
+    restar_f = (
+        _m015_upsert("resumen_facturacion", facturacion, clave_old, _m015_montos_factura("old"), -1)
+        + _m015_limpiar("resumen_facturacion", "facturas", clave_old)
+    )
+    # Las facturas de una póliza cuya aseguradora o ramo cambia (o que se borra) cambian de grupo
+    sacar_facturas = (
+        _m015_mover_facturas("old", -1, "old.aseguradora_id", "old.ramo_id")
+        + "DELETE FROM resumen_facturacion WHERE aseguradora_id = ifnull(old.aseguradora_id, 0) "
+          "AND ramo_id = ifnull(old.ramo_id, 0) AND facturas = 0;"
+    )
+    # Si cambia polizas.id (no hay claves foráneas activas) sus facturas quedan
+    # sin póliza, y las que ya apuntaban al id nuevo salen del grupo (0, 0)
+    sacar_huerfanas = (
+        _m015_mover_facturas("new", -1, "NULL", "NULL")
+        + "DELETE FROM resumen_facturacion WHERE aseguradora_id = 0 AND ramo_id = 0 AND facturas = 0;"
+    )
+    return {
+        "resumen_cartera_ai": f"AFTER INSERT ON polizas BEGIN {sumar_p} END",
+        "resumen_cartera_ad": f"AFTER DELETE ON polizas BEGIN {restar_p} END",
+        "resumen_cartera_au": (
+            f"AFTER UPDATE OF {', '.join(_M015_COLUMNAS_POLIZA)} ON polizas BEGIN {restar_p} {sumar_p} END"
+        ),
+        "resumen_facturacion_poliza_au": (
+            "AFTER UPDATE OF aseguradora_id, ramo_id ON polizas "
+            "WHEN old.id IS new.id AND (old.aseguradora_id IS NOT new.aseguradora_id OR old.ramo_id IS NOT new.ramo_id) "
+            f"BEGIN {sacar_facturas} {_m015_mover_facturas('new', 1, 'new.aseguradora_id', 'new.ramo_id')} END"
+        ),
+        "resumen_facturacion_poliza_id_au": (
+            "AFTER UPDATE OF id ON polizas WHEN old.id IS NOT new.id "
+            f"BEGIN {sacar_facturas} {_m015_mover_facturas('old', 1, 'NULL', 'NULL')} "
+            f"{sacar_huerfanas} {_m015_mover_facturas('new', 1, 'new.aseguradora_id', 'new.ramo_id')} END"
+        ),
+        "resumen_facturacion_poliza_ad": (
+            f"AFTER DELETE ON polizas BEGIN {sacar_facturas} {_m015_mover_facturas('old', 1, 'NULL', 'NULL')} END"
+        ),
+        "resumen_facturacion_ai": f"AFTER INSERT ON facturas BEGIN {sumar_f} END",
+        "resumen_facturacion_ad": f"AFTER DELETE ON facturas BEGIN {restar_f} END",
+        "resumen_facturacion_au": (
+            f"AFTER UPDATE OF {', '.join(_M015_COLUMNAS_FACTURA)} ON facturas BEGIN {restar_f} {sumar_f} END"
+        ),
+    }
+
+
+def _m015_resumenes_cartera(conn):
+    cartera = _m015_clave_poliza("p") + tuple(f"SUM({m})" for m in _m015_montos_poliza("p"))
+    facturacion = _m015_clave_factura("f", "p.aseguradora_id", "p.ramo_id") + tuple(
+        f"SUM({m})" for m in _m015_montos_factura("f")
+    )
+    resumenes = {
+        "resumen_cartera": (
+            _M015_MEDIDAS_CARTERA,
+            f"SELECT {', '.join(cartera)} FROM polizas p GROUP BY 1, 2, 3, 4",
+        ),
+        "resumen_facturacion": (
+            _M015_MEDIDAS_FACTURACION,
+            f"SELECT {', '.join(facturacion)} FROM facturas f LEFT JOIN polizas p ON p.id = f.poliza_id "
+            "GROUP BY 1, 2, 3, 4",
+        ),
+    }
+    for tabla, (medidas, _) in resumenes.items():
+        columnas = ",\n".join(f"            {m} INTEGER NOT NULL DEFAULT 0" for m in medidas)
+        conn.execute(f'''
+            CREATE TABLE IF NOT EXISTS {tabla} (
+            aseguradora_id INTEGER NOT NULL,  -- 0 = sin aseguradora
+            ramo_id INTEGER NOT NULL,  -- 0 = sin ramo
+            estado TEXT NOT NULL,
+            mes TEXT NOT NULL,  -- "AAAA-MM" ('' si no hay fecha)
+{columnas},
+            PRIMARY KEY (aseguradora_id, ramo_id, estado, mes)
+            )
+        ''')
+    for nombre, cuerpo in _m015_triggers().items():
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS {nombre} {cuerpo}")
+    # Llenar los resúmenes con los datos actuales
+    for tabla, (medidas, consulta) in resumenes.items():
+        conn.execute(f"DELETE FROM {tabla}")
+        conn.execute(f"INSERT INTO {tabla} ({', '.join(_M015_CLAVE + medidas)}) {consulta}")
+
+
+# ============================================================================
+# MIGRACIÓN 16: Calendario de vencimientos y lista de renovación
+# Índice de pólizas por (estado, fecha_fin) que cubre los conteos por
+# ejecutivo y aseguradora de core/renovaciones.py, y la tabla renovaciones
+# que llena la tarea nocturna (scripts/generar_renovaciones.py).
+# ============================================================================
+INDICES_RENOVACIONES = [
+    ("idx_polizas_vencimientos", "polizas", "estado, fecha_fin, ejecutivo_comercial_id, aseguradora_id"),
+]
+
+
+def _m016_renovaciones(conn):
+    for nombre, tabla, columnas in INDICES_RENOVACIONES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS renovaciones (
+            poliza_id INTEGER PRIMARY KEY,  -- Póliza por renovar (polizas.id)
+            numero_poliza TEXT,
+            cliente_id INTEGER,
+            ejecutivo_comercial_id INTEGER,
+            aseguradora_id INTEGER,
+            ramo_id INTEGER,
+            fecha_fin TEXT NOT NULL,  -- Fin de vigencia al generar la lista
+            ventana INTEGER NOT NULL,  -- 30, 60 o 90 días
+            prima_neta_centavos INTEGER,
+            estado_gestion TEXT NOT NULL DEFAULT 'Pendiente',  -- Ver ESTADOS_GESTION
+            observaciones TEXT,
+            fecha_generacion TEXT,  -- Última tarea nocturna que la incluyó
+            fecha_gestion TEXT,  -- Último cambio de estado_gestion
+            FOREIGN KEY (poliza_id) REFERENCES polizas (id) ON DELETE CASCADE
+        )
+    ''')
+    for nombre, columnas in (
+        ("idx_renovaciones_fecha_fin", "fecha_fin, poliza_id"),
+        ("idx_renovaciones_ejecutivo_fecha_fin", "ejecutivo_comercial_id, fecha_fin, poliza_id"),
+        ("idx_renovaciones_aseguradora_fecha_fin", "aseguradora_id, fecha_fin, poliza_id"),
+    ):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON renovaciones ({columnas})")
+
+
+# ============================================================================
+# MIGRACIÓN 17: Comisiones por aseguradora y ramo
+# Tasas de comisión, resultado del cálculo por póliza (core/comisiones.py) y
+# la cola de pólizas a recalcular, que llenan los triggers sobre polizas,
+# movimientos_poliza, facturas y notas_de_credito.
+# ============================================================================
+def _m017_comisiones(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tasas_comision (
+            aseguradora_id INTEGER NOT NULL,  -- aseguradoras.id
+            ramo_id INTEGER NOT NULL DEFAULT 0,  -- ramos_seguros.id; 0 = todos los ramos
+            vigente_desde TEXT NOT NULL DEFAULT '1900-01-01',  -- Aplica a pólizas emitidas desde esta fecha
+            tasa_bp INTEGER NOT NULL,  -- Puntos básicos: 1250 = 12,50 %
+            PRIMARY KEY (aseguradora_id, ramo_id, vigente_desde)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS comisiones (
+            poliza_id INTEGER PRIMARY KEY,  -- polizas.id
+            aseguradora_id INTEGER,
+            ramo_id INTEGER,
+            mes TEXT,  -- Mes de emisión "AAAA-MM"
+            tasa_bp INTEGER NOT NULL,  -- Tasa aplicada
+            prima_neta_centavos INTEGER NOT NULL,
+            devengada_centavos INTEGER NOT NULL,
+            facturada_centavos INTEGER NOT NULL,
+            cobrada_centavos INTEGER NOT NULL,
+            fecha_calculo TEXT
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_comisiones_mes ON comisiones (mes)")
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS comisiones_pendientes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Orden de la marca; nunca se reutiliza
+            poliza_id INTEGER NOT NULL UNIQUE  -- Póliza tocada desde el último cálculo
+        )
+    ''')
+
+    # (tabla, evento, fila con la póliza): cada cambio anota la póliza en la cola.
+    # INSERT OR REPLACE borra la marca anterior de la póliza e inserta una con id
+    # nuevo, así que core/comisiones.py puede borrar solo los id que leyó.
+    eventos = [
+        ("polizas", "INSERT", "new.id"),
+        ("polizas", "DELETE", "old.id"),
+        ("polizas", "UPDATE OF aseguradora_id, ramo_id, estado, fecha_emision, fecha_inicio, prima_neta_centavos", "new.id"),
+        ("movimientos_poliza", "INSERT", "new.poliza_id"),
+    ]
+    for tabla in ("facturas", "notas_de_credito"):
+        eventos += [
+            (tabla, "INSERT", "new.poliza_id"),
+            (tabla, "DELETE", "old.poliza_id"),
+            (tabla, "UPDATE OF poliza_id, estado, monto_neto", "new.poliza_id"),
+            # Una factura o nota que cambia de póliza también cambia la anterior
+            (tabla, "UPDATE OF poliza_id", "old.poliza_id"),
+        ]
+    for tabla, evento, poliza in eventos:
+        nombre = f"comisiones_{tabla}_{evento.split()[0].lower()}_{poliza.split('.')[0]}"
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {nombre} AFTER {evento} ON {tabla} WHEN {poliza} IS NOT NULL "
+            f"BEGIN INSERT OR REPLACE INTO comisiones_pendientes (poliza_id) VALUES ({poliza}); END"
+        )
+
+
+# ============================================================================
+# MIGRACIÓN 18: Siniestralidad
+# Índice de siniestros por fecha de ocurrencia para los reportes de
+# siniestralidad por período (core/siniestralidad.py).
+# ============================================================================
+INDICES_SINIESTRALIDAD = [
+    ("idx_siniestros_fecha", "siniestros", "fecha_siniestro, poliza_id"),
+]
+
+
+def _m018_siniestralidad(conn):
+    for nombre, tabla, columnas in INDICES_SINIESTRALIDAD:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+
+
+# ============================================================================
+# REGISTRO ORDENADO DE MIGRACIONES: (versión, nombre, función)
+# ============================================================================
+MIGRATIONS = [
+    (1, "esquema_base", _m001_esquema_base),
+    (2, "columnas_adicionales", _m002_columnas_adicionales),
+    (3, "indices_consultas", _m003_indices_consultas),
+    (4, "montos_en_centavos", _m004_montos_en_centavos),
+    (5, "indices_listado_polizas", _m005_indices_listado_polizas),
+    (6, "secuencias", _m006_secuencias),
+    (7, "busqueda_clientes", _m007_busqueda_clientes),
+    (8, "polizas_por_cliente", _m008_polizas_por_cliente),
+    (9, "indice_documento_clientes", _m009_indice_documento_clientes),
+    (10, "ingestas_polizas", _m010_ingestas_polizas),
+    (11, "secuencia_movimientos", _m011_secuencia_movimientos),
+    (12, "textos_pdf", _m012_textos_pdf),
+    (13, "conocimiento", _m013_conocimiento),
+    (14, "actividades_economicas", _m014_actividades_economicas),
+    (15, "resumenes_cartera", _m015_resumenes_cartera),
+    (16, "renovaciones", _m016_renovaciones),
+    (17, "comisiones", _m017_comisiones),
+    (18, "siniestralidad", _m018_siniestralidad),
+]
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+_applied_paths = set()  # Bases de datos ya migradas en este proceso
+_runner_lock = threading.Lock()
+_columns_cache = {}  # {(ruta, tabla): tupla de columnas}
+
+
+def get_schema_version(db_file=None):
+    """
+    Retorna la versión de esquema aplicada (0 si la base está vacía)
+
+    Parámetros:
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        int: Versión más alta registrada en schema_version
+    """
+    with connection(db_file) as conn:
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+        ).fetchone()
+        if not exists:
+            return 0
+        return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def run_migrations(db_file=None):
+    """
+    Aplica en orden las migraciones pendientes. Solo trabaja la primera vez por
+    proceso y base de datos; las siguientes llamadas retornan inmediatamente.
+
+    Parámetros:
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        list: Versiones aplicadas en esta llamada
+    """
+    path = os.path.abspath(db_file or DB_FILE)
+    if path in _applied_paths:
+        return []
+
+    with _runner_lock:
+        if path in _applied_paths:
+            return []
+
+        with unit_of_work(path, immediate=True) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,  -- Número de la migración
+                    nombre TEXT NOT NULL,  -- Descripción corta
+                    aplicada_en TEXT NOT NULL  -- Fecha/hora de aplicación
+                )
+            ''')
+
+        applied = []
+        current = get_schema_version(path)
+        for version, nombre, migration in MIGRATIONS:
+            if version <= current:
+                continue
+            # Cada migración es atómica: o se aplica completa o no se registra
+            with unit_of_work(path, immediate=True) as conn:
+                # Otro proceso pudo aplicarla mientras esperábamos el lock
+                if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone():
+                    continue
+                migration(conn)
+                conn.execute(
+                    "INSERT INTO schema_version (version, nombre, aplicada_en) VALUES (?, ?, ?)",
+                    (version, nombre, datetime.datetime.now().isoformat(timespec="seconds")),
+                )
+            applied.append(version)
+
+        # El esquema pudo cambiar: descartar columnas cacheadas de esta base
+        for key in [k for k in _columns_cache if k[0] == path]:
+            del _columns_cache[key]
+        _applied_paths.add(path)
+        return applied
+
+
+def reset_migration_state(db_file=None):
+    """Olvida que la base fue migrada (p. ej. tras borrar el archivo en reset_database)."""
+    path = os.path.abspath(db_file or DB_FILE)
+    with _runner_lock:
+        _applied_paths.discard(path)
+        for key in [k for k in _columns_cache if k[0] == path]:
+            del _columns_cache[key]
+
+
+# ============================================================================
+# FUNCIÓN: get_columns
+# Conjunto de columnas conocido, cacheado por proceso
+# ============================================================================
+def get_columns(table, db_file=None):
+    """
+    Retorna las columnas de una tabla en el orden de la base de datos.
+    La introspección se hace una sola vez por proceso (después de migrar),
+    así las rutas calientes no ejecutan PRAGMA table_info en cada render.
+
+    Parámetros:
+        table (str): Nombre de la tabla
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        tuple: Nombres de columnas
+    """
+    path = os.path.abspath(db_file or DB_FILE)
+    key = (path, table)
+    columns = _columns_cache.get(key)
+    if columns is None:
+        run_migrations(path)
+        with connection(path) as conn:
+            columns = tuple(_table_columns(conn, table))
+        _columns_cache[key] = columns
+    return columns
@@ -0,0 +1,352 @@
+# ============================================================================
+# MONTOS EN CENTAVOS - core/money.py
+# ============================================================================
+# Tipo Money respaldado por un entero de centavos para primas, sumas
+# aseguradas, impuestos y totales. Reemplaza la aritmética con float (que
+# acumula errores de redondeo) y el texto libre ("$1,234.56 USD") guardado en
+# la base: cada monto se persiste también como INTEGER en una columna
+# `<columna>_centavos`, lo que permite totalizar la cartera con SUM() en SQL.
+# ============================================================================
+
+# Importaciones necesarias
+import functools  # total_ordering para las comparaciones
+import re  # Número dentro de un texto con moneda ("$1,250.50 USD")
+from decimal import ROUND_HALF_UP, Decimal  # Redondeo exacto
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+TASA_SCVS = Decimal("0.5")  # Contribución Superintendencia de Compañías (% de la prima)
+TASA_SEGURO_CAMPESINO = Decimal("0.5")  # Seguro Social Campesino (% de la prima)
+TASA_IVA = Decimal("15")  # IVA sobre el subtotal (%)
+
+# Columnas monetarias (TEXT heredado) que tienen su gemela `<columna>_centavos`
+MONTOS_POLIZA = ("prima", "prima_neta", "suma_asegurada", "subtotal", "iva_15", "total")
+MONTOS_POLIZA_RAMO = ("prima", "suma_asegurada")
+COLUMNAS_MONETARIAS = {
+    "polizas": MONTOS_POLIZA,
+    "poliza_ramos": MONTOS_POLIZA_RAMO,
+}
+
+_CENTAVO = Decimal("0.01")
+
+# Texto de un monto: signo, símbolo o código de moneda opcionales y los
+# dígitos con sus separadores ("-$1.250,50", "USD 1,250.50", "1250 USD")
+_MONTO_TEXTO = re.compile(r"^\s*(-?)\s*(?:[A-Za-z]{1,3}\s*)?\$?\s*(-?)\s*([\d.,]+)\s*(?:[A-Za-z]{1,3})?\s*$")
+
+
+def _decimal_de_texto(texto):
+    """
+    Decimal de un monto escrito como texto, o None si no es numérico o es ambiguo
+
+    El separador decimal es el último de "." o "," cuando el otro también
+    aparece ("1,250.50", "1.250,50"). Con un solo tipo de separador:
+    repetido es de miles ("1.250.000"); una coma seguida de 3 dígitos es de
+    miles ("1,250", el formato de Money.format) y de 1 o 2 dígitos es decimal
+    ("1250,5"); un punto solo es decimal, como en los montos heredados de la
+    base ("99.999"). Exponentes ("12e5"), una coma con otra cantidad de
+    dígitos ("1,2500") y grupos de miles mal formados ("1.2.3") se rechazan.
+    """
+    match = _MONTO_TEXTO.match(texto)
+    if not match or (match.group(1) and match.group(2)):
+        return None
+    signo, numero = match.group(1) or match.group(2), match.group(3)
+
+    ultimo = max(numero.rfind("."), numero.rfind(","))
+    miles = None
+    if ultimo < 0:
+        entero, decimales = numero, ""
+    else:
+        separador, cola = numero[ultimo], numero[ultimo + 1:]
+        otro = "," if separador == "." else "."
+        if otro in numero:
+            entero, decimales, miles = numero[:ultimo], cola, otro
+        elif numero.count(separador) > 1:
+            entero, decimales, miles = numero, "", separador
+        elif separador == ",":
+            if len(cola) == 3:
+                entero, decimales, miles = numero, "", ","
+            elif len(cola) in (1, 2):
+                entero, decimales = numero[:ultimo], cola
+            else:
+                return None
+        else:
+            entero, decimales = numero[:ultimo], cola
+
+    if miles:
+        if not re.fullmatch(rf"\d{{1,3}}(?:{re.escape(miles)}\d{{3}})*", entero):
+            return None
+        entero = entero.replace(miles, "")
+    if not (entero or decimales) or not (entero + decimales).isdigit():
+        return None
+    return Decimal(f"{signo}{entero or 0}.{decimales or 0}")
+
+
+def columna_centavos(columna):
+    """Nombre de la columna INTEGER que guarda `columna` en centavos."""
+    return f"{columna}_centavos"
+
+
+# ============================================================================
+# CLASE: Money
+# Monto inmutable en centavos enteros
+# ============================================================================
+@functools.total_ordering
+class Money:
+    """
+    Monto en dólares guardado como centavos enteros.
+
+    Uso:
+        prima = Money.parse("1,250.00")
+        scvs = prima.percent(TASA_SCVS)
+        total = prima + scvs
+        total.cents  -> 125625
+    """
+
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        self.cents = int(cents)
+
+    # ------------------------------------------------------------------
+    # Construcción
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_cents(cls, cents):
+        """Crea un monto a partir de centavos (None si cents es None)."""
+        return None if cents is None else cls(cents)
+
+    @classmethod
+    def parse(cls, value):
+        """
+        Convierte un valor de formulario o de la base a Money
+
+        Acepta números, Decimal, Money y textos como "1250", "1,250.50",
+        "1.250,50" o "$1,250.50 USD" (ver _decimal_de_texto para los
+        separadores).
+
+        Parámetros:
+            value: Valor a convertir
+
+        Retorna:
+            Money: El monto, o None si el valor está vacío o no es numérico
+        """
+        if value is None or isinstance(value, bool):
+            return None
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, int):
+            return cls(value * 100)
+        if isinstance(value, float):
+            # repr corto del float ("0.1" y no 0.1000000000000000055...)
+            amount = Decimal(repr(value))
+        elif isinstance(value, Decimal):
+            amount = value
+        else:
+            amount = _decimal_de_texto(str(value))
+            if amount is None:
+                return None
+        if not amount.is_finite():
+            return None
+        return cls(int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    @classmethod
+    def of(cls, value):
+        """Igual que parse() pero retorna cero en lugar de None."""
+        parsed = cls.parse(value)
+        return cls(0) if parsed is None else parsed
+
+    # ------------------------------------------------------------------
+    # Aritmética
+    # ------------------------------------------------------------------
+    def __add__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents + other.cents)
+
+    def __sub__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return Money(self.cents - other.cents)
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __abs__(self):
+        return Money(abs(self.cents))
+
+    def percent(self, pct):
+        """
+        Retorna `pct` por ciento del monto, redondeado al centavo (mitad hacia arriba)
+
+        Parámetros:
+            pct (Decimal|int|str): Porcentaje, p. ej. Decimal("0.5") o 15
+        """
+        value = Decimal(self.cents) * Decimal(str(pct)) / 100
+        return Money(int(value.quantize(Decimal(1), rounding=ROUND_HALF_UP)))
+
+    # ------------------------------------------------------------------
+    # Comparación
+    # ------------------------------------------------------------------
+    def __eq__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents == other.cents
+
+    def __lt__(self, other):
+        if not isinstance(other, Money):
+            return NotImplemented
+        return self.cents < other.cents
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    # ------------------------------------------------------------------
+    # Conversión y presentación
+    # ------------------------------------------------------------------
+    def to_decimal(self):
+        """Monto en dólares como Decimal exacto con dos decimales."""
+        return (Decimal(self.cents) / 100).quantize(_CENTAVO)
+
+    def __float__(self):
+        # Solo para widgets que exigen float (st.number_input); nunca para cálculos
+        return self.cents / 100
+
+    def __str__(self):
+        # Representación que se guarda en las columnas TEXT heredadas
+        return str(self.to_decimal())
+
+    def __repr__(self):
+        return f"Money({self})"
+
+    def format(self):
+        """Monto con separador de miles para mostrar en pantalla: 1,234.56"""
+        return f"{self.to_decimal():,}"
+
+
+# ============================================================================
+# FUNCIÓN: centavos
+# Conversión directa de un valor de la base a centavos
+# ============================================================================
+def centavos(value):
+    """
+    Retorna el valor expresado en centavos enteros, o None si no es un monto.
+    También se registra como función SQL `centavos()` en el backfill.
+    """
+    money = Money.parse(value)
+    return None if money is None else money.cents
+
+
+def centavos_de(data, columnas):
+    """
+    Construye las columnas `<columna>_centavos` a partir de un registro
+
+    Parámetros:
+        data (dict): Valores del registro (p. ej. datos del formulario)
+        columnas (iterable): Columnas monetarias a convertir
+
+    Retorna:
+        dict: {"<columna>_centavos": int|None} para cada columna (None si falta o no es un monto)
+    """
+    return {columna_centavos(col): centavos(data.get(col)) for col in columnas}
+
+
+# ============================================================================
+# FUNCIÓN: calcular_desglose
+# Contribuciones, subtotal, IVA y total de una prima
+# ============================================================================
+def calcular_desglose(prima, derecho_emision=None, otros_cargos=None):
+    """
+    Calcula el desglose de facturación de una prima con aritmética de centavos
+
+    Cada componente se redondea al centavo antes de sumarse, igual que en la
+    factura impresa, de modo que subtotal + IVA siempre coincide con el total.
+
+    Parámetros:
+        prima: Prima neta (cualquier valor aceptado por Money.parse)
+        derecho_emision: Derechos de emisión (opcional)
+        otros_cargos: Otros cargos (opcional)
+
+    Retorna:
+        dict: Montos Money con las claves prima, contrib_scvs, seguro_campesino,
+              derecho_emision, otros_cargos, impuestos (contribuciones + cargos),
+              subtotal, iva y total
+    """
+    prima = Money.of(prima)
+    derecho_emision = Money.of(derecho_emision)
+    otros_cargos = Money.of(otros_cargos)
+
+    contrib_scvs = prima.percent(TASA_SCVS)
+    seguro_campesino = prima.percent(TASA_SEGURO_CAMPESINO)
+    impuestos = contrib_scvs + seguro_campesino + derecho_emision + otros_cargos
+    subtotal = prima + impuestos
+    iva = subtotal.percent(TASA_IVA)
+
+    return {
+        "prima": prima,
+        "contrib_scvs": contrib_scvs,
+        "seguro_campesino": seguro_campesino,
+        "derecho_emision": derecho_emision,
+        "otros_cargos": otros_cargos,
+        "impuestos": impuestos,
+        "subtotal": subtotal,
+        "iva": iva,
+        "total": subtotal + iva,
+    }
+
+
+# ============================================================================
+# RELLENO Y VERIFICACIÓN DE COLUMNAS EN CENTAVOS
+# Usados por scripts/backfill_montos.py
+# ============================================================================
+def registrar_funcion_centavos(conn):
+    """Registra la función SQL determinística centavos(texto) en la conexión."""
+    conn.create_function("centavos", 1, centavos, deterministic=True)
+
+
+def rellenar_centavos(conn, solo_vacios=False):
+    """
+    Recalcula las columnas `<columna>_centavos` a partir de las columnas TEXT
+
+    Parámetros:
+        conn: Conexión (el llamador controla la transacción)
+        solo_vacios (bool): Si es True solo completa filas con centavos NULL y texto no vacío
+
+    Retorna:
+        dict: {"tabla.columna": filas actualizadas}
+    """
+    registrar_funcion_centavos(conn)
+    actualizadas = {}
+    for tabla, columnas in COLUMNAS_MONETARIAS.items():
+        for col in columnas:
+            destino = columna_centavos(col)
+            query = f"UPDATE {tabla} SET {destino} = centavos({col})"
+            if solo_vacios:
+                query += f" WHERE {destino} IS NULL AND COALESCE({col}, '') <> ''"
+            else:
+                query += f" WHERE {destino} IS NOT centavos({col})"
+            actualizadas[f"{tabla}.{col}"] = conn.execute(query).rowcount
+    return actualizadas
+
+
+def verificar_centavos(conn):
+    """
+    Busca filas cuyo monto en centavos no coincide con el texto heredado
+
+    Retorna:
+        dict: {"tabla.columna": [(id, texto, centavos_guardados), ...]} solo con diferencias
+    """
+    registrar_funcion_centavos(conn)
+    diferencias = {}
+    for tabla, columnas in COLUMNAS_MONETARIAS.items():
+        for col in columnas:
+            destino = columna_centavos(col)
+            filas = conn.execute(
+                f"SELECT id, {col}, {destino} FROM {tabla} WHERE {destino} IS NOT centavos({col})"
+            ).fetchall()
+            if filas:
+                diferencias[f"{tabla}.{col}"] = filas
+    return diferencias
@@ -0,0 +1,395 @@
+# ============================================================================
+# MOTOR DE MOVIMIENTOS EN LOTE - core/movimientos.py
+# ============================================================================
+# Aplica movimientos de póliza (anexos de suma asegurada y prima,
+# cancelación, rehabilitación, activación, anexo aclaratorio) a muchas
+# pólizas sin pasar por los formularios de Movimientos/. Cada movimiento es
+# una tupla (poliza_id, tipo_movimiento, parámetros):
+#   1. Las pólizas de cada lote se leen con una sola consulta (json_each).
+#   2. Se valida el estado de la póliza y el sentido del cambio con las mismas
+#      reglas que los formularios (p. ej. un aumento solo sobre una 'Activa').
+#   3. Se calculan la nueva suma/prima y el desglose (core.money).
+#   4. movimientos_poliza, polizas y la factura o nota de crédito opcional se
+#      escriben en una transacción por lote.
+# Los movimientos rechazados no detienen el lote. No depende de Streamlit.
+#
+# Uso (indexación anual del 5% de las sumas aseguradas de una cartera):
+#   aplicar_movimientos([(pid, AUMENTO_SUMA, {"porcentaje_suma": 5}) for pid in ids])
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha de los movimientos y documentos
+import json  # Lista de pólizas como un solo parámetro (json_each)
+import sqlite3  # Errores de integridad al escribir un lote
+from decimal import Decimal, InvalidOperation  # Porcentajes de los parámetros
+
+from core.consultas import POLIZAS_PARA_MOVIMIENTO  # Lectura por lote
+from core.db import unit_of_work  # Transacción por lote
+from core.money import TASA_IVA, Money, calcular_desglose, columna_centavos
+from core.secuencias import siguiente_codigo_movimiento, siguiente_numero_factura, siguiente_numero_nota
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+TAMANO_LOTE = 500  # Movimientos por transacción
+
+# Tipos de movimiento (mismo texto que guardan los formularios de Movimientos/)
+ACTIVACION = "Activación de póliza"
+ANEXO_ACLARATORIO = "Anexo Aclaratorio"
+AUMENTO_SUMA = "Anexo de Aumento de Suma Asegurada"
+DISMINUCION_SUMA = "Anexo de Disminución de Suma Asegurada"
+AUMENTO_PRIMA = "Aumento de Prima"
+DISMINUCION_PRIMA = "Disminucion de Prima"
+CANCELACION = "Cancelación"
+REHABILITACION = "Rehabilitación"
+
+# Estado de la póliza que exige cada tipo y estado en que la deja (None = no cambia)
+REGLAS_ESTADO = {
+    ACTIVACION: (lambda estado: estado != "Activa", "La póliza ya está Activa", "Activa"),
+    ANEXO_ACLARATORIO: (lambda estado: estado == "Activa", "La póliza no está Activa", None),
+    AUMENTO_SUMA: (lambda estado: estado == "Activa", "La póliza no está Activa", None),
+    DISMINUCION_SUMA: (lambda estado: estado == "Activa", "La póliza no está Activa", None),
+    AUMENTO_PRIMA: (lambda estado: estado == "Activa", "La póliza no está Activa", None),
+    DISMINUCION_PRIMA: (lambda estado: estado == "Activa", "La póliza no está Activa", None),
+    CANCELACION: (lambda estado: estado != "Cancelada", "La póliza ya está Cancelada", "Cancelada"),
+    REHABILITACION: (lambda estado: estado == "Cancelada", "Solo se rehabilitan pólizas Canceladas", "Activa"),
+}
+TIPOS_MOVIMIENTO = tuple(REGLAS_ESTADO)
+
+# Sentido exigido al cambio de suma (+1 aumento, -1 disminución) y de prima
+_SENTIDO_SUMA = {AUMENTO_SUMA: 1, DISMINUCION_SUMA: -1}
+_SENTIDO_PRIMA = {AUMENTO_SUMA: 1, DISMINUCION_SUMA: -1, AUMENTO_PRIMA: 1, DISMINUCION_PRIMA: -1}
+
+
+class MovimientoInvalido(ValueError):
+    """Movimiento que no se puede aplicar a la póliza (se reporta, no se escribe)."""
+
+
+# ============================================================================
+# CÁLCULO DE NUEVOS VALORES
+# ============================================================================
+def _nuevo_monto(actual, params, clave_monto, clave_porcentaje):
+    """
+    Monto nuevo a partir de un valor absoluto o de un porcentaje sobre el actual
+
+    Retorna:
+        Money: Nuevo monto, o None si los parámetros no piden cambiarlo
+    """
+    if params.get(clave_monto) not in (None, ""):
+        nuevo = Money.parse(params[clave_monto])
+        if nuevo is None:
+            raise MovimientoInvalido(f"{clave_monto} no es un monto válido")
+        return nuevo
+    if params.get(clave_porcentaje) not in (None, ""):
+        porcentaje = _porcentaje(params[clave_porcentaje])
+        if porcentaje is None:
+            raise MovimientoInvalido(f"{clave_porcentaje} no es un porcentaje válido")
+        if actual is None:
+            raise MovimientoInvalido(f"La póliza no tiene {clave_monto} para aplicar un porcentaje")
+        return actual + actual.percent(porcentaje)
+    return None
+
+
+def _porcentaje(valor):
+    """
+    Convierte un porcentaje ("5", "-2.5", "5 %", 5.0) a Decimal, como Money.parse con los montos
+
+    Retorna:
+        Decimal: El porcentaje, o None si no es un número finito
+    """
+    if valor is None or isinstance(valor, bool):
+        return None
+    if isinstance(valor, float):
+        valor = repr(valor)
+    if not isinstance(valor, (int, Decimal)):
+        valor = "".join(c for c in str(valor) if c.isdigit() or c in ".-")
+    try:
+        porcentaje = Decimal(valor)
+    except InvalidOperation:
+        return None
+    return porcentaje if porcentaje.is_finite() else None
+
+
+def _cargo(params, clave):
+    """
+    Cargo opcional del desglose (derecho_emision, otros_cargos)
+
+    Retorna:
+        Money: El cargo, o None si no se indicó
+    """
+    if params.get(clave) in (None, ""):
+        return None
+    cargo = Money.parse(params[clave])
+    if cargo is None:
+        raise MovimientoInvalido(f"{clave} no es un monto válido")
+    if cargo.cents < 0:
+        raise MovimientoInvalido(f"{clave} no puede ser negativo")
+    return cargo
+
+
+def _fecha_documento(params):
+    """
+    Fecha de la factura o nota de crédito (date o texto AAAA-MM-DD)
+
+    Retorna:
+        datetime.date: La fecha, o None si no se indicó (se usa la del día)
+    """
+    fecha = params.get("fecha_documento")
+    if fecha in (None, ""):
+        return None
+    if isinstance(fecha, datetime.date):
+        return fecha
+    try:
+        return datetime.date.fromisoformat(str(fecha))
+    except ValueError:
+        raise MovimientoInvalido("fecha_documento no es una fecha válida (AAAA-MM-DD)")
+
+
+def _validar_sentido(actual, nuevo, sentido, nombre):
+    """Un aumento debe subir el monto y una disminución bajarlo (sin quedar negativo)."""
+    if nuevo.cents < 0:
+        raise MovimientoInvalido(f"La nueva {nombre} no puede ser negativa")
+    if actual is None or not actual:
+        if sentido < 0:
+            raise MovimientoInvalido(f"La póliza no tiene {nombre} que disminuir")
+        if not nuevo:
+            raise MovimientoInvalido(f"La nueva {nombre} debe ser mayor que 0")
+        return
+    if sentido > 0 and nuevo <= actual:
+        raise MovimientoInvalido(f"La nueva {nombre} no es mayor que la actual ({actual.format()})")
+    if sentido < 0 and nuevo >= actual:
+        raise MovimientoInvalido(f"La nueva {nombre} no es menor que la actual ({actual.format()})")
+
+
+def calcular_movimiento(poliza, tipo, params):
+    """
+    Valida un movimiento contra el estado actual de la póliza y calcula sus efectos
+
+    Parámetros:
+        poliza (dict): {"estado", "suma_asegurada": Money|None, "prima_neta": Money|None}
+        tipo (str): Uno de TIPOS_MOVIMIENTO
+        params (dict): suma_asegurada o porcentaje_suma, prima o porcentaje_prima,
+                       derecho_emision, otros_cargos, fecha_documento (según el tipo)
+
+    Retorna:
+        dict: {"estado": nuevo estado o None, "suma": Money|None, "prima": Money|None,
+               "desglose": dict de calcular_desglose o None, "fecha_documento": date|None}
+
+    Lanza:
+        MovimientoInvalido: Si el estado, los montos o la fecha no permiten el movimiento
+    """
+    if not isinstance(params, dict):
+        raise MovimientoInvalido("Los parámetros del movimiento deben ser un diccionario")
+    if tipo not in REGLAS_ESTADO:
+        raise MovimientoInvalido(f"Tipo de movimiento desconocido: {tipo}")
+    permitido, motivo, estado_nuevo = REGLAS_ESTADO[tipo]
+    if not permitido(poliza["estado"]):
+        raise MovimientoInvalido(motivo)
+
+    # Los cargos y la fecha se validan antes de escribir, aunque no se use el documento
+    derecho_emision = _cargo(params, "derecho_emision")
+    otros_cargos = _cargo(params, "otros_cargos")
+    fecha_documento = _fecha_documento(params)
+
+    suma = prima = None
+    if tipo in _SENTIDO_SUMA:
+        suma = _nuevo_monto(poliza["suma_asegurada"], params, "suma_asegurada", "porcentaje_suma")
+        if suma is None:
+            raise MovimientoInvalido("Falta suma_asegurada o porcentaje_suma")
+        _validar_sentido(poliza["suma_asegurada"], suma, _SENTIDO_SUMA[tipo], "suma asegurada")
+    if tipo in _SENTIDO_PRIMA:
+        prima = _nuevo_monto(poliza["prima_neta"], params, "prima", "porcentaje_prima")
+        if prima is None and tipo not in _SENTIDO_SUMA:
+            raise MovimientoInvalido("Falta prima o porcentaje_prima")
+        if prima is not None:
+            _validar_sentido(poliza["prima_neta"], prima, _SENTIDO_PRIMA[tipo], "prima")
+
+    desglose = None
+    if prima is not None:
+        desglose = calcular_desglose(prima, derecho_emision, otros_cargos)
+    return {
+        "estado": estado_nuevo, "suma": suma, "prima": prima, "desglose": desglose,
+        "fecha_documento": fecha_documento,
+    }
+
+
+# ============================================================================
+# ESCRITURA
+# ============================================================================
+def _insertar_movimiento(conn, poliza_id, poliza, tipo, params, efecto, fecha, usuario_id):
+    """INSERT en movimientos_poliza; retorna (id, código)."""
+    codigo = params.get("codigo_movimiento") or siguiente_codigo_movimiento(conn=conn)
+    desglose = efecto["desglose"]
+    cargos = {}
+    if desglose is not None:
+        cargos = {
+            "scvs": float(desglose["contrib_scvs"]),
+            "seguro_campesino": float(desglose["seguro_campesino"]),
+            "derecho_emision": float(desglose["derecho_emision"]),
+            "otros_cargos": float(desglose["otros_cargos"]),
+            "subtotal_prima": float(desglose["subtotal"]),
+            "iva_rate": float(TASA_IVA),
+            "iva_amount": float(desglose["iva"]),
+            "prima_total_con_iva": float(desglose["total"]),
+        }
+    datos = {
+        "codigo_movimiento": codigo,
+        "poliza_id": poliza_id,
+        "cliente_id": poliza["cliente_id"],
+        "fecha_movimiento": fecha,
+        "tipo_movimiento": tipo,
+        "estado": "Aplicado",
+        "suma_asegurada_nueva": float(efecto["suma"]) if efecto["suma"] is not None else None,
+        "prima_nueva": float(efecto["prima"]) if efecto["prima"] is not None else None,
+        "observaciones": params.get("observaciones"),
+        "usuario_id": usuario_id,
+        **cargos,
+    }
+    movimiento_id = conn.execute(
+        f"INSERT INTO movimientos_poliza ({', '.join(datos)}) VALUES ({', '.join('?' for _ in datos)})",
+        list(datos.values()),
+    ).lastrowid
+    return movimiento_id, codigo
+
+
+def _actualizar_poliza(conn, poliza_id, efecto):
+    """UPDATE de polizas con el nuevo estado, suma y desglose de la prima."""
+    cambios = {}
+    if efecto["estado"]:
+        cambios["estado"] = efecto["estado"]
+    if efecto["suma"] is not None:
+        cambios["suma_asegurada"] = efecto["suma"]
+    if efecto["desglose"] is not None:
+        d = efecto["desglose"]
+        cambios.update({
+            "prima_neta": d["prima"], "contrib_scvs": d["contrib_scvs"], "ssoc_camp": d["seguro_campesino"],
+            "subtotal": d["subtotal"], "iva_15": d["iva"], "total": d["total"],
+        })
+    if not cambios:
+        return
+    columnas, valores = [], []
+    for columna, valor in cambios.items():
+        columnas.append(f"{columna} = ?")
+        valores.append(str(valor))
+        if columna in ("suma_asegurada", "prima_neta", "subtotal", "iva_15", "total"):
+            columnas.append(f"{columna_centavos(columna)} = ?")
+            valores.append(valor.cents)
+    conn.execute(f"UPDATE polizas SET {', '.join(columnas)} WHERE id = ?", (*valores, poliza_id))
+
+
+def _emitir_documento(conn, poliza_id, poliza, movimiento_id, tipo, params, efecto, hoy):
+    """Factura para los aumentos y nota de crédito para las disminuciones."""
+    fecha = efecto["fecha_documento"] or datetime.date.today()
+    desglose = efecto["desglose"]
+    montos = (float(desglose["prima"]), float(desglose["impuestos"]), float(desglose["iva"]), float(desglose["total"]))
+    if _SENTIDO_PRIMA.get(tipo, 1) > 0:
+        numero = params.get("numero_documento") or siguiente_numero_factura(fecha, conn=conn)
+        conn.execute(
+            """INSERT INTO facturas (numero_factura, poliza_id, movimiento_id, cliente_id, fecha_emision,
+                                     monto_neto, impuestos, iva, total, estado, fecha_registro)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'Emitida', ?)""",
+            (numero, poliza_id, movimiento_id, poliza["cliente_id"], fecha.strftime("%Y-%m-%d"), *montos, hoy),
+        )
+    else:
+        numero = params.get("numero_documento") or siguiente_numero_nota(fecha, conn=conn)
+        conn.execute(
+            """INSERT INTO notas_de_credito (numero_nota, factura_id, poliza_id, movimiento_id, cliente_id, fecha_emision,
+                                             monto_neto, impuestos, iva, total, motivo, estado, fecha_registro)
+               VALUES (?, NULL, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'Emitida', ?)""",
+            (numero, poliza_id, movimiento_id, poliza["cliente_id"], fecha.strftime("%Y-%m-%d"), *montos,
+             params.get("motivo") or tipo, hoy),
+        )
+    return numero
+
+
+# ============================================================================
+# FUNCIÓN: aplicar_movimientos
+# ============================================================================
+def aplicar_movimientos(movimientos, usuario_id=None, emitir_documentos=False,
+                        tamano=TAMANO_LOTE, progreso=None, db_file=None):
+    """
+    Aplica una lista de movimientos con una transacción por lote
+
+    Varios movimientos de la misma póliza se aplican en orden, cada uno sobre
+    los valores que dejó el anterior.
+
+    Parámetros:
+        movimientos (list): Tuplas (poliza_id, tipo_movimiento, parámetros). Parámetros
+                            (dict, opcionales según el tipo): suma_asegurada o
+                            porcentaje_suma, prima o porcentaje_prima, derecho_emision,
+                            otros_cargos, codigo_movimiento (por defecto MOV-000001...),
+                            observaciones, emitir_documento, numero_documento,
+                            fecha_documento, motivo
+        usuario_id (int): Usuario que registra los movimientos
+        emitir_documentos (bool): Valor por defecto de emitir_documento (factura en
+                                  aumentos de prima, nota de crédito en disminuciones)
+        tamano (int): Movimientos por transacción
+        progreso (callable): Opcional, se llama con los movimientos procesados tras cada lote
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {"aplicados", "documentos", "movimientos": [(poliza_id, movimiento_id, codigo)],
+               "rechazados": [(posición, poliza_id, tipo, motivo)]}
+    """
+    movimientos = list(movimientos)
+    fecha = datetime.date.today().strftime("%Y-%m-%d")
+    resumen = {"aplicados": 0, "documentos": 0, "movimientos": [], "rechazados": []}
+
+    for inicio in range(0, len(movimientos), tamano):
+        lote = movimientos[inicio:inicio + tamano]
+        aplicados, rechazados, documentos = [], [], 0
+        try:
+            with unit_of_work(db_file, immediate=True) as conn:
+                ids = sorted({int(pid) for pid, _, _ in lote if str(pid).isdigit()})
+                polizas = {
+                    row[0]: {
+                        "numero_poliza": row[1], "cliente_id": row[2], "estado": row[3],
+                        "suma_asegurada": Money.parse(row[4]), "prima_neta": Money.parse(row[5]),
+                    }
+                    for row in conn.execute(POLIZAS_PARA_MOVIMIENTO, (json.dumps(ids),))
+                }
+
+                for posicion, (poliza_id, tipo, params) in enumerate(lote, start=inicio):
+                    params = {} if params is None else params
+                    poliza = polizas.get(int(poliza_id)) if str(poliza_id).isdigit() else None
+                    if poliza is None:
+                        rechazados.append((posicion, poliza_id, tipo, "Póliza no encontrada"))
+                        continue
+                    try:
+                        efecto = calcular_movimiento(poliza, tipo, params)
+                    except MovimientoInvalido as e:
+                        rechazados.append((posicion, poliza_id, tipo, str(e)))
+                        continue
+
+                    movimiento_id, codigo = _insertar_movimiento(
+                        conn, int(poliza_id), poliza, tipo, params, efecto, fecha, usuario_id
+                    )
+                    _actualizar_poliza(conn, int(poliza_id), efecto)
+                    if efecto["desglose"] is not None and params.get("emitir_documento", emitir_documentos):
+                        _emitir_documento(conn, int(poliza_id), poliza, movimiento_id, tipo, params, efecto, fecha)
+                        documentos += 1
+
+                    # Los siguientes movimientos de la póliza parten de los nuevos valores
+                    if efecto["estado"]:
+                        poliza["estado"] = efecto["estado"]
+                    if efecto["suma"] is not None:
+                        poliza["suma_asegurada"] = efecto["suma"]
+                    if efecto["prima"] is not None:
+                        poliza["prima_neta"] = efecto["prima"]
+                    aplicados.append((int(poliza_id), movimiento_id, codigo))
+        except sqlite3.IntegrityError as e:
+            # El lote se revirtió completo (p. ej. código de movimiento repetido)
+            rechazados = [
+                (posicion, poliza_id, tipo, f"Lote revertido: {e}")
+                for posicion, (poliza_id, tipo, _) in enumerate(lote, start=inicio)
+            ]
+            aplicados, documentos = [], 0
+
+        resumen["aplicados"] += len(aplicados)
+        resumen["documentos"] += documentos
+        resumen["movimientos"].extend(aplicados)
+        resumen["rechazados"].extend(rechazados)
+        if progreso:
+            progreso(inicio + len(lote))
+
+    return resumen
@@ -0,0 +1,308 @@
+# ============================================================================
+# CONSULTAS DE PÓLIZAS - core/polizas.py
+# ============================================================================
+# Listado de pólizas con filtros, búsqueda y orden resueltos en SQL y
+# paginación por keyset (fecha_inicio, id). Cada página lee solo `limite`
+# filas con los nombres de cliente y aseguradora ya unidos, así el costo de
+# la pantalla "Leer" depende del tamaño de página y no del tamaño de la
+# cartera. No depende de Streamlit.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha de registro de la factura
+
+from core.consultas import polizas_de_cliente as _consulta_polizas_de_cliente  # SQL del lookup por cliente
+from core.db import connection, unit_of_work  # Pool de conexiones compartido
+from core.migrations import get_columns  # Columnas de polizas
+from core.migrations import _M008_CATEGORIAS, _m008_categoria, _m008_reparar_cliente_id  # Reglas de la migración 8
+from core.migrations import _m008_normalizar as _normalizar  # Minúsculas sin tildes (también core/ingesta_polizas.py)
+from core.money import MONTOS_POLIZA, centavos_de  # Montos en centavos
+from core.secuencias import siguiente_numero_factura, siguiente_numero_poliza  # Numeración atómica
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+TAMANO_PAGINA = 20  # Pólizas por página en la grilla de tarjetas
+SIN_ESTADO = "Sin estado"  # Etiqueta para pólizas con estado vacío
+
+# Categorías de ramo (ramos_seguros.categoria) y palabras clave del nombre del
+# ramo que las identifican; coinciden con siniestros.tipo_siniestro
+CATEGORIAS_RAMO = _M008_CATEGORIAS
+
+# Nombre visible del cliente: razón social para empresas, nombres y apellidos para personas
+_NOMBRE_CLIENTE_SQL = """
+    CASE
+        WHEN lower(COALESCE(c.tipo_cliente, '')) IN ('persona jurídica', 'persona juridica', 'empresa')
+            THEN COALESCE(c.razon_social, '')
+        ELSE trim(COALESCE(c.nombres, '') || ' ' || COALESCE(c.apellidos, ''))
+    END
+"""
+
+# Columnas de cada fila del listado (en este orden)
+COLUMNAS_LISTADO = (
+    "id", "numero_poliza", "cliente_id", "aseguradora_id", "fecha_inicio", "fecha_fin",
+    "tomador_nombre", "estado", "suma_asegurada", "prima_neta", "cliente_nombre", "aseguradora_nombre",
+)
+
+_SELECT_LISTADO = f"""
+    SELECT p.id, p.numero_poliza, p.cliente_id, p.aseguradora_id, p.fecha_inicio, p.fecha_fin,
+           p.tomador_nombre, p.estado, p.suma_asegurada, p.prima_neta,
+           {_NOMBRE_CLIENTE_SQL} AS cliente_nombre,
+           a.razon_social AS aseguradora_nombre
+    FROM polizas p
+    LEFT JOIN clients c ON c.id = p.cliente_id
+    LEFT JOIN aseguradoras a ON a.id = p.aseguradora_id
+"""
+
+
+# ============================================================================
+# FUNCIÓN: _filtros_sql
+# Condiciones WHERE comunes al listado y al conteo
+# ============================================================================
+def _filtros_sql(estados=None, aseguradora_ids=None, buscar=None):
+    """
+    Construye las condiciones de filtro
+
+    Parámetros:
+        estados (list): Estados a incluir (SIN_ESTADO incluye los vacíos); None = todos
+        aseguradora_ids (list): IDs de aseguradora a incluir; None = todas
+        buscar (str): Texto contenido en el número de póliza (sin distinguir mayúsculas)
+
+    Retorna:
+        tuple: (lista de condiciones SQL, lista de parámetros)
+    """
+    condiciones = []
+    params = []
+
+    if estados:
+        valores = [e for e in estados if e != SIN_ESTADO]
+        partes = []
+        if valores:
+            partes.append(f"p.estado IN ({', '.join('?' for _ in valores)})")
+            params.extend(valores)
+        if SIN_ESTADO in estados:
+            partes.append("COALESCE(p.estado, '') = ''")
+        condiciones.append(f"({' OR '.join(partes)})")
+
+    if aseguradora_ids:
+        condiciones.append(f"p.aseguradora_id IN ({', '.join('?' for _ in aseguradora_ids)})")
+        params.extend(aseguradora_ids)
+
+    if buscar and buscar.strip():
+        # LIKE de SQLite no distingue mayúsculas en ASCII; se escapan los comodines del usuario
+        patron = buscar.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        condiciones.append("p.numero_poliza LIKE ? ESCAPE '\\'")
+        params.append(f"%{patron}%")
+
+    return condiciones, params
+
+
+# ============================================================================
+# FUNCIÓN: consulta_listado
+# SQL de una página del listado (también usada por test_query_plans.py)
+# ============================================================================
+def consulta_listado(estados=None, aseguradora_ids=None, buscar=None, despues_de=None,
+                     limite=TAMANO_PAGINA):
+    """
+    Construye la consulta de una página ordenada por fecha de inicio descendente
+
+    Parámetros:
+        estados (list): Filtro de estados (ver _filtros_sql)
+        aseguradora_ids (list): Filtro de aseguradoras
+        buscar (str): Búsqueda por número de póliza
+        despues_de (tuple): Cursor (fecha_inicio, id) de la última fila de la página anterior
+        limite (int): Tamaño de la página
+
+    Retorna:
+        tuple: (consulta SQL, lista de parámetros)
+    """
+    condiciones, params = _filtros_sql(estados, aseguradora_ids, buscar)
+    if despues_de is not None:
+        # Comparación de valores de fila: continúa justo después de la última fila vista
+        condiciones.append("(p.fecha_inicio, p.id) < (?, ?)")
+        params.extend(despues_de)
+
+    query = _SELECT_LISTADO
+    if condiciones:
+        query += " WHERE " + " AND ".join(condiciones)
+    # Se pide una fila extra para saber si existe una página siguiente
+    query += " ORDER BY p.fecha_inicio DESC, p.id DESC LIMIT ?"
+    params.append(limite + 1)
+    return query, params
+
+
+# ============================================================================
+# FUNCIÓN: listar_polizas
+# Una página del listado con paginación por keyset
+# ============================================================================
+def listar_polizas(estados=None, aseguradora_ids=None, buscar=None, despues_de=None,
+                   limite=TAMANO_PAGINA, db_file=None):
+    """
+    Retorna una página de pólizas ordenadas por fecha de inicio descendente
+
+    Parámetros:
+        (los de consulta_listado)
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        tuple: (lista de dicts con COLUMNAS_LISTADO, cursor de la página siguiente o None)
+    """
+    query, params = consulta_listado(estados, aseguradora_ids, buscar, despues_de, limite)
+    with connection(db_file) as conn:
+        rows = conn.execute(query, params).fetchall()
+
+    filas = [dict(zip(COLUMNAS_LISTADO, row)) for row in rows[:limite]]
+    siguiente = None
+    if len(rows) > limite:
+        ultima = filas[-1]
+        siguiente = (ultima["fecha_inicio"], ultima["id"])
+    return filas, siguiente
+
+
+def contar_polizas(estados=None, aseguradora_ids=None, buscar=None, db_file=None):
+    """
+    Cuenta las pólizas que cumplen los filtros (sin leerlas)
+
+    Retorna:
+        int: Número de pólizas
+    """
+    condiciones, params = _filtros_sql(estados, aseguradora_ids, buscar)
+    query = "SELECT COUNT(*) FROM polizas p"
+    if condiciones:
+        query += " WHERE " + " AND ".join(condiciones)
+    with connection(db_file) as conn:
+        return conn.execute(query, params).fetchone()[0]
+
+
+def estados_de_polizas(db_file=None):
+    """
+    Estados presentes en la cartera para el filtro (vacíos como SIN_ESTADO)
+
+    Retorna:
+        list: Estados ordenados alfabéticamente
+    """
+    with connection(db_file) as conn:
+        rows = conn.execute("SELECT DISTINCT estado FROM polizas ORDER BY estado").fetchall()
+    estados = {row[0] if row[0] else SIN_ESTADO for row in rows}
+    return sorted(estados)
+
+
+# ============================================================================
+# PÓLIZAS DE UN CLIENTE POR CATEGORÍA DE RAMO
+# ============================================================================
+def categoria_de_ramo(nombre):
+    """
+    Categoría de un ramo según su nombre ("Vehículos" -> "Vehicular")
+
+    Retorna:
+        str: Clave de CATEGORIAS_RAMO, o None si el ramo no es de ninguna
+    """
+    return _m008_categoria(nombre)
+
+
+def polizas_de_cliente(cliente_id, categoria=None, db_file=None):
+    """
+    Pólizas de un cliente por cliente_id indexado, filtradas por categoría de ramo
+
+    Parámetros:
+        cliente_id (int): ID del cliente
+        categoria (str): Clave de CATEGORIAS_RAMO (None = todas)
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        list: Tuplas (id, numero_poliza, ramo_id, estado, aseguradora, ramos)
+    """
+    query, params = _consulta_polizas_de_cliente(cliente_id, categoria)
+    with connection(db_file) as conn:
+        return conn.execute(query, params).fetchall()
+
+
+# ============================================================================
+# REPARACIÓN DE cliente_id EN PÓLIZAS HEREDADAS
+# Usada por scripts/reparar_cliente_id.py
+# ============================================================================
+def reparar_cliente_id(conn, escribir=True):
+    """
+    Completa polizas.cliente_id a partir de tomador_nombre
+
+    El formulario de pólizas guardaba el cliente solo en tomador_nombre
+    ("Nombres Apellidos (Persona Natural) [ID: 49]") y dejaba cliente_id
+    vacío. Se usa el ID entre corchetes si existe; si no, el nombre exacto
+    (sin tildes ni mayúsculas) cuando corresponde a un único cliente.
+
+    Parámetros:
+        conn: Conexión (el llamador controla la transacción)
+        escribir (bool): Si es False solo calcula, sin actualizar
+
+    Retorna:
+        tuple: (lista de (poliza_id, cliente_id) reparadas, lista de (poliza_id, tomador_nombre) sin resolver)
+    """
+    return _m008_reparar_cliente_id(conn, escribir)
+
+
+# ============================================================================
+# FUNCIÓN: create_policy_with_invoice
+# Alta de una póliza y su factura en una sola transacción
+# ============================================================================
+def create_policy_with_invoice(poliza, factura=None, db_file=None):
+    """
+    Inserta la póliza y, si se indica, su factura ligada con un único commit
+
+    Si cualquiera de los INSERT falla (p. ej. número de póliza repetido) se
+    revierte todo: no quedan facturas huérfanas ni números de factura gastados.
+
+    Parámetros:
+        poliza (dict): Valores por columna de `polizas`; las columnas ausentes
+                       quedan NULL (o con su DEFAULT), cliente_id se toma de tomador_id si falta,
+                       sin numero_poliza se asigna el interno (PRG-n) de la secuencia y
+                       las columnas *_centavos se calculan de los montos de texto
+        factura (dict): Valores de `facturas` (monto_neto, impuestos, iva, total,
+                        fecha_emision, numero_factura...); sin numero_factura se
+                        asigna el siguiente de la secuencia. None = sin factura.
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        tuple: (id de la póliza, id de la factura o None)
+
+    Lanza:
+        sqlite3.IntegrityError: Si el número de póliza o de factura ya existe
+    """
+    datos = dict(poliza)
+    if not datos.get("cliente_id"):
+        datos["cliente_id"] = datos.get("tomador_id")
+    datos.update(centavos_de(datos, MONTOS_POLIZA))
+
+    columnas_poliza = [col for col in get_columns("polizas", db_file) if col != "id"]
+
+    with unit_of_work(db_file, immediate=True) as conn:
+        # El número interno se toma en la misma transacción: si el alta falla no se gasta
+        if not str(datos.get("numero_poliza") or "").strip():
+            datos["numero_poliza"] = siguiente_numero_poliza(conn=conn)
+        if factura is not None:
+            factura = dict(factura)
+            if not str(factura.get("numero_factura") or "").strip():
+                factura["numero_factura"] = siguiente_numero_factura(conn=conn)
+            # La póliza guarda el mismo número que su factura
+            if not str(datos.get("numero_factura") or "").strip():
+                datos["numero_factura"] = factura["numero_factura"]
+
+        # Solo las columnas con valor: las demás quedan NULL y no '' (aseguradora_id, ramo_id...)
+        columnas = [col for col in columnas_poliza if col in datos]
+        poliza_id = conn.execute(
+            f"INSERT INTO polizas ({', '.join(columnas)}) VALUES ({', '.join('?' for _ in columnas)})",
+            [datos[col] for col in columnas],
+        ).lastrowid
+
+        factura_id = None
+        if factura is not None:
+            factura["poliza_id"] = poliza_id
+            factura.setdefault("cliente_id", datos["cliente_id"])
+            factura.setdefault("estado", "Emitida")
+            factura.setdefault("fecha_registro", datetime.date.today().strftime("%Y-%m-%d"))
+            campos = list(factura)
+            factura_id = conn.execute(
+                f"INSERT INTO facturas ({', '.join(campos)}) VALUES ({', '.join('?' for _ in campos)})",
+                [factura[campo] for campo in campos],
+            ).lastrowid
+
+    return poliza_id, factura_id
@@ -0,0 +1,224 @@
+# ============================================================================
+# RENOVACIONES - core/renovaciones.py
+# ============================================================================
+# Pólizas activas que se acercan a su fecha_fin:
+#
+#   - Calendario de vencimientos: el índice idx_polizas_vencimientos
+#     (estado, fecha_fin, ejecutivo_comercial_id, aseguradora_id; migración
+#     16) cubre los conteos por ventana de 30/60/90 días agrupados por
+#     ejecutivo comercial o aseguradora, sin leer las filas de polizas.
+#   - Lista de trabajo: `renovaciones` guarda una fila por póliza dentro del
+#     horizonte con su ventana y el estado de la gestión. La genera cada
+#     noche generar_lista_renovacion() (scripts/generar_renovaciones.py):
+#     agrega las pólizas que entran al horizonte, actualiza fecha y ventana
+#     de las existentes sin perder la gestión (salvo que la póliza tenga otra
+#     fecha_fin: es un nuevo período) y retira las pendientes que ya no
+#     aplican (renovadas con nueva fecha_fin, canceladas) y las de períodos
+#     ya terminados.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha de corte y ventanas
+
+from core.db import connection, unit_of_work  # Pool de conexiones y transacciones
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+VENTANAS = (30, 60, 90)  # Días hasta fecha_fin
+ESTADO_RENOVABLE = "Activa"  # Estado de las pólizas que se renuevan
+ESTADOS_GESTION = ("Pendiente", "Contactado", "Cotizada", "Renovada", "No renueva")
+
+# Agrupaciones del reporte: columna de polizas y nombre a mostrar
+AGRUPACIONES = {
+    "ejecutivo": (
+        "ejecutivo_comercial_id",
+        "LEFT JOIN users g ON g.id = p.ejecutivo_comercial_id",
+        "coalesce(nullif(trim(ifnull(g.nombres, '') || ' ' || ifnull(g.apellidos, '')), ''), g.username, 'Sin ejecutivo')",
+    ),
+    "aseguradora": (
+        "aseguradora_id",
+        "LEFT JOIN aseguradoras g ON g.id = p.aseguradora_id",
+        "coalesce(g.nombre_comercial, g.razon_social, 'Sin aseguradora')",
+    ),
+}
+
+
+def limites(hoy=None, ventanas=VENTANAS):
+    """
+    Fechas de corte de cada ventana
+
+    Retorna:
+        tuple: (hoy "AAAA-MM-DD", [fecha límite de cada ventana])
+    """
+    hoy = hoy or datetime.date.today()
+    if isinstance(hoy, str):
+        hoy = datetime.date.fromisoformat(hoy)
+    return hoy.isoformat(), [(hoy + datetime.timedelta(days=dias)).isoformat() for dias in ventanas]
+
+
+# ============================================================================
+# CALENDARIO DE VENCIMIENTOS
+# ============================================================================
+def consulta_vencimientos(agrupar_por="ejecutivo", hoy=None, ventanas=VENTANAS):
+    """
+    Construye la consulta de pólizas activas por vencer en cada ventana, por grupo
+
+    Parámetros:
+        agrupar_por (str): "ejecutivo" o "aseguradora"
+        hoy (date | str): Fecha de corte (por defecto hoy)
+        ventanas (tuple): Días de cada ventana, de menor a mayor (acumuladas)
+
+    Retorna:
+        tuple: (consulta SQL, parámetros); columnas: id del grupo, nombre y una por ventana
+    """
+    columna, union, nombre = AGRUPACIONES[agrupar_por]
+    desde, cortes = limites(hoy, ventanas)
+    conteos = ", ".join(f"SUM(p.fecha_fin <= ?)" for _ in ventanas)
+    return (
+        f"""SELECT p.{columna}, {nombre}, {conteos}
+            FROM polizas p {union}
+            WHERE p.estado = ? AND p.fecha_fin BETWEEN ? AND ?
+            GROUP BY p.{columna}
+            ORDER BY COUNT(*) DESC""",
+        (*cortes, ESTADO_RENOVABLE, desde, cortes[-1]),
+    )
+
+
+def vencimientos(agrupar_por="ejecutivo", hoy=None, ventanas=VENTANAS, db_file=None):
+    """
+    Pólizas activas que vencen en los próximos 30/60/90 días por ejecutivo o aseguradora
+
+    Retorna:
+        list: Tuplas (id del grupo, nombre, en_30, en_60, en_90); las ventanas son acumuladas
+    """
+    with connection(db_file) as conn:
+        return conn.execute(*consulta_vencimientos(agrupar_por, hoy, ventanas)).fetchall()
+
+
+# ============================================================================
+# LISTA DE TRABAJO
+# ============================================================================
+def generar_lista_renovacion(hoy=None, ventanas=VENTANAS, db_file=None):
+    """
+    Materializa la lista de renovación (tarea nocturna)
+
+    Parámetros:
+        hoy (date | str): Fecha de corte (por defecto hoy)
+        ventanas (tuple): Días de cada ventana; la mayor es el horizonte de la lista
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        dict: {"en_lista": n, "nuevas": n, "retiradas": n, "fecha": hoy}
+    """
+    desde, cortes = limites(hoy, ventanas)
+    ventana = " ".join(f"WHEN p.fecha_fin <= ? THEN {dias}" for dias in ventanas)
+    ahora = datetime.datetime.now().isoformat(timespec="seconds")
+    with unit_of_work(db_file, immediate=True) as conn:
+        antes = conn.execute("SELECT COUNT(*) FROM renovaciones").fetchone()[0]
+        retiradas = conn.execute(
+            """DELETE FROM renovaciones
+               WHERE fecha_fin < ? OR (estado_gestion = 'Pendiente' AND NOT EXISTS (
+                   SELECT 1 FROM polizas p
+                   WHERE p.id = renovaciones.poliza_id AND p.estado = ? AND p.fecha_fin BETWEEN ? AND ?
+               ))""",
+            (desde, ESTADO_RENOVABLE, desde, cortes[-1]),
+        ).rowcount
+        conn.execute(
+            f"""INSERT INTO renovaciones (
+                    poliza_id, numero_poliza, cliente_id, ejecutivo_comercial_id, aseguradora_id, ramo_id,
+                    fecha_fin, ventana, prima_neta_centavos, fecha_generacion
+                )
+                SELECT p.id, p.numero_poliza, p.cliente_id, p.ejecutivo_comercial_id, p.aseguradora_id, p.ramo_id,
+                       p.fecha_fin, CASE {ventana} END, p.prima_neta_centavos, ?
+                FROM polizas p
+                WHERE p.estado = ? AND p.fecha_fin BETWEEN ? AND ?
+                ON CONFLICT (poliza_id) DO UPDATE SET
+                    numero_poliza = excluded.numero_poliza,
+                    cliente_id = excluded.cliente_id,
+                    ejecutivo_comercial_id = excluded.ejecutivo_comercial_id,
+                    aseguradora_id = excluded.aseguradora_id,
+                    ramo_id = excluded.ramo_id,
+                    ventana = excluded.ventana,
+                    prima_neta_centavos = excluded.prima_neta_centavos,
+                    fecha_generacion = excluded.fecha_generacion,
+                    -- Otra fecha_fin es un nuevo período: la gestión empieza de nuevo
+                    estado_gestion = CASE WHEN renovaciones.fecha_fin = excluded.fecha_fin
+                                          THEN renovaciones.estado_gestion ELSE 'Pendiente' END,
+                    observaciones = CASE WHEN renovaciones.fecha_fin = excluded.fecha_fin
+                                         THEN renovaciones.observaciones END,
+                    fecha_gestion = CASE WHEN renovaciones.fecha_fin = excluded.fecha_fin
+                                         THEN renovaciones.fecha_gestion END,
+                    fecha_fin = excluded.fecha_fin""",
+            (*cortes, ahora, ESTADO_RENOVABLE, desde, cortes[-1]),
+        )
+        en_lista = conn.execute("SELECT COUNT(*) FROM renovaciones").fetchone()[0]
+    return {"en_lista": en_lista, "nuevas": en_lista - antes + retiradas, "retiradas": retiradas, "fecha": desde}
+
+
+def consulta_lista(ejecutivo_id=None, aseguradora_id=None, ventana=None, estado_gestion=None):
+    """
+    Construye la consulta de la lista de renovación con filtros opcionales
+
+    Retorna:
+        tuple: (consulta SQL, lista de parámetros)
+    """
+    filtros, parametros = [], []
+    for columna, valor in (
+        ("r.ejecutivo_comercial_id", ejecutivo_id),
+        ("r.aseguradora_id", aseguradora_id),
+        ("r.ventana", ventana),
+        ("r.estado_gestion", estado_gestion),
+    ):
+        if valor is not None:
+            filtros.append(f"{columna} = ?")
+            parametros.append(valor)
+    query = f"""
+        SELECT r.poliza_id, r.numero_poliza, trim(ifnull(c.nombres, '') || ' ' || ifnull(c.apellidos, '')),
+               coalesce(a.nombre_comercial, a.razon_social), r.fecha_fin, r.ventana, r.prima_neta_centavos,
+               r.estado_gestion, r.observaciones, r.ejecutivo_comercial_id
+        FROM renovaciones r
+        LEFT JOIN clients c ON c.id = r.cliente_id
+        LEFT JOIN aseguradoras a ON a.id = r.aseguradora_id
+        WHERE {' AND '.join(filtros) or '1'}
+        ORDER BY r.fecha_fin, r.poliza_id
+    """
+    return query, parametros
+
+
+def lista_renovacion(ejecutivo_id=None, aseguradora_id=None, ventana=None, estado_gestion=None, db_file=None):
+    """
+    Pólizas de la lista de renovación, de la que vence primero a la última
+
+    Retorna:
+        list: Tuplas (poliza_id, numero_poliza, cliente, aseguradora, fecha_fin, ventana,
+              prima_neta_centavos, estado_gestion, observaciones, ejecutivo_comercial_id)
+    """
+    with connection(db_file) as conn:
+        return conn.execute(*consulta_lista(ejecutivo_id, aseguradora_id, ventana, estado_gestion)).fetchall()
+
+
+def ultima_generacion(db_file=None):
+    """Fecha/hora de la última generación de la lista, o None si nunca se generó."""
+    with connection(db_file) as conn:
+        return conn.execute("SELECT MAX(fecha_generacion) FROM renovaciones").fetchone()[0]
+
+
+def registrar_gestion(poliza_id, estado_gestion, observaciones=None, db_file=None):
+    """
+    Actualiza el estado de la gestión de renovación de una póliza
+
+    Retorna:
+        tuple: (True/False, mensaje)
+    """
+    if estado_gestion not in ESTADOS_GESTION:
+        return False, f"Estado de gestión no válido: {estado_gestion}"
+    ahora = datetime.datetime.now().isoformat(timespec="seconds")
+    with unit_of_work(db_file) as conn:
+        cambios = conn.execute(
+            "UPDATE renovaciones SET estado_gestion = ?, observaciones = ?, fecha_gestion = ? WHERE poliza_id = ?",
+            (estado_gestion, observaciones, ahora, poliza_id),
+        ).rowcount
+    if not cambios:
+        return False, "La póliza no está en la lista de renovación."
+    return True, "Gestión registrada."
@@ -0,0 +1,166 @@
+# ============================================================================
+# SECUENCIAS DE NUMERACIÓN - core/secuencias.py
+# ============================================================================
+# Generador atómico de números para pólizas internas (PRG-n), siniestros
+# (SIN-VEH-001 / SIN-SAL-001), facturas y notas de crédito. Antes cada número
+# se calculaba leyendo la última fila (ORDER BY id DESC / LIKE 'SIN-VEH-%') y
+# dos sesiones simultáneas podían obtener el mismo valor y fallar después en
+# la restricción UNIQUE.
+#
+# Los códigos de movimiento automáticos (MOV-000001) los usa el motor de
+# movimientos en lote (core/movimientos.py).
+#
+# Cada secuencia es una fila de la tabla `secuencias` (migración 6). El
+# incremento se hace con UPDATE dentro de BEGIN IMMEDIATE, así SQLite
+# serializa a los escritores y ningún número se entrega dos veces. Para
+# procesos que emiten muchos números seguidos (importaciones, lotes) se
+# puede reservar un bloque por proceso con configurar_bloque(): los números
+# del bloque se entregan desde memoria sin tocar la base.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha en los números de factura y nota de crédito
+import os  # PID para no compartir bloques entre procesos hijos
+import threading  # Lock de los bloques reservados en memoria
+
+from core.db import unit_of_work  # Transacciones con BEGIN IMMEDIATE
+from core.migrations import _M006_ORIGENES, _ultimo_numero  # Orígenes y lectura de la migración 6
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+POLIZA = "poliza"
+SINIESTRO_VEHICULAR = "siniestro_vehicular"
+SINIESTRO_SALUD = "siniestro_salud"
+FACTURA = "factura"
+NOTA_CREDITO = "nota_credito"
+MOVIMIENTO = "movimiento"
+
+# Para cada secuencia: (tabla, columna, prefijo LIKE) de donde se toma el valor
+# inicial al crear la tabla; los códigos ya emitidos no se vuelven a entregar
+# (las de la migración 6 más la de movimientos de la migración 11)
+ORIGENES = {
+    **_M006_ORIGENES,
+    MOVIMIENTO: ("movimientos_poliza", "codigo_movimiento", "MOV-"),
+}
+
+# ============================================================================
+# ESTADO DEL PROCESO: bloques reservados
+# ============================================================================
+_lock = threading.Lock()
+_tamanos_bloque = {}  # {nombre: tamaño}; por defecto 1 (sin reserva)
+_bloques = {}  # {(pid, ruta, nombre): [siguiente, último]}
+
+
+# ============================================================================
+# FUNCIÓN: valor_inicial
+# Mayor número ya usado para una secuencia
+# ============================================================================
+def valor_inicial(conn, nombre):
+    """
+    Busca el mayor número final entre los códigos existentes de la secuencia
+
+    Parámetros:
+        conn: Conexión abierta
+        nombre (str): Secuencia (clave de ORIGENES)
+
+    Retorna:
+        int: Último número usado (0 si no hay códigos)
+    """
+    return _ultimo_numero(conn, *ORIGENES[nombre])
+
+
+def _incrementar(conn, nombre, cantidad):
+    """Suma `cantidad` a la secuencia en la transacción de `conn` y retorna el nuevo valor."""
+    conn.execute("INSERT OR IGNORE INTO secuencias (nombre, valor) VALUES (?, 0)", (nombre,))
+    conn.execute("UPDATE secuencias SET valor = valor + ? WHERE nombre = ?", (cantidad, nombre))
+    return conn.execute("SELECT valor FROM secuencias WHERE nombre = ?", (nombre,)).fetchone()[0]
+
+
+# ============================================================================
+# FUNCIÓN: siguiente
+# Asigna el siguiente número de una secuencia
+# ============================================================================
+def siguiente(nombre, db_file=None, conn=None):
+    """
+    Retorna el siguiente número de la secuencia (nunca repetido)
+
+    Parámetros:
+        nombre (str): Secuencia, p. ej. FACTURA
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+        conn: Conexión con una transacción de escritura ya abierta; si se pasa,
+              el número se asigna dentro de ella (y se revierte con ella).
+              Sin conn se usa una transacción BEGIN IMMEDIATE propia.
+
+    Retorna:
+        int: Número asignado
+    """
+    if conn is not None:
+        return _incrementar(conn, nombre, 1)
+
+    tamano = _tamanos_bloque.get(nombre, 1)
+    if tamano <= 1:
+        with unit_of_work(db_file, immediate=True) as conn_sec:
+            return _incrementar(conn_sec, nombre, 1)
+
+    clave = (os.getpid(), os.path.abspath(db_file) if db_file else None, nombre)
+    with _lock:
+        bloque = _bloques.get(clave)
+        if bloque is None or bloque[0] > bloque[1]:
+            # Reservar un bloque completo con un solo incremento
+            with unit_of_work(db_file, immediate=True) as conn_sec:
+                ultimo = _incrementar(conn_sec, nombre, tamano)
+            bloque = _bloques[clave] = [ultimo - tamano + 1, ultimo]
+        numero = bloque[0]
+        bloque[0] += 1
+        return numero
+
+
+def configurar_bloque(nombre, tamano):
+    """
+    Activa la reserva de bloques por proceso para una secuencia
+
+    Los números sobrantes de un bloque se pierden al terminar el proceso, por
+    lo que no debe usarse para numeraciones que deban ser consecutivas
+    (facturas y notas de crédito quedan con tamaño 1 por defecto).
+
+    Parámetros:
+        nombre (str): Secuencia
+        tamano (int): Números por reserva (1 desactiva la reserva)
+    """
+    with _lock:
+        _tamanos_bloque[nombre] = max(1, int(tamano))
+        for clave in [c for c in _bloques if c[2] == nombre]:
+            del _bloques[clave]
+
+
+# ============================================================================
+# FORMATOS DE CÓDIGO
+# ============================================================================
+def siguiente_numero_poliza(db_file=None, conn=None):
+    """Número interno de póliza: PRG-1, PRG-2, ..."""
+    return f"PRG-{siguiente(POLIZA, db_file, conn)}"
+
+
+def siguiente_codigo_siniestro(tipo_siniestro, db_file=None, conn=None):
+    """Código de siniestro: SIN-VEH-001 para vehiculares, SIN-SAL-001 para el resto."""
+    if tipo_siniestro == "Vehicular":
+        return f"SIN-VEH-{siguiente(SINIESTRO_VEHICULAR, db_file, conn):03d}"
+    return f"SIN-SAL-{siguiente(SINIESTRO_SALUD, db_file, conn):03d}"
+
+
+def siguiente_numero_factura(fecha=None, db_file=None, conn=None):
+    """Número de factura: F-AAAAMMDD-00001 (el correlativo no se reinicia por día)."""
+    fecha = fecha or datetime.date.today()
+    return f"F-{fecha.strftime('%Y%m%d')}-{siguiente(FACTURA, db_file, conn):05d}"
+
+
+def siguiente_numero_nota(fecha=None, db_file=None, conn=None):
+    """Número de nota de crédito: NC-AAAAMMDD-00001."""
+    fecha = fecha or datetime.date.today()
+    return f"NC-{fecha.strftime('%Y%m%d')}-{siguiente(NOTA_CREDITO, db_file, conn):05d}"
+
+
+def siguiente_codigo_movimiento(db_file=None, conn=None):
+    """Código de movimiento automático: MOV-000001."""
+    return f"MOV-{siguiente(MOVIMIENTO, db_file, conn):06d}"
@@ -0,0 +1,336 @@
+# ============================================================================
+# SERVICIOS DE NEGOCIO - core/servicios.py
+# ============================================================================
+# Capa de servicios sin Streamlit para clientes, pólizas, desglose de primas y
+# movimientos. Cada operación recibe un objeto de solicitud tipado (dataclass)
+# y retorna un objeto de respuesta, en lugar de mensajes pensados para la UI.
+# La usan las páginas de Streamlit (crud/client_crud.py, Movimientos/), los
+# scripts y el endpoint HTTP/JSON local de core/api_http.py.
+#
+# Convención: las operaciones que escriben retornan Respuesta(ok, mensaje, id);
+# los errores de validación no lanzan excepciones, se informan con ok=False.
+# ============================================================================
+
+# Importaciones necesarias
+import sqlite3  # Errores de integridad
+from dataclasses import asdict, dataclass, field, fields  # Solicitudes y respuestas tipadas
+
+from core.clientes import LIMITE_RESULTADOS, buscar_clientes as _buscar_clientes
+from core.db import unit_of_work  # Transacciones
+from core.documentos import encolar_movimientos  # PDF en segundo plano
+from core.migrations import get_columns  # Columnas válidas de clients
+from core.money import calcular_desglose  # Desglose de la prima
+from core.movimientos import TAMANO_LOTE, aplicar_movimientos as _aplicar_movimientos
+from core.polizas import polizas_de_cliente as _polizas_de_cliente
+
+_LONGITUD_DOCUMENTO = {"cedula": 10, "ruc": 13}
+
+
+def a_dict(objeto):
+    """Convierte una respuesta (dataclass o lista de dataclasses) a tipos JSON."""
+    if isinstance(objeto, list):
+        return [a_dict(o) for o in objeto]
+    return asdict(objeto)
+
+
+# ============================================================================
+# RESPUESTA GENÉRICA
+# ============================================================================
+@dataclass
+class Respuesta:
+    """Resultado de una operación de escritura."""
+
+    ok: bool
+    mensaje: str
+    id: int | None = None
+
+
+# ============================================================================
+# CLIENTES
+# ============================================================================
+@dataclass
+class ClienteRequest:
+    """
+    Datos de un cliente nuevo o modificado
+
+    Los campos principales son atributos; el resto de columnas de `clients`
+    (dirección, actividad económica, ...) van en `otros`.
+    """
+
+    tipo_cliente: str
+    tipo_documento: str
+    numero_documento: str
+    nombres: str | None = None
+    apellidos: str | None = None
+    razon_social: str | None = None
+    correo_electronico: str | None = None
+    telefono_movil: str | None = None
+    otros: dict = field(default_factory=dict)
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """Crea la solicitud desde un dict plano de columnas (formulario o JSON)."""
+        propios = {f.name for f in fields(cls)} - {"otros"}
+        datos = dict(datos)
+        otros = {k: datos.pop(k) for k in list(datos) if k not in propios}
+        otros.update(datos.pop("otros", None) or {})
+        return cls(**datos, otros=otros)
+
+    def columnas(self):
+        """Dict {columna: valor} para el INSERT/UPDATE."""
+        datos = {f.name: getattr(self, f.name) for f in fields(self) if f.name != "otros"}
+        datos.update(self.otros)
+        return datos
+
+
+@dataclass
+class ClienteResumen:
+    """Cliente en los resultados de búsqueda."""
+
+    id: int
+    etiqueta: str
+
+
+def _validar_cliente(datos, db_file):
+    """Mensaje de error de validación, o None si los datos son válidos."""
+    longitud = _LONGITUD_DOCUMENTO.get(str(datos.get("tipo_documento") or "").lower().replace("é", "e"))
+    documento = str(datos.get("numero_documento") or "")
+    if longitud == 10 and len(documento) != 10:
+        return "El número de cédula debe tener exactamente 10 dígitos."
+    if longitud == 13 and len(documento) != 13:
+        return "El número de RUC debe tener exactamente 13 dígitos."
+    desconocidas = set(datos) - set(get_columns("clients", db_file))
+    if desconocidas:
+        return f"Columnas desconocidas: {', '.join(sorted(desconocidas))}"
+    return None
+
+
+def _nombre_cliente(datos):
+    if datos.get("tipo_cliente") == "Persona Jurídica":
+        return datos.get("razon_social") or "Empresa sin nombre"
+    return f"{datos.get('nombres') or 'N/A'} {datos.get('apellidos') or 'N/A'}"
+
+
+def crear_cliente(solicitud, db_file=None):
+    """
+    Registra un cliente
+
+    Parámetros:
+        solicitud (ClienteRequest): Datos del cliente
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        Respuesta: ok, mensaje e id del cliente creado
+    """
+    datos = solicitud.columnas()
+    error = _validar_cliente(datos, db_file)
+    if error:
+        return Respuesta(False, error)
+
+    try:
+        with unit_of_work(db_file, immediate=True) as conn:
+            # Duplicado: mismos nombres, apellidos, documento y correo
+            existe = conn.execute(
+                "SELECT 1 FROM clients WHERE nombres IS ? AND apellidos IS ? AND numero_documento IS ? AND correo_electronico IS ?",
+                (datos.get("nombres"), datos.get("apellidos"), datos.get("numero_documento"), datos.get("correo_electronico")),
+            ).fetchone()
+            if existe:
+                return Respuesta(
+                    False,
+                    f"El cliente con nombre '{datos.get('nombres')} {datos.get('apellidos')}', número de documento "
+                    f"'{datos.get('numero_documento')}' y correo '{datos.get('correo_electronico')}' ya existe.",
+                )
+            cliente_id = conn.execute(
+                f"INSERT INTO clients ({', '.join(datos)}) VALUES ({', '.join('?' for _ in datos)})",
+                list(datos.values()),
+            ).lastrowid
+    except sqlite3.Error as e:
+        return Respuesta(False, f"Error al crear el cliente: {e}")
+    return Respuesta(True, f"Cliente '{_nombre_cliente(datos)}' creado exitosamente.", cliente_id)
+
+
+def actualizar_cliente(correo_electronico, cambios, db_file=None):
+    """
+    Modifica el cliente identificado por su correo (criterio del formulario de clientes)
+
+    Parámetros:
+        correo_electronico (str): Correo actual del cliente
+        cambios (dict): {columna: nuevo valor}
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        Respuesta: ok y mensaje
+    """
+    error = _validar_cliente(cambios, db_file)
+    if error:
+        return Respuesta(False, error)
+    if not cambios:
+        return Respuesta(False, "No hay cambios que guardar.")
+    try:
+        with unit_of_work(db_file) as conn:
+            cursor = conn.execute(
+                f"UPDATE clients SET {', '.join(f'{col} = ?' for col in cambios)} WHERE correo_electronico = ?",
+                [*cambios.values(), correo_electronico],
+            )
+    except sqlite3.Error as e:
+        return Respuesta(False, f"Error al modificar el cliente: {e}")
+    if cursor.rowcount == 0:
+        return Respuesta(False, f"No se encontró un cliente con correo '{correo_electronico}'.")
+    return Respuesta(True, f"Cliente con correo '{correo_electronico}' modificado exitosamente.")
+
+
+def eliminar_cliente(cliente_id, db_file=None):
+    """
+    Borra un cliente por ID
+
+    Retorna:
+        Respuesta: ok y mensaje
+    """
+    try:
+        with unit_of_work(db_file) as conn:
+            cursor = conn.execute("DELETE FROM clients WHERE id = ?", (cliente_id,))
+    except sqlite3.Error as e:
+        return Respuesta(False, f"Error al borrar el cliente: {e}")
+    if cursor.rowcount == 0:
+        return Respuesta(False, f"No se encontró un cliente con ID '{cliente_id}'.")
+    return Respuesta(True, f"Cliente con ID '{cliente_id}' borrado exitosamente.", cliente_id)
+
+
+def buscar_clientes(texto, limite=LIMITE_RESULTADOS, db_file=None):
+    """
+    Busca clientes (índice FTS5, ver core/clientes.py)
+
+    Retorna:
+        list: ClienteResumen ordenados por relevancia
+    """
+    return [ClienteResumen(*fila) for fila in _buscar_clientes(texto, limite, db_file)]
+
+
+# ============================================================================
+# PÓLIZAS
+# ============================================================================
+@dataclass
+class PolizaResumen:
+    """Póliza de un cliente."""
+
+    id: int
+    numero_poliza: str
+    ramo_id: str | None
+    estado: str | None
+    aseguradora: str
+    ramos: str | None
+
+
+def polizas_de_cliente(cliente_id, categoria=None, db_file=None):
+    """
+    Pólizas de un cliente, opcionalmente de una categoría de ramo ('Vehicular', 'Vida/Salud')
+
+    Retorna:
+        list: PolizaResumen
+    """
+    return [PolizaResumen(*fila) for fila in _polizas_de_cliente(cliente_id, categoria, db_file)]
+
+
+# ============================================================================
+# DESGLOSE DE PRIMA
+# ============================================================================
+@dataclass
+class DesgloseRequest:
+    """Prima neta y cargos a desglosar (texto o número, como en los formularios)."""
+
+    prima: str
+    derecho_emision: str | None = None
+    otros_cargos: str | None = None
+
+
+@dataclass
+class Desglose:
+    """Desglose de facturación con montos en texto decimal ("1250.50")."""
+
+    prima: str
+    contrib_scvs: str
+    seguro_campesino: str
+    derecho_emision: str
+    otros_cargos: str
+    impuestos: str
+    subtotal: str
+    iva: str
+    total: str
+
+
+def desglose_prima(solicitud):
+    """
+    Contribuciones, subtotal, IVA y total de una prima (core.money.calcular_desglose)
+
+    Retorna:
+        Desglose
+    """
+    montos = calcular_desglose(solicitud.prima, solicitud.derecho_emision, solicitud.otros_cargos)
+    return Desglose(**{clave: str(valor) for clave, valor in montos.items()})
+
+
+# ============================================================================
+# MOVIMIENTOS
+# ============================================================================
+@dataclass
+class MovimientoRequest:
+    """Un movimiento a aplicar (ver parámetros en core.movimientos.aplicar_movimientos)."""
+
+    poliza_id: int
+    tipo_movimiento: str
+    parametros: dict = field(default_factory=dict)
+
+
+@dataclass
+class MovimientoAplicado:
+    poliza_id: int
+    movimiento_id: int
+    codigo_movimiento: str
+
+
+@dataclass
+class MovimientoRechazado:
+    posicion: int
+    poliza_id: int
+    tipo_movimiento: str
+    motivo: str
+
+
+@dataclass
+class ResultadoMovimientos:
+    """Resumen de aplicar una lista de movimientos."""
+
+    aplicados: int
+    documentos: int
+    movimientos: list
+    rechazados: list
+
+
+def aplicar_movimientos(solicitudes, usuario_id=None, emitir_documentos=False, tamano=TAMANO_LOTE,
+                        progreso=None, generar_pdf=False, db_file=None):
+    """
+    Aplica movimientos con una transacción por lote (core/movimientos.py)
+
+    Parámetros:
+        solicitudes (list): MovimientoRequest
+        usuario_id (int): Usuario que registra los movimientos
+        emitir_documentos (bool): Factura / nota de crédito por defecto en los cambios de prima
+        generar_pdf (bool): Encolar los PDF de los movimientos y sus documentos (core/documentos.py);
+                            se generan en segundo plano y no retrasan la respuesta
+
+    Retorna:
+        ResultadoMovimientos
+    """
+    resumen = _aplicar_movimientos(
+        [(s.poliza_id, s.tipo_movimiento, s.parametros) for s in solicitudes],
+        usuario_id=usuario_id, emitir_documentos=emitir_documentos,
+        tamano=tamano, progreso=progreso, db_file=db_file,
+    )
+    if generar_pdf and resumen["movimientos"]:
+        encolar_movimientos([m[1] for m in resumen["movimientos"]], db_file=db_file)
+    return ResultadoMovimientos(
+        aplicados=resumen["aplicados"],
+        documentos=resumen["documentos"],
+        movimientos=[MovimientoAplicado(*m) for m in resumen["movimientos"]],
+        rechazados=[MovimientoRechazado(*r) for r in resumen["rechazados"]],
+    )
@@ -0,0 +1,183 @@
+# ============================================================================
+# SINIESTRALIDAD - core/siniestralidad.py
+# ============================================================================
+# Índice de siniestralidad = siniestros incurridos / prima devengada, por
+# ramo, aseguradora o cliente y por mes, año o todo el rango, en una sola
+# consulta SQL:
+#
+#   - Prima devengada: la prima neta (centavos) de cada póliza vigente se
+#     reparte por días entre fecha_inicio y fecha_fin; a cada período le
+#     toca la parte de los días que caen en él.
+#   - Incurrido: monto aprobado del siniestro o, si aún no lo tiene, el
+#     monto estimado, por fecha de ocurrencia; los rechazados no cuentan.
+#   - Funciones de ventana: índice acumulado del grupo hasta cada período y
+#     índice del grupo en todo el rango.
+#
+# Los resultados se guardan en la caché de core/catalogos.py; el CRUD de
+# siniestros invalida "siniestros" al registrar, actualizar o eliminar, y el
+# TTL acota lo que tarda en verse un cambio de primas.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Rango de fechas del reporte
+
+from core.catalogos import catalogo  # Caché con invalidación por tabla
+from core.db import connection  # Pool de conexiones
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+ESTADOS_SIN_PRIMA = ("Borrador", "Anulada")  # Pólizas que no devengan prima
+ESTADOS_SIN_SINIESTRO = ("Rechazado",)  # Siniestros que no cuentan como incurridos
+TTL_SEGUNDOS = 600  # Vida máxima de un reporte en caché
+
+# Período del reporte: (inicio del período, paso, formato de la etiqueta)
+PERIODOS = {
+    "mes": ("start of month", "+1 month", "%Y-%m"),
+    "anio": ("start of year", "+1 year", "%Y"),
+    "total": None,  # Un solo período con todo el rango
+}
+
+# Agrupaciones del reporte: grupo de la póliza `p`, join del nombre y nombre a mostrar.
+# Las pólizas sin polizas.ramo_id (multirramo) se cuentan en su primer ramo de
+# poliza_ramos, como en core/consultas.polizas_de_cliente; el siniestro no
+# dice de qué ramo es, así que prima e incurrido de la póliza van a ese ramo.
+AGRUPACIONES = {
+    "ramo": (
+        "coalesce(p.ramo_id, (SELECT pr.ramo_id FROM poliza_ramos pr WHERE pr.poliza_id = p.id "
+        "ORDER BY pr.nro_ramo, pr.id LIMIT 1))",
+        "LEFT JOIN ramos_seguros g ON g.id = t.grupo",
+        "coalesce(g.nombre, 'Sin ramo')",
+    ),
+    "aseguradora": (
+        "p.aseguradora_id",
+        "LEFT JOIN aseguradoras g ON g.id = t.grupo",
+        "coalesce(g.nombre_comercial, g.razon_social, 'Sin aseguradora')",
+    ),
+    "cliente": (
+        "p.cliente_id",
+        "LEFT JOIN clients g ON g.id = t.grupo",
+        "coalesce(nullif(trim(ifnull(g.nombres, '') || ' ' || ifnull(g.apellidos, '')), ''), g.razon_social, 'Sin cliente')",
+    ),
+}
+
+
+def _fecha(valor):
+    """date o "AAAA-MM-DD" -> date."""
+    return datetime.date.fromisoformat(valor) if isinstance(valor, str) else valor
+
+
+def desde_predeterminado(hasta):
+    """Inicio del rango por defecto: el día siguiente a la misma fecha un año antes (29/02 -> 01/03)."""
+    try:
+        anterior = hasta.replace(year=hasta.year - 1)
+    except ValueError:  # 29 de febrero: el año anterior no es bisiesto
+        anterior = hasta.replace(year=hasta.year - 1, day=28)
+    return anterior + datetime.timedelta(days=1)
+
+
+def consulta_siniestralidad(agrupar_por="ramo", desde=None, hasta=None, periodo="mes"):
+    """
+    Construye la consulta de siniestralidad por grupo y período
+
+    Parámetros:
+        agrupar_por (str): "ramo", "aseguradora" o "cliente"
+        desde (date | str): Primer día del rango (por defecto, hace un año)
+        hasta (date | str): Último día del rango, incluido (por defecto hoy)
+        periodo (str): "mes", "anio" o "total"
+
+    Retorna:
+        tuple: (consulta SQL, parámetros); columnas: id del grupo, nombre, período,
+               prima devengada (centavos), siniestros, incurrido (centavos),
+               siniestralidad del período, acumulada y del grupo en el rango
+    """
+    grupo, union, nombre = AGRUPACIONES[agrupar_por]
+    hasta = _fecha(hasta) or datetime.date.today()
+    desde = _fecha(desde) or desde_predeterminado(hasta)
+    if PERIODOS[periodo] is None:
+        siguiente, etiqueta = ":hasta", "'{}'".format(f"{desde.isoformat()} a {hasta.isoformat()}")
+    else:
+        inicio, paso, formato = PERIODOS[periodo]
+        siguiente, etiqueta = f"min(date({{}}, '{inicio}', '{paso}'), :hasta)", f"strftime('{formato}', {{}})"
+    parametros = {
+        "desde": desde.isoformat(),
+        "hasta": (hasta + datetime.timedelta(days=1)).isoformat(),  # Exclusivo
+    }
+    sin_prima = ", ".join(f"'{e}'" for e in ESTADOS_SIN_PRIMA)
+    sin_siniestro = ", ".join(f"'{e}'" for e in ESTADOS_SIN_SINIESTRO)
+    return (
+        f"""WITH RECURSIVE periodos (inicio, fin) AS (
+                SELECT :desde, {siguiente.format(':desde')}
+                UNION ALL
+                SELECT fin, {siguiente.format('fin')} FROM periodos WHERE fin < :hasta
+            ),
+            primas AS (
+                SELECT {grupo} AS grupo, {etiqueta.format('m.inicio')} AS periodo,
+                       SUM(p.prima_neta_centavos
+                           * (julianday(min(p.fecha_fin, m.fin)) - julianday(max(p.fecha_inicio, m.inicio)))
+                           / (julianday(p.fecha_fin) - julianday(p.fecha_inicio))) AS devengada,
+                       0 AS siniestros, 0 AS incurrido
+                FROM periodos m
+                JOIN polizas p ON p.fecha_inicio < m.fin AND p.fecha_fin > m.inicio
+                WHERE p.fecha_fin > p.fecha_inicio AND ifnull(p.estado, '') NOT IN ({sin_prima})
+                GROUP BY 1, 2
+            ),
+            reclamos AS (
+                SELECT {grupo} AS grupo, {etiqueta.format('s.fecha_siniestro')} AS periodo, 0 AS devengada,
+                       COUNT(*) AS siniestros,
+                       SUM(round(coalesce(s.monto_aprobado, s.monto_estimado, 0) * 100)) AS incurrido
+                FROM siniestros s
+                JOIN polizas p ON p.id = s.poliza_id
+                WHERE s.fecha_siniestro >= :desde AND s.fecha_siniestro < :hasta
+                  AND ifnull(s.estado, '') NOT IN ({sin_siniestro})
+                GROUP BY 1, 2
+            ),
+            totales AS (
+                SELECT grupo, periodo, SUM(devengada) AS devengada, SUM(siniestros) AS siniestros,
+                       SUM(incurrido) AS incurrido
+                FROM (SELECT * FROM primas UNION ALL SELECT * FROM reclamos)
+                GROUP BY grupo, periodo
+            )
+            SELECT t.grupo, {nombre}, t.periodo, CAST(round(t.devengada) AS INTEGER), t.siniestros,
+                   CAST(t.incurrido AS INTEGER),
+                   t.incurrido / nullif(t.devengada, 0),
+                   SUM(t.incurrido) OVER acumulado / nullif(SUM(t.devengada) OVER acumulado, 0),
+                   SUM(t.incurrido) OVER del_grupo / nullif(SUM(t.devengada) OVER del_grupo, 0) AS del_rango
+            FROM totales t {union}
+            WINDOW acumulado AS (PARTITION BY t.grupo ORDER BY t.periodo),
+                   del_grupo AS (PARTITION BY t.grupo)
+            ORDER BY del_rango DESC NULLS LAST, t.grupo, t.periodo""",
+        parametros,
+    )
+
+
+@catalogo(tablas=("siniestros", "polizas"), ttl=TTL_SEGUNDOS)
+def siniestralidad(agrupar_por="ramo", desde=None, hasta=None, periodo="mes", db_file=None):
+    """
+    Siniestralidad por grupo y período (resultado en caché)
+
+    Los argumentos se pasan por posición (los usa la clave de la caché); las
+    fechas como "AAAA-MM-DD".
+
+    Retorna:
+        list: Tuplas como las columnas de consulta_siniestralidad()
+    """
+    with connection(db_file) as conn:
+        return conn.execute(*consulta_siniestralidad(agrupar_por, desde, hasta, periodo)).fetchall()
+
+
+def totales_por_grupo(filas):
+    """
+    Totales de cada grupo en el rango a partir de las filas de siniestralidad()
+
+    Retorna:
+        list: Tuplas (nombre, prima devengada, siniestros, incurrido, siniestralidad),
+              en el orden de las filas (mayor siniestralidad primero)
+    """
+    grupos = {}
+    for grupo, nombre, _, devengada, siniestros, incurrido, _, _, del_rango in filas:
+        total = grupos.setdefault(grupo, [nombre, 0, 0, 0, del_rango])
+        total[1] += devengada or 0
+        total[2] += siniestros or 0
+        total[3] += incurrido or 0
+    return [tuple(total) for total in grupos.values()]
@@ -0,0 +1,130 @@
+# ============================================================================
+# EXTRACCIÓN DE TEXTO DE PDF CON CACHÉ - core/texto_pdf.py
+# ============================================================================
+# Texto por página de los PDF (base de conocimiento, manuales) extraído con
+# PyMuPDF y guardado en SQLite (textos_pdf / textos_pdf_paginas), indexado
+# por el SHA-256 del contenido: un archivo sin cambios no se vuelve a abrir,
+# aunque se mueva o se renombre, y uno modificado se extrae de nuevo.
+#
+#   - La huella de cada ruta se memoriza por (tamaño, fecha de modificación)
+#     para no leer el archivo completo en cada rerun de Streamlit.
+#   - Los documentos grandes se reparten por rangos de páginas en un pool de
+#     procesos ("spawn", como core/documentos.py).
+#   - El texto se une con "".join(), sin concatenaciones repetidas.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Fecha de extracción
+import hashlib  # SHA-256 del contenido
+import multiprocessing  # Contexto "spawn" para los workers
+import os  # Tamaño, fecha de modificación y núcleos
+import threading  # Lock de la memoria de huellas
+from concurrent.futures import ProcessPoolExecutor  # Extracción en paralelo
+
+from core.db import connection, unit_of_work  # Caché en la base
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+PAGINAS_PARALELO = 40  # Desde cuántas páginas se reparte la extracción entre procesos
+PAGINAS_POR_TAREA = 20  # Rango de páginas que extrae cada tarea del pool
+
+_huellas = {}  # {ruta absoluta: (tamaño, mtime_ns, huella)}
+_lock = threading.Lock()
+
+
+# ============================================================================
+# EXTRACCIÓN (se ejecuta en los procesos del pool; no usa la base)
+# ============================================================================
+def _extraer_rango(ruta, desde, hasta):
+    """Texto de las páginas [desde, hasta) de un PDF."""
+    import fitz  # PyMuPDF (solo lo necesitan quienes extraen)
+
+    with fitz.open(ruta) as documento:
+        return [documento.load_page(numero).get_text() for numero in range(desde, hasta)]
+
+
+def _extraer(ruta, procesos=None):
+    """Lista con el texto de cada página; en paralelo si el documento es grande."""
+    import fitz
+
+    with fitz.open(ruta) as documento:
+        total = len(documento)
+        if total < PAGINAS_PARALELO or (procesos or os.cpu_count() or 1) < 2:
+            return [documento.load_page(numero).get_text() for numero in range(total)]
+
+    rangos = [(desde, min(desde + PAGINAS_POR_TAREA, total)) for desde in range(0, total, PAGINAS_POR_TAREA)]
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context("spawn")) as pool:
+        partes = pool.map(_extraer_rango, *zip(*[(ruta, desde, hasta) for desde, hasta in rangos]))
+        return [texto for parte in partes for texto in parte]
+
+
+# ============================================================================
+# CACHÉ
+# ============================================================================
+def huella_pdf(ruta):
+    """SHA-256 del archivo, memorizado mientras no cambien su tamaño ni su fecha de modificación."""
+    ruta = os.path.abspath(ruta)
+    estado = os.stat(ruta)
+    with _lock:
+        memorizada = _huellas.get(ruta)
+    if memorizada and memorizada[:2] == (estado.st_size, estado.st_mtime_ns):
+        return memorizada[2]
+    with open(ruta, "rb") as archivo:
+        huella = hashlib.file_digest(archivo, "sha256").hexdigest()
+    with _lock:
+        _huellas[ruta] = (estado.st_size, estado.st_mtime_ns, huella)
+    return huella
+
+
+def paginas_pdf(ruta, procesos=None, db_file=None):
+    """
+    Texto de cada página de un PDF, desde la caché o extrayéndolo una sola vez
+
+    Parámetros:
+        ruta (str): Archivo PDF
+        procesos (int): Workers para documentos grandes (por defecto uno por núcleo)
+        db_file (str): Ruta de la base de datos (por defecto DB_FILE)
+
+    Retorna:
+        list: Texto de cada página, en orden
+    """
+    huella = huella_pdf(ruta)
+    with connection(db_file) as conn:
+        registrado = conn.execute("SELECT paginas FROM textos_pdf WHERE huella = ?", (huella,)).fetchone()
+        if registrado:
+            return [fila[0] for fila in conn.execute(
+                "SELECT texto FROM textos_pdf_paginas WHERE huella = ? ORDER BY pagina", (huella,)
+            )]
+
+    paginas = _extraer(ruta, procesos)
+    # Otro proceso pudo extraer el mismo archivo a la vez: INSERT OR REPLACE deja un único resultado
+    with unit_of_work(db_file) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO textos_pdf (huella, archivo, paginas, fecha_extraccion) VALUES (?, ?, ?, ?)",
+            (huella, os.path.basename(ruta), len(paginas), datetime.datetime.now().isoformat(timespec="seconds")),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO textos_pdf_paginas (huella, pagina, texto) VALUES (?, ?, ?)",
+            [(huella, numero, texto) for numero, texto in enumerate(paginas)],
+        )
+    return paginas
+
+
+def texto_pdf(rutas, procesos=None, db_file=None):
+    """
+    Texto concatenado de varios PDF (caché por contenido, ver paginas_pdf)
+
+    Retorna:
+        str: Texto de todas las páginas de todos los archivos
+    """
+    return "".join(texto for ruta in rutas for texto in paginas_pdf(ruta, procesos, db_file))
+
+
+def limpiar_cache(db_file=None):
+    """Borra los textos de archivos extraídos; se vuelven a extraer en el siguiente uso."""
+    with _lock:
+        _huellas.clear()
+    with unit_of_work(db_file) as conn:
+        conn.execute("DELETE FROM textos_pdf_paginas")
+        conn.execute("DELETE FROM textos_pdf")
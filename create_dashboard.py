@@ -1,6 +1,7 @@
 import os
 import sqlite3
 from dbconfig import DB_FILE
+from core.db import get_connection
 import streamlit as st
 
 def create_dashboard(role_name):
@@ -41,7 +42,7 @@ def create_dashboards_for_existing_roles():
     """
     Crea dashboards para todos los roles existentes en la base de datos.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT name FROM roles")
@@ -0,0 +1,72 @@
+# ============================================================================
+# SELECTOR DE ACTIVIDAD ECONÓMICA CON BÚSQUEDA - crud/actividad_selector.py
+# ============================================================================
+# Componente para elegir una actividad CIIU: filtro por sección, campo de
+# búsqueda (código o palabras de la descripción) y un selectbox con las
+# coincidencias de core/actividades.buscar_actividades. Reemplaza el
+# selectbox que cargaba las 1.849 actividades en cada formulario de clientes.
+# ============================================================================
+
+# Importaciones necesarias
+import streamlit as st  # Framework web
+
+from core.actividades import (  # Catálogo CIIU indexado
+    LIMITE_RESULTADOS, actividad_por_codigo, buscar_actividades, etiqueta_actividad, secciones, valor_actividad,
+)
+
+
+def campo_busqueda_actividad(key):
+    """
+    Filtro de sección y campo de búsqueda (separados para poder dibujarlos fuera
+    de un st.form, donde los widgets no provocan rerun hasta el envío)
+
+    Retorna:
+        tuple: (texto de búsqueda, letra de la sección o None)
+    """
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        seccion = st.selectbox(
+            "Sección CIIU",
+            [None] + secciones(),
+            format_func=lambda s: "Todas" if s is None else f"{s[0]} · {s[1]}",
+            key=f"{key}_seccion",
+        )
+    with col2:
+        texto = st.text_input(
+            "🔎 Buscar actividad económica",
+            key=f"{key}_buscar",
+            placeholder="Código (A0113) o palabras de la descripción",
+        )
+    return texto, seccion[0] if seccion else None
+
+
+def selector_actividad(label, key, valor_actual=None, busqueda=None, limite=LIMITE_RESULTADOS):
+    """
+    Muestra un buscador de actividades y retorna la elegida
+
+    Parámetros:
+        label (str): Etiqueta del selectbox
+        key (str): Clave única del widget (la búsqueda usa f"{key}_buscar" y f"{key}_seccion")
+        valor_actual (str): Valor guardado en clients.actividad_economica ("código<TAB>descripción")
+        busqueda (tuple): (texto, sección) ya capturados con campo_busqueda_actividad(); si es
+                          None los campos de búsqueda se dibujan aquí mismo
+        limite (int): Máximo de coincidencias mostradas
+
+    Retorna:
+        str: "código<TAB>descripción" de la actividad elegida, o el valor actual si no hay coincidencias
+    """
+    texto, seccion = busqueda if busqueda is not None else campo_busqueda_actividad(key)
+    opciones = buscar_actividades(texto, seccion, limite)
+
+    # La actividad actual se conserva aunque no esté entre las coincidencias
+    actual = actividad_por_codigo(valor_actual)
+    if actual and actual not in opciones:
+        opciones.insert(0, actual)
+
+    if not opciones:
+        st.info("No hay actividades que coincidan con la búsqueda.")
+        return valor_actual
+
+    indice = opciones.index(actual) if actual else 0
+    elegida = st.selectbox(label, opciones, index=indice, format_func=etiqueta_actividad, key=key)
+    return valor_actividad(elegida)
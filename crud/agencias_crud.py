@@ -1,6 +1,8 @@
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
+from core.catalogos import invalidar
+from core.db import get_connection
 
 def crud_agencias():
     st.subheader("Gestión de Agencias")
@@ -14,7 +16,7 @@ def crud_agencias():
             email = st.text_input("Correo Electrónico")
             submit_button = st.form_submit_button("Crear Agencia")
             if submit_button:
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
                 try:
                     cursor.execute("""
@@ -22,6 +24,7 @@ def crud_agencias():
                         VALUES (?, ?, ?, ?)
                     """, (name, address, phone, email))
                     conn.commit()
+                    invalidar("companies")
                     st.success("Agencia creada exitosamente")
                 except sqlite3.IntegrityError:
                     st.error("El nombre de la agencia ya existe.")
@@ -29,7 +32,7 @@ def crud_agencias():
                     conn.close()
 
     elif operation == "Leer":
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, name, address, phone, email FROM companies")
         columns = [col[0] for col in cursor.description]
@@ -43,7 +46,7 @@ def crud_agencias():
             st.info("No hay agencias registradas.")
 
     elif operation == "Modificar":
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, name FROM companies")
         agencias = cursor.fetchall()
@@ -55,7 +58,7 @@ def crud_agencias():
             phone = st.text_input("Teléfono")
             email = st.text_input("Correo Electrónico")
             if st.button("Actualizar Agencia"):
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
                 try:
                     cursor.execute("""
@@ -64,6 +67,7 @@ def crud_agencias():
                         WHERE id = ?
                     """, (name, address, phone, email, selected_agencia[0]))
                     conn.commit()
+                    invalidar("companies")
                     st.success("Agencia actualizada exitosamente")
                 except sqlite3.IntegrityError:
                     st.error("Error al actualizar la agencia.")
@@ -71,18 +75,19 @@ def crud_agencias():
                     conn.close()
 
     elif operation == "Borrar":
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, name FROM companies")
         agencias = cursor.fetchall()
         conn.close()
         selected_agencia = st.selectbox("Selecciona una agencia para eliminar", agencias, format_func=lambda x: x[1])
         if st.button("Eliminar Agencia"):
-            conn = sqlite3.connect(DB_FILE)
+            conn = get_connection()
             cursor = conn.cursor()
             try:
                 cursor.execute("DELETE FROM companies WHERE id = ?", (selected_agencia[0],))
                 conn.commit()
+                invalidar("companies")
                 st.success("Agencia eliminada exitosamente")
             except sqlite3.IntegrityError:
                 st.error("No se puede eliminar la agencia asignada a usuarios.")
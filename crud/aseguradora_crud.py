@@ -12,6 +12,9 @@ import json  # Manejo de datos JSON
 import os  # Operaciones del sistema operativo
 from datetime import datetime  # Manejo de fechas y tiempos
 from dbconfig import DB_FILE  # Ruta del archivo de base de datos
+from core.catalogos import invalidar  # Invalidación de la caché de catálogos
+from core.db import get_connection  # Pool de conexiones SQLite compartido
+from core.migrations import run_migrations  # Migraciones de esquema
 
 # ============================================================================
 # FUNCIÓN: ensure_sucursales_table
@@ -19,29 +22,11 @@ from dbconfig import DB_FILE  # Ruta del archivo de base de datos
 # ============================================================================
 def ensure_sucursales_table():
     """
-    Crea la tabla sucursales si no existe
-    Sucursales son puntos de atención de las aseguradoras
+    Garantiza que exista la tabla sucursales
+    La tabla la crea core/migrations.py al arrancar; esta función se conserva
+    por compatibilidad y no ejecuta DDL si la base ya está migrada
     """
-    # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    # Crear tabla sucursales con relación a aseguradoras
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sucursales (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- ID único de la sucursal
-            aseguradora_id INTEGER NOT NULL,  -- ID de la aseguradora (clave foránea)
-            nombre TEXT NOT NULL,  -- Nombre de la sucursal
-            ciudad TEXT,  -- Ciudad donde se ubica
-            direccion TEXT,  -- Dirección completa
-            telefono TEXT,  -- Teléfono de contacto
-            email TEXT,  -- Email de contacto
-            FOREIGN KEY (aseguradora_id) REFERENCES aseguradoras(id)  -- Relación con aseguradora
-        )
-    ''')
-    
-    conn.commit()  # Confirmar cambios
-    conn.close()  # Cerrar conexión
+    run_migrations()
 
 # ============================================================================
 # FUNCIÓN: create_sucursal
@@ -59,11 +44,8 @@ def create_sucursal(aseguradora_id, nombre, ciudad, direccion, telefono, email):
         telefono (str): Teléfono de contacto
         email (str): Email de contacto
     """
-    # Asegurar que la tabla existe
-    ensure_sucursales_table()
-    
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Insertar nueva sucursal
@@ -74,6 +56,7 @@ def create_sucursal(aseguradora_id, nombre, ciudad, direccion, telefono, email):
     
     conn.commit()  # Confirmar cambios
     conn.close()  # Cerrar conexión
+    invalidar("sucursales")  # Los selectores de sucursales se recargan
 
 # ============================================================================
 # FUNCIÓN: get_sucursales_by_aseguradora
@@ -89,11 +72,8 @@ def get_sucursales_by_aseguradora(aseguradora_id):
     Retorna:
         list: Lista de tuplas con los datos de las sucursales
     """
-    # Asegurar que la tabla existe
-    ensure_sucursales_table()
-    
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     # Consultar sucursales de la aseguradora
@@ -118,7 +98,7 @@ def get_ramos_options():
         list: Lista de tuplas (id, nombre) de ramos ordenados alfabéticamente
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -152,7 +132,7 @@ def get_aseguradora_ramos(aseguradora_id):
         list: Lista de tuplas (id, nombre) de ramos asociados
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -175,7 +155,7 @@ def get_aseguradora_ramos(aseguradora_id):
         conn.close()
 
 def create_aseguradora(data, ramo_ids):
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     try:
         cursor.execute('''
@@ -188,6 +168,7 @@ def create_aseguradora(data, ramo_ids):
         for ramo_id in ramo_ids:
             cursor.execute('INSERT INTO aseguradora_ramos (aseguradora_id, ramo_id) VALUES (?, ?)', (aseguradora_id, ramo_id))
         conn.commit()
+        invalidar("aseguradoras", "aseguradora_ramos")
         return "Aseguradora creada exitosamente."
     except sqlite3.IntegrityError:
         return "Error: La aseguradora ya existe o los datos son inválidos."
@@ -195,7 +176,7 @@ def create_aseguradora(data, ramo_ids):
         conn.close()
 
 def read_aseguradoras():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, nombre, direccion, telefono, email FROM aseguradoras")
     aseguradoras = cursor.fetchall()
@@ -212,7 +193,7 @@ def read_aseguradoras():
     ]
 
 def read_aseguradoras_with_sucursales():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM aseguradoras")
     aseguradoras = cursor.fetchall()
@@ -227,7 +208,7 @@ def read_aseguradoras_with_sucursales():
 
 def get_aseguradora_by_id(aseguradora_id):
     """Obtiene los detalles de una aseguradora específica"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, nombre, direccion, telefono, email FROM aseguradoras WHERE id=?", (aseguradora_id,))
     row = cursor.fetchone()
@@ -243,19 +224,21 @@ def get_aseguradora_by_id(aseguradora_id):
     return None
 
 def update_aseguradora(aseguradora_id, nombre, direccion, telefono, email):
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("UPDATE aseguradoras SET nombre=?, direccion=?, telefono=?, email=? WHERE id=?",
                    (nombre, direccion, telefono, email, aseguradora_id))
     conn.commit()
     conn.close()
+    invalidar("aseguradoras")
 
 def delete_aseguradora(aseguradora_id):
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("DELETE FROM aseguradoras WHERE id=?", (aseguradora_id,))
     conn.commit()
     conn.close()
+    invalidar("aseguradoras")
 
 def populate_aseguradoras_from_json():
     """Populate the database with insurance companies from the JSON file"""
@@ -268,7 +251,7 @@ def populate_aseguradoras_from_json():
         with open(json_file_path, 'r', encoding='utf-8') as file:
             aseguradoras_data = json.load(file)
         
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         
         inserted_count = 0
@@ -329,6 +312,7 @@ def populate_aseguradoras_from_json():
         
         conn.commit()
         conn.close()
+        invalidar("aseguradoras")
         
         return f"Proceso completado: {inserted_count} aseguradoras insertadas, {skipped_count} omitidas (duplicadas o vacías)"
         
@@ -1,9 +1,11 @@
 import sqlite3
 import streamlit as st
 from dbconfig import DB_FILE
+from core.catalogos import invalidar
+from core.db import get_connection
 
 def create_aseguradora(nombre, direccion, telefono, email):
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
         INSERT INTO aseguradoras (razon_social, nombre_comercial, correo_electronico) 
@@ -11,9 +13,10 @@ def create_aseguradora(nombre, direccion, telefono, email):
     """, (nombre, nombre, email))
     conn.commit()
     conn.close()
+    invalidar("aseguradoras")
 
 def read_aseguradoras():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
         SELECT id, 
@@ -38,7 +41,7 @@ def read_aseguradoras():
 
 def get_aseguradora_by_id(aseguradora_id):
     """Obtiene los detalles de una aseguradora específica"""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
         SELECT id, 
@@ -62,7 +65,7 @@ def get_aseguradora_by_id(aseguradora_id):
     return None
 
 def update_aseguradora(aseguradora_id, nombre, direccion, telefono, email):
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
         UPDATE aseguradoras 
@@ -73,13 +76,15 @@ def update_aseguradora(aseguradora_id, nombre, direccion, telefono, email):
     """, (nombre, nombre, email, aseguradora_id))
     conn.commit()
     conn.close()
+    invalidar("aseguradoras")
 
 def delete_aseguradora(aseguradora_id):
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("DELETE FROM aseguradoras WHERE id=?", (aseguradora_id,))
     conn.commit()
     conn.close()
+    invalidar("aseguradoras")
 
 def display_aseguradoras_cards():
     """Muestra las aseguradoras en formato de tarjetas estilo Trello usando componentes de Streamlit"""
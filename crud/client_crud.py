@@ -1,53 +1,22 @@
 import sqlite3
 import os
 from dbconfig import DB_FILE
+from core.db import get_connection
+from crud.actividad_selector import campo_busqueda_actividad, selector_actividad
+from core.servicios import ClienteRequest, actualizar_cliente, crear_cliente, eliminar_cliente
 from database_config import initialize_database, reset_database
 import streamlit as st
 import datetime as dt
 import re
-from assets.actividad_economica import actividad_economica_options
 
-# Update the create_client function to handle all fields
+# Las operaciones de escritura delegan en la capa de servicios (core/servicios.py)
+# y retornan Respuesta(ok, mensaje, id)
 def create_client(**data):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    try:
-        # Validar longitud del número de documento
-        if data['tipo_documento'].lower() == 'cedula' and len(data['numero_documento']) != 10:
-            return "El número de cédula debe tener exactamente 10 dígitos."
-        if data['tipo_documento'].lower() == 'ruc' and len(data['numero_documento']) != 13:
-            return "El número de RUC debe tener exactamente 13 dígitos."
-
-        # Verificar duplicados en nombres, apellidos, número de documento y correo electrónico
-        cursor.execute(
-            "SELECT * FROM clients WHERE nombres=? AND apellidos=? AND numero_documento=? AND correo_electronico=?",
-            (data['nombres'], data['apellidos'], data['numero_documento'], data['correo_electronico'])
-        )
-        if cursor.fetchone():
-            return f"El cliente con nombre '{data['nombres']} {data['apellidos']}', número de documento '{data['numero_documento']}' y correo '{data['correo_electronico']}' ya existe."
-
-        # Insertar cliente si no hay duplicados
-        fields = ', '.join(data.keys())
-        placeholders = ', '.join(['?'] * len(data))
-        cursor.execute(f'''
-            INSERT INTO clients ({fields})
-            VALUES ({placeholders})
-        ''', tuple(data.values()))
-        conn.commit()
-        # Mensaje personalizado según tipo_cliente
-        if data.get("tipo_cliente") == "Persona Jurídica":
-            nombre_cliente = data.get("razon_social", "Empresa sin nombre")
-        else:
-            nombre_cliente = f"{data.get('nombres', 'N/A')} {data.get('apellidos', 'N/A')}"
-        return f"Cliente '{nombre_cliente}' creado exitosamente."
-    except Exception as e:
-        return f"Error al crear el cliente: {e}"
-    finally:
-        conn.close()
+    return crear_cliente(ClienteRequest.desde_dict(data))
 
 # Update the read_clients function to fetch all fields
 def read_clients():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     try:
         cursor.execute("SELECT * FROM clients")
@@ -56,35 +25,11 @@ def read_clients():
     finally:
         conn.close()
 
-# Update the update_client function to handle all fields
 def update_client(email, **updates):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    try:
-        fields = ', '.join([f"{field}=?" for field in updates.keys()])
-        values = list(updates.values()) + [email]
-        cursor.execute(f"UPDATE clients SET {fields} WHERE correo_electronico=?", values)
-        conn.commit()
-        return f"Cliente con correo '{email}' modificado exitosamente."
-    except Exception as e:
-        return f"Error al modificar el cliente: {e}"
-    finally:
-        conn.close()
+    return actualizar_cliente(email, updates)
 
-# Update the delete_client function to delete by client ID
 def delete_client(client_id):
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM clients WHERE id=?", (client_id,))
-        if cursor.rowcount == 0:
-            return f"No se encontró un cliente con ID '{client_id}'."
-        conn.commit()
-        return f"Cliente con ID '{client_id}' borrado exitosamente."
-    except Exception as e:
-        return f"Error al borrar el cliente: {e}"
-    finally:
-        conn.close()
+    return eliminar_cliente(client_id)
 
 # Add a function to reset the database
 def reset_database():
@@ -93,11 +38,13 @@ def reset_database():
 
 def crud_clientes():
     st.subheader("Gestión de Clientes")
-    operation = st.selectbox("Selecciona una operación", ["Crear", "Leer", "Modificar", "Borrar"], key="crud_clientes_operation")
+    operation = st.selectbox("Selecciona una operación", ["Crear", "Importar", "Leer", "Modificar", "Borrar"], key="crud_clientes_operation")
 
     if operation == "Crear":
         tipo_cliente = st.selectbox("Tipo de Cliente", ["Persona Natural", "Persona Jurídica"])
         if tipo_cliente == "Persona Natural":
+            # Búsqueda de actividad fuera del formulario: filtra al escribir, sin esperar al envío
+            busqueda_actividad = campo_busqueda_actividad("actividad_crear_natural")
             with st.form("form_cliente_persona_natural"):
                 tipo_documento = st.selectbox("Tipo de Documento", ["Cédula", "Pasaporte", "RUC"])
                 col1, col2 = st.columns(2)
@@ -166,8 +113,7 @@ def crud_clientes():
                 col1, col2 = st.columns(2)
                
                 with col1:
-                    # Cambiar a selectbox usando las opciones importadas
-                    actividad_economica = st.selectbox("Actividad Económica", actividad_economica_options)
+                    actividad_economica = selector_actividad("Actividad Económica", "actividad_crear_natural", busqueda=busqueda_actividad)
                 with col2:
                     subactividad_economica = st.text_input("Subactividad Económica")
                 col1,col2 = st.columns(2)
@@ -246,10 +192,11 @@ def crud_clientes():
                             # fecha_aniversario=fecha_aniversario.strftime("%Y-%m-%d") if fecha_aniversario else None, # Eliminado para individual
                             contacto_autorizado_id=None
                         )
-                        st.success(result)
+                        (st.success if result.ok else st.error)(result.mensaje)
                     else:
                         st.error("Completa todos los campos obligatorios.")
         else:
+            busqueda_actividad = campo_busqueda_actividad("actividad_crear_juridica")
             with st.form("form_cliente_persona_juridica"):
                 razon_social = st.text_input("Razón Social")
                 col1, col2 = st.columns(2)
@@ -326,8 +273,7 @@ def crud_clientes():
                     )
                 col1, col2 = st.columns(2)
                 with col1:
-                    # Cambiar a selectbox usando las opciones importadas
-                    actividad_economica = st.selectbox("Actividad Económica", actividad_economica_options)
+                    actividad_economica = selector_actividad("Actividad Económica", "actividad_crear_juridica", busqueda=busqueda_actividad)
                 with col2:
                     subactividad_economica = st.text_input("Subactividad Económica")
                 col1, col2 = st.columns(2)
@@ -377,7 +323,48 @@ def crud_clientes():
                             representante_legal_id=representante_legal_id,
                             contacto_autorizado_id=contacto_autorizado_id
                         )
-                        st.success(result)
+                        (st.success if result.ok else st.error)(result.mensaje)
+    elif operation == "Importar":
+        st.header("Importación masiva de clientes")
+        st.caption(
+            "Archivo CSV o XLSX con una fila de encabezados igual a las columnas de clientes "
+            "(tipo_cliente, nombres, apellidos, razon_social, tipo_documento, numero_documento, "
+            "correo_electronico, telefono_movil, ...). Se valida e inserta por lotes en una sola transacción."
+        )
+        archivo = st.file_uploader("Archivo de clientes", type=["csv", "xlsx"], key="importar_clientes_archivo")
+        if archivo and st.button("Importar clientes"):
+            # pandas solo se carga al importar un archivo
+            from core.importacion_clientes import importar_clientes, reporte_errores_csv
+            # El archivo se lee en streaming, así que se informa el avance en filas
+            avance = st.empty()
+            try:
+                resumen = importar_clientes(
+                    archivo,
+                    archivo.name,
+                    progreso=lambda filas: avance.info(f"⏳ {filas} filas procesadas..."),
+                )
+            except Exception as e:
+                # La transacción se revierte completa: no queda ningún cliente a medias
+                avance.empty()
+                st.error(f"Error al importar el archivo: {e}")
+            else:
+                avance.empty()
+                st.success(
+                    f"{resumen['insertados']} clientes importados de {resumen['filas']} filas "
+                    f"({resumen['duplicados']} duplicados, {len(resumen['errores']) - resumen['duplicados']} con errores)."
+                )
+                if resumen["columnas_ignoradas"]:
+                    st.warning(f"Columnas ignoradas (no existen en clientes): {', '.join(resumen['columnas_ignoradas'])}")
+                if resumen["errores"]:
+                    st.dataframe(
+                        [{"fila": f, "numero_documento": d, "motivo": m} for f, d, m in resumen["errores"][:500]]
+                    )
+                    st.download_button(
+                        "Descargar reporte de errores",
+                        reporte_errores_csv(resumen["errores"]),
+                        file_name="errores_importacion_clientes.csv",
+                        mime="text/csv",
+                    )
     elif operation == "Leer":
         st.header("Clientes Existentes")
         clients = read_clients()
@@ -417,6 +404,7 @@ def crud_clientes():
         if selected_client:
             tipo_cliente = selected_client.get("tipo_cliente", "Persona Natural")
             if tipo_cliente == "Persona Natural" or tipo_cliente == "Individual":
+                busqueda_actividad = campo_busqueda_actividad("actividad_mod_natural")
                 with st.form("form_modificar_cliente_persona_natural"):
                     tipos_doc_disponibles = ["Cédula", "Pasaporte", "RUC"]
                     tipo_doc_actual = selected_client.get("tipo_documento", "Cédula")
@@ -484,13 +472,10 @@ def crud_clientes():
                         ciudad = st.text_input("Ciudad", value=selected_client.get("ciudad", ""))
                     col1, col2 = st.columns(2)
                     with col1:
-                        # Cambiar a selectbox usando las opciones importadas
-                        actividad_actual = selected_client.get("actividad_economica", actividad_economica_options[0])
-                        if actividad_actual in actividad_economica_options:
-                            actividad_index = actividad_economica_options.index(actividad_actual)
-                        else:
-                            actividad_index = 0
-                        actividad_economica = st.selectbox("Actividad Económica", actividad_economica_options, index=actividad_index)
+                        actividad_economica = selector_actividad(
+                            "Actividad Económica", "actividad_mod_natural",
+                            valor_actual=selected_client.get("actividad_economica"), busqueda=busqueda_actividad,
+                        )
                     with col2:
                         subactividad_economica = st.text_input("Subactividad Económica", value=selected_client.get("subactividad_economica", ""))
                     fecha_registro = st.date_input("Fecha de Registro", value=_parse_date(selected_client.get("fecha_registro")))
@@ -554,8 +539,9 @@ def crud_clientes():
                             fecha_aniversario=fecha_aniversario.strftime("%Y-%m-%d") if fecha_aniversario else None,
                             contacto_autorizado_id=None
                         )
-                        st.success(result)
+                        (st.success if result.ok else st.error)(result.mensaje)
             else:
+                busqueda_actividad = campo_busqueda_actividad("actividad_mod_juridica")
                 with st.form("form_modificar_cliente_persona_juridica"):
                     razon_social = st.text_input("Razón Social", value=selected_client.get("razon_social", ""))
                     col1, col2 = st.columns(2)
@@ -609,13 +595,10 @@ def crud_clientes():
                         )
                     col1, col2 = st.columns(2)
                     with col1:
-                        # Cambiar a selectbox usando las opciones importadas
-                        actividad_actual = selected_client.get("actividad_economica", actividad_economica_options[0])
-                        if actividad_actual in actividad_economica_options:
-                            actividad_index = actividad_economica_options.index(actividad_actual)
-                        else:
-                            actividad_index = 0
-                        actividad_economica = st.selectbox("Actividad Económica", actividad_economica_options, index=actividad_index)
+                        actividad_economica = selector_actividad(
+                            "Actividad Económica", "actividad_mod_juridica",
+                            valor_actual=selected_client.get("actividad_economica"), busqueda=busqueda_actividad,
+                        )
                     with col2:
                         subactividad_economica = st.text_input("Subactividad Económica", value=selected_client.get("subactividad_economica", ""))
                     telefono_fijo = st.text_input("Teléfono Fijo", value=selected_client.get("telefono_fijo", ""))
@@ -650,7 +633,7 @@ def crud_clientes():
                             representante_legal_id=representante_legal_id,
                             contacto_autorizado_id=contacto_autorizado_id
                         )
-                        st.success(result)
+                        (st.success if result.ok else st.error)(result.mensaje)
     elif operation == "Borrar":
         st.header("Eliminar Cliente")
         clients = read_clients()
@@ -674,7 +657,7 @@ def crud_clientes():
         if st.button("Eliminar Cliente"):
             if selected_id:
                 result = delete_client(selected_id)
-                st.success(result)
+                (st.success if result.ok else st.error)(result.mensaje)
             else:
                 st.warning("Debes seleccionar un cliente para eliminar.")
 
@@ -698,7 +681,7 @@ def actualizar_tipo_cliente_en_db():
     Actualiza los valores antiguos de tipo_cliente en la base de datos a los nuevos valores.
     Ejecutar una sola vez después del cambio de nomenclatura.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     try:
         cursor.execute("UPDATE clients SET tipo_cliente = 'Persona Natural' WHERE tipo_cliente = 'Individual'")
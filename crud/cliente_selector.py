@@ -0,0 +1,60 @@
+# ============================================================================
+# SELECTOR DE CLIENTE CON BÚSQUEDA - crud/cliente_selector.py
+# ============================================================================
+# Componente reutilizable para elegir un cliente: un campo de búsqueda y un
+# selectbox con las coincidencias de core/clientes.buscar_clientes (índice
+# FTS5). Reemplaza los selectbox que cargaban la tabla `clients` completa en
+# poliza_crud, Ejecutivo_Siniestros y Back Office.
+# ============================================================================
+
+# Importaciones necesarias
+import streamlit as st  # Framework web
+
+from core.clientes import LIMITE_RESULTADOS, buscar_clientes, cliente_por_id  # Búsqueda FTS5
+
+
+def campo_busqueda_cliente(label, key):
+    """
+    Campo de texto de la búsqueda (separado para poder dibujarlo fuera de un st.form,
+    donde los widgets no provocan rerun hasta el envío)
+
+    Retorna:
+        str: Texto escrito por el usuario
+    """
+    return st.text_input(
+        f"🔎 Buscar {label.lower()}",
+        key=f"{key}_buscar",
+        placeholder="Nombre, razón social, cédula/RUC, correo o teléfono",
+    )
+
+
+def selector_cliente(label, key, cliente_actual=None, texto=None, limite=LIMITE_RESULTADOS):
+    """
+    Muestra un buscador de clientes y retorna el cliente elegido
+
+    Parámetros:
+        label (str): Etiqueta del selectbox
+        key (str): Clave única del widget (la búsqueda usa f"{key}_buscar")
+        cliente_actual (int): ID preseleccionado (p. ej. al modificar una póliza)
+        texto (str): Búsqueda ya capturada con campo_busqueda_cliente(); si es None
+                     el campo de búsqueda se dibuja aquí mismo
+        limite (int): Máximo de coincidencias mostradas
+
+    Retorna:
+        tuple: (id, etiqueta) del cliente elegido, o None si no hay coincidencias
+    """
+    if texto is None:
+        texto = campo_busqueda_cliente(label, key)
+    opciones = buscar_clientes(texto, limite)
+
+    # La selección actual se conserva aunque no esté entre las coincidencias
+    actual = cliente_por_id(cliente_actual)
+    if actual and actual not in opciones:
+        opciones.insert(0, actual)
+
+    if not opciones:
+        st.info("No hay clientes que coincidan con la búsqueda.")
+        return None
+
+    indice = opciones.index(actual) if actual else 0
+    return st.selectbox(label, opciones, index=indice, format_func=lambda x: x[1], key=key)
@@ -0,0 +1,117 @@
+# ============================================================================
+# COMISIONES - crud/comisiones_crud.py
+# ============================================================================
+# Pantalla de administración sobre core/comisiones.py:
+#   - Tasas de comisión por aseguradora y ramo, con fecha de vigencia
+#   - Cálculo: pólizas pendientes (recálculo incremental) y cierre de mes
+#   - Reporte de comisión devengada, facturada y cobrada
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Vigencia por defecto de una tasa nueva
+
+import streamlit as st  # Framework de interfaz de usuario
+
+from core.comisiones import (  # Motor de comisiones
+    calcular_comisiones, guardar_tasa, listar_tasas, pendientes, recalcular_pendientes, resumen_comisiones,
+)
+from core.money import Money  # Formato de montos en centavos
+from crud.poliza_crud import get_aseguradora_options, get_ramos_options  # Selectores con caché
+
+
+def _monto(centavos):
+    """Centavos -> "$1,234.56"."""
+    return f"${Money.from_cents(centavos or 0).format()}"
+
+
+def _mostrar_resultado(resumen):
+    """Mensaje con el resultado de un cálculo."""
+    st.success(
+        f"{resumen['polizas']} póliza(s) calculadas en {resumen['segundos']:.2f} s · "
+        f"devengada {_monto(resumen['devengada'])} · cobrada {_monto(resumen['cobrada'])}"
+    )
+
+
+def crud_comisiones():
+    """Muestra las pestañas de tasas, cálculo y reporte de comisiones."""
+    st.subheader("💼 Comisiones")
+    tab1, tab2, tab3 = st.tabs(["📋 Tasas", "⚙️ Cálculo", "📊 Reporte"])
+
+    # Tasas por aseguradora y ramo
+    with tab1:
+        tasas = listar_tasas()
+        if tasas:
+            st.dataframe(
+                [
+                    {"Aseguradora": aseguradora, "Ramo": ramo, "Vigente desde": vigente_desde,
+                     "Tasa": f"{tasa_bp / 100:.2f} %"}
+                    for _, aseguradora, _, ramo, vigente_desde, tasa_bp in tasas
+                ],
+                use_container_width=True,
+            )
+        else:
+            st.info("No hay tasas de comisión registradas.")
+
+        with st.form("comisiones_tasa"):
+            aseguradora = st.selectbox(
+                "Aseguradora", get_aseguradora_options(), format_func=lambda x: x[1], key="comisiones_aseguradora"
+            )
+            ramo = st.selectbox(
+                "Ramo", [(0, "Todos los ramos"), *get_ramos_options()], format_func=lambda x: x[1],
+                key="comisiones_ramo",
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                tasa = st.number_input("Tasa (%)", min_value=0.0, max_value=100.0, step=0.25, key="comisiones_tasa")
+            with col2:
+                vigente_desde = st.date_input(
+                    "Vigente desde (fecha de emisión)", value=datetime.date(1900, 1, 1), key="comisiones_vigencia"
+                )
+            if st.form_submit_button("Guardar tasa"):
+                if not aseguradora:
+                    st.error("Seleccione una aseguradora.")
+                else:
+                    ok, mensaje = guardar_tasa(aseguradora[0], ramo[0], tasa, vigente_desde.isoformat())
+                    if ok:
+                        st.success(f"{mensaje} Las pólizas afectadas quedaron pendientes de recálculo.")
+                    else:
+                        st.error(mensaje)
+
+    # Recálculo incremental y cierre de mes
+    with tab2:
+        st.metric("Pólizas pendientes de recálculo", pendientes())
+        st.caption("Las pólizas, movimientos, facturas y notas de crédito nuevas o modificadas quedan pendientes.")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Recalcular pendientes", key="comisiones_incremental"):
+                _mostrar_resultado(recalcular_pendientes())
+        with col2:
+            if st.button("Cierre de mes (toda la cartera)", key="comisiones_completo"):
+                _mostrar_resultado(calcular_comisiones())
+
+    # Totales por aseguradora o ramo
+    with tab3:
+        col1, col2 = st.columns(2)
+        with col1:
+            agrupar_por = st.radio(
+                "Agrupar por", ["aseguradora", "ramo"], format_func=str.capitalize,
+                horizontal=True, key="comisiones_agrupar",
+            )
+        with col2:
+            mes = st.text_input("Mes de emisión (AAAA-MM, vacío = todos)", key="comisiones_mes").strip()
+        filas = resumen_comisiones(agrupar_por, mes or None)
+        if not filas:
+            st.info("No hay comisiones calculadas. Ejecute el cálculo en la pestaña ⚙️ Cálculo.")
+            return
+        col1, col2, col3 = st.columns(3)
+        for columna, titulo, indice in ((col1, "Devengada", 3), (col2, "Facturada", 4), (col3, "Cobrada", 5)):
+            with columna:
+                st.metric(f"Comisión {titulo.lower()}", _monto(sum(fila[indice] for fila in filas)))
+        st.dataframe(
+            [
+                {agrupar_por.capitalize(): nombre, "Pólizas": n, "Prima neta": _monto(prima),
+                 "Devengada": _monto(devengada), "Facturada": _monto(facturada), "Cobrada": _monto(cobrada)}
+                for nombre, n, prima, devengada, facturada, cobrada in filas
+            ],
+            use_container_width=True,
+        )
@@ -0,0 +1,94 @@
+# ============================================================================
+# EXPORTACIONES - crud/exportacion_crud.py
+# ============================================================================
+# Pantalla de exportación de tablas a CSV / XLSX sobre core/exportacion.py:
+# elige tabla, columnas y filtros, lanza la exportación en segundo plano y
+# ofrece la descarga del archivo cuando termina (leído solo al pulsar el
+# botón; los archivos muy grandes se retiran del servidor).
+# ============================================================================
+
+# Importaciones necesarias
+import functools  # Lectura diferida del archivo a descargar
+import os  # Nombre y tamaño del archivo descargado
+
+import streamlit as st  # Framework de interfaz de usuario
+
+from core.exportacion import (  # Exportación por lotes en segundo plano
+    FORMATOS, OPERADORES, TABLAS, estado_exportacion, iniciar_exportacion,
+)
+from core.migrations import get_columns  # Columnas de la tabla elegida
+
+MIME = {"csv": "text/csv", "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"}
+FILTROS_MAXIMOS = 3  # Filas de filtro del formulario
+TAMANO_DESCARGA_MAXIMO = 100 * 1024 * 1024  # Bytes; los archivos mayores se retiran del servidor
+
+
+def _leer_archivo(ruta):
+    """Contenido del archivo exportado (lo llama download_button al pulsarlo)."""
+    with open(ruta, "rb") as archivo:
+        return archivo.read()
+
+
+def crud_exportaciones():
+    """Muestra el formulario de exportación y la lista de exportaciones de la sesión."""
+    st.subheader("📤 Exportar datos")
+    tabla = st.selectbox("Tabla", list(TABLAS), format_func=TABLAS.get, key="exportar_tabla")
+    columnas_tabla = list(get_columns(tabla))
+    columnas = st.multiselect(
+        "Columnas (vacío = todas)", columnas_tabla, key=f"exportar_columnas_{tabla}"
+    )
+
+    # Filtros: columna, operador y valor; los vacíos se ignoran
+    filtros = []
+    with st.expander("Filtros"):
+        for i in range(FILTROS_MAXIMOS):
+            col1, col2, col3 = st.columns([2, 1, 2])
+            with col1:
+                columna = st.selectbox(
+                    "Columna", columnas_tabla, index=None, key=f"exportar_filtro_columna_{tabla}_{i}",
+                    placeholder="Sin filtro",
+                )
+            with col2:
+                operador = st.selectbox("Operador", OPERADORES, key=f"exportar_filtro_operador_{tabla}_{i}")
+            with col3:
+                valor = st.text_input("Valor", key=f"exportar_filtro_valor_{tabla}_{i}")
+            if columna and valor:
+                filtros.append((columna, operador, valor))
+
+    formato = st.radio("Formato", FORMATOS, format_func=str.upper, horizontal=True, key="exportar_formato")
+    if st.button("Exportar", key="exportar_iniciar"):
+        try:
+            trabajo_id = iniciar_exportacion(tabla, formato, columnas, filtros)
+        except ValueError as e:
+            st.error(str(e))
+        else:
+            st.session_state.setdefault("exportaciones", []).insert(0, trabajo_id)
+            st.success("Exportación iniciada; el archivo aparecerá abajo cuando termine.")
+
+    # Exportaciones de esta sesión (las de otros usuarios no se muestran)
+    propias = st.session_state.get("exportaciones", [])
+    trabajos = [t for t in (estado_exportacion(i) for i in propias) if t]
+    if not trabajos:
+        return
+    st.markdown("#### Mis exportaciones")
+    if st.button("🔄 Actualizar estado", key="exportar_actualizar"):
+        st.rerun()
+    for trabajo in trabajos:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            detalle = f"{TABLAS[trabajo['tabla']]} · {trabajo['formato'].upper()} · {trabajo['inicio']}"
+            st.write(f"**{trabajo['estado']}** — {detalle} — {trabajo['filas']:,} filas")
+            if trabajo["error"]:
+                st.error(trabajo["error"])
+        with col2:
+            if trabajo["ruta"] and os.path.exists(trabajo["ruta"]):
+                if os.path.getsize(trabajo["ruta"]) > TAMANO_DESCARGA_MAXIMO:
+                    # Demasiado grande para pasar por la sesión de Streamlit
+                    st.caption(f"Archivo en el servidor: `{trabajo['ruta']}`")
+                else:
+                    # El archivo se lee solo al pulsar el botón, no en cada recarga de la página
+                    st.download_button(
+                        "📥 Descargar", functools.partial(_leer_archivo, trabajo["ruta"]),
+                        file_name=os.path.basename(trabajo["ruta"]), mime=MIME[trabajo["formato"]],
+                        key=f"exportar_descargar_{trabajo['id']}",
+                    )
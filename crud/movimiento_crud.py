@@ -1,21 +1,35 @@
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
-from Movimientos.Activacion_poliza import activacion_poliza
-from Movimientos.Aumento_suma_asegurada import aumento_suma_asegurada
-from Movimientos.Anexo_aclaratorio import anexo_aclaratorio
-from Movimientos.Disminucion_suma_asegurada import disminucion_suma_asegurada
-from Movimientos.Aumento_prima import aumento_prima
-from Movimientos.Disminucion_prima import disminucion_prima
-from Movimientos.Cancelacion_poliza import cancelacion_poliza
-from Movimientos.Rehabilitación_poliza import rehabilitacion_poliza
+from core.db import get_connection
+from core.migrations import get_columns
+from core.consultas import (
+	MOVIMIENTOS_RECIENTES,
+	FACTURAS_POR_MOVIMIENTO_O_POLIZA,
+	NOTAS_POR_MOVIMIENTO_O_POLIZA,
+	notas_por_movimiento_o_facturas,
+)
+from core.carga_diferida import cargar
+
+# Opción del menú -> formulario del movimiento (se importa al elegirlo)
+FORMULARIOS_MOVIMIENTO = {
+	'Activación de póliza': 'Movimientos.Activacion_poliza:activacion_poliza',
+	'Anexo Aclaratorio': 'Movimientos.Anexo_aclaratorio:anexo_aclaratorio',
+	'Anexo Aumento Suma Asegurada': 'Movimientos.Aumento_suma_asegurada:aumento_suma_asegurada',
+	'Anexo Disminución Suma Asegurada': 'Movimientos.Disminucion_suma_asegurada:disminucion_suma_asegurada',
+	'Anexo Aumento Prima': 'Movimientos.Aumento_prima:aumento_prima',
+	'Anexo Disminución Prima': 'Movimientos.Disminucion_prima:disminucion_prima',
+	'Cancelación de póliza': 'Movimientos.Cancelacion_poliza:cancelacion_poliza',
+	'Rehabilitación de póliza': 'Movimientos.Rehabilitación_poliza:rehabilitacion_poliza',
+	'Movimientos en lote': 'Movimientos.Movimientos_lote:movimientos_en_lote',
+}
 
 def _fetch_movimientos(limit=200):
 	try:
-		conn = sqlite3.connect(DB_FILE)
+		conn = get_connection()
 		cur = conn.cursor()
 		cur.execute(
-			"SELECT id, codigo_movimiento, tipo_movimiento, estado, fecha_movimiento FROM movimientos_poliza ORDER BY fecha_movimiento DESC LIMIT ?",
+			MOVIMIENTOS_RECIENTES,
 			(limit,)
 		)
 		rows = cur.fetchall()
@@ -51,11 +65,10 @@ def crud_movimientos():
 			return
 		mov_id = seleccionado[0]
 		try:
-			conn = sqlite3.connect(DB_FILE)
+			conn = get_connection()
 			cur = conn.cursor()
-			# Fetch movement full row with column names
-			cur.execute('PRAGMA table_info(movimientos_poliza)')
-			cols = [c[1] for c in cur.fetchall()]
+			# Fetch movement full row with column names (cached column set)
+			cols = get_columns('movimientos_poliza')
 			cur.execute('SELECT * FROM movimientos_poliza WHERE id = ?', (mov_id,))
 			row = cur.fetchone()
 			if not row:
@@ -87,7 +100,7 @@ def crud_movimientos():
 			# Fetch invoices linked to this movement or its policy
 			facturas = []
 			try:
-				cur.execute('SELECT id, numero_factura, poliza_id, fecha_emision, monto_neto, impuestos, iva, total, estado FROM facturas WHERE movimiento_id = ? OR poliza_id = ?', (mov_id, mov.get('poliza_id')))
+				cur.execute(FACTURAS_POR_MOVIMIENTO_O_POLIZA, (mov_id, mov.get('poliza_id')))
 				for f in cur.fetchall():
 					facturas.append({
 						'id': f[0], 'numero_factura': f[1], 'poliza_id': f[2], 'fecha_emision': f[3],
@@ -109,12 +122,11 @@ def crud_movimientos():
 				# buscar por movimiento_id o por factura_id relacionada
 				if facturas:
 					factura_ids = tuple([f['id'] for f in facturas])
-					placeholders = ','.join('?' for _ in factura_ids)
-					query = f'SELECT id, numero_nota, factura_id, poliza_id, monto_neto, impuestos, iva, total, motivo, estado FROM notas_de_credito WHERE movimiento_id = ? OR factura_id IN ({placeholders})'
+					query = notas_por_movimiento_o_facturas(len(factura_ids))
 					params = (mov_id,) + factura_ids
 					cur.execute(query, params)
 				else:
-					cur.execute('SELECT id, numero_nota, factura_id, poliza_id, monto_neto, impuestos, iva, total, motivo, estado FROM notas_de_credito WHERE movimiento_id = ? OR poliza_id = ?', (mov_id, mov.get('poliza_id')))
+					cur.execute(NOTAS_POR_MOVIMIENTO_O_POLIZA, (mov_id, mov.get('poliza_id')))
 				for n in cur.fetchall():
 					notas.append({
 						'id': n[0], 'numero_nota': n[1], 'factura_id': n[2], 'poliza_id': n[3],
@@ -153,7 +165,7 @@ def crud_movimientos():
 		if seleccionado:
 			mov_id = seleccionado[0]
 			try:
-				conn = sqlite3.connect(DB_FILE)
+				conn = get_connection()
 				cur = conn.cursor()
 				cur.execute('SELECT * FROM movimientos_poliza WHERE id = ?', (mov_id,))
 				row = cur.fetchone()
@@ -161,9 +173,8 @@ def crud_movimientos():
 					st.error('Movimiento no encontrado en la base de datos.')
 					return
 
-				# Mapear columnas por índice usando PRAGMA
-				cur.execute('PRAGMA table_info(movimientos_poliza)')
-				cols = [c[1] for c in cur.fetchall()]
+				# Mapear columnas por índice usando el conjunto de columnas cacheado
+				cols = get_columns('movimientos_poliza')
 				mov = dict(zip(cols, row))
 
 				# Campos editables básicos
@@ -242,7 +253,7 @@ def crud_movimientos():
 		if seleccionado:
 			mov_id = seleccionado[0]
 			try:
-				conn = sqlite3.connect(DB_FILE)
+				conn = get_connection()
 				cur = conn.cursor()
 				cur.execute('SELECT codigo_movimiento FROM movimientos_poliza WHERE id = ?', (mov_id,))
 				row = cur.fetchone()
@@ -263,7 +274,7 @@ def crud_movimientos():
 				if codigo_confirm == codigo:
 					if st.button('🗑️ ELIMINAR MOVIMIENTO'):
 						try:
-							conn2 = sqlite3.connect(DB_FILE)
+							conn2 = get_connection()
 							cur2 = conn2.cursor()
 							cur2.execute('DELETE FROM movimientos_poliza WHERE id = ?', (mov_id,))
 							conn2.commit()
@@ -282,22 +293,6 @@ def crud_movimientos():
 		return
 
 	# --- USAR MOVIMIENTOS: mostrar selector original de tipo de movimiento ---
-	option = st.selectbox('Movimientos de poliza:', ['Activación de póliza', 'Anexo Aclaratorio', 'Anexo Aumento Suma Asegurada','Anexo Disminución Suma Asegurada', 'Anexo Aumento Prima', 'Anexo Disminución Prima', 'Cancelación de póliza', 'Rehabilitación de póliza'])
-	if option == 'Activación de póliza':
-		activacion_poliza()
-	if option == 'Anexo Aclaratorio':
-		anexo_aclaratorio()
-	if option == 'Anexo Aumento Suma Asegurada':
-		aumento_suma_asegurada()
-	if option == 'Anexo Disminución Suma Asegurada':
-		disminucion_suma_asegurada()
-	if option == 'Anexo Aumento Prima':		
-		aumento_prima()
-	if option == 'Anexo Disminución Prima':
-		disminucion_prima()
-	if option == 'Cancelación de póliza':		
-		cancelacion_poliza()
-	if option == 'Rehabilitación de póliza':		
-		rehabilitacion_poliza()
-		
-
+	option = st.selectbox('Movimientos de poliza:', ['Activación de póliza', 'Anexo Aclaratorio', 'Anexo Aumento Suma Asegurada','Anexo Disminución Suma Asegurada', 'Anexo Aumento Prima', 'Anexo Disminución Prima', 'Cancelación de póliza', 'Rehabilitación de póliza', 'Movimientos en lote'])
+	if option in FORMULARIOS_MOVIMIENTO:
+		cargar(FORMULARIOS_MOVIMIENTO[option])()
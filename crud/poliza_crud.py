@@ -1,9 +1,17 @@
 import streamlit as st
 import sqlite3
 import datetime
-from dbconfig import DB_FILE, initialize_database
-
-initialize_database()
+from dbconfig import DB_FILE
+from core.catalogos import catalogo
+from core.db import connection, get_connection
+from core.migrations import get_columns
+from core.money import MONTOS_POLIZA, Money, calcular_desglose, centavos_de
+from core.polizas import (
+    SIN_ESTADO, TAMANO_PAGINA, contar_polizas, create_policy_with_invoice, estados_de_polizas, listar_polizas,
+)
+from core.documentos import FACTURA, encolar
+from core.consultas import MOVIMIENTOS_POR_POLIZA, FACTURAS_POR_POLIZA, SUCURSALES_POR_ASEGURADORA
+from crud.cliente_selector import campo_busqueda_cliente, selector_cliente
 
 # Lista canonica de estados de póliza usada en crear y modificar
 ESTADOS_POLIZA = [
@@ -15,46 +23,18 @@ ESTADOS_POLIZA = [
     "Pendiente de Pago",
 ]
 
-def get_next_numero_poliza():
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT numero_poliza FROM polizas ORDER BY id DESC LIMIT 1")
-    last = cursor.fetchone()
-    conn.close()
-    if last and last[0] and last[0].startswith("PRG-"):
-        try:
-            num = int(last[0].replace("PRG-", ""))
-            return f"PRG-{num + 1}"
-        except Exception:
-            pass
-    return "PRG-1"
-
-def get_client_options():
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, tipo_cliente, nombres, apellidos, razon_social FROM clients")
-    clients = cursor.fetchall()
-    conn.close()
-    options = []
-    for c in clients:
-        # Mostrar Razón Social si es Persona Jurídica, nombre y apellido si es Persona Natural
-        if c[1] == "Persona Jurídica":
-            label = f"{c[4]} (Persona Jurídica) [ID: {c[0]}]"
-        else:
-            label = f"{c[2]} {c[3]} (Persona Natural) [ID: {c[0]}]"
-        options.append((c[0], label))
-    return options
-
+@catalogo(tablas=("aseguradoras",))
 def get_aseguradora_options():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, razon_social FROM aseguradoras")
     aseguradoras = cursor.fetchall()
     conn.close()
     return [(a[0], a[1]) for a in aseguradoras]
 
+@catalogo(tablas=("users",))
 def get_user_options():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, username, role FROM users")
     users = cursor.fetchall()
@@ -66,7 +46,7 @@ def get_user_options():
     return options
 
 def get_client_details(client_id):
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("""
         SELECT tipo_cliente, nombres, apellidos, razon_social, tipo_documento, numero_documento, 
@@ -90,39 +70,37 @@ def get_client_details(client_id):
         "direccion_domicilio": row[9]
     }
 
+@catalogo(tablas=("ramos_seguros",))
 def get_ramos_options():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, nombre FROM ramos_seguros ORDER BY nombre")
     ramos = cursor.fetchall()
     conn.close()
     return [(r[0], r[1]) for r in ramos]
 
+@catalogo(tablas=("sucursales",))
 def get_sucursales_by_aseguradora_id(aseguradora_id):
-    conn = sqlite3.connect(DB_FILE)
+    # La tabla sucursales la garantiza la migración de esquema base
+    conn = get_connection()
     cursor = conn.cursor()
-    # Asegurarse de que la tabla sucursales existe antes de consultar
-    cursor.execute("""
-        SELECT name FROM sqlite_master WHERE type='table' AND name='sucursales'
-    """)
-    if not cursor.fetchone():
-        conn.close()
-        return []
-    cursor.execute("SELECT id, nombre FROM sucursales WHERE aseguradora_id=?", (aseguradora_id,))
+    cursor.execute(SUCURSALES_POR_ASEGURADORA, (aseguradora_id,))
     sucursales = cursor.fetchall()
     conn.close()
     return sucursales
 
+@catalogo(tablas=("companies",))
 def get_agrupadora_options():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, name FROM companies")
     agrupadoras = cursor.fetchall()
     conn.close()
     return [(a[0], a[1]) for a in agrupadoras]
 
+@catalogo(tablas=("users",))
 def get_ejecutivo_comercial_options():
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT id, nombres, apellidos FROM users WHERE role = 'Ejecutivo Comercial'")
     ejecutivos = cursor.fetchall()
@@ -134,7 +112,7 @@ def crud_polizas():
     st.subheader("Gestión de Pólizas")
     col1, col2, col3 = st.columns(3)
     with col1:
-        operation = st.selectbox("Selecciona una operación", ["Crear", "Leer", "Modificar", "Borrar"])
+        operation = st.selectbox("Selecciona una operación", ["Crear", "Leer", "Modificar", "Borrar", "Importar"])
     
     # Reiniciar el proceso y los datos de la póliza cada vez que se cambia de operación
     if "last_poliza_operation" not in st.session_state or st.session_state["last_poliza_operation"] != operation:
@@ -143,72 +121,8 @@ def crud_polizas():
         st.session_state["ramos_list"] = []
         st.session_state["last_poliza_operation"] = operation
 
-    # Obtener columnas de la tabla polizas para usarlas en el formulario de creación
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(polizas)")
-    columns_info = cursor.fetchall()
-    # --- Añadir columna beneficiario si no existe ---
-    poliza_columns = [col[1] for col in columns_info]
-    if "beneficiario" not in poliza_columns:
-        cursor.execute("ALTER TABLE polizas ADD COLUMN beneficiario TEXT")
-    # --- Añadir columna tipo_renovacion si no existe ---
-    if "tipo_renovacion" not in poliza_columns:
-        cursor.execute("ALTER TABLE polizas ADD COLUMN tipo_renovacion TEXT")
-    # --- Campo eliminado: tipo_movimiento ---
-    # if "tipo_movimiento" not in poliza_columns:
-    #     cursor.execute("ALTER TABLE polizas ADD COLUMN tipo_movimiento TEXT")
-    # --- Añadir columna sucursal_id si no existe ---
-    if "sucursal_id" not in poliza_columns:
-        cursor.execute("ALTER TABLE polizas ADD COLUMN sucursal_id INTEGER")
-    # --- Añadir columna asegurado_contratante si no existe ---
-    if "asegurado_contratante" not in poliza_columns:
-        cursor.execute("ALTER TABLE polizas ADD COLUMN asegurado_contratante TEXT")
-    # --- Añadir columna id_beneficiario si no existe ---
-    if "id_beneficiario" not in poliza_columns:
-        cursor.execute("ALTER TABLE polizas ADD COLUMN id_beneficiario TEXT")
-    # --- Añadir columna prima_neta si no existe ---
-    if "prima_neta" not in poliza_columns:
-        cursor.execute("ALTER TABLE polizas ADD COLUMN prima_neta TEXT")
-    # --- Añadir columna fecha_factura si no existe ---
-    if "fecha_factura" not in poliza_columns:
-        cursor.execute("ALTER TABLE polizas ADD COLUMN fecha_factura TEXT")
-    # --- Campo eliminado: anexos ---
-    # if "anexos" not in poliza_columns:
-    #     cursor.execute("ALTER TABLE polizas ADD COLUMN anexos TEXT")
-    conn.commit()
-    conn.close()
-    poliza_fields = [col[1] for col in columns_info if col[1] != "id"]
-
-    # --- NUEVO: Añadir campos de facturación si no existen ---
-    fact_fields = [
-        ("numero_factura", "TEXT"),
-        ("moneda", "TEXT"),
-        # ("clausulas_particulares", "TEXT"),  # Campo eliminado
-        ("contrib_scvs", "TEXT"),
-        ("derechos_emision", "TEXT"),
-        ("ssoc_camp", "TEXT"),
-        ("subtotal", "TEXT"),
-        ("iva_15", "TEXT"),
-        # ("csolidaria_2", "TEXT"),  # Campo eliminado
-        # ("financiacion", "TEXT"),  # Campo eliminado
-        # ("otros_iva", "TEXT"),  # Campo eliminado - ya no es necesario
-        ("total", "TEXT"),
-        ("formas_de_pago", "TEXT"),  # <-- Nuevo campo
-        ("cuotas", "TEXT"),
-        ("valor_cuota_inicial", "TEXT"),
-        ("valor_cuotas_financiadas", "TEXT"),
-        ("fecha_factura", "TEXT"),
-    ]
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("PRAGMA table_info(polizas)")
-    existing_cols = [row[1] for row in cursor.fetchall()]
-    for col, coltype in fact_fields:
-        if col not in existing_cols:
-            cursor.execute(f"ALTER TABLE polizas ADD COLUMN {col} {coltype}")
-    conn.commit()
-    conn.close()
+    # Las columnas de polizas las garantiza core/migrations.py al arrancar el proceso;
+    # aquí ya no se ejecuta PRAGMA/ALTER en cada render.
 
     if operation == "Crear":
         # FORMULARIO 1: Datos de información general
@@ -216,17 +130,15 @@ def crud_polizas():
             col1, col2 = st.columns(2)
             with col1:
                 # PRIMER CAMPO: Número de Póliza
-                numero_poliza = st.text_input("Número de Póliza")
+                numero_poliza = st.text_input(
+                    "Número de Póliza",
+                    placeholder="Vacío = número interno automático (PRG-n)",
+                )
 
             with col2:
                 # SEGUNDO CAMPO: Solicitante
-                client_options = get_client_options()
-                selected_tomador = st.selectbox(
-                "Solicitante",
-                client_options,
-                format_func=lambda x: x[1] if x else "",
-                key="tomador_poliza_selector"
-            ) if client_options else None
+                # Búsqueda FTS5: solo se leen las coincidencias, no la tabla completa
+                selected_tomador = selector_cliente("Solicitante", key="tomador_poliza_selector")
             
             aseguradora_options = get_aseguradora_options()
             aseguradora_labels = [a[1] for a in aseguradora_options]
@@ -339,11 +251,12 @@ def crud_polizas():
             if siguiente:
                 if not selected_aseguradora:
                     st.error("Debe seleccionar una aseguradora.")
-                elif not numero_poliza or not numero_poliza.strip():
-                    st.error("El número de póliza es obligatorio.")
                 elif not fecha_inicio or not fecha_fin:
                     st.error("Debe ingresar la vigencia de la póliza.")
                 else:
+                    # Sin número de la aseguradora, create_policy_with_invoice asigna uno
+                    # interno de la secuencia al guardar (no se reserva en este paso)
+                    numero_poliza = (numero_poliza or "").strip()
                     # Guardar también el nombre del tomador seleccionado para mostrarlo fácilmente al leer
                     tomador_id = selected_tomador[0] if isinstance(selected_tomador, tuple) else selected_tomador
                     tomador_nombre = selected_tomador[1] if isinstance(selected_tomador, tuple) and len(selected_tomador) > 1 else ""
@@ -463,7 +376,7 @@ def crud_polizas():
                 numero_poliza_actual = poliza_data.get("numero_poliza", "")
                 
                 # Obtener pólizas existentes
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
                 cursor.execute("SELECT numero_poliza FROM polizas ORDER BY id DESC")
                 polizas_existentes = cursor.fetchall()
@@ -483,6 +396,7 @@ def crud_polizas():
                         numero_poliza_seleccionado = st.text_input(
                             "Número de Póliza (actual)",
                             value=numero_poliza_actual,
+                            placeholder="Número interno (PRG-n) asignado al guardar",
                             disabled=True,
                             help="Este es el número de la póliza que se está creando actualmente"
                         )
@@ -501,6 +415,8 @@ def crud_polizas():
                 # Mostrar póliza seleccionada
                 if numero_poliza_seleccionado:
                     st.success(f"✅ Póliza seleccionada: **{numero_poliza_seleccionado}**")
+                elif opcion_poliza == "Usar póliza actual":
+                    st.info("Se asignará un número interno (PRG-n) al guardar la póliza.")
                 else:
                     st.error("⚠️ Debe seleccionar un número de póliza")
                 
@@ -590,16 +506,12 @@ def crud_polizas():
                 # Validar y formatear la suma asegurada
                 suma_asegurada = ""
                 if suma_asegurada_input:
-                    try:
-                        # Remover caracteres no numéricos excepto punto decimal
-                        cleaned_amount = ''.join(c for c in suma_asegurada_input if c.isdigit() or c == '.')
-                        if cleaned_amount:
-                            amount = float(cleaned_amount)
-                            suma_asegurada = f"${amount:,.2f} USD"
-                            st.success(f"✅ Suma Asegurada formateada: **{suma_asegurada}**")
-                        else:
-                            st.error("⚠️ Ingrese un monto válido")
-                    except ValueError:
+                    # Money ignora símbolos y separadores de miles; None si no hay un número válido
+                    amount = Money.parse(suma_asegurada_input)
+                    if amount is not None:
+                        suma_asegurada = f"${amount.format()} USD"
+                        st.success(f"✅ Suma Asegurada formateada: **{suma_asegurada}**")
+                    else:
                         st.error("⚠️ Formato de monto inválido. Use solo números y punto decimal.")
                 
                 # Guardar el valor limpio para la base de datos
@@ -624,16 +536,12 @@ def crud_polizas():
                 # Validar y formatear la prima neta
                 prima_neta = ""
                 if prima_neta_input:
-                    try:
-                        # Remover caracteres no numéricos excepto punto decimal
-                        cleaned_amount = ''.join(c for c in prima_neta_input if c.isdigit() or c == '.')
-                        if cleaned_amount:
-                            amount = float(cleaned_amount)
-                            prima_neta = f"${amount:,.2f} USD"
-                            st.success(f"✅ Prima Neta formateada: **{prima_neta}**")
-                        else:
-                            st.error("⚠️ Ingrese un monto válido")
-                    except ValueError:
+                    # Money ignora símbolos y separadores de miles; None si no hay un número válido
+                    amount = Money.parse(prima_neta_input)
+                    if amount is not None:
+                        prima_neta = f"${amount.format()} USD"
+                        st.success(f"✅ Prima Neta formateada: **{prima_neta}**")
+                    else:
                         st.error("⚠️ Formato de monto inválido. Use solo números y punto decimal.")
                 
                 # Guardar el valor limpio para la base de datos
@@ -672,7 +580,6 @@ def crud_polizas():
                     ) if ejecutivo_options else None
                 with col2:
                     liberacion_comision = st.selectbox("Liberación Comisión", ["NO", "SI"])
-                client_options = get_client_options()
                 col1, col2 = st.columns(2)
                 with col1:
                     cuotas = st.text_input("Cuotas", key="cuotas_form2")
@@ -712,88 +619,44 @@ def crud_polizas():
                 st.markdown("### Información Factura")
                 col1, col2 = st.columns(2)
                 with col1:
-                    numero_factura = st.text_input("Nº Factura")
+                    numero_factura = st.text_input("Nº Factura", placeholder="Vacío = número automático (F-AAAAMMDD-00001)")
                 # Eliminar el campo de moneda
                 # with col2:
                 #     moneda = st.selectbox("Moneda", ["USD", "EUR", "Otra"])
                 # Campo eliminado: Cláusulas particulares
                 col1, col2 ,col3 = st.columns(3)
+                with col3:
+                    derechos_emision = st.text_input("Derechos Emisión")
+
+                # Desglose en centavos exactos: Contrib. S.C.V.S. y Seguro Campesino (0.5% c/u),
+                # Subtotal = Prima Neta + contribuciones + Derechos Emisión, IVA 15% y Prima Total
+                desglose = calcular_desglose(prima_neta_db, derechos_emision)
                 with col1:
-                    # Calcular Contrib. S.C.V.S. como 0.5% de la prima neta
-                    contrib_scvs_calculado = ""
-                    if prima_neta_db:
-                        try:
-                            prima_neta_valor = float(prima_neta_db)
-                            contrib_scvs_valor = prima_neta_valor * 0.005  # 0.5%
-                            contrib_scvs_calculado = f"{contrib_scvs_valor:.2f}"
-                        except ValueError:
-                            contrib_scvs_calculado = "0.00"
-                    else:
-                        contrib_scvs_calculado = "0.00"
-                    
                     contrib_scvs = st.text_input(
                         "Contrib. S.C.V.S. (0.5% Prima Neta)", 
-                        value=contrib_scvs_calculado,
+                        value=str(desglose["contrib_scvs"]),
                         disabled=True,
                         help="Calculado automáticamente como 0.5% de la Prima Neta"
                     )
                 with col2:
-                    # Calcular Seguro Social Campesino como 0.5% de la prima neta
-                    ssoc_camp_calculado = ""
-                    if prima_neta_db:
-                        try:
-                            prima_neta_valor = float(prima_neta_db)
-                            ssoc_camp_valor = prima_neta_valor * 0.005  # 0.5%
-                            ssoc_camp_calculado = f"{ssoc_camp_valor:.2f}"
-                        except ValueError:
-                            ssoc_camp_calculado = "0.00"
-                    else:
-                        ssoc_camp_calculado = "0.00"
-                    
                     ssoc_camp = st.text_input(
                         "Seguro Campesino (0.5% Prima Neta)", 
-                        value=ssoc_camp_calculado,
+                        value=str(desglose["seguro_campesino"]),
                         disabled=True,
                         help="Calculado automáticamente como 0.5% de la Prima Neta"
                     )
-                with col3:
-                    derechos_emision = st.text_input("Derechos Emisión")
-                
-                # Calcular Subtotal como suma de Prima Neta + Contrib. S.C.V.S. + Seguro Campesino + Derechos Emisión
-                subtotal_calculado = ""
-                try:
-                    prima_neta_valor = float(prima_neta_db) if prima_neta_db else 0.0
-                    contrib_valor = float(contrib_scvs_calculado) if contrib_scvs_calculado else 0.0
-                    ssoc_valor = float(ssoc_camp_calculado) if ssoc_camp_calculado else 0.0
-                    derechos_valor = float(derechos_emision) if derechos_emision else 0.0
-                    subtotal_valor = prima_neta_valor + contrib_valor + ssoc_valor + derechos_valor
-                    subtotal_calculado = f"{subtotal_valor:.2f}"
-                except ValueError:
-                    subtotal_calculado = "0.00"
                 
                 subtotal = st.text_input(
                     "Subtotal (Prima Neta + Contrib S.C.V.S. + Seguro Campesino + Derechos Emisión)",
-                    value=subtotal_calculado,
+                    value=str(desglose["subtotal"]),
                     disabled=True,
                     help="Calculado automáticamente como la suma de Prima Neta + Contribuciones + Derechos de Emisión"
                 )
                 col1,col2,col3,col4 = st.columns(4)
                 with col1:
-                    # Calcular IVA como 15% del subtotal (que ya incluye derechos de emisión)
-                    iva_15_calculado = ""
-                    if subtotal_calculado:
-                        try:
-                            subtotal_valor = float(subtotal_calculado)
-                            iva_15_valor = subtotal_valor * 0.15  # 15% del subtotal (que incluye derechos)
-                            iva_15_calculado = f"{iva_15_valor:.2f}"
-                        except ValueError:
-                            iva_15_calculado = "0.00"
-                    else:
-                        iva_15_calculado = "0.00"
-                    
                     iva_15 = st.text_input(
                         "IVA (15% del Subtotal)", 
-                        value=iva_15_calculado,
+                        value=str(desglose["iva"]),
                         disabled=True,
                         help="Calculado automáticamente como 15% del Subtotal (que incluye Prima Neta + Contribuciones + Derechos de Emisión)"
                     )
@@ -803,19 +666,9 @@ def crud_polizas():
                     pass
                 # Campo eliminado: Otros IVA - ya no es necesario
                 
-                # Calcular Prima Total como suma de Subtotal + IVA
-                total_calculado = ""
-                try:
-                    subtotal_valor = float(subtotal_calculado) if subtotal_calculado else 0.0
-                    iva_valor = float(iva_15_calculado) if iva_15_calculado else 0.0
-                    total_valor = subtotal_valor + iva_valor
-                    total_calculado = f"{total_valor:.2f}"
-                except ValueError:
-                    total_calculado = "0.00"
-                
                 total = st.text_input(
                     "Prima Total (Subtotal + IVA)",
-                    value=total_calculado,
+                    value=str(desglose["total"]),
                     disabled=True,
                     help="Prima Total calculada automáticamente como Subtotal + IVA (15%)"
                 )
@@ -868,154 +721,50 @@ def crud_polizas():
                         "id_beneficiario": id_beneficiario if asegurado_contratante == "No" else "",
                         "formas_de_pago": formas_de_pago,
                     }
-                    # Persistir la factura provisionalmente en la tabla `facturas` para que quede registrada
-                    try:
-                        connf = sqlite3.connect(DB_FILE)
-                        curf = connf.cursor()
-                        # Preparar montos numéricos seguros
-                        try:
-                            monto_neto_f = float(st.session_state["facturacion_data"].get("prima_neta", 0) or 0)
-                        except Exception:
-                            monto_neto_f = 0.0
-                        try:
-                            impuestos_f = float(st.session_state["facturacion_data"].get("contrib_scvs", 0) or 0) + float(st.session_state["facturacion_data"].get("ssoc_camp", 0) or 0) + float(st.session_state["facturacion_data"].get("derechos_emision", 0) or 0)
-                        except Exception:
-                            impuestos_f = 0.0
-                        try:
-                            iva_f = float(st.session_state["facturacion_data"].get("iva_15", 0) or 0)
-                        except Exception:
-                            iva_f = 0.0
-                        try:
-                            total_f = float(st.session_state["facturacion_data"].get("total", 0) or 0)
-                        except Exception:
-                            total_f = monto_neto_f + impuestos_f + iva_f
-
-                        # Use None for empty invoice number so SQLite stores NULL (UNIQUE allows multiple NULLs)
-                        numero_fact_raw = st.session_state["facturacion_data"].get("numero_factura", "")
-                        numero_fact = numero_fact_raw.strip() if numero_fact_raw and str(numero_fact_raw).strip() else None
-                        fecha_fact = st.session_state["facturacion_data"].get("fecha_factura", None)
-                        # intentar derivar cliente_id del formulario de póliza si está disponible
-                        cliente_id_for_fact = None
-                        try:
-                            cliente_id_for_fact = st.session_state.get("poliza_form_data", {}).get("tomador_id")
-                        except Exception:
-                            cliente_id_for_fact = None
-
-                        # Use a local import of date to avoid accidental shadowing of the `datetime` name
-                        from datetime import date
-                        fecha_reg = date.today().strftime('%Y-%m-%d')
-
-                        curf.execute(
-                            '''
-                            INSERT INTO facturas (numero_factura, poliza_id, movimiento_id, cliente_id, fecha_emision, monto_neto, impuestos, iva, total, estado, fecha_registro)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            ''',
-                            (
-                                numero_fact,
-                                None,
-                                None,
-                                cliente_id_for_fact,
-                                fecha_fact,
-                                monto_neto_f,
-                                impuestos_f,
-                                iva_f,
-                                total_f,
-                                'Emitida',
-                                fecha_reg
-                            )
-                        )
-                        connf.commit()
-                        factura_id_created = curf.lastrowid
-                        st.session_state["factura_id"] = factura_id_created
-                        st.success(f"Datos de facturación guardados y factura provisional registrada (id={factura_id_created}).")
-                    except Exception as e:
-                        st.warning(f"No se pudo crear factura provisional automáticamente: {e}")
-                    finally:
-                        try:
-                            connf.close()
-                        except Exception:
-                            pass
-                    # --- CREAR POLIZA EN LA BASE DE DATOS ---
+                    # --- CREAR PÓLIZA Y FACTURA EN UNA SOLA TRANSACCIÓN (core/polizas.py) ---
                     poliza_data = st.session_state.get("poliza_form_data", {})
                     facturacion_data = st.session_state.get("facturacion_data", {})
                     if poliza_data:
-                        # Validar que el número de póliza no exista antes de insertar
-                        conn = sqlite3.connect(DB_FILE)
-                        cursor = conn.cursor()
-                        cursor.execute("SELECT COUNT(*) FROM polizas WHERE numero_poliza = ?", (poliza_data.get("numero_poliza", ""),))
-                        exists = cursor.fetchone()[0]
-                        if exists:
-                            st.error("Ya existe una póliza con ese número. Por favor, ingrese un número de póliza único.")
-                            conn.close()
-                        else:
-                            insert_data = {**poliza_data, **facturacion_data}
-                            cursor.execute("PRAGMA table_info(polizas)")
-                            poliza_cols = [row[1] for row in cursor.fetchall() if row[1] != "id"]
-                            # Asegurar que exista la columna canonical 'estado' y mapear valores desde el formulario
-                            if "estado" not in poliza_cols:
-                                try:
-                                    cursor.execute("ALTER TABLE polizas ADD COLUMN estado TEXT")
-                                    poliza_cols.append("estado")
-                                except Exception:
-                                    # Si falla, continuar sin detener la inserción
-                                    pass
-                            # El formulario guarda el estado en la clave 'estado_poliza'
-                            if "estado_poliza" in insert_data and "estado" in poliza_cols:
-                                insert_data["estado"] = insert_data.get("estado_poliza", "")
-                                # conservar la clave original si la tabla también la tiene; evitar duplicados al mapear
-                                insert_data.pop("estado_poliza", None)
-                            # Si por alguna razón la tabla tiene 'estado_poliza' (vieja convención), también mantenerla
-                            elif "estado_poliza" in poliza_cols and "estado" in insert_data:
-                                insert_data["estado_poliza"] = insert_data.get("estado", "")
-                                insert_data.pop("estado", None)
-                            # --- Asegura que formas_de_pago esté en poliza_cols ---
-                            if "formas_de_pago" not in poliza_cols:
-                                cursor.execute("ALTER TABLE polizas ADD COLUMN formas_de_pago TEXT")
-                                poliza_cols.append("formas_de_pago")
-                            # --- FIN FIX ---
-                            insert_fields = []
-                            insert_values = []
-                            for col in poliza_cols:
-                                insert_fields.append(col)
-                                insert_values.append(insert_data.get(col, ""))
-                            try:
-                                cursor.execute(
-                                    f"INSERT INTO polizas ({', '.join(insert_fields)}) VALUES ({', '.join(['?']*len(insert_fields))})",
-                                    insert_values
-                                )
-                                new_poliza_id = cursor.lastrowid
-                                conn.commit()
-                                st.success("Póliza creada exitosamente.")
-                                st.session_state["poliza_form_step"] = 1
-                                st.session_state["poliza_form_data"] = {}
-                                st.session_state["facturacion_data"] = {}
-                                # Si previamente se creó una factura provisional, ligarla a la póliza creada
-                                try:
-                                    factura_pending = st.session_state.get("factura_id")
-                                    if factura_pending:
-                                        cur_up = conn.cursor()
-                                        cur_up.execute("UPDATE facturas SET poliza_id = ? WHERE id = ?", (new_poliza_id, factura_pending))
-                                        conn.commit()
-                                        # limpiar estado de factura provisional
-                                        st.session_state.pop("factura_id", None)
-                                except Exception:
-                                    # No bloquear la creación si no se puede ligar la factura
-                                    pass
-                            except Exception as e:
+                        insert_data = {**poliza_data, **facturacion_data}
+                        poliza_cols = get_columns("polizas")
+                        # Mapear el estado del formulario a la columna canonical 'estado'
+                        # El formulario guarda el estado en la clave 'estado_poliza'
+                        if "estado_poliza" in insert_data and "estado" in poliza_cols:
+                            insert_data["estado"] = insert_data.get("estado_poliza", "")
+                            # conservar la clave original si la tabla también la tiene; evitar duplicados al mapear
+                            insert_data.pop("estado_poliza", None)
+                        # Si por alguna razón la tabla tiene 'estado_poliza' (vieja convención), también mantenerla
+                        elif "estado_poliza" in poliza_cols and "estado" in insert_data:
+                            insert_data["estado_poliza"] = insert_data.get("estado", "")
+                            insert_data.pop("estado", None)
+
+                        # Factura con los montos del desglose (las columnas de facturas son REAL);
+                        # sin número ingresado se asigna el siguiente de la secuencia
+                        factura = {
+                            "numero_factura": facturacion_data.get("numero_factura", ""),
+                            "fecha_emision": facturacion_data.get("fecha_factura"),
+                            "monto_neto": float(desglose["prima"]),
+                            "impuestos": float(desglose["impuestos"]),
+                            "iva": float(desglose["iva"]),
+                            "total": float(desglose["total"]),
+                        }
+                        try:
+                            new_poliza_id, factura_id = create_policy_with_invoice(insert_data, factura)
+                        except sqlite3.IntegrityError as e:
+                            # Un solo commit: si algo falla no queda ni la póliza ni la factura
+                            if "numero_poliza" in str(e):
+                                st.error("Ya existe una póliza con ese número. Por favor, ingrese un número de póliza único.")
+                            else:
                                 st.error(f"Error al crear la póliza: {e}")
-                            finally:
-                                conn.close()
-                            # Debug: ensure direccion/contenido were saved (logs for local debugging)
-                            try:
-                                conn2 = sqlite3.connect(DB_FILE)
-                                cur2 = conn2.cursor()
-                                cur2.execute("SELECT id, numero_poliza, direccion, contenido FROM polizas WHERE numero_poliza = ? ORDER BY id DESC LIMIT 1", (insert_data.get('numero_poliza', ''),))
-                                saved = cur2.fetchone()
-                                if saved:
-                                    st.write('Guardado en DB:', saved)
-                                conn2.close()
-                            except Exception:
-                                pass
+                        except Exception as e:
+                            st.error(f"Error al crear la póliza: {e}")
+                        else:
+                            # El PDF de la factura se genera en segundo plano (core/documentos.py)
+                            encolar(FACTURA, [factura_id])
+                            st.success(f"Póliza creada exitosamente (id={new_poliza_id}) con su factura (id={factura_id}).")
+                            st.session_state["poliza_form_step"] = 1
+                            st.session_state["poliza_form_data"] = {}
+                            st.session_state["facturacion_data"] = {}
     elif operation == "Leer":
         # Agregar estilos CSS para las tarjetas
         st.markdown("""
@@ -1054,131 +803,93 @@ def crud_polizas():
         </style>
         """, unsafe_allow_html=True)
         
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        
-        # Asegurar que exista la columna canonical 'estado'
-        cursor.execute("PRAGMA table_info(polizas)")
-        all_fields = [row[1] for row in cursor.fetchall()]
-        if "estado" not in all_fields:
-            try:
-                cursor.execute("ALTER TABLE polizas ADD COLUMN estado TEXT")
-                conn.commit()
-                all_fields.append("estado")
-            except Exception:
-                pass
-
-        # Construir diccionario de clientes
-        cursor.execute("SELECT id, tipo_cliente, nombres, apellidos, razon_social FROM clients")
-        clients_rows = cursor.fetchall()
-        clientes_dict = {}
-        for row in clients_rows:
-            tipo = (row[1] or "").lower()
-            if tipo in ("persona jurídica", "persona juridica", "empresa"):
-                clientes_dict[row[0]] = row[4] or ""
-            else:
-                clientes_dict[row[0]] = f"{(row[2] or '').strip()} {(row[3] or '').strip()}".strip()
-
-        # Obtener todas las pólizas con información adicional
-        cursor.execute("PRAGMA table_info(polizas)")
-        pol_cols = [r[1] for r in cursor.fetchall()]
-        
-        select_fields = ["id", "numero_poliza", "cliente_id", "aseguradora_id", "fecha_inicio", "fecha_fin"]
-        if "tomador_nombre" in pol_cols:
-            select_fields.append("tomador_nombre")
-        if "estado" in pol_cols:
-            select_fields.append("estado")
-        elif "estado_poliza" in pol_cols:
-            select_fields.append("estado_poliza")
-        if "suma_asegurada" in pol_cols:
-            select_fields.append("suma_asegurada")
-        if "prima_neta" in pol_cols:
-            select_fields.append("prima_neta")
-            
-        cursor.execute(f"SELECT {', '.join(select_fields)} FROM polizas ORDER BY fecha_inicio DESC")
-        pol_rows = cursor.fetchall()
-        
-        # Obtener nombres de aseguradoras
-        cursor.execute("SELECT id, razon_social FROM aseguradoras")
-        aseguradoras_dict = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Obtener nombres de sucursales
-        cursor.execute("SELECT id, nombre FROM sucursales")
-        sucursales_dict = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Obtener nombres de agrupadoras
-        cursor.execute("SELECT id, name FROM companies")
-        agrupadoras_dict = {row[0]: row[1] for row in cursor.fetchall()}
-
-        if not pol_rows:
+        # Filtros, búsqueda, orden y paginación se resuelven en SQL (core/polizas.py):
+        # cada render lee solo una página con los nombres de cliente y aseguradora ya unidos
+        total_polizas = contar_polizas()
+        if not total_polizas:
             st.info("📋 No hay pólizas registradas.")
-            conn.close()
             return
 
-        st.markdown(f"### 📊 Total de Pólizas: {len(pol_rows)}")
+        st.markdown(f"### 📊 Total de Pólizas: {total_polizas}")
         st.divider()
         
         # Filtros
+        with connection() as conn:
+            aseguradoras_opciones = conn.execute(
+                "SELECT id, razon_social FROM aseguradoras ORDER BY razon_social"
+            ).fetchall()
         col1, col2, col3 = st.columns(3)
         with col1:
-            estados_disponibles = list(set([row[7] if len(row) > 7 and row[7] else "Sin estado" for row in pol_rows]))
-            filtro_estado = st.multiselect("Filtrar por estado", ["Todos"] + estados_disponibles, default=["Todos"])
+            filtro_estado = st.multiselect("Filtrar por estado", ["Todos"] + estados_de_polizas(), default=["Todos"])
         
         with col2:
-            aseguradoras_disponibles = list(set([aseguradoras_dict.get(row[3], "Sin aseguradora") for row in pol_rows if len(row) > 3]))
-            filtro_aseguradora = st.multiselect("Filtrar por aseguradora", ["Todas"] + aseguradoras_disponibles, default=["Todas"])
+            filtro_aseguradora = st.multiselect(
+                "Filtrar por aseguradora", ["Todas"] + aseguradoras_opciones, default=["Todas"],
+                format_func=lambda x: x if isinstance(x, str) else (x[1] or "(Sin nombre)")
+            )
         
         with col3:
             buscar = st.text_input("🔍 Buscar por número de póliza", placeholder="Ej: PRG-1")
 
-        # Aplicar filtros
-        pol_rows_filtradas = pol_rows
-        if "Todos" not in filtro_estado:
-            pol_rows_filtradas = [r for r in pol_rows_filtradas if (len(r) > 7 and r[7] in filtro_estado) or (len(r) <= 7 and "Sin estado" in filtro_estado)]
-        
-        if "Todas" not in filtro_aseguradora:
-            pol_rows_filtradas = [r for r in pol_rows_filtradas if aseguradoras_dict.get(r[3], "Sin aseguradora") in filtro_aseguradora]
-        
-        if buscar:
-            pol_rows_filtradas = [r for r in pol_rows_filtradas if buscar.upper() in str(r[1]).upper()]
+        estados = None if "Todos" in filtro_estado else filtro_estado
+        aseguradora_ids = None if "Todas" in filtro_aseguradora else [a[0] for a in filtro_aseguradora]
+
+        # Paginación por keyset: pila de cursores de las páginas visitadas; se reinicia al cambiar filtros
+        firma_filtros = (tuple(estados or ()), tuple(aseguradora_ids or ()), buscar.strip())
+        if st.session_state.get("polizas_leer_filtros") != firma_filtros:
+            st.session_state["polizas_leer_filtros"] = firma_filtros
+            st.session_state["polizas_leer_cursores"] = [None]
+        cursores = st.session_state["polizas_leer_cursores"]
 
-        if not pol_rows_filtradas:
+        pagina, siguiente = listar_polizas(estados, aseguradora_ids, buscar, despues_de=cursores[-1])
+        if not pagina:
             st.warning("⚠️ No se encontraron pólizas con los filtros aplicados.")
-            conn.close()
             return
 
-        st.markdown(f"**Mostrando {len(pol_rows_filtradas)} pólida(s)**")
-        
+        total_filtradas = contar_polizas(estados, aseguradora_ids, buscar)
+        desde = (len(cursores) - 1) * TAMANO_PAGINA + 1
+        st.markdown(f"**Mostrando {desde}–{desde + len(pagina) - 1} de {total_filtradas} póliza(s)**")
+
+        col_prev, col_pag, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("⬅️ Anterior", disabled=len(cursores) == 1, key="polizas_leer_anterior"):
+                cursores.pop()
+                st.rerun()
+        with col_pag:
+            st.markdown(f"Página {len(cursores)}")
+        with col_next:
+            if st.button("Siguiente ➡️", disabled=siguiente is None, key="polizas_leer_siguiente"):
+                cursores.append(siguiente)
+                st.rerun()
+
+        conn = get_connection()
+        cursor = conn.cursor()
+
         # Mostrar pólizas en tarjetas (2 columnas)
-        for idx in range(0, len(pol_rows_filtradas), 2):
+        for idx in range(0, len(pagina), 2):
             cols = st.columns(2)
             
             for col_idx, col in enumerate(cols):
-                if idx + col_idx < len(pol_rows_filtradas):
-                    row = pol_rows_filtradas[idx + col_idx]
+                if idx + col_idx < len(pagina):
+                    row = pagina[idx + col_idx]
                     
                     with col:
                         # Extraer información de la fila
-                        poliza_id = row[0]
-                        numero_poliza = row[1] or "(Sin número)"
-                        cliente_id = row[2]
-                        aseguradora_id = row[3]
-                        fecha_inicio = row[4] if len(row) > 4 else ""
-                        fecha_fin = row[5] if len(row) > 5 else ""
-                        tomador_nombre = row[6] if len(row) > 6 and "tomador_nombre" in select_fields else None
-                        estado = row[7] if len(row) > 7 else "Sin estado"
-                        suma_asegurada = row[8] if len(row) > 8 else ""
-                        prima_neta = row[9] if len(row) > 9 else ""
+                        poliza_id = row["id"]
+                        numero_poliza = row["numero_poliza"] or "(Sin número)"
+                        fecha_inicio = row["fecha_inicio"] or ""
+                        fecha_fin = row["fecha_fin"] or ""
+                        tomador_nombre = row["tomador_nombre"]
+                        estado = row["estado"] or SIN_ESTADO
                         
-                        # Obtener nombre del cliente
+                        # Nombre del cliente: tomador del formulario o cliente ligado por cliente_id
                         client_name = "(Sin solicitante)"
                         if tomador_nombre and str(tomador_nombre).strip().lower() not in ("none", ""):
                             client_name = tomador_nombre
-                        elif cliente_id and cliente_id in clientes_dict:
-                            client_name = clientes_dict[cliente_id] or client_name
+                        elif row["cliente_nombre"]:
+                            client_name = row["cliente_nombre"]
                         
-                        # Obtener nombre de aseguradora
-                        aseguradora_nombre = aseguradoras_dict.get(aseguradora_id, "(Sin aseguradora)")
+                        aseguradora_nombre = row["aseguradora_nombre"] or "(Sin aseguradora)"
                         
                         # Color de estado
                         estado_colors = {
@@ -1209,8 +920,7 @@ def crud_polizas():
                             """, unsafe_allow_html=True)
                             
                             # Obtener detalles completos de la póliza
-                            cursor.execute("PRAGMA table_info(polizas)")
-                            all_fields = [row[1] for row in cursor.fetchall()]
+                            all_fields = get_columns("polizas")
                             cursor.execute(f"SELECT {', '.join(all_fields)} FROM polizas WHERE id=?", (poliza_id,))
                             poliza_row = cursor.fetchone()
                             
@@ -1255,12 +965,7 @@ def crud_polizas():
                                 with tab3:
                                     # Movimientos asociados
                                     try:
-                                        cursor.execute("""
-                                            SELECT m.id, m.codigo_movimiento, m.tipo_movimiento, m.estado, m.fecha_movimiento
-                                            FROM movimientos_poliza m
-                                            WHERE m.poliza_id = ?
-                                            ORDER BY m.fecha_movimiento DESC
-                                        """, (poliza_id,))
+                                        cursor.execute(MOVIMIENTOS_POR_POLIZA, (poliza_id,))
                                         movimientos = cursor.fetchall()
                                         
                                         if movimientos:
@@ -1275,10 +980,7 @@ def crud_polizas():
                                     
                                     # Facturas
                                     try:
-                                        cursor.execute("""
-                                            SELECT numero_factura, fecha_emision, total, estado
-                                            FROM facturas WHERE poliza_id = ?
-                                        """, (poliza_id,))
+                                        cursor.execute(FACTURAS_POR_POLIZA, (poliza_id,))
                                         facturas = cursor.fetchall()
                                         
                                         if facturas:
@@ -1293,11 +995,10 @@ def crud_polizas():
 
         conn.close()
     elif operation == "Modificar":
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         # Obtener todos los campos de la tabla polizas
-        cursor.execute("PRAGMA table_info(polizas)")
-        all_fields = [row[1] for row in cursor.fetchall()]
+        all_fields = get_columns("polizas")
         cursor.execute(f"SELECT id, numero_poliza FROM polizas")
         polizas = cursor.fetchall()
         if not polizas:
@@ -1313,16 +1014,21 @@ def crud_polizas():
                 st.error("No se encontró la póliza seleccionada.")
                 return
             poliza_dict = dict(zip(all_fields, poliza_actual))
+            # La búsqueda de cliente va fuera del formulario para refrescar las coincidencias al escribir
+            texto_cliente = campo_busqueda_cliente("Cliente", key="modificar_poliza_cliente")
             with st.form("modificar_poliza"):
                 updated_values = {}
                 for field in all_fields:
                     if field == "numero_poliza":
                         updated_values[field] = st.text_input("Número de Póliza", value=poliza_dict.get(field, ""), disabled=True)
                     elif field == "cliente_id":
-                        client_options = get_client_options()
-                        current_client = next((c for c in client_options if c[0] == poliza_dict.get(field)), None)
-                        updated = st.selectbox("Cliente", client_options, index=client_options.index(current_client) if current_client else 0, format_func=lambda x: x[1])
-                        updated_values[field] = updated[0]
+                        updated = selector_cliente(
+                            "Cliente",
+                            key="modificar_poliza_cliente",
+                            cliente_actual=poliza_dict.get(field),
+                            texto=texto_cliente,
+                        )
+                        updated_values[field] = updated[0] if updated else poliza_dict.get(field)
                     elif field == "usuario_id":
                         user_options = get_user_options()
                         current_user = next((u for u in user_options if u[0] == poliza_dict.get(field)), None)
@@ -1368,11 +1074,14 @@ def crud_polizas():
                         updated_values[field] = st.text_input("Dirección", value=str(poliza_dict.get(field, "")))
                     elif field == "contenido":
                         updated_values[field] = st.text_area("Contenido asegurado", value=str(poliza_dict.get(field, "")), height=120)
+                    elif field.endswith("_centavos"):
+                        # Se recalculan a partir de los montos de texto al guardar
+                        continue
                     else:
                         updated_values[field] = st.text_input(field.replace("_", " ").capitalize(), value=str(poliza_dict.get(field, "")))
                 submit = st.form_submit_button("Actualizar Póliza")
                 if submit:
-                    conn = sqlite3.connect(DB_FILE)
+                    conn = get_connection()
                     cursor = conn.cursor()
                     try:
                         # Mantener consistencia entre columnas 'estado' y 'estado_poliza' si existen ambas
@@ -1382,18 +1091,10 @@ def crud_polizas():
                                 updated_values["estado_poliza"] = updated_values.get("estado", "")
                             elif "estado_poliza" in updated_values:
                                 updated_values["estado"] = updated_values.get("estado_poliza", "")
-                        # Si la tabla tiene solo 'estado_poliza' pero no 'estado', crear 'estado' para normalizar
-                        if "estado_poliza" in all_fields and "estado" not in all_fields:
-                            try:
-                                cursor.execute("ALTER TABLE polizas ADD COLUMN estado TEXT")
-                                conn.commit()
-                                all_fields.append("estado")
-                                updated_values["estado"] = updated_values.get("estado_poliza", "")
-                            except Exception:
-                                pass
                         for f in ["fecha_inicio", "fecha_fin", "fecha_emision"]:
                             if f in updated_values and hasattr(updated_values[f], "strftime"):
                                 updated_values[f] = updated_values[f].strftime("%Y-%m-%d")
+                        updated_values.update(centavos_de(updated_values, MONTOS_POLIZA))
                         set_clause = ', '.join([f"{f}=?" for f in all_fields])
                         values = [updated_values[f] for f in all_fields] + [selected_poliza[0]]
                         cursor.execute(
@@ -1407,10 +1108,85 @@ def crud_polizas():
                     finally:
                         conn.close()
 
+    elif operation == "Importar":
+        st.header("Ingesta de bordereaux")
+        st.caption(
+            "Archivo CSV o XLSX exportado por la aseguradora, una póliza por fila. Clientes y aseguradoras "
+            "se buscan por número de documento/RUC; la factura se calcula con el desglose estándar. "
+            "Cada lote se confirma por separado: si la carga se interrumpe, vuelva a subir el mismo "
+            "archivo y continuará desde la última fila guardada."
+        )
+        archivo = st.file_uploader("Bordereau", type=["csv", "xlsx"], key="ingesta_polizas_archivo")
+        if not archivo:
+            return
+        # pandas solo se carga al subir un bordereau
+        from core.importacion_clientes import leer_lotes, reporte_errores_csv
+        from core.ingesta_polizas import MAPEO_PREDETERMINADO, ingestar_polizas, mapear_columnas
+
+        # Editor del mapeo: cada encabezado del archivo a un campo de la póliza
+        encabezados = list(next(leer_lotes(archivo, archivo.name, 1)).columns)
+        archivo.seek(0)
+        detectado = mapear_columnas(encabezados)
+        campos = ["(ignorar)"] + list(MAPEO_PREDETERMINADO)
+        mapeo = {}
+        with st.expander("Columnas del archivo", expanded=True):
+            for encabezado in encabezados:
+                campo = st.selectbox(
+                    str(encabezado), campos,
+                    index=campos.index(detectado.get(encabezado, "(ignorar)")),
+                    key=f"ingesta_mapeo_{encabezado}",
+                )
+                mapeo[encabezado] = None if campo == "(ignorar)" else campo
+
+        col1, col2 = st.columns(2)
+        with col1:
+            usuario = st.selectbox("Usuario responsable", get_user_options(), format_func=lambda x: x[1])
+        with col2:
+            aseguradoras = [(None, "Según la columna del archivo")] + get_aseguradora_options()
+            aseguradora = st.selectbox("Aseguradora del archivo", aseguradoras, format_func=lambda x: x[1])
+        facturar = st.checkbox("Generar la factura de cada póliza", value=True)
+
+        if usuario and st.button("Cargar pólizas"):
+            avance = st.empty()
+            try:
+                resumen = ingestar_polizas(
+                    archivo,
+                    archivo.name,
+                    usuario[0],
+                    mapeo=mapeo,
+                    aseguradora_id=aseguradora[0],
+                    facturar=facturar,
+                    progreso=lambda filas: avance.info(f"⏳ {filas} filas procesadas..."),
+                )
+            except Exception as e:
+                # Solo se revierte el lote en curso; los anteriores quedan confirmados
+                avance.empty()
+                st.error(f"Error en la ingesta (puede reanudarla subiendo el mismo archivo): {e}")
+            else:
+                avance.empty()
+                if resumen["completada_antes"]:
+                    st.info("Este archivo ya se había cargado por completo; no se insertó nada nuevo.")
+                elif resumen["reanudada_desde"]:
+                    st.info(f"Ingesta reanudada desde la fila {resumen['reanudada_desde'] + 2}.")
+                st.success(
+                    f"{resumen['insertadas']} pólizas cargadas de {resumen['filas']} filas "
+                    f"({resumen['rechazadas']} rechazadas)."
+                )
+                if resumen["errores"]:
+                    st.dataframe(
+                        [{"fila": f, "numero_poliza": n, "motivo": m} for f, n, m in resumen["errores"][:500]]
+                    )
+                    st.download_button(
+                        "Descargar reporte de errores",
+                        reporte_errores_csv(resumen["errores"], ("fila", "numero_poliza", "motivo")),
+                        file_name="errores_ingesta_polizas.csv",
+                        mime="text/csv",
+                    )
+
     elif operation == "Borrar":
         st.warning("⚠️ **Atención**: Esta acción eliminará permanentemente la póliza seleccionada.")
         
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, numero_poliza FROM polizas ORDER BY numero_poliza")
         polizas = cursor.fetchall()
@@ -1433,8 +1209,7 @@ def crud_polizas():
         
         if selected_poliza:
             # Verificar qué columnas existen en la tabla
-            cursor.execute("PRAGMA table_info(polizas)")
-            existing_columns = [row[1] for row in cursor.fetchall()]
+            existing_columns = get_columns("polizas")
             
             # Construir la consulta solo con columnas que existan
             select_fields = ["numero_poliza"]
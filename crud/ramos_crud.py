@@ -10,6 +10,9 @@ import streamlit as st  # Framework de interfaz de usuario
 import sqlite3  # Manejo de base de datos SQLite
 import pandas as pd  # Manejo de DataFrames para visualización
 from dbconfig import DB_FILE  # Ruta del archivo de base de datos
+from core.catalogos import invalidar  # Invalidación de la caché de catálogos
+from core.db import get_connection  # Pool de conexiones SQLite compartido
+from core.polizas import categoria_de_ramo  # Categoría (Vehicular, Vida/Salud) según el nombre
 import datetime as dt  # Manejo de fechas
 
 # ============================================================================
@@ -23,7 +26,7 @@ def get_all_ramos():
     Retorna:
         pandas.DataFrame: DataFrame con todos los ramos ordenados por nombre
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     try:
         query = "SELECT * FROM ramos_seguros ORDER BY nombre"
         df = pd.read_sql_query(query, conn)
@@ -50,16 +53,17 @@ def create_ramo(nombre, descripcion):
         tuple: (bool éxito, str mensaje)
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        # Insertar nuevo ramo
+        # Insertar nuevo ramo (la categoría filtra las pólizas en siniestros)
         cursor.execute('''
-            INSERT INTO ramos_seguros (nombre, descripcion)
-            VALUES (?, ?)
-        ''', (nombre, descripcion))
+            INSERT INTO ramos_seguros (nombre, descripcion, categoria)
+            VALUES (?, ?, ?)
+        ''', (nombre, descripcion, categoria_de_ramo(nombre)))
         conn.commit()
+        invalidar("ramos_seguros")
         return True, "Ramo creado exitosamente"
     
     except sqlite3.IntegrityError:
@@ -90,17 +94,18 @@ def update_ramo(ramo_id, nombre, descripcion):
         tuple: (bool éxito, str mensaje)
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
         # Actualizar ramo
         cursor.execute('''
             UPDATE ramos_seguros 
-            SET nombre = ?, descripcion = ?
+            SET nombre = ?, descripcion = ?, categoria = ?
             WHERE id = ?
-        ''', (nombre, descripcion, ramo_id))
+        ''', (nombre, descripcion, categoria_de_ramo(nombre), ramo_id))
         conn.commit()
+        invalidar("ramos_seguros")
         
         # Verificar si se actualizó algún registro
         if cursor.rowcount > 0:
@@ -133,7 +138,7 @@ def delete_ramo(ramo_id):
         tuple: (bool éxito, str mensaje)
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -150,6 +155,7 @@ def delete_ramo(ramo_id):
         # Si no está en uso, proceder con la eliminación
         cursor.execute("DELETE FROM ramos_seguros WHERE id = ?", (ramo_id,))
         conn.commit()
+        invalidar("ramos_seguros")
         
         # Verificar si se eliminó algún registro
         if cursor.rowcount > 0:
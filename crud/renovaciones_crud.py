@@ -0,0 +1,99 @@
+# ============================================================================
+# RENOVACIONES - crud/renovaciones_crud.py
+# ============================================================================
+# Pantallas del Back Office sobre core/renovaciones.py:
+#   - reporte_vencimientos(): pólizas activas que vencen en 30/60/90 días
+#     por ejecutivo comercial o por aseguradora (índice de vencimientos)
+#   - lista_renovaciones(): lista de trabajo que genera la tarea nocturna,
+#     con filtros y registro del estado de cada gestión
+# ============================================================================
+
+# Importaciones necesarias
+import streamlit as st  # Framework de interfaz de usuario
+
+from core.money import Money  # Formato de montos en centavos
+from core.renovaciones import (  # Calendario de vencimientos y lista de trabajo
+    ESTADOS_GESTION, VENTANAS, generar_lista_renovacion, lista_renovacion, registrar_gestion, ultima_generacion,
+    vencimientos,
+)
+
+
+def reporte_vencimientos():
+    """Muestra los vencimientos de los próximos 30/60/90 días agrupados por ejecutivo o aseguradora."""
+    st.subheader("📅 Pólizas por vencer")
+    agrupar_por = st.radio(
+        "Agrupar por", ["ejecutivo", "aseguradora"],
+        format_func=lambda x: "Ejecutivo comercial" if x == "ejecutivo" else "Aseguradora",
+        horizontal=True, key="vencimientos_agrupar",
+    )
+    filas = vencimientos(agrupar_por)
+    if not filas:
+        st.info(f"No hay pólizas activas que venzan en los próximos {VENTANAS[-1]} días.")
+        return
+
+    totales = [sum(fila[2 + i] for fila in filas) for i in range(len(VENTANAS))]
+    for columna, dias, total in zip(st.columns(len(VENTANAS)), VENTANAS, totales):
+        with columna:
+            st.metric(f"Vencen en {dias} días", total)
+    st.dataframe(
+        [
+            {"Ejecutivo comercial" if agrupar_por == "ejecutivo" else "Aseguradora": nombre,
+             **{f"≤ {dias} días": n for dias, n in zip(VENTANAS, conteos)}}
+            for _, nombre, *conteos in filas
+        ],
+        use_container_width=True,
+    )
+
+
+def lista_renovaciones():
+    """Muestra la lista de renovación y permite registrar la gestión de cada póliza."""
+    st.subheader("🔁 Lista de renovación")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        generada = ultima_generacion()
+        st.caption(f"Última generación: {generada or 'nunca'} (tarea nocturna: scripts/generar_renovaciones.py)")
+    with col2:
+        if st.button("Regenerar ahora", key="renovaciones_regenerar"):
+            resumen = generar_lista_renovacion()
+            st.success(f"{resumen['en_lista']} póliza(s) en la lista ({resumen['nuevas']} nuevas, {resumen['retiradas']} retiradas)")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        ventana = st.selectbox(
+            "Ventana", [None, *VENTANAS],
+            format_func=lambda x: "Todas" if x is None else f"{x} días", key="renovaciones_ventana",
+        )
+    with col2:
+        estado = st.selectbox(
+            "Estado de la gestión", [None, *ESTADOS_GESTION],
+            format_func=lambda x: "Todos" if x is None else x, key="renovaciones_estado",
+        )
+
+    filas = lista_renovacion(ventana=ventana, estado_gestion=estado)
+    if not filas:
+        st.info("No hay pólizas en la lista con esos filtros.")
+        return
+    st.dataframe(
+        [
+            {"Póliza": numero, "Cliente": cliente, "Aseguradora": aseguradora, "Fin de vigencia": fecha_fin,
+             "Ventana": f"{ventana_dias} días", "Prima neta": Money.from_cents(prima or 0).format(),
+             "Gestión": gestion, "Observaciones": observaciones or ""}
+            for _, numero, cliente, aseguradora, fecha_fin, ventana_dias, prima, gestion, observaciones, _ in filas
+        ],
+        use_container_width=True,
+    )
+
+    # Registro de la gestión de una póliza
+    with st.form("renovaciones_gestion"):
+        poliza = st.selectbox(
+            "Póliza", filas, format_func=lambda fila: f"{fila[1]} · {fila[2]} · vence {fila[4]}",
+            key="renovaciones_poliza",
+        )
+        nuevo_estado = st.selectbox("Nuevo estado", ESTADOS_GESTION, key="renovaciones_nuevo_estado")
+        observaciones = st.text_area("Observaciones", key="renovaciones_observaciones")
+        if st.form_submit_button("Registrar gestión"):
+            ok, mensaje = registrar_gestion(poliza[0], nuevo_estado, observaciones or None)
+            if ok:
+                st.success(mensaje)
+            else:
+                st.error(mensaje)
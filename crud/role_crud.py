@@ -1,6 +1,7 @@
 import streamlit as st
 import sqlite3
 from dbconfig import DB_FILE
+from core.db import get_connection
 
 def crud_roles():
     st.subheader("Gestión de Roles")
@@ -10,7 +11,7 @@ def crud_roles():
         role_name = st.text_input("Nombre del Rol")
         if st.button("Crear Rol"):
             if role_name:
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
                 try:
                     cursor.execute("INSERT INTO roles (name) VALUES (?)", (role_name,))
@@ -24,7 +25,7 @@ def crud_roles():
                 st.error("Ingresa un nombre para el rol.")
 
     elif operation == "Leer":
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, name FROM roles")
         roles = cursor.fetchall()
@@ -37,7 +38,7 @@ def crud_roles():
             st.info("No hay roles registrados.")
 
     elif operation == "Modificar":
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, name FROM roles")
         roles = cursor.fetchall()
@@ -49,7 +50,7 @@ def crud_roles():
         new_name = st.text_input("Nuevo nombre del rol")
         if st.button("Modificar Rol"):
             if new_name:
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
                 try:
                     cursor.execute("UPDATE roles SET name = ? WHERE id = ?", (new_name, selected_role[0]))
@@ -63,7 +64,7 @@ def crud_roles():
                 st.error("Ingresa un nuevo nombre.")
 
     elif operation == "Borrar":
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_connection()
         cursor = conn.cursor()
         cursor.execute("SELECT id, name FROM roles")
         roles = cursor.fetchall()
@@ -73,7 +74,7 @@ def crud_roles():
             return
         selected_role = st.selectbox("Selecciona un rol para eliminar", roles, format_func=lambda x: x[1])
         if st.button("Eliminar Rol"):
-            conn = sqlite3.connect(DB_FILE)
+            conn = get_connection()
             cursor = conn.cursor()
             try:
                 cursor.execute("DELETE FROM roles WHERE id = ?", (selected_role[0],))
@@ -0,0 +1,94 @@
+# ============================================================================
+# SINIESTRALIDAD - crud/siniestralidad_crud.py
+# ============================================================================
+# Reporte de siniestralidad (core/siniestralidad.py) para los dashboards:
+# siniestros incurridos sobre prima devengada por ramo, aseguradora o
+# cliente, por mes, año o en todo el rango.
+# ============================================================================
+
+# Importaciones necesarias
+import datetime  # Rango por defecto del reporte
+
+import streamlit as st  # Framework de interfaz de usuario
+
+from core.money import Money  # Formato de montos en centavos
+from core.siniestralidad import desde_predeterminado, siniestralidad, totales_por_grupo  # Consulta agregada con caché
+
+ETIQUETAS_AGRUPACION = {"ramo": "Ramo", "aseguradora": "Aseguradora", "cliente": "Cliente"}
+ETIQUETAS_PERIODO = {"mes": "Mes", "anio": "Año", "total": "Todo el rango"}
+
+
+def _monto(centavos):
+    """Centavos -> "$1,234.56"."""
+    return f"${Money.from_cents(centavos or 0).format()}"
+
+
+def _porcentaje(indice):
+    """0.8467 -> "84.7 %" (— si no hay prima devengada)."""
+    return "—" if indice is None else f"{indice * 100:.1f} %"
+
+
+def reporte_siniestralidad(clave="siniestralidad"):
+    """
+    Muestra la siniestralidad por grupo y período
+
+    Parámetros:
+        clave (str): Prefijo de las keys de los widgets (una por página que lo usa)
+    """
+    st.subheader("📉 Siniestralidad")
+    hoy = datetime.date.today()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        agrupar_por = st.selectbox(
+            "Agrupar por", list(ETIQUETAS_AGRUPACION), format_func=ETIQUETAS_AGRUPACION.get, key=f"{clave}_agrupar"
+        )
+    with col2:
+        periodo = st.selectbox(
+            "Período", list(ETIQUETAS_PERIODO), format_func=ETIQUETAS_PERIODO.get, key=f"{clave}_periodo"
+        )
+    with col3:
+        desde = st.date_input("Desde", value=desde_predeterminado(hoy), key=f"{clave}_desde")
+    with col4:
+        hasta = st.date_input("Hasta", value=hoy, key=f"{clave}_hasta")
+    if desde > hasta:
+        st.error("La fecha inicial debe ser anterior a la final.")
+        return
+
+    # Por posición: los argumentos son la clave de la caché
+    filas = siniestralidad(agrupar_por, desde.isoformat(), hasta.isoformat(), periodo)
+    if not filas:
+        st.info("No hay pólizas vigentes ni siniestros en el rango.")
+        return
+
+    devengada = sum(fila[3] or 0 for fila in filas)
+    incurrido = sum(fila[5] or 0 for fila in filas)
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Prima devengada", _monto(devengada))
+    with col2:
+        st.metric("Siniestros", f"{sum(fila[4] or 0 for fila in filas):,}")
+    with col3:
+        st.metric("Incurrido", _monto(incurrido))
+    with col4:
+        st.metric("Siniestralidad", _porcentaje(incurrido / devengada if devengada else None))
+
+    etiqueta = ETIQUETAS_AGRUPACION[agrupar_por]
+    st.dataframe(
+        [
+            {etiqueta: nombre, "Prima devengada": _monto(prima), "Siniestros": n, "Incurrido": _monto(monto),
+             "Siniestralidad": _porcentaje(indice)}
+            for nombre, prima, n, monto, indice in totales_por_grupo(filas)
+        ],
+        use_container_width=True,
+    )
+    if periodo != "total":
+        with st.expander(f"Detalle por {ETIQUETAS_PERIODO[periodo].lower()}"):
+            st.dataframe(
+                [
+                    {etiqueta: nombre, "Período": etiqueta_periodo, "Prima devengada": _monto(prima),
+                     "Siniestros": n, "Incurrido": _monto(monto), "Siniestralidad": _porcentaje(indice),
+                     "Acumulada": _porcentaje(acumulada)}
+                    for _, nombre, etiqueta_periodo, prima, n, monto, indice, acumulada, _ in filas
+                ],
+                use_container_width=True,
+            )
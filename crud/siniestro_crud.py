@@ -6,39 +6,24 @@ Operaciones para crear, leer, actualizar y eliminar siniestros
 import sqlite3
 import streamlit as st
 from dbconfig import DB_FILE
+from core.db import get_connection
+from core.catalogos import invalidar  # Invalida los reportes de siniestralidad en caché
+from core.consultas import siniestros_filtrados
+from core.secuencias import siguiente_codigo_siniestro
 from datetime import datetime
 
 def generate_codigo_siniestro(tipo_siniestro):
     """
     Genera un código único para el siniestro
-    Formato: SIN-VEH-001 o SIN-SAL-001
+    Formato: SIN-VEH-001 o SIN-SAL-001 (asignado por core/secuencias.py)
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    
-    prefix = "SIN-VEH" if tipo_siniestro == "Vehicular" else "SIN-SAL"
-    
-    cursor.execute(
-        "SELECT codigo_siniestro FROM siniestros WHERE codigo_siniestro LIKE ? ORDER BY id DESC LIMIT 1",
-        (f"{prefix}-%",)
-    )
-    last = cursor.fetchone()
-    conn.close()
-    
-    if last and last[0]:
-        try:
-            num = int(last[0].split('-')[-1])
-            return f"{prefix}-{num + 1:03d}"
-        except:
-            pass
-    
-    return f"{prefix}-001"
+    return siguiente_codigo_siniestro(tipo_siniestro)
 
 def create_siniestro(**data):
     """
     Crea un nuevo siniestro en la base de datos
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -59,6 +44,7 @@ def create_siniestro(**data):
         )
         
         conn.commit()
+        invalidar("siniestros")
         siniestro_id = cursor.lastrowid
         return True, f"Siniestro {data['codigo_siniestro']} creado exitosamente", siniestro_id
     
@@ -72,29 +58,12 @@ def read_siniestros(tipo_siniestro=None, estado=None):
     """
     Lee todos los siniestros o filtrados por tipo y estado
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        query = """
-            SELECT s.*, p.numero_poliza, c.nombres, c.apellidos
-            FROM siniestros s
-            LEFT JOIN polizas p ON s.poliza_id = p.id
-            LEFT JOIN clients c ON s.cliente_id = c.id
-            WHERE 1=1
-        """
-        params = []
-        
-        if tipo_siniestro:
-            query += " AND s.tipo_siniestro = ?"
-            params.append(tipo_siniestro)
-        
-        if estado:
-            query += " AND s.estado = ?"
-            params.append(estado)
-        
-        query += " ORDER BY s.fecha_siniestro DESC"
-        
+        # Filtros por tipo/estado resueltos con los índices de siniestros
+        query, params = siniestros_filtrados(tipo_siniestro, estado)
         cursor.execute(query, params)
         columns = [col[0] for col in cursor.description]
         return [dict(zip(columns, row)) for row in cursor.fetchall()]
@@ -106,7 +75,7 @@ def update_siniestro(siniestro_id, **updates):
     """
     Actualiza un siniestro existente
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -121,6 +90,7 @@ def update_siniestro(siniestro_id, **updates):
         )
         
         conn.commit()
+        invalidar("siniestros")
         return True, "Siniestro actualizado exitosamente"
     
     except Exception as e:
@@ -133,12 +103,13 @@ def delete_siniestro(siniestro_id):
     """
     Elimina un siniestro
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
         cursor.execute("DELETE FROM siniestros WHERE id=?", (siniestro_id,))
         conn.commit()
+        invalidar("siniestros")
         return True, "Siniestro eliminado exitosamente"
     
     except Exception as e:
@@ -151,7 +122,7 @@ def get_siniestro_by_id(siniestro_id):
     """
     Obtiene un siniestro por su ID
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
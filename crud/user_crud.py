@@ -8,9 +8,11 @@
 # Importaciones necesarias
 import sqlite3  # Manejo de base de datos SQLite
 import os  # Operaciones del sistema operativo
-import bcrypt  # Encriptación de contraseñas con hash seguro
 import streamlit as st  # Framework de interfaz de usuario
 from dbconfig import DB_FILE  # Ruta del archivo de base de datos
+from core.autenticacion import hashear  # Hash bcrypt con el costo de dbconfig.BCRYPT_COSTO
+from core.catalogos import invalidar  # Invalidación de la caché de catálogos
+from core.db import get_connection  # Pool de conexiones SQLite compartido
 from database_config import initialize_database, reset_database  # Funciones de inicialización
 
 # ============================================================================
@@ -28,7 +30,7 @@ def create_user(**data):
         str: Mensaje indicando éxito o error en la creación
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -42,9 +44,9 @@ def create_user(**data):
         # ============================================================================
         # SEGURIDAD: Cifrar la contraseña con bcrypt
         # ============================================================================
-        # bcrypt.hashpw genera un hash seguro de la contraseña
-        # bcrypt.gensalt() genera un "salt" aleatorio para mayor seguridad
-        data['password'] = bcrypt.hashpw(data['password'].encode('utf-8'), bcrypt.gensalt())
+        # hashear() genera un hash bcrypt con "salt" aleatorio y el costo
+        # configurado en dbconfig.BCRYPT_COSTO
+        data['password'] = hashear(data['password'])
 
         # ============================================================================
         # INSERCIÓN: Construir y ejecutar query SQL dinámicamente
@@ -60,6 +62,7 @@ def create_user(**data):
         ''', tuple(data.values()) + (data.get("company_id"),))
         
         conn.commit()  # Confirmar cambios
+        invalidar("users")  # Selectores de usuarios y ejecutivos
         return f"Usuario '{data['username']}' creado exitosamente."
     
     except Exception as e:
@@ -83,7 +86,7 @@ def read_users():
         list: Lista de diccionarios con los datos de cada usuario
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -123,7 +126,7 @@ def update_user(username, **updates):
         str: Mensaje indicando éxito o error en la actualización
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -134,7 +137,7 @@ def update_user(username, **updates):
             # Solo encriptar si es una contraseña nueva (no ya encriptada)
             # Las contraseñas bcrypt empiezan con "$2b$"
             updates["password"] = (
-                bcrypt.hashpw(updates["password"].encode('utf-8'), bcrypt.gensalt())
+                hashear(updates["password"])
                 if isinstance(updates["password"], str) and not updates["password"].startswith("$2b$")
                 else updates["password"]
             )
@@ -152,6 +155,7 @@ def update_user(username, **updates):
             UPDATE users SET {fields} WHERE username=?
         ''', values)
         conn.commit()
+        invalidar("users")
 
         # ============================================================================
         # VALIDACIÓN: Verificar si se actualizó algún registro
@@ -182,13 +186,14 @@ def delete_user(username):
         str: Mensaje indicando éxito o error en la eliminación
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
         # Ejecutar eliminación
         cursor.execute("DELETE FROM users WHERE username=?", (username,))
         conn.commit()
+        invalidar("users")
         return f"Usuario '{username}' eliminado exitosamente."
     
     except Exception as e:
@@ -224,7 +229,7 @@ def get_user_details(username):
         dict: Diccionario con username, nombre completo y empresa, o None si no existe
     """
     # Conectar a la base de datos
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
@@ -264,7 +269,7 @@ def get_available_roles():
     Retorna:
         list: Lista de nombres de roles disponibles
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     
     try:
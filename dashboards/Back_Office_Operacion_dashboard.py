@@ -5,6 +5,29 @@ import streamlit as st
 import sqlite3
 from crud.user_crud import get_user_details
 from dbconfig import DB_FILE
+from core.catalogos import catalogo
+from core.db import connection, get_connection
+from core.consultas import POLIZAS_POR_CLIENTE
+from core.money import centavos
+from crud.cliente_selector import selector_cliente
+from core.carga_diferida import cargar  # Importación en el primer uso
+
+# Catálogos de referencia del formulario "Crear póliza por cliente"; se
+# invalidan desde user_crud, aseguradoras_crud y ramos_crud al escribir
+@catalogo(tablas=("users",))
+def _usuarios_con_rol():
+    with connection() as conn:
+        return conn.execute("SELECT id, username, role FROM users").fetchall()
+
+@catalogo(tablas=("aseguradoras",))
+def _aseguradoras():
+    with connection() as conn:
+        return conn.execute("SELECT id, razon_social FROM aseguradoras").fetchall()
+
+@catalogo(tablas=("ramos_seguros",))
+def _ramos_seguros():
+    with connection() as conn:
+        return conn.execute("SELECT id, nombre FROM ramos_seguros").fetchall()
 
 def welcome_message():
     st.markdown("### **Bienvenido al dashboard del rol: :red[Back Office - Operación]**")
@@ -63,9 +86,11 @@ def manage_modules():
     if modulo == "Gestión de Documentos":
         st.info("Aquí irá la gestión de documentos para Back Office.")
     elif modulo == "Control de Operaciones":
-        st.info("Aquí irá el control de operaciones para Back Office.")
+        # Lista de renovación que genera la tarea nocturna (core/renovaciones.py)
+        cargar("crud.renovaciones_crud:lista_renovaciones")()
     elif modulo == "Reportes":
-        st.info("Aquí irán los reportes para Back Office.")
+        # Vencimientos de 30/60/90 días por ejecutivo o aseguradora
+        cargar("crud.renovaciones_crud:reporte_vencimientos")()
     elif modulo == "Automatizaciones":
         st.subheader("Automatizaciones Back Office")
         automatizacion = st.selectbox(
@@ -78,40 +103,13 @@ def manage_modules():
         )
 
         if automatizacion == "Gestionar pólizas por cliente":
-            # 1. Selección de cliente
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id,
-                    CASE
-                        WHEN razon_social IS NOT NULL AND razon_social != ''
-                            THEN razon_social
-                        WHEN (COALESCE(nombres, '') || ' ' || COALESCE(apellidos, '')) != ' '
-                            THEN COALESCE(nombres, '') || ' ' || COALESCE(apellidos, '')
-                        ELSE 'Cliente sin nombre'
-                    END AS nombre_completo
-                FROM clients
-            """)
-            clientes = [c for c in cursor.fetchall() if c[1] and c[1].strip() != '']
-            conn.close()
-            if not clientes:
-                st.info("No hay clientes registrados.")
-                return
-
-            def cliente_format(x):
-                if isinstance(x, (list, tuple)) and len(x) > 1:
-                    return x[1]
-                return str(x) if x else "Desconocido"
-
-            cliente_seleccionado = st.selectbox("Selecciona un cliente", clientes, format_func=cliente_format)
+            # 1. Selección de cliente con búsqueda (solo lee las coincidencias)
+            cliente_seleccionado = selector_cliente("Selecciona un cliente", key="backoffice_gestion_cliente")
             if cliente_seleccionado:
                 # 2. Mostrar pólizas del cliente seleccionado
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT id, numero_poliza FROM polizas
-                    WHERE cliente_id = ?
-                """, (cliente_seleccionado[0],))
+                cursor.execute(POLIZAS_POR_CLIENTE, (cliente_seleccionado[0],))
                 polizas = cursor.fetchall()
                 conn.close()
 
@@ -127,7 +125,7 @@ def manage_modules():
                 poliza_seleccionada = st.selectbox("Selecciona una póliza para modificar", polizas, format_func=poliza_format)
                 if poliza_seleccionada:
                     # 3. Mostrar y permitir modificar los datos de la póliza seleccionada
-                    conn = sqlite3.connect(DB_FILE)
+                    conn = get_connection()
                     cursor = conn.cursor()
                     cursor.execute("""
                         SELECT numero_poliza, tipo_poliza, cobertura, prima, fecha_inicio, fecha_fin, estado
@@ -145,15 +143,15 @@ def manage_modules():
                         estado = st.selectbox("Estado", ["Activa", "Inactiva", "Cancelada"], index=["Activa", "Inactiva", "Cancelada"].index(datos[6]) if datos[6] in ["Activa", "Inactiva", "Cancelada"] else 0)
 
                         if st.button("Actualizar Póliza"):
-                            conn = sqlite3.connect(DB_FILE)
+                            conn = get_connection()
                             cursor = conn.cursor()
                             try:
                                 cursor.execute("""
                                     UPDATE polizas
-                                    SET numero_poliza = ?, tipo_poliza = ?, cobertura = ?, prima = ?, fecha_inicio = ?, fecha_fin = ?, estado = ?
+                                    SET numero_poliza = ?, tipo_poliza = ?, cobertura = ?, prima = ?, prima_centavos = ?, fecha_inicio = ?, fecha_fin = ?, estado = ?
                                     WHERE id = ?
                                 """, (
-                                    numero_poliza, tipo_poliza, cobertura, prima,
+                                    numero_poliza, tipo_poliza, cobertura, prima, centavos(prima),
                                     fecha_inicio.strftime("%Y-%m-%d"),
                                     fecha_fin.strftime("%Y-%m-%d"),
                                     estado, poliza_seleccionada[0]
@@ -166,37 +164,14 @@ def manage_modules():
                                 conn.close()
         elif automatizacion == "Crear póliza por cliente":
             st.subheader("Crear Póliza por Cliente")
-            # Obtener lista de clientes
-            conn = sqlite3.connect(DB_FILE)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id,
-                   CASE
-                       WHEN razon_social IS NOT NULL AND razon_social != ''
-                           THEN razon_social
-                       WHEN (COALESCE(nombres, '') || ' ' || COALESCE(apellidos, '')) != ' '
-                           THEN COALESCE(nombres, '') || ' ' || COALESCE(apellidos, '')
-                       ELSE 'Cliente sin nombre'
-                    END AS nombre_completo
-                FROM clients
-            """)
-            clientes = [c for c in cursor.fetchall() if c[1] and c[1].strip() != '']
-            cursor.execute("SELECT id, username, role FROM users")
-            usuarios_roles = cursor.fetchall()
-            cursor.execute("SELECT id, razon_social FROM aseguradoras")
-            aseguradoras = cursor.fetchall()
-            cursor.execute("SELECT id, nombre FROM ramos_seguros")
-            ramos_seguros = cursor.fetchall()
-            conn.close()
+            # Catálogos de referencia desde la caché compartida (core/catalogos.py)
+            usuarios_roles = _usuarios_con_rol()
+            aseguradoras = _aseguradoras()
+            ramos_seguros = _ramos_seguros()
 
             usuarios = [(u[0], u[1]) for u in usuarios_roles]
             ejecutivos_comerciales = [(u[0], u[1]) for u in usuarios_roles if u[2] and u[2].strip().lower().replace(" ", "_") in ["ejecutivo_comercial", "seller"]]
 
-            def cliente_format(x):
-                if isinstance(x, (list, tuple)) and len(x) > 1:
-                    return x[1]
-                return str(x) if x else "Desconocido"
-
             def usuario_format(x):
                 if isinstance(x, (list, tuple)) and len(x) > 1:
                     return x[1]
@@ -217,7 +192,7 @@ def manage_modules():
                     return x[1]
                 return str(x) if x else "No hay ejecutivos comerciales"
 
-            cliente_seleccionado = st.selectbox("Selecciona un Cliente", clientes, format_func=cliente_format, key="crear_poliza_cliente")
+            cliente_seleccionado = selector_cliente("Selecciona un Cliente", key="crear_poliza_cliente")
             usuario_seleccionado = st.selectbox("Selecciona un Gestor", usuarios, format_func=usuario_format, key="crear_poliza_gestor")
             aseguradora_seleccionada = st.selectbox("Selecciona una Aseguradora", aseguradoras, format_func=aseguradora_format, key="crear_poliza_aseguradora")
             ramo_seleccionado = st.selectbox("Selecciona un Ramo de Seguros", ramos_seguros, format_func=ramo_format, key="crear_poliza_ramo")
@@ -246,18 +221,18 @@ def manage_modules():
             tipo_anexo = st.text_input("Tipo de anexo", key="crear_poliza_tipoanexo")
 
             if st.button("Crear Póliza", key="crear_poliza_btn"):
-                conn = sqlite3.connect(DB_FILE)
+                conn = get_connection()
                 cursor = conn.cursor()
                 try:
                     cursor.execute("""
-                        INSERT INTO polizas (numero_poliza, cliente_id, usuario_id, aseguradora_id, ramo_id, tipo_poliza, cobertura, prima, fecha_inicio, fecha_fin, estado, fecha_emision, suma_asegurada, deducible, sucursal, tipo_facturacion, linea_negocio, numero_factura, numero_anexo, tipo_anexo, ejecutivo_comercial_id)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        INSERT INTO polizas (numero_poliza, cliente_id, usuario_id, aseguradora_id, ramo_id, tipo_poliza, cobertura, prima, prima_centavos, fecha_inicio, fecha_fin, estado, fecha_emision, suma_asegurada, suma_asegurada_centavos, deducible, sucursal, tipo_facturacion, linea_negocio, numero_factura, numero_anexo, tipo_anexo, ejecutivo_comercial_id)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
                         numero_poliza, cliente_seleccionado[0], usuario_seleccionado[0], aseguradora_seleccionada[0], ramo_seleccionado[0],
-                        tipo_poliza, cobertura, prima,
+                        tipo_poliza, cobertura, prima, centavos(prima),
                         fecha_inicio_vigencia.strftime("%Y-%m-%d"),
                         fecha_fin_vigencia.strftime("%Y-%m-%d"),
-                        estado, fecha_emision.strftime("%Y-%m-%d"), suma_asegurada, deducible, sucursal, tipo_facturacion, linea_negocio, numero_factura, numero_anexo, tipo_anexo, ejecutivo_comercial_seleccionado[0]
+                        estado, fecha_emision.strftime("%Y-%m-%d"), suma_asegurada, centavos(suma_asegurada), deducible, sucursal, tipo_facturacion, linea_negocio, numero_factura, numero_anexo, tipo_anexo, ejecutivo_comercial_seleccionado[0]
                     ))
                     conn.commit()
                     st.success("Póliza creada exitosamente")
@@ -14,6 +14,11 @@ except ImportError:
     DB_FILE = "broker.db"
     st.warning("No se pudo importar dbconfig, usando base de datos por defecto")
 
+from core.carga_diferida import cargar  # Importación en el primer uso
+from core.db import get_connection  # Pool de conexiones SQLite compartido
+from core.polizas import polizas_de_cliente  # Pólizas por cliente_id y categoría de ramo
+from crud.cliente_selector import selector_cliente  # Búsqueda de clientes (FTS5)
+
 # Importar funciones CRUD de siniestros
 from crud.siniestro_crud import (
     create_siniestro, 
@@ -50,48 +55,13 @@ def manage_modules():
         st.success("Sesión cerrada exitosamente")
         st.rerun()
 
-def get_clients():
-    """Obtiene la lista de clientes desde la base de datos"""
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, nombres, apellidos FROM clients ORDER BY nombres")
-        clients = cursor.fetchall()
-        conn.close()
-        return clients
-    except Exception as e:
-        st.error(f"Error al obtener clientes: {str(e)}")
-        return []
-
-def get_policies_by_client(client_id):
-    """Obtiene las pólizas de un cliente específico"""
+def get_policies_by_client(client_id, categoria=None):
+    """
+    Obtiene las pólizas de un cliente por cliente_id (indexado), ya filtradas
+    por categoría de ramo ('Vehicular' o 'Vida/Salud')
+    """
     try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        
-        # Primero obtener el nombre completo del cliente por su ID
-        cursor.execute("SELECT nombres, apellidos FROM clients WHERE id = ?", (client_id,))
-        client_data = cursor.fetchone()
-        
-        if not client_data:
-            conn.close()
-            return []
-        
-        # Construir el nombre completo del cliente
-        client_full_name = f"{client_data[0]} {client_data[1]}"
-        
-        # Buscar pólizas que contengan el nombre del cliente en tomador_nombre
-        cursor.execute("""
-            SELECT p.id, p.numero_poliza, p.ramo_id, p.estado, 
-                   COALESCE(a.razon_social, 'Sin aseguradora') as aseguradora
-            FROM polizas p
-            LEFT JOIN aseguradoras a ON p.aseguradora_id = a.id
-            WHERE p.tomador_nombre LIKE ?
-            ORDER BY p.numero_poliza
-        """, (f"%{client_full_name}%",))
-        policies = cursor.fetchall()
-        conn.close()
-        return policies
+        return polizas_de_cliente(client_id, categoria, DB_FILE)
     except Exception as e:
         st.error(f"Error al obtener pólizas: {str(e)}")
         return []
@@ -116,46 +86,28 @@ def gestionar_siniestros_vehiculos():
     if opcion == "Registrar Nuevo Siniestro":
         st.markdown("### Registrar Nuevo Siniestro Vehicular")
         
-        # Obtener lista de clientes
-        clients = get_clients()
-        
-        if not clients:
-            st.warning("No hay clientes registrados en el sistema.")
-            return
-        
         col1, col2 = st.columns(2)
         
         with col1:
-            # Selector de cliente
-            client_options = {f"{c[1]} {c[2]} (ID: {c[0]})": c[0] for c in clients}
-            selected_client = st.selectbox("Seleccionar Cliente", list(client_options.keys()))
-            client_id = client_options[selected_client]
+            # Selector de cliente con búsqueda (solo lee las coincidencias)
+            selected_client = selector_cliente("Seleccionar Cliente", key="siniestro_vehicular_cliente")
+            if not selected_client:
+                return
+            client_id = selected_client[0]
             
-            # Obtener pólizas del cliente seleccionado
-            policies = get_policies_by_client(client_id)
+            # Pólizas de vehículos del cliente (filtro por categoría de ramo en SQL)
+            vehicle_policies = get_policies_by_client(client_id, "Vehicular")
             
-            if not policies:
-                st.warning(f"El cliente seleccionado no tiene pólizas activas.")
+            if not vehicle_policies:
+                st.warning("El cliente no tiene pólizas de vehículos activas.")
                 policy_id = None
             else:
-                # Filtrar pólizas de vehículos
-                # Verificar tanto si ramo_id es número (ID del ramo) como si es texto (nombre del ramo)
-                vehicle_policies = [
-                    p for p in policies 
-                    if p[2] and (str(p[2]).strip() in ['77', '77.0'] or 
-                                any(keyword in str(p[2]).lower() for keyword in ['vehicular', 'vehículo', 'auto', 'carro']))
-                ]
-                
-                if not vehicle_policies:
-                    st.warning("El cliente no tiene pólizas de vehículos activas.")
-                    policy_id = None
-                else:
-                    policy_options = {
-                        f"{p[1]} - Ramo: {p[2]} ({p[4]})": p[0] 
-                        for p in vehicle_policies
-                    }
-                    selected_policy = st.selectbox("Seleccionar Póliza de Vehículo", list(policy_options.keys()))
-                    policy_id = policy_options[selected_policy]
+                policy_options = {
+                    f"{p[1]} - Ramo: {p[5] or p[2]} ({p[4]})": p[0] 
+                    for p in vehicle_policies
+                }
+                selected_policy = st.selectbox("Seleccionar Póliza de Vehículo", list(policy_options.keys()))
+                policy_id = policy_options[selected_policy]
             
             placa = st.text_input("Placa del Vehículo")
             fecha_siniestro = st.date_input("Fecha del Siniestro")
@@ -233,13 +185,7 @@ def gestionar_siniestros_vehiculos():
     
     elif opcion == "Reportes de Siniestros Vehiculares":
         st.markdown("### Reportes y Estadísticas")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Siniestros Activos", "45")
-        with col2:
-            st.metric("Siniestros Cerrados", "120")
-        with col3:
-            st.metric("Pendientes de Revisión", "12")
+        cargar("crud.siniestralidad_crud:reporte_siniestralidad")("siniestralidad_vehiculos")
 
 def gestionar_siniestros_vida_salud():
     """
@@ -262,47 +208,28 @@ def gestionar_siniestros_vida_salud():
     if opcion == "Registrar Nuevo Siniestro":
         st.markdown("### Registrar Nuevo Siniestro de Vida/Salud")
         
-        # Obtener lista de clientes
-        clients = get_clients()
-        
-        if not clients:
-            st.warning("No hay clientes registrados en el sistema.")
-            return
-        
         col1, col2 = st.columns(2)
         
         with col1:
-            # Selector de cliente
-            client_options = {f"{c[1]} {c[2]} (ID: {c[0]})": c[0] for c in clients}
-            selected_client = st.selectbox("Seleccionar Cliente/Asegurado", list(client_options.keys()))
-            client_id = client_options[selected_client]
+            # Selector de cliente con búsqueda (solo lee las coincidencias)
+            selected_client = selector_cliente("Seleccionar Cliente/Asegurado", key="siniestro_salud_cliente")
+            if not selected_client:
+                return
+            client_id = selected_client[0]
             
-            # Obtener pólizas del cliente seleccionado
-            policies = get_policies_by_client(client_id)
+            # Pólizas de vida/salud del cliente (filtro por categoría de ramo en SQL)
+            health_policies = get_policies_by_client(client_id, "Vida/Salud")
             
-            if not policies:
-                st.warning(f"El cliente seleccionado no tiene pólizas activas.")
+            if not health_policies:
+                st.warning("El cliente no tiene pólizas de vida/salud activas.")
                 policy_id = None
             else:
-                # Filtrar pólizas de vida y salud
-                health_policies = []
-                for p in policies:
-                    ramo_id_value = str(p[2]).strip() if p[2] else ""
-                    
-                    # Verificar si contiene palabras clave de vida/salud
-                    if any(keyword in ramo_id_value.lower() for keyword in ['vida', 'salud', 'médico', 'hospitalización', 'seguro de vida']):
-                        health_policies.append(p)
-                
-                if not health_policies:
-                    st.warning("El cliente no tiene pólizas de vida/salud activas.")
-                    policy_id = None
-                else:
-                    policy_options = {
-                        f"{p[1]} - Ramo ID: {p[2]} ({p[4]})": p[0] 
-                        for p in health_policies
-                    }
-                    selected_policy = st.selectbox("Seleccionar Póliza de Vida/Salud", list(policy_options.keys()))
-                    policy_id = policy_options[selected_policy]
+                policy_options = {
+                    f"{p[1]} - Ramo: {p[5] or p[2]} ({p[4]})": p[0] 
+                    for p in health_policies
+                }
+                selected_policy = st.selectbox("Seleccionar Póliza de Vida/Salud", list(policy_options.keys()))
+                policy_id = policy_options[selected_policy]
             
             st.date_input("Fecha del Evento")
             st.selectbox("Tipo de Cobertura", ["Hospitalización", "Cirugía", "Emergencia", "Consulta", "Fallecimiento"])
@@ -339,10 +266,4 @@ def gestionar_siniestros_vida_salud():
     
     elif opcion == "Reportes de Siniestros Médicos":
         st.markdown("### Reportes y Estadísticas")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Siniestros Activos", "32")
-        with col2:
-            st.metric("Siniestros Pagados", "95")
-        with col3:
-            st.metric("Monto Total Reclamado", "$45,000")
+        cargar("crud.siniestralidad_crud:reporte_siniestralidad")("siniestralidad_vida_salud")
@@ -7,10 +7,11 @@
 
 # Importaciones de librerías
 import streamlit as st  # Framework de interfaz de usuario
-import fitz  # PyMuPDF para procesamiento de PDFs
 import os  # Operaciones del sistema operativo
 import datetime as dt  # Manejo de fechas
 import re  # Expresiones regulares
+import html  # Escapar el texto del chat
+from htmlTemplates import css, bot_template, user_template  # Estilos del chat de la guía
 
 # Importaciones comentadas: funcionalidad de IA/Chat deshabilitada
 #from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -24,15 +25,28 @@ import re  # Expresiones regulares
 # ============================================================================
 # IMPORTACIONES DE MÓDULOS CRUD
 # ============================================================================
-# Importa todas las interfaces CRUD desde el directorio crud/
-from crud.user_crud import crud_usuarios, get_user_details  # Gestión de usuarios
-from crud.client_crud import crud_clientes  # Gestión de clientes
-from crud.aseguradoras_crud import crud_aseguradoras  # Gestión de aseguradoras - CORREGIDO
-from crud.agencias_crud import crud_agencias  # Gestión de agencias
-from crud.role_crud import crud_roles  # Gestión de roles
-from crud.poliza_crud import crud_polizas  # Gestión de pólizas
-from crud.ramos_crud import crud_ramos  # Gestión de ramos de seguros
-from crud.movimiento_crud import crud_movimientos  # Gestión de movimientos
+# Las interfaces CRUD se importan al abrir cada módulo (core/carga_diferida.py):
+# arrancar el dashboard no carga pandas, PyMuPDF ni los catálogos grandes
+from crud.user_crud import get_user_details  # Datos del usuario de la barra lateral
+from core.carga_diferida import cargar, tiempos_de_carga  # Importación en el primer uso
+from core.catalogos import estadisticas as estadisticas_catalogos  # Métricas de la caché de selectores
+from core.texto_pdf import texto_pdf  # Texto de PDF con caché por contenido
+from core.conocimiento import actualizar_indice, buscar  # Búsqueda local en los manuales
+from dashboards.kpi_cartera import mostrar_kpis_cartera  # KPI desde las tablas de resumen
+
+# Módulo del menú -> "paquete.modulo:función" que dibuja su página
+MODULOS_ADMIN = {
+    "Usuarios": "crud.user_crud:crud_usuarios",  # Gestión de usuarios
+    "Clientes": "crud.client_crud:crud_clientes",  # Gestión de clientes
+    "Aseguradoras": "crud.aseguradoras_crud:crud_aseguradoras",  # Gestión de aseguradoras
+    "Agencias": "crud.agencias_crud:crud_agencias",  # Gestión de agencias
+    "Roles": "crud.role_crud:crud_roles",  # Gestión de roles
+    "Pólizas": "crud.poliza_crud:crud_polizas",  # Gestión de pólizas
+    "Ramos de Seguros": "crud.ramos_crud:crud_ramos",  # Gestión de ramos de seguros
+    "Movimientos": "crud.movimiento_crud:crud_movimientos",  # Gestión de movimientos
+    "Comisiones": "crud.comisiones_crud:crud_comisiones",  # Tasas y cálculo de comisiones
+    "Exportaciones": "crud.exportacion_crud:crud_exportaciones",  # Exportación CSV / XLSX
+}
 
 # ============================================================================
 # FUNCIÓN: get_pdf_text
@@ -42,28 +56,48 @@ def get_pdf_text(pdf_list):
     """
     Extrae y concatena el texto de múltiples archivos PDF
     
+    El texto de cada página se guarda en la base por el hash del contenido
+    (core/texto_pdf.py): un PDF sin cambios no se vuelve a abrir.
+    
     Parámetros:
         pdf_list (list): Lista de rutas a archivos PDF
     
     Retorna:
         str: Texto concatenado de todos los PDFs
     """
-    text = ""  # String para acumular el texto extraído
-    
-    # Iterar sobre cada archivo PDF
-    for pdf_path in pdf_list:
-        # Abrir el documento PDF con PyMuPDF (fitz)
-        pdf_document = fitz.open(pdf_path)
-        
-        # Iterar sobre cada página del documento
-        for page_num in range(len(pdf_document)):
-            # Cargar la página actual
-            page = pdf_document.load_page(page_num)
-            # Extraer y concatenar el texto de la página
-            text += page.get_text()
-    
-    return text
+    return texto_pdf(pdf_list)
+
+
+
+# ============================================================================
+# FUNCIÓN: handle_userInput
+# Responde con los pasajes de los manuales más relevantes para la pregunta
+# ============================================================================
+def handle_userInput(user_question):
+    """
+    Muestra la pregunta y los fragmentos del manual que mejor la responden
+
+    Búsqueda local (core/conocimiento.py, sin APIs externas): el índice solo
+    se actualiza si algún manual cambió desde la última vez.
+
+    Parámetros:
+        user_question (str): Pregunta escrita por el administrador
+    """
+    try:
+        actualizar_indice()
+        pasajes = buscar(user_question)
+    except Exception as e:
+        st.error(f"Error al consultar la base de conocimiento: {e}")
+        return
 
+    st.write(css, unsafe_allow_html=True)
+    st.write(user_template.replace("{{MSG}}", html.escape(user_question)), unsafe_allow_html=True)
+    if not pasajes:
+        st.write(bot_template.replace("{{MSG}}", "No encontré información sobre eso en los manuales."), unsafe_allow_html=True)
+        return
+    for fuente, ubicacion, texto, _ in pasajes:
+        mensaje = f"{html.escape(texto)}<br><small>📄 {html.escape(fuente)} — {html.escape(ubicacion or '')}</small>"
+        st.write(bot_template.replace("{{MSG}}", mensaje), unsafe_allow_html=True)
 
 
 # ============================================================================
@@ -184,6 +218,8 @@ def admin_dashboard():
         ("Pólizas", "Pólizas"),
         ("Ramos de Seguros", "Ramos de Seguros"),
         ("Movimientos", "Movimientos"),
+        ("Comisiones", "Comisiones"),
+        ("Exportaciones", "Exportaciones"),
     ]
     selected_produccion = st.sidebar.selectbox(
         "Producción",
@@ -197,23 +233,32 @@ def admin_dashboard():
 
     module = st.session_state["module"]
 
-    if module == "Usuarios":
-        crud_usuarios()
-    elif module == "Clientes":
-        crud_clientes()
-    elif module == "Aseguradoras":
-        crud_aseguradoras()
-    elif module == "Agencias":
-        crud_agencias()
-    elif module == "Roles":
-        crud_roles()
-    elif module == "Pólizas":
-        crud_polizas()
-    elif module == "Ramos de Seguros":
-        crud_ramos()
-    elif module == "Movimientos":
-        crud_movimientos()
-    # ...puedes agregar más elif para otros módulos si creas sus archivos...
+    # Solo se importa el módulo que se va a dibujar
+    if module in MODULOS_ADMIN:
+        cargar(MODULOS_ADMIN[module])()
+    else:
+        # Página de inicio: KPI de cartera (core/cartera.py)
+        mostrar_kpis_cartera()
+    # ...puedes agregar más módulos a MODULOS_ADMIN si creas sus archivos...
+
+    # Aciertos/fallos de la caché de catálogos de los selectores (core/catalogos.py)
+    with st.sidebar.expander("📊 Caché de catálogos"):
+        stats = estadisticas_catalogos()
+        if not stats:
+            st.caption("Sin lecturas todavía")
+        for nombre, datos in stats.items():
+            st.caption(
+                f"{nombre.rsplit('.', 1)[-1]}: {datos['aciertos']} aciertos / {datos['fallos']} fallos "
+                f"({datos['tasa_aciertos']:.0%}), {datos['invalidaciones']} invalidaciones"
+            )
+
+    # Tiempo de la primera importación de cada módulo abierto (core/carga_diferida.py)
+    with st.sidebar.expander("⏱️ Carga de módulos"):
+        tiempos = tiempos_de_carga()
+        if not tiempos:
+            st.caption("Ningún módulo cargado todavía")
+        for nombre, segundos in tiempos.items():
+            st.caption(f"{nombre}: {segundos * 1000:.0f} ms")
 
     # Botón de Logout
     if st.sidebar.button("Logout"):
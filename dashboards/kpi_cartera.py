@@ -0,0 +1,71 @@
+# ============================================================================
+# WIDGET DE KPI DE CARTERA - dashboards/kpi_cartera.py
+# ============================================================================
+# Métricas y gráficos de la página de inicio de los dashboards, leídos de las
+# tablas de resumen de core/cartera.py (unas decenas de grupos) en lugar de
+# recorrer polizas y facturas.
+# ============================================================================
+
+# Importaciones necesarias
+import streamlit as st  # Framework de interfaz de usuario
+
+from core.cartera import kpis_cartera  # Totales por aseguradora, ramo, estado y mes
+from core.money import Money  # Formato de montos en centavos
+
+
+def _monto(centavos):
+    """Centavos -> "$1,234.56"."""
+    return f"${Money.from_cents(centavos or 0).format()}"
+
+
+def mostrar_kpis_cartera(meses=12):
+    """
+    Dibuja los KPI de cartera: pólizas y primas por estado, prima por mes,
+    facturación por mes y prima activa por aseguradora
+
+    Parámetros:
+        meses (int): Meses que muestran los gráficos
+    """
+    datos = kpis_cartera(meses)
+    por_estado = {estado: fila for estado, *fila in datos["por_estado"]}
+    activas = por_estado.get("Activa", (0, 0, 0, 0))
+    facturacion = datos["facturacion_por_mes"]
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📋 Total Pólizas", f"{sum(fila[0] for fila in por_estado.values()):,}")
+    with col2:
+        st.metric("✅ Pólizas Activas", f"{activas[0]:,}")
+    with col3:
+        st.metric("💰 Prima Neta Activa", _monto(activas[1]))
+    with col4:
+        ultimo = facturacion[-1] if facturacion else ("—", 0, 0)
+        anterior = facturacion[-2][2] if len(facturacion) > 1 else None
+        st.metric(
+            f"🧾 Facturado {ultimo[0]}",
+            _monto(ultimo[2]),
+            delta=_monto(ultimo[2] - anterior) if anterior is not None else None,
+        )
+
+    if not por_estado:
+        st.info("Todavía no hay pólizas registradas.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("📈 Prima neta por mes de emisión")
+        st.bar_chart({mes: centavos / 100 for mes, _, centavos in datos["prima_por_mes"]})
+    with col2:
+        st.subheader("🧾 Facturación por mes")
+        st.bar_chart({mes: centavos / 100 for mes, _, centavos in facturacion})
+
+    with st.expander("Detalle por estado y aseguradora"):
+        st.table([
+            {"Estado": estado or "Sin estado", "Pólizas": n, "Prima neta": _monto(prima),
+             "Suma asegurada": _monto(suma), "Total": _monto(total)}
+            for estado, (n, prima, suma, total) in por_estado.items()
+        ])
+        st.table([
+            {"Aseguradora": nombre, "Pólizas activas": n, "Prima neta": _monto(prima)}
+            for nombre, n, prima in datos["por_aseguradora"]
+        ])
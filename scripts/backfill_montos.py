@@ -0,0 +1,60 @@
+# ============================================================================
+# RELLENO DE MONTOS EN CENTAVOS - scripts/backfill_montos.py
+# ============================================================================
+# Convierte las columnas monetarias TEXT de pólizas y ramos por póliza
+# (prima, prima_neta, suma_asegurada, subtotal, iva_15, total) a sus columnas
+# INTEGER `<columna>_centavos`. La migración 4 lo hace una vez; este script
+# sirve para repetirlo tras importar datos externos o editar la base a mano.
+#
+# Uso:
+#   python scripts/backfill_montos.py                # recalcula todas las filas
+#   python scripts/backfill_montos.py --solo-vacios  # solo filas sin centavos
+#   python scripts/backfill_montos.py --verificar    # reporta diferencias, no escribe
+#   python scripts/backfill_montos.py --db otra.db
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.db import connection, unit_of_work  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from core.money import rellenar_centavos, verificar_centavos  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rellena las columnas de montos en centavos")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    parser.add_argument("--solo-vacios", action="store_true", help="Solo completar filas sin centavos")
+    parser.add_argument("--verificar", action="store_true", help="Reportar diferencias sin escribir")
+    args = parser.parse_args(argv)
+
+    # Garantiza que las columnas *_centavos existan
+    run_migrations(args.db)
+
+    if args.verificar:
+        with connection(args.db) as conn:
+            diferencias = verificar_centavos(conn)
+        if not diferencias:
+            print("✅ Todos los montos en centavos coinciden con las columnas de texto.")
+            return 0
+        for columna, filas in diferencias.items():
+            print(f"⚠️ {columna}: {len(filas)} fila(s) con diferencias")
+            for fila_id, texto, guardado in filas[:10]:
+                print(f"    id={fila_id} texto={texto!r} centavos={guardado}")
+        return 1
+
+    with unit_of_work(args.db, immediate=True) as conn:
+        actualizadas = rellenar_centavos(conn, solo_vacios=args.solo_vacios)
+    for columna, filas in actualizadas.items():
+        print(f"{columna}: {filas} fila(s) actualizadas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# ============================================================================
+# CÁLCULO DE COMISIONES - scripts/calcular_comisiones.py
+# ============================================================================
+# Recalcula las comisiones (core/comisiones.py). Sin opciones recalcula solo
+# las pólizas tocadas desde el último cálculo; con --completo recalcula toda
+# la cartera, como en el cierre de mes. Por ejemplo con cron:
+#
+#   */15 * * * *  cd /ruta/del/proyecto && python scripts/calcular_comisiones.py
+#   0 3 1 * *     cd /ruta/del/proyecto && python scripts/calcular_comisiones.py --completo
+#
+# Uso:
+#   python scripts/calcular_comisiones.py
+#   python scripts/calcular_comisiones.py --completo --db otra.db
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.comisiones import calcular_comisiones, recalcular_pendientes  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from core.money import Money  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula las comisiones por aseguradora y ramo")
+    parser.add_argument("--completo", action="store_true", help="Recalcular toda la cartera (cierre de mes)")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    args = parser.parse_args(argv)
+
+    run_migrations(args.db)
+    if args.completo:
+        resumen = calcular_comisiones(db_file=args.db)
+    else:
+        resumen = recalcular_pendientes(db_file=args.db)
+    print(
+        f"{'Cierre de mes' if args.completo else 'Recálculo incremental'}: {resumen['polizas']} póliza(s) "
+        f"en {resumen['segundos'] * 1000:.0f} ms"
+    )
+    for titulo in ("devengada", "facturada", "cobrada"):
+        print(f"    Comisión {titulo}: ${Money.from_cents(resumen[titulo]).format()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# ============================================================================
+# CALIBRACIÓN DE BCRYPT E INICIOS DE SESIÓN CONCURRENTES - scripts/calibrar_bcrypt.py
+# ============================================================================
+# 1. Mide bcrypt en este equipo y recomienda el mayor costo cuyo hash tarda
+#    menos que la latencia objetivo (dbconfig.LATENCIA_LOGIN_MS); el valor se
+#    fija en dbconfig.BCRYPT_COSTO y los hashes antiguos se actualizan solos
+#    al iniciar sesión (core/autenticacion.py).
+# 2. Simula el inicio de turno: --inicios inicios de sesión llegan a la vez y
+#    los atienden --concurrencia hilos (bcrypt libera el GIL), sobre una base
+#    temporal con usuarios de prueba. Reporta la latencia que ve cada usuario
+#    (espera + verificación) y falla si el p95 supera --max-p95-ms.
+#
+# Uso:
+#   python scripts/calibrar_bcrypt.py
+#   python scripts/calibrar_bcrypt.py --objetivo-ms 300 --inicios 50 --concurrencia 8
+#   python scripts/calibrar_bcrypt.py --costo 12 --costo-guardado 10   # incluye el rehash
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import concurrent.futures  # Inicios de sesión concurrentes
+import os  # Rutas del proyecto y de la base temporal
+import statistics  # Percentiles de latencia
+import sys  # Código de salida y ruta de importación
+import tempfile  # Base de datos de prueba
+import time  # Latencia de cada inicio de sesión
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import core.autenticacion as autenticacion  # noqa: E402
+from core.db import close_pools, connection, unit_of_work  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from dbconfig import BCRYPT_COSTO, LATENCIA_LOGIN_MS  # noqa: E402
+
+CONTRASENA = "Inicio-De-Turno-2025"  # Contraseña de los usuarios de prueba
+
+
+def _percentil(valores, p):
+    """Percentil p (0-100) de una lista no vacía."""
+    if len(valores) == 1:
+        return valores[0]
+    return statistics.quantiles(valores, n=100, method="inclusive")[p - 1]
+
+
+def simular_inicios(db_file, usuarios, inicios, concurrencia, costo):
+    """
+    Lanza `inicios` autenticaciones a la vez repartidas entre `usuarios`
+
+    Retorna:
+        tuple: (latencias en ms, segundos totales, fallidos)
+    """
+    nombres = [f"bench_{i}" for i in range(usuarios)]
+
+    def iniciar(nombre, llegada):
+        usuario, error = autenticacion.autenticar(nombre, CONTRASENA, db_file, costo)
+        return (time.perf_counter() - llegada) * 1000, error is not None
+
+    inicio = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrencia) as ejecutor:
+        futuros = [ejecutor.submit(iniciar, nombres[i % usuarios], inicio) for i in range(inicios)]
+        resultados = [futuro.result() for futuro in futuros]
+    total = time.perf_counter() - inicio
+    return [ms for ms, _ in resultados], total, sum(fallo for _, fallo in resultados)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibra el costo de bcrypt y mide inicios de sesión concurrentes")
+    parser.add_argument("--objetivo-ms", type=float, default=LATENCIA_LOGIN_MS, help="Latencia objetivo de un hash")
+    parser.add_argument("--costo", type=int, help="Costo a simular (por defecto el calibrado)")
+    parser.add_argument("--costo-guardado", type=int, help="Costo de los hashes iniciales (distinto => rehash)")
+    parser.add_argument("--usuarios", type=int, default=10, help="Usuarios de prueba")
+    parser.add_argument("--inicios", type=int, default=30, help="Inicios de sesión simultáneos")
+    parser.add_argument("--concurrencia", type=int, default=os.cpu_count() or 1, help="Hilos que los atienden")
+    parser.add_argument("--max-p95-ms", type=float, help="Falla si el p95 de latencia lo supera")
+    args = parser.parse_args(argv)
+
+    recomendado, mediciones = autenticacion.calibrar_costo(args.objetivo_ms)
+    print(f"bcrypt en este equipo (objetivo {args.objetivo_ms:.0f} ms por hash):")
+    for costo, ms in mediciones.items():
+        marca = "←" if costo == recomendado else " "
+        print(f"  {marca} costo {costo:2d}: {ms:8.1f} ms")
+    print(f"Costo recomendado: {recomendado} (configurado: dbconfig.BCRYPT_COSTO = {BCRYPT_COSTO})")
+
+    costo = args.costo or recomendado
+    costo_guardado = args.costo_guardado or costo
+    with tempfile.TemporaryDirectory() as carpeta:
+        db_file = os.path.join(carpeta, "inicios.db")
+        run_migrations(db_file)
+        with unit_of_work(db_file) as conn:
+            conn.executemany(
+                "INSERT INTO users (username, password, role) VALUES (?, ?, 'admin')",
+                [(f"bench_{i}", autenticacion.hashear(CONTRASENA, costo_guardado)) for i in range(args.usuarios)],
+            )
+        latencias, total, fallidos = simular_inicios(db_file, args.usuarios, args.inicios, args.concurrencia, costo)
+        with connection(db_file) as conn:
+            actualizados = sum(
+                autenticacion.costo_de(hash_guardado) == costo
+                for (hash_guardado,) in conn.execute("SELECT password FROM users")
+            )
+        close_pools()
+
+    p95 = _percentil(latencias, 95)
+    print(
+        f"\n{args.inicios} inicios simultáneos, {args.concurrencia} hilo(s), costo {costo}"
+        + (f" (hashes guardados con costo {costo_guardado})" if costo_guardado != costo else "") + ":"
+    )
+    print(f"  p50 {_percentil(latencias, 50):.0f} ms · p95 {p95:.0f} ms · máx {max(latencias):.0f} ms")
+    print(f"  {args.inicios / total:.1f} inicios/s · {fallidos} fallidos · {actualizados}/{args.usuarios} hashes con el costo vigente")
+    if args.max_p95_ms and p95 > args.max_p95_ms:
+        print(f"✗ El p95 supera {args.max_p95_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# ============================================================================
+# EXPORTACIÓN DE TABLAS - scripts/exportar_tabla.py
+# ============================================================================
+# Exporta una tabla a CSV o XLSX por lotes (core/exportacion.py), con la
+# memoria constante sin importar el tamaño de la tabla. Útil para
+# exportaciones programadas o demasiado grandes para la página.
+#
+# Uso:
+#   python scripts/exportar_tabla.py polizas
+#   python scripts/exportar_tabla.py polizas --formato xlsx --columnas numero_poliza,estado,fecha_fin
+#   python scripts/exportar_tabla.py facturas --filtro "estado=Emitida" --filtro "fecha_emision>=2025-01-01"
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import re  # Lectura de los filtros
+import sys  # Código de salida y ruta de importación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.exportacion import FORMATOS, TABLAS, exportar  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+# columna, operador y valor: "estado=Activa", "fecha_fin>=2025-01-01", "nombres LIKE Ana%"
+_FILTRO = re.compile(r"^\s*(\w+)\s*(<>|<=|>=|=|<|>|\s+LIKE\s+)\s*(.*)$", re.IGNORECASE)
+
+
+def leer_filtro(texto):
+    """ "columna<op>valor" -> (columna, operador, valor)."""
+    coincidencia = _FILTRO.match(texto)
+    if not coincidencia:
+        raise argparse.ArgumentTypeError(f"Filtro no válido: {texto}")
+    columna, operador, valor = coincidencia.groups()
+    return columna, operador.strip().upper(), valor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta una tabla a CSV o XLSX por lotes")
+    parser.add_argument("tabla", choices=list(TABLAS), help="Tabla a exportar")
+    parser.add_argument("--formato", choices=FORMATOS, default="csv")
+    parser.add_argument("--columnas", help="Columnas separadas por coma (por defecto todas)")
+    parser.add_argument("--filtro", action="append", type=leer_filtro, default=[],
+                        help='Filtro "columna<op>valor"; se puede repetir')
+    parser.add_argument("--salida", help="Archivo de destino (por defecto exportaciones/<tabla>_<fecha>)")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    args = parser.parse_args(argv)
+
+    run_migrations(args.db)
+    columnas = [c.strip() for c in args.columnas.split(",")] if args.columnas else None
+    try:
+        resumen = exportar(
+            args.tabla, args.formato, columnas, args.filtro, ruta=args.salida,
+            avance=lambda filas: print(f"\r{filas:,} filas", end="", flush=True), db_file=args.db,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"\r{resumen['filas']:,} filas exportadas a {resumen['ruta']} en {resumen['segundos']:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
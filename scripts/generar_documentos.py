@@ -0,0 +1,57 @@
+# ============================================================================
+# GENERACIÓN DE PDF DESDE LA LÍNEA DE COMANDOS - scripts/generar_documentos.py
+# ============================================================================
+# Genera con core/documentos.py los PDF pendientes (pdf_documento vacío) de
+# movimientos, facturas y notas de crédito, repartidos entre los núcleos de
+# la máquina. Útil tras cargas masivas (bordereaux, movimientos en lote) o
+# para regenerar documentos antiguos.
+#
+# Uso:
+#   python scripts/generar_documentos.py                    # todos los tipos
+#   python scripts/generar_documentos.py --tipo factura --procesos 4
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+import time  # Duración de cada tipo
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.documentos import DIRECTORIO_DOCUMENTOS, TABLAS, generar_documentos, pendientes  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera los PDF pendientes de movimientos, facturas y notas de crédito")
+    parser.add_argument("--tipo", choices=sorted(TABLAS), action="append", help="Tipo de documento (repetible; por defecto todos)")
+    parser.add_argument("--procesos", type=int, help="Procesos de renderizado (por defecto uno por núcleo)")
+    parser.add_argument("--directorio", default=DIRECTORIO_DOCUMENTOS, help="Carpeta de salida de los PDF")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    args = parser.parse_args(argv)
+
+    run_migrations(args.db)
+
+    con_errores = False
+    for tipo in args.tipo or list(TABLAS):
+        ids = pendientes(tipo, db_file=args.db)
+        print(f"{tipo}: {len(ids)} documento(s) pendientes")
+        if not ids:
+            continue
+        inicio = time.perf_counter()
+        resumen = generar_documentos(
+            tipo, ids, procesos=args.procesos, directorio=args.directorio,
+            progreso=lambda n: print(f"    {n} procesados"), db_file=args.db,
+        )
+        print(f"    {resumen['generados']} generados en {time.perf_counter() - inicio:.1f} s")
+        for documento_id, error in resumen["errores"][:20]:
+            print(f"    id {documento_id}: {error}")
+        con_errores = con_errores or bool(resumen["errores"])
+    return 1 if con_errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+# ============================================================================
+# LISTA DE RENOVACIÓN NOCTURNA - scripts/generar_renovaciones.py
+# ============================================================================
+# Materializa la lista de renovación (core/renovaciones.py) con las pólizas
+# activas que vencen en los próximos 90 días y muestra los vencimientos por
+# ejecutivo comercial. Pensado para ejecutarse cada noche, por ejemplo con
+# cron:
+#
+#   0 2 * * *  cd /ruta/del/proyecto && python scripts/generar_renovaciones.py
+#
+# Uso:
+#   python scripts/generar_renovaciones.py
+#   python scripts/generar_renovaciones.py --fecha 2026-01-15 --db otra.db
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+import time  # Duración de la generación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.migrations import run_migrations  # noqa: E402
+from core.renovaciones import VENTANAS, generar_lista_renovacion, vencimientos  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera la lista de renovación de pólizas por vencer")
+    parser.add_argument("--fecha", help="Fecha de corte AAAA-MM-DD (por defecto hoy)")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    args = parser.parse_args(argv)
+
+    run_migrations(args.db)
+    inicio = time.perf_counter()
+    resumen = generar_lista_renovacion(args.fecha, db_file=args.db)
+    print(
+        f"Lista de renovación al {resumen['fecha']}: {resumen['en_lista']} póliza(s), "
+        f"{resumen['nuevas']} nuevas, {resumen['retiradas']} retiradas "
+        f"({(time.perf_counter() - inicio) * 1000:.0f} ms)"
+    )
+    for _, nombre, *conteos in vencimientos("ejecutivo", args.fecha, db_file=args.db):
+        print(f"    {nombre}: " + ", ".join(f"{n} en {dias} días" for dias, n in zip(VENTANAS, conteos)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+# ============================================================================
+# ÍNDICE DE LA BASE DE CONOCIMIENTO - scripts/indexar_conocimiento.py
+# ============================================================================
+# Actualiza el índice de core/conocimiento.py (solo los manuales nuevos o
+# modificados) y, opcionalmente, responde una pregunta desde la consola.
+#
+# Uso:
+#   python scripts/indexar_conocimiento.py
+#   python scripts/indexar_conocimiento.py --pregunta "¿Cómo registro un aumento de prima?"
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+import time  # Duración de la consulta
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.conocimiento import RESULTADOS, actualizar_indice, buscar  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Actualiza y consulta el índice de los manuales")
+    parser.add_argument("--pregunta", help="Pregunta a responder con los fragmentos más relevantes")
+    parser.add_argument("-k", type=int, default=RESULTADOS, help="Fragmentos a mostrar")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    args = parser.parse_args(argv)
+
+    run_migrations(args.db)
+    resumen = actualizar_indice(db_file=args.db)
+    print(
+        f"{len(resumen['indexados'])} archivo(s) indexados, {resumen['sin_cambios']} sin cambios, "
+        f"{len(resumen['eliminados'])} eliminados"
+    )
+    for ruta in resumen["indexados"]:
+        print(f"    + {ruta}")
+
+    if args.pregunta:
+        inicio = time.perf_counter()
+        pasajes = buscar(args.pregunta, args.k, db_file=args.db)
+        print(f"{len(pasajes)} fragmento(s) en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+        for fuente, ubicacion, texto, puntaje in pasajes:
+            print(f"\n[{puntaje:.2f}] {fuente} — {ubicacion}\n{texto}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# ============================================================================
+# INGESTA DE BORDEREAUX DESDE LA LÍNEA DE COMANDOS - scripts/ingestar_bordereau.py
+# ============================================================================
+# Carga un bordereau (CSV/XLSX de una aseguradora) con core/ingesta_polizas.py
+# sin abrir la aplicación, p. ej. los archivos grandes de la temporada de
+# renovaciones. Si se interrumpe, volver a ejecutar el mismo comando continúa
+# desde el último lote confirmado.
+#
+# Uso:
+#   python scripts/ingestar_bordereau.py archivo.xlsx --usuario 1
+#   python scripts/ingestar_bordereau.py archivo.csv --usuario 1 --aseguradora 4 --sin-factura
+#   python scripts/ingestar_bordereau.py archivo.csv --usuario 1 --errores errores.csv
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.importacion_clientes import reporte_errores_csv  # noqa: E402
+from core.ingesta_polizas import TAMANO_LOTE, ingestar_polizas  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga las pólizas de un bordereau de aseguradora")
+    parser.add_argument("archivo", help="Archivo CSV o XLSX")
+    parser.add_argument("--usuario", type=int, required=True, help="ID del usuario responsable")
+    parser.add_argument("--aseguradora", type=int, help="ID de la aseguradora si el archivo no trae su RUC")
+    parser.add_argument("--sin-factura", action="store_true", help="No generar facturas")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="Filas por transacción")
+    parser.add_argument("--errores", help="Guardar las filas rechazadas en este CSV")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    args = parser.parse_args(argv)
+
+    run_migrations(args.db)
+
+    resumen = ingestar_polizas(
+        args.archivo,
+        os.path.basename(args.archivo),
+        args.usuario,
+        aseguradora_id=args.aseguradora,
+        facturar=not args.sin_factura,
+        tamano=args.lote,
+        progreso=lambda filas: print(f"    {filas} filas procesadas"),
+        db_file=args.db,
+    )
+
+    if resumen["completada_antes"]:
+        print("El archivo ya se había cargado por completo")
+    elif resumen["reanudada_desde"]:
+        print(f"Reanudada desde la fila {resumen['reanudada_desde'] + 2}")
+    print(f"{resumen['insertadas']} póliza(s) cargadas de {resumen['filas']} filas, {resumen['rechazadas']} rechazadas")
+    for fila, numero, motivo in resumen["errores"][:20]:
+        print(f"    fila {fila} ({numero}): {motivo}")
+    if args.errores and resumen["errores"]:
+        with open(args.errores, "w", encoding="utf-8", newline="") as f:
+            f.write(reporte_errores_csv(resumen["errores"], ("fila", "numero_poliza", "motivo")))
+    return 1 if resumen["rechazadas"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
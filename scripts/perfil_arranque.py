@@ -0,0 +1,123 @@
+# ============================================================================
+# PERFIL DE ARRANQUE - scripts/perfil_arranque.py
+# ============================================================================
+# Mide el tiempo de importación de app1.py y de cada dashboard en un proceso
+# nuevo (python -X importtime), como en un arranque en frío tras un
+# despliegue, y falla si alguno supera el presupuesto o arrastra
+# dependencias pesadas (pandas, PyMuPDF, reportlab...) que solo deberían
+# cargarse al abrir el módulo que las usa (ver core/carga_diferida.py).
+#
+# Los módulos que ya importa la línea base (streamlit) no cuentan como
+# pesados: los paga cualquier página.
+#
+# Uso:
+#   python scripts/perfil_arranque.py
+#   python scripts/perfil_arranque.py --presupuesto-ms 800 --detalle 10
+#   python scripts/perfil_arranque.py dashboards.admin_dashboard crud.poliza_crud
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import collections  # Tiempo acumulado por paquete
+import os  # Rutas del proyecto y entorno del subproceso
+import subprocess  # Un intérprete nuevo por medición
+import sys  # Intérprete actual y código de salida
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que se importan al arrancar o al entrar con cada rol
+MODULOS = (
+    "app1",
+    "dashboards.admin_dashboard",
+    "dashboards.Ejecutivo_Comercial_dashboard",
+    "dashboards.Back_Office_Operacion_dashboard",
+    "dashboards.Ejecutivo_Siniestros_dashboard",
+    "user_dashboard",
+)
+LINEA_BASE = "streamlit"  # Framework que paga cualquier página
+PESADOS = ("pandas", "numpy", "fitz", "pymupdf", "reportlab", "openpyxl", "assets.actividad_economica")
+PRESUPUESTO_MS = 1500  # Tiempo máximo de importación por módulo, sin contar la línea base
+
+
+def medir(modulo):
+    """
+    Importa `modulo` en un intérprete nuevo con -X importtime
+
+    Retorna:
+        tuple: (total en ms, {módulo importado: ms propios}, error o None)
+    """
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=RAIZ, env=entorno, capture_output=True, text=True,
+    )
+    propios, total = {}, 0.0
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = (parte.strip() for parte in linea[len("import time:"):].split("|", 2))
+        propios[nombre] = int(propio) / 1000
+        # Las importaciones de primer nivel no tienen sangría; su acumulado incluye a las anidadas
+        if not linea.split("|", 2)[2][1:].startswith(" "):
+            total += int(acumulado) / 1000
+    error = None
+    if proceso.returncode:
+        error = (proceso.stderr.strip().splitlines() or ["error desconocido"])[-1]
+    return total, propios, error
+
+
+def _por_paquete(propios):
+    """Tiempo propio sumado por paquete raíz (pandas, streamlit, core...)."""
+    sumas = collections.Counter()
+    for nombre, ms in propios.items():
+        sumas[nombre.split(".")[0]] += ms
+    return sumas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de importación de los dashboards y presupuesto de arranque")
+    parser.add_argument("modulos", nargs="*", default=MODULOS, help="Módulos a medir (por defecto app1 y los dashboards)")
+    parser.add_argument("--presupuesto-ms", type=float, default=PRESUPUESTO_MS, help="Máximo por módulo sobre la línea base")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Mediciones por módulo (se toma la menor)")
+    parser.add_argument("--detalle", type=int, default=0, help="Paquetes más costosos a listar por módulo")
+    parser.add_argument("--permitir-pesados", action="store_true", help="No fallar por dependencias pesadas")
+    args = parser.parse_args(argv)
+
+    base_total, base_propios, base_error = medir(LINEA_BASE)
+    if base_error:
+        print(f"Línea base '{LINEA_BASE}' no disponible ({base_error}); se mide sin descontarla")
+        base_total, base_propios = 0.0, {}
+    else:
+        print(f"Línea base '{LINEA_BASE}': {base_total:.0f} ms")
+
+    fallos = 0
+    for modulo in args.modulos:
+        mediciones = [medir(modulo) for _ in range(max(1, args.repeticiones))]
+        total, propios, error = min(mediciones, key=lambda m: m[0])
+        if error:
+            print(f"✗ {modulo}: no se pudo importar: {error}")
+            fallos += 1
+            continue
+        neto = max(0.0, total - base_total)
+        pesados = sorted(
+            nombre for nombre in propios
+            if nombre not in base_propios and any(nombre == p or nombre.startswith(f"{p}.") for p in PESADOS)
+        )
+        raices = sorted({nombre.split(".")[0] if not nombre.startswith("assets.") else nombre for nombre in pesados})
+        problemas = []
+        if neto > args.presupuesto_ms:
+            problemas.append(f"supera el presupuesto de {args.presupuesto_ms:.0f} ms")
+        if raices and not args.permitir_pesados:
+            problemas.append(f"importa {', '.join(raices)} al arrancar")
+        print(f"{'✗' if problemas else '✓'} {modulo}: {total:.0f} ms ({neto:.0f} ms sobre la línea base)"
+              + (f" — {'; '.join(problemas)}" if problemas else ""))
+        if args.detalle:
+            base_paquetes = _por_paquete(base_propios)
+            for paquete, ms in (_por_paquete(propios) - base_paquetes).most_common(args.detalle):
+                print(f"      {ms:8.1f} ms  {paquete}")
+        fallos += bool(problemas)
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
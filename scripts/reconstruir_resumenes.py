@@ -0,0 +1,59 @@
+# ============================================================================
+# RECONSTRUCCIÓN DE LOS RESÚMENES DE CARTERA - scripts/reconstruir_resumenes.py
+# ============================================================================
+# Recalcula desde cero resumen_cartera y resumen_facturacion (core/cartera.py)
+# a partir de polizas y facturas, o solo los compara con las tablas vivas.
+# Los triggers de la migración 15 los mantienen al día; este script sirve
+# para verificarlos o repararlos tras editar la base a mano o restaurar un
+# respaldo.
+#
+# Uso:
+#   python scripts/reconstruir_resumenes.py              # recalcula
+#   python scripts/reconstruir_resumenes.py --verificar  # reporta diferencias, no escribe
+#   python scripts/reconstruir_resumenes.py --db otra.db
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.cartera import diferencias, reconstruir  # noqa: E402
+from core.db import connection, unit_of_work  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalcula o verifica los resúmenes de cartera y facturación")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    parser.add_argument("--verificar", action="store_true", help="Reportar diferencias sin escribir")
+    args = parser.parse_args(argv)
+
+    # Garantiza que las tablas de resumen y sus triggers existan
+    run_migrations(args.db)
+
+    if args.verificar:
+        with connection(args.db) as conn:
+            distintos = diferencias(conn)
+        if not distintos:
+            print("✅ Los resúmenes coinciden con polizas y facturas.")
+            return 0
+        for tabla, grupos in distintos.items():
+            print(f"⚠️ {tabla}: {len(grupos)} grupo(s) con diferencias")
+            for clave, guardado, calculado in grupos[:10]:
+                print(f"    {clave}: guardado={guardado} calculado={calculado}")
+        return 1
+
+    with unit_of_work(args.db, immediate=True) as conn:
+        grupos = reconstruir(conn)
+    for tabla, cantidad in grupos.items():
+        print(f"{tabla}: {cantidad} grupo(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
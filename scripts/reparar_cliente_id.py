@@ -0,0 +1,53 @@
+# ============================================================================
+# REPARACIÓN DE cliente_id EN PÓLIZAS - scripts/reparar_cliente_id.py
+# ============================================================================
+# Completa polizas.cliente_id en las pólizas que solo tienen tomador_nombre
+# (formulario anterior) usando el "[ID: n]" de la etiqueta o el nombre exacto
+# del cliente. La migración 8 lo hace una vez; este script sirve para
+# repetirlo tras importar pólizas o crear los clientes que faltaban.
+#
+# Uso:
+#   python scripts/reparar_cliente_id.py              # repara y lista lo no resuelto
+#   python scripts/reparar_cliente_id.py --verificar  # solo reporta, no escribe
+#   python scripts/reparar_cliente_id.py --db otra.db
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto
+import sys  # Código de salida y ruta de importación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.db import unit_of_work  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from core.polizas import reparar_cliente_id  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Repara polizas.cliente_id a partir de tomador_nombre")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    parser.add_argument("--verificar", action="store_true", help="Reportar sin escribir")
+    args = parser.parse_args(argv)
+
+    run_migrations(args.db)
+
+    with unit_of_work(args.db, immediate=True) as conn:
+        reparadas, sin_resolver = reparar_cliente_id(conn, escribir=not args.verificar)
+
+    accion = "reparables" if args.verificar else "reparadas"
+    print(f"{len(reparadas)} póliza(s) {accion}")
+    for poliza_id, cliente_id in reparadas[:20]:
+        print(f"    póliza id={poliza_id} -> cliente_id={cliente_id}")
+    if sin_resolver:
+        print(f"⚠️ {len(sin_resolver)} póliza(s) sin cliente identificable")
+        for poliza_id, tomador in sin_resolver[:20]:
+            print(f"    póliza id={poliza_id} tomador_nombre={tomador!r}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+# ============================================================================
+# SERVIDOR HTTP/JSON DE SERVICIOS - scripts/servidor_api.py
+# ============================================================================
+# Inicia el endpoint local de core/api_http.py sobre la capa de servicios
+# (core/servicios.py) para integraciones y procesos por lotes.
+#
+# El token es obligatorio y pertenece a un usuario de la tabla users (los
+# movimientos se registran a su nombre); para pruebas locales sin token hay
+# que pedirlo explícitamente con --sin-autenticacion.
+#
+# Uso:
+#   python scripts/servidor_api.py --token secreto --usuario admin   # http://127.0.0.1:8765
+#   API_TOKEN=secreto API_USUARIO=admin python scripts/servidor_api.py --puerto 9000
+#   python scripts/servidor_api.py --sin-autenticacion
+#   curl -s -H "Authorization: Bearer secreto" "http://127.0.0.1:8765/clientes?q=maria"
+# ============================================================================
+
+# Importaciones necesarias
+import argparse  # Opciones de línea de comandos
+import os  # Rutas del proyecto y variables de entorno
+import sys  # Ruta de importación
+
+# Permitir ejecutar el script desde cualquier carpeta
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.api_http import crear_servidor  # noqa: E402
+from core.db import close_pools  # noqa: E402
+from core.migrations import run_migrations  # noqa: E402
+from dbconfig import DB_FILE  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Endpoint HTTP/JSON local de los servicios del broker")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz de escucha (por defecto solo local)")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto TCP")
+    parser.add_argument("--token", default=os.environ.get("API_TOKEN"), help="Token Bearer exigido (o variable API_TOKEN)")
+    parser.add_argument("--usuario", default=os.environ.get("API_USUARIO"),
+                        help="Username dueño del token (o variable API_USUARIO)")
+    parser.add_argument("--sin-autenticacion", action="store_true",
+                        help="Arrancar sin token: cualquier proceso local puede usar la API")
+    parser.add_argument("--db", default=DB_FILE, help="Archivo de base de datos (por defecto el de dbconfig)")
+    parser.add_argument("--verbose", action="store_true", help="Registrar cada petición")
+    args = parser.parse_args(argv)
+
+    if not args.token and not args.sin_autenticacion:
+        parser.error("se requiere --token (o API_TOKEN); use --sin-autenticacion para arrancar sin él")
+    if args.token and not args.usuario:
+        parser.error("--token requiere --usuario (o API_USUARIO)")
+
+    run_migrations(args.db)
+    try:
+        servidor = crear_servidor(
+            args.host, args.puerto, args.db, args.token, args.usuario,
+            sin_autenticacion=args.sin_autenticacion, verbose=args.verbose,
+        )
+    except ValueError as e:
+        close_pools()
+        parser.error(str(e))
+    if not args.token:
+        print("ADVERTENCIA: servidor sin autenticación", file=sys.stderr)
+    print(f"Escuchando en http://{args.host}:{servidor.server_address[1]}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        close_pools()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+# ============================================================================
+# PRUEBAS DEL ENDPOINT HTTP - test_api_http.py
+# ============================================================================
+# core/api_http.py contra una base creada con las migraciones: el servidor
+# exige token (salvo sin_autenticacion) y los movimientos se registran a
+# nombre del usuario dueño del token, no del usuario_id del cuerpo.
+#
+# Uso: python -m pytest test_api_http.py
+# ============================================================================
+
+import json
+import sqlite3
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core import servicios
+from core.api_http import crear_servidor
+from core.db import close_pools
+from core.migrations import run_migrations
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base migrada con los usuarios 1 (admin) y 2 (operador) y una póliza Activa."""
+    path = str(tmp_path / "api.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO users (id, username) VALUES (?, ?)", [(1, "admin"), (2, "operador")])
+    conn.execute(
+        """INSERT INTO polizas (id, numero_poliza, cliente_id, usuario_id, tipo_poliza, cobertura, prima,
+                                prima_neta, fecha_inicio, fecha_fin, estado)
+           VALUES (1, 'POL-1', 1, 1, 'Individual', 'Total', '100.00', '100.00', '2025-01-01', '2026-01-01', 'Activa')"""
+    )
+    conn.commit()
+    yield path, conn
+    conn.close()
+    close_pools()
+
+
+@pytest.fixture
+def servidor(db):
+    """Servidor en un puerto libre con el token "secreto" del usuario operador."""
+    path, conn = db
+    servidor = crear_servidor(puerto=0, db_file=path, token="secreto", usuario="operador")
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}", conn
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _post(url, cuerpo, token="secreto"):
+    peticion = urllib.request.Request(
+        url, data=json.dumps(cuerpo).encode(), method="POST",
+        headers={"Content-Type": "application/json", "Authorization": f"Bearer {token}"},
+    )
+    try:
+        with urllib.request.urlopen(peticion) as respuesta:
+            return respuesta.status, json.loads(respuesta.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_sin_token_no_arranca(db):
+    path, _ = db
+    with pytest.raises(ValueError, match="Se requiere un token"):
+        crear_servidor(puerto=0, db_file=path)
+    with pytest.raises(ValueError, match="no existe"):
+        crear_servidor(puerto=0, db_file=path, token="secreto", usuario="nadie")
+    servidor = crear_servidor(puerto=0, db_file=path, sin_autenticacion=True)
+    assert servidor.usuario_id is None
+    servidor.server_close()
+
+
+def test_movimientos_a_nombre_del_token(servidor):
+    url, conn = servidor
+    movimiento = {"poliza_id": 1, "tipo_movimiento": "Aumento de Prima", "parametros": {"porcentaje_prima": 10}}
+    estado, _ = _post(f"{url}/movimientos", {"movimientos": [movimiento]})
+    assert estado == 200
+    assert conn.execute("SELECT usuario_id FROM movimientos_poliza").fetchall() == [(2,)]
+
+
+def test_usuario_id_en_el_cuerpo_se_rechaza(servidor):
+    url, conn = servidor
+    estado, datos = _post(f"{url}/movimientos", {"usuario_id": 1, "movimientos": []})
+    assert estado == 400
+    assert "se toma del token" in datos["mensaje"]
+
+
+def test_token_invalido(servidor):
+    url, _ = servidor
+    assert _post(f"{url}/desglose", {}, token="otro")[0] == 401
+
+
+def _get(url):
+    peticion = urllib.request.Request(url, headers={"Authorization": "Bearer secreto"})
+    try:
+        with urllib.request.urlopen(peticion) as respuesta:
+            return respuesta.status, json.loads(respuesta.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_limite_no_numerico_es_400(servidor):
+    url, _ = servidor
+    assert _get(f"{url}/clientes?q=maria&limite=diez") == (
+        400, {"ok": False, "mensaje": "El parámetro limite debe ser un número entero"},
+    )
+
+
+def test_error_interno_no_expone_detalles(servidor, monkeypatch, caplog):
+    url, _ = servidor
+
+    def falla(*args):
+        raise RuntimeError("no such table: clients_fts")
+
+    monkeypatch.setattr(servicios, "buscar_clientes", falla)
+    assert _get(f"{url}/clientes?q=maria") == (500, {"ok": False, "mensaje": "Error interno del servidor"})
+    assert "no such table" in caplog.text
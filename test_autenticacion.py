@@ -0,0 +1,98 @@
+# ============================================================================
+# PRUEBAS DE AUTENTICACIÓN - test_autenticacion.py
+# ============================================================================
+# core/autenticacion.py: verificar() pide volver a cifrar cuando el hash
+# guardado tiene otro costo que el vigente, y autenticar() guarda ese hash
+# sin pisar una contraseña cambiada mientras tanto. Usa costos bajos (4 y 5)
+# para que las pruebas sean rápidas.
+#
+# Uso: python -m pytest test_autenticacion.py
+# ============================================================================
+
+import sqlite3
+
+import pytest
+
+import core.autenticacion as autenticacion
+from core.autenticacion import autenticar, costo_de, hashear, verificar
+from core.db import close_pools
+from core.migrations import run_migrations
+
+COSTO_ANTERIOR = 4
+COSTO_VIGENTE = 5
+
+
+def test_mismo_costo_no_rehashea():
+    guardado = hashear("clave", COSTO_VIGENTE)
+    assert verificar("clave", guardado, COSTO_VIGENTE) == (True, None)
+
+
+@pytest.mark.parametrize("como_bytes", [False, True])
+def test_costo_distinto_rehashea(como_bytes):
+    guardado = hashear("clave", COSTO_ANTERIOR)
+    correcta, nuevo = verificar("clave", guardado.encode() if como_bytes else guardado, COSTO_VIGENTE)
+    assert correcta
+    assert costo_de(nuevo) == COSTO_VIGENTE
+    assert verificar("clave", nuevo, COSTO_VIGENTE) == (True, None)
+
+
+@pytest.mark.parametrize("guardado", [hashear("clave", COSTO_ANTERIOR), None, "", "texto plano", "$2b$xx$roto"])
+def test_contrasena_incorrecta_o_hash_invalido(guardado):
+    assert verificar("otra", guardado, COSTO_VIGENTE) == (False, None)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base migrada con el usuario ana (hash de costo COSTO_ANTERIOR)."""
+    path = str(tmp_path / "autenticacion.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO users (username, password, role) VALUES ('ana', ?, 'admin')",
+        (hashear("clave", COSTO_ANTERIOR),),
+    )
+    conn.commit()
+    yield path, conn
+    conn.close()
+    close_pools()
+
+
+def _hash(conn):
+    return conn.execute("SELECT password FROM users WHERE username = 'ana'").fetchone()[0]
+
+
+def test_autenticar_guarda_el_nuevo_hash(db):
+    path, conn = db
+    assert autenticar("ana", "clave", path, COSTO_VIGENTE) == ({"username": "ana", "role": "admin"}, None)
+    rehasheado = _hash(conn)
+    assert costo_de(rehasheado) == COSTO_VIGENTE
+    # El siguiente inicio ya no reescribe el hash
+    autenticar("ana", "clave", path, COSTO_VIGENTE)
+    assert _hash(conn) == rehasheado
+
+
+def test_autenticar_fallido_no_toca_el_hash(db):
+    path, conn = db
+    anterior = _hash(conn)
+    assert autenticar("ana", "otra", path, COSTO_VIGENTE) == (None, "Contraseña incorrecta.")
+    assert autenticar("nadie", "clave", path, COSTO_VIGENTE) == (None, "Usuario no encontrado.")
+    assert _hash(conn) == anterior
+
+
+def test_rehash_no_pisa_un_cambio_de_contrasena(db, monkeypatch):
+    path, conn = db
+    cambiada = hashear("nueva", COSTO_VIGENTE)
+
+    def verificar_con_cambio(password, hash_guardado, costo=None):
+        resultado = verificar(password, hash_guardado, costo)
+        # Otra sesión cambia la contraseña mientras se verificaba la anterior
+        otra = sqlite3.connect(path)
+        otra.execute("UPDATE users SET password = ? WHERE username = 'ana'", (cambiada,))
+        otra.commit()
+        otra.close()
+        return resultado
+
+    monkeypatch.setattr(autenticacion, "verificar", verificar_con_cambio)
+    usuario, _ = autenticar("ana", "clave", path, COSTO_VIGENTE)
+    assert usuario == {"username": "ana", "role": "admin"}
+    assert _hash(conn) == cambiada
@@ -0,0 +1,86 @@
+# ============================================================================
+# PRUEBAS DE LOS RESÚMENES DE CARTERA - test_cartera.py
+# ============================================================================
+# Los triggers de la migración 15 mantienen resumen_cartera y
+# resumen_facturacion: después de cada INSERT, UPDATE y DELETE sobre
+# polizas y facturas, core/cartera.diferencias() no encuentra diferencias y
+# las tablas coinciden con las que arma reconstruir().
+#
+# Uso: python -m pytest test_cartera.py
+# ============================================================================
+
+import sqlite3
+
+import pytest
+
+from core.cartera import RESUMENES, diferencias, reconstruir
+from core.db import close_pools
+from core.migrations import run_migrations
+
+# Cada paso se aplica sobre el resultado del anterior
+PASOS = [
+    ("alta de pólizas", """
+        INSERT INTO polizas (id, numero_poliza, cliente_id, usuario_id, tipo_poliza, cobertura, prima,
+                             prima_neta_centavos, suma_asegurada_centavos, total_centavos,
+                             aseguradora_id, ramo_id, fecha_emision, fecha_inicio, fecha_fin, estado)
+        VALUES (1, 'POL-1', 1, 1, 'Individual', 'Total', '100', 10000, 500000, 11500, 1, 1, '2025-01-15', '2025-01-15', '2026-01-15', 'Activa'),
+               (2, 'POL-2', 1, 1, 'Individual', 'Total', '200', 20000, NULL, 23000, 1, 1, '', '2025-01-20', '2026-01-20', 'Activa'),
+               (3, 'POL-3', 2, 1, 'Individual', 'Total', '300', 30000, 900000, 34500, 2, NULL, NULL, '2025-02-01', '2026-02-01', 'Activa')
+    """),
+    ("alta de facturas", """
+        INSERT INTO facturas (id, numero_factura, poliza_id, fecha_emision, monto_neto, total, estado)
+        VALUES (1, 'F-1', 1, '2025-01-15', 100.005, 115.01, 'Emitida'),
+               (2, 'F-2', 2, '2025-01-20', 200, 230, 'Emitida'),
+               (3, 'F-3', 3, NULL, 300, 345, 'Emitida'),
+               (4, 'F-4', NULL, '2025-03-01', 10, 11.5, 'Emitida')
+    """),
+    ("cambio de montos", "UPDATE polizas SET prima_neta_centavos = 15000, total_centavos = NULL WHERE id = 1"),
+    ("cambio de estado", "UPDATE polizas SET estado = 'Cancelada' WHERE id = 2"),
+    ("cambio de aseguradora y ramo (mueve sus facturas)", "UPDATE polizas SET aseguradora_id = 3, ramo_id = 2 WHERE id = 1"),
+    ("cambio de mes", "UPDATE polizas SET fecha_emision = '2025-06-01' WHERE id = 3"),
+    ("columna fuera de la clave", "UPDATE polizas SET cobertura = 'Parcial' WHERE id = 3"),
+    ("factura a otra póliza", "UPDATE facturas SET poliza_id = 3 WHERE id = 4"),
+    ("anulación de factura", "UPDATE facturas SET estado = 'Anulada', total = 0 WHERE id = 2"),
+    ("baja de factura", "DELETE FROM facturas WHERE id = 1"),
+    ("baja de póliza con facturas", "DELETE FROM polizas WHERE id = 3"),
+    ("cambio de id de póliza (sus facturas quedan sin póliza)", "UPDATE polizas SET id = 10 WHERE id = 2"),
+    ("id de póliza que adopta facturas sin póliza", "UPDATE polizas SET id = 3, aseguradora_id = 4 WHERE id = 10"),
+]
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "cartera.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+    close_pools()
+
+
+def _resumenes(conn):
+    return {
+        tabla: sorted(conn.execute(f"SELECT * FROM {tabla}").fetchall(), key=repr)
+        for tabla in RESUMENES
+    }
+
+
+def test_triggers_coinciden_con_reconstruir(db):
+    for descripcion, sql in PASOS:
+        db.execute(sql)
+        assert diferencias(db) == {}, descripcion
+        guardados = _resumenes(db)
+        db.execute("SAVEPOINT comparar")
+        reconstruir(db)
+        assert _resumenes(db) == guardados, descripcion
+        db.execute("ROLLBACK TO comparar")
+        db.execute("RELEASE comparar")
+        db.commit()
+
+
+def test_grupos_en_cero_se_borran(db):
+    for _, sql in PASOS[:2]:
+        db.execute(sql)
+    db.execute("DELETE FROM facturas")
+    db.execute("DELETE FROM polizas")
+    assert _resumenes(db) == {tabla: [] for tabla in RESUMENES}
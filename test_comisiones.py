@@ -0,0 +1,92 @@
+# ============================================================================
+# PRUEBAS DE LA COLA DE COMISIONES - test_comisiones.py
+# ============================================================================
+# core/comisiones.recalcular_pendientes contra una base creada con las
+# migraciones: una póliza marcada de nuevo mientras se calcula sigue en la
+# cola al terminar.
+#
+# Uso: python -m pytest test_comisiones.py
+# ============================================================================
+
+import sqlite3
+
+import pytest
+
+import core.comisiones as comisiones
+from core.db import close_pools
+from core.migrations import run_migrations
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base migrada con tres pólizas de la aseguradora 1 y una tasa del 10 %."""
+    path = str(tmp_path / "comisiones.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        """INSERT INTO polizas (id, numero_poliza, cliente_id, usuario_id, tipo_poliza, cobertura, prima,
+                                prima_neta_centavos, aseguradora_id, ramo_id, fecha_inicio, fecha_fin, estado)
+           VALUES (?, ?, 1, 1, 'Individual', 'Total', '100', 10000, 1, 1, '2025-01-01', '2026-01-01', 'Activa')""",
+        [(1, "POL-1"), (2, "POL-2"), (3, "POL-3")],
+    )
+    conn.commit()
+    comisiones.guardar_tasa(1, 0, 10, db_file=path)
+    yield path, conn
+    conn.close()
+    close_pools()
+
+
+def _cola(conn):
+    return [fila[0] for fila in conn.execute("SELECT poliza_id FROM comisiones_pendientes ORDER BY id")]
+
+
+def test_triggers_marcan_polizas(db):
+    path, conn = db
+    comisiones.calcular_comisiones(db_file=path)
+    assert _cola(conn) == []
+    conn.execute("UPDATE polizas SET estado = 'Cancelada' WHERE id = 2")
+    conn.execute("INSERT INTO facturas (numero_factura, poliza_id) VALUES ('F-1', 3)")
+    conn.commit()
+    assert _cola(conn) == [2, 3]
+
+
+def test_marca_durante_el_calculo_no_se_pierde(db, monkeypatch):
+    path, conn = db
+    assert _cola(conn) == [1, 2, 3]  # guardar_tasa marca las pólizas de la aseguradora
+    calcular = comisiones.calcular_comisiones
+
+    def calcular_con_escritura(poliza_ids=None, db_file=None):
+        resumen = calcular(poliza_ids, db_file)
+        # Otra sesión cambia la póliza 2 antes de que se borren las marcas leídas
+        otra = sqlite3.connect(path)
+        otra.execute("UPDATE polizas SET prima_neta_centavos = 20000 WHERE id = 2")
+        otra.commit()
+        otra.close()
+        return resumen
+
+    monkeypatch.setattr(comisiones, "calcular_comisiones", calcular_con_escritura)
+    assert comisiones.recalcular_pendientes(path)["polizas"] == 3
+    assert _cola(conn) == [2]
+
+    monkeypatch.setattr(comisiones, "calcular_comisiones", calcular)
+    comisiones.recalcular_pendientes(path)
+    assert _cola(conn) == []
+    devengada = conn.execute("SELECT devengada_centavos FROM comisiones WHERE poliza_id = 2").fetchone()[0]
+    assert devengada == 2000
+
+
+def test_calculo_completo_conserva_marcas_posteriores(db, monkeypatch):
+    path, conn = db
+    leer = comisiones._leer
+
+    def leer_con_escritura(conexion, ids):
+        datos = leer(conexion, ids)
+        otra = sqlite3.connect(path)
+        otra.execute("UPDATE polizas SET estado = 'Cancelada' WHERE id = 1")
+        otra.commit()
+        otra.close()
+        return datos
+
+    monkeypatch.setattr(comisiones, "_leer", leer_con_escritura)
+    comisiones.calcular_comisiones(db_file=path)
+    assert _cola(conn) == [1]
@@ -0,0 +1,64 @@
+# ============================================================================
+# PRUEBAS DE LA BASE DE CONOCIMIENTO - test_conocimiento.py
+# ============================================================================
+# core/conocimiento.actualizar_indice contra una base creada con las
+# migraciones: los patrones se resuelven contra la carpeta de los manuales
+# (no el directorio de trabajo) y solo se quitan las fuentes que de verdad
+# se borraron o renombraron.
+#
+# Uso: python -m pytest test_conocimiento.py
+# ============================================================================
+
+import pytest
+
+from core.conocimiento import FUENTES, RAIZ, actualizar_indice, archivos_fuente, buscar
+from core.db import close_pools
+from core.migrations import run_migrations
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "conocimiento.db")
+    run_migrations(path)
+    yield path
+    close_pools()
+
+
+@pytest.fixture
+def manuales(tmp_path):
+    """Carpeta de proyecto con docs/emision.md y docs/siniestros.md."""
+    raiz = tmp_path / "proyecto"
+    (raiz / "docs").mkdir(parents=True)
+    (raiz / "docs" / "emision.md").write_text("# Emisión\nPara emitir una póliza se registra la factura.\n")
+    (raiz / "docs" / "siniestros.md").write_text("# Siniestros\nEl reclamo vehicular requiere el parte policial.\n")
+    return raiz
+
+
+def test_independiente_del_directorio_de_trabajo(db, manuales, tmp_path, monkeypatch):
+    raiz = str(manuales)
+    assert actualizar_indice(FUENTES, db, raiz)["indexados"] == ["docs/emision.md", "docs/siniestros.md"]
+    otra = tmp_path / "otra"
+    otra.mkdir()
+    monkeypatch.chdir(otra)
+    assert actualizar_indice(FUENTES, db, raiz) == {"indexados": [], "sin_cambios": 2, "eliminados": []}
+    assert buscar("parte policial", db_file=db)[0][0] == "docs/siniestros.md"
+
+
+def test_fuente_renombrada_o_borrada(db, manuales):
+    raiz = str(manuales)
+    actualizar_indice(FUENTES, db, raiz)
+    (manuales / "docs" / "siniestros.md").rename(manuales / "docs" / "reclamos.md")
+    assert actualizar_indice(FUENTES, db, raiz) == {
+        "indexados": ["docs/reclamos.md"], "sin_cambios": 1, "eliminados": ["docs/siniestros.md"],
+    }
+    assert buscar("parte policial", db_file=db)[0][0] == "docs/reclamos.md"
+
+    (manuales / "docs" / "emision.md").unlink()
+    assert actualizar_indice(FUENTES, db, raiz)["eliminados"] == ["docs/emision.md"]
+    assert buscar("emitir factura", db_file=db) == []
+
+
+def test_raiz_es_la_carpeta_del_proyecto(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert archivos_fuente(("dbconfig.py",)) == ["dbconfig.py"]
+    assert RAIZ != str(tmp_path)
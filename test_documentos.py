@@ -0,0 +1,81 @@
+# ============================================================================
+# PRUEBAS DE GENERACIÓN DE DOCUMENTOS - test_documentos.py
+# ============================================================================
+# core/documentos.encolar contra una base creada con las migraciones: la
+# factura se dibuja en el pool de procesos "spawn", los errores de los
+# trabajos en segundo plano quedan en fallos() y un pool roto se reemplaza.
+#
+# Uso: python -m pytest test_documentos.py
+# ============================================================================
+
+import os
+import sqlite3
+import time
+
+import pytest
+
+from core import documentos
+from core.db import close_pools
+from core.migrations import run_migrations
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Base migrada con la factura 1; los PDF se escriben en tmp_path/documentos."""
+    monkeypatch.chdir(tmp_path)
+    path = str(tmp_path / "documentos.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """INSERT INTO facturas (id, numero_factura, fecha_emision, monto_neto, impuestos, iva, total)
+           VALUES (1, 'F-20250101-00001', '2025-01-01', 100, 1, 15.15, 116.15)"""
+    )
+    conn.commit()
+    documentos._fallos.clear()
+    yield path, conn
+    documentos.detener()
+    conn.close()
+    close_pools()
+
+
+def _pdf(conn):
+    return conn.execute("SELECT pdf_documento FROM facturas WHERE id = 1").fetchone()[0]
+
+
+def test_factura_en_el_pool_de_procesos(db):
+    path, conn = db
+    resumen = documentos.encolar(documentos.FACTURA, [1], db_file=path).result(timeout=60)
+    assert resumen == {"generados": 1, "errores": []}
+    ruta = _pdf(conn)
+    assert ruta == os.path.join("documentos", "facturas", "F-20250101-00001_1.pdf")
+    with open(ruta, "rb") as archivo:
+        assert archivo.read(5) == b"%PDF-"
+    assert documentos.fallos() == []
+
+
+def test_errores_en_segundo_plano_se_registran(db, tmp_path):
+    path, conn = db
+    (tmp_path / "documentos").write_text("no es una carpeta")  # Ningún PDF se puede escribir
+    resumen = documentos.encolar(documentos.FACTURA, [1], db_file=path).result(timeout=60)
+    assert resumen["generados"] == 0
+    futuro = documentos.encolar("tipo_inexistente", [1], db_file=path)
+    with pytest.raises(KeyError):
+        futuro.result(timeout=60)
+    # El callback corre en el hilo despachador justo después de resolver el futuro
+    limite = time.monotonic() + 10
+    while len(documentos.fallos()) < 2 and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert [fallo["tarea"] for fallo in documentos.fallos()] == ["factura 1", "tipo_inexistente"]
+    assert _pdf(conn) is None
+
+
+def test_pool_roto_se_reemplaza(db):
+    path, conn = db
+    procesos, _ = documentos._pools()
+    procesos.submit(os._exit, 1)  # Un worker muere: el pool queda roto
+    with pytest.raises(Exception):
+        procesos.submit(int).result(timeout=60)
+    resumen = documentos.encolar(documentos.FACTURA, [1], db_file=path).result(timeout=60)
+    assert resumen == {"generados": 1, "errores": []}
+    assert documentos._pools()[0] is not procesos
+    assert _pdf(conn)
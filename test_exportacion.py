@@ -0,0 +1,48 @@
+# ============================================================================
+# PRUEBAS DE EXPORTACIÓN - test_exportacion.py
+# ============================================================================
+# core/exportacion.py: limpieza de exportaciones/ por antigüedad y cantidad,
+# y validación del formato antes de encolar una exportación.
+#
+# Uso: python -m pytest test_exportacion.py
+# ============================================================================
+
+import os
+import time
+
+import pytest
+
+from core.exportacion import iniciar_exportacion, limpiar_exportaciones
+
+
+def _archivo(directorio, nombre, dias):
+    """Crea un archivo con mtime de hace `dias` días."""
+    ruta = directorio / nombre
+    ruta.write_text("x")
+    momento = time.time() - dias * 86400
+    os.utime(ruta, (momento, momento))
+    return str(ruta)
+
+
+def test_limpiar_por_antiguedad(tmp_path):
+    viejo = _archivo(tmp_path, "polizas_viejo.csv", 10)
+    parcial = _archivo(tmp_path, "polizas_abandonado.csv.parcial", 10)
+    reciente = _archivo(tmp_path, "polizas_reciente.csv", 1)
+    assert sorted(limpiar_exportaciones(str(tmp_path), dias=7)) == sorted([viejo, parcial])
+    assert os.listdir(tmp_path) == [os.path.basename(reciente)]
+
+
+def test_limpiar_por_cantidad(tmp_path):
+    rutas = [_archivo(tmp_path, f"polizas_{n}.csv", n / 10) for n in range(5)]  # rutas[0], la más reciente
+    en_curso = _archivo(tmp_path, "polizas_en_curso.xlsx.parcial", 0.5)
+    assert sorted(limpiar_exportaciones(str(tmp_path), dias=7, maximo=2)) == sorted(rutas[2:])
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(r) for r in rutas[:2] + [en_curso])
+
+
+def test_limpiar_sin_directorio(tmp_path):
+    assert limpiar_exportaciones(str(tmp_path / "no_existe")) == []
+
+
+def test_formato_invalido_no_se_encola():
+    with pytest.raises(ValueError, match="Formato no soportado: pdf"):
+        iniciar_exportacion("polizas", formato="pdf")
@@ -0,0 +1,36 @@
+# ============================================================================
+# PRUEBAS DE LA INGESTA DE PÓLIZAS - test_ingesta_polizas.py
+# ============================================================================
+# Lectura de las fechas de los bordereaux (core/ingesta_polizas._fechas):
+# cada formato se interpreta con su propia regla, sin intercambiar día y mes.
+#
+# Uso: python -m pytest test_ingesta_polizas.py
+# ============================================================================
+
+import pandas as pd
+
+from core.ingesta_polizas import _fechas
+
+
+def test_fechas_por_formato():
+    entrada = pd.Series(["2025-01-02", "02/01/2025", "2025-01-02 00:00:00", "45678", "2025-13-01"])
+    assert _fechas(entrada).tolist() == [
+        "2025-01-02",  # ISO: año-mes-día, nunca día primero
+        "2025-01-02",  # dd/mm/aaaa
+        "2025-01-02",  # Celda datetime de openpyxl convertida a texto
+        "2025-01-21",  # Serial de Excel
+        "",  # Mes 13: inválida
+    ]
+
+
+def test_fechas_vacias_e_invalidas():
+    entrada = pd.Series(["", "sin fecha", "31/02/2025", "2025-02-30"])
+    assert _fechas(entrada).tolist() == ["", "", "", ""]
+
+
+def test_fechas_conservan_el_indice():
+    # El índice es la fila del archivo: los rechazos se reportan con él
+    entrada = pd.Series(["15/06/2024", "2024-06-15T08:30"], index=[7, 9])
+    resultado = _fechas(entrada)
+    assert resultado.index.tolist() == [7, 9]
+    assert resultado.tolist() == ["2024-06-15", "2024-06-15"]
@@ -0,0 +1,130 @@
+# ============================================================================
+# PRUEBAS DE MONTOS EN CENTAVOS - test_money.py
+# ============================================================================
+# core/money.py: conversión de valores a Money, porcentajes redondeados al
+# centavo (mitad hacia arriba), desglose de facturación y relleno de las
+# columnas `<columna>_centavos` sobre una base creada con las migraciones.
+#
+# Uso: python -m pytest test_money.py
+# ============================================================================
+
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from core.db import close_pools
+from core.migrations import run_migrations
+from core.money import Money, calcular_desglose, rellenar_centavos, verificar_centavos
+
+
+@pytest.mark.parametrize("valor,centavos", [
+    ("1250", 125000),
+    ("1,250.50", 125050),
+    ("$1,250.50 USD", 125050),
+    ("1.250,50", 125050),  # Coma decimal
+    ("1250,5", 125050),
+    ("1,250", 125000),  # Coma con 3 dígitos: miles
+    ("1.250.000", 125000000),
+    ("-$5", -500),
+    (1250, 125000),
+    (0.1, 10),  # repr corto del float, no 0.1000000000000000055...
+    (Decimal("2.675"), 268),  # float(2.675) redondearía a 2.67
+    ("0.005", 1),
+    ("-0.005", -1),  # Mitad hacia arriba en valor absoluto
+    (Money(42), 42),
+])
+def test_parse(valor, centavos):
+    assert Money.parse(valor).cents == centavos
+
+
+@pytest.mark.parametrize("valor", [
+    None, "", "USD", "1.2.3", "nan", float("nan"), float("inf"), True,
+    "12e5",  # Exponente: no se lee como 125
+    "1,2500",  # Ambiguo: ni miles ni centavos
+    "1,25.50",  # Grupo de miles mal formado
+])
+def test_parse_invalido(valor):
+    assert Money.parse(valor) is None
+    assert Money.of(valor) == Money(0)
+
+
+@pytest.mark.parametrize("centavos,pct,esperado", [
+    (125000, Decimal("0.5"), 625),
+    (10010, Decimal("0.5"), 50),  # 50.05 centavos
+    (12345, 15, 1852),  # 1851.75 centavos
+    (100, "12.5", 13),  # 12.5 centavos: mitad hacia arriba
+    (-100, "12.5", -13),
+    (199, 0, 0),
+])
+def test_percent(centavos, pct, esperado):
+    assert Money(centavos).percent(pct).cents == esperado
+
+
+def test_presentacion():
+    monto = Money.parse("1234567.8")
+    assert str(monto) == "1234567.80"
+    assert monto.format() == "1,234,567.80"
+    assert monto.to_decimal() == Decimal("1234567.80")
+
+
+def test_calcular_desglose():
+    desglose = calcular_desglose("1,250.00", derecho_emision="0.45", otros_cargos=None)
+    assert {clave: monto.cents for clave, monto in desglose.items()} == {
+        "prima": 125000,
+        "contrib_scvs": 625,
+        "seguro_campesino": 625,
+        "derecho_emision": 45,
+        "otros_cargos": 0,
+        "impuestos": 1295,
+        "subtotal": 126295,
+        "iva": 18944,  # 18944.25 centavos
+        "total": 145239,
+    }
+
+
+@pytest.mark.parametrize("prima", ["0.01", "0.99", "100.10", "333.33", "9999.99", "12345.67"])
+def test_desglose_cuadra(prima):
+    # Cada componente se redondea antes de sumar: los totales cuadran al centavo
+    d = calcular_desglose(prima, "1.11", "2.22")
+    assert d["impuestos"] == d["contrib_scvs"] + d["seguro_campesino"] + d["derecho_emision"] + d["otros_cargos"]
+    assert d["subtotal"] == d["prima"] + d["impuestos"]
+    assert d["total"] == d["subtotal"] + d["iva"]
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base migrada con una póliza de montos en texto libre y sin centavos."""
+    path = str(tmp_path / "money.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """INSERT INTO polizas (id, numero_poliza, cliente_id, usuario_id, tipo_poliza, cobertura, prima,
+                                prima_neta, suma_asegurada, fecha_inicio, fecha_fin, estado)
+           VALUES (1, 'POL-1', 1, 1, 'Individual', 'Total', '$1,250.50 USD', '1250.5', 'sin monto',
+                   '2025-01-01', '2026-01-01', 'Activa')"""
+    )
+    conn.execute("INSERT INTO poliza_ramos (poliza_id, nro_ramo, ramo_id, prima) VALUES (1, 1, 1, '99.995')")
+    conn.commit()
+    yield conn
+    conn.close()
+    close_pools()
+
+
+def test_rellenar_centavos(db):
+    rellenar_centavos(db, solo_vacios=True)
+    fila = db.execute("SELECT prima_centavos, prima_neta_centavos, suma_asegurada_centavos FROM polizas").fetchone()
+    assert fila == (125050, 125050, None)
+    assert db.execute("SELECT prima_centavos FROM poliza_ramos").fetchone() == (10000,)
+    assert verificar_centavos(db) == {}
+
+
+def test_rellenar_corrige_diferencias(db):
+    rellenar_centavos(db)
+    db.execute("UPDATE polizas SET prima = '99.999'")
+    assert verificar_centavos(db) == {"polizas.prima": [(1, "99.999", 125050)]}
+    actualizadas = rellenar_centavos(db)
+    assert actualizadas["polizas.prima"] == 1
+    assert sum(actualizadas.values()) == 1  # Solo se reescribe lo que cambió
+    assert db.execute("SELECT prima_centavos FROM polizas").fetchone() == (10000,)
+    assert verificar_centavos(db) == {}
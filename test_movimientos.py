@@ -0,0 +1,125 @@
+# ============================================================================
+# PRUEBAS DEL MOTOR DE MOVIMIENTOS EN LOTE - test_movimientos.py
+# ============================================================================
+# core/movimientos.aplicar_movimientos contra una base creada con las
+# migraciones: los movimientos inválidos se rechazan uno por uno y el resto
+# del lote se escribe.
+#
+# Uso: python -m pytest test_movimientos.py
+# ============================================================================
+
+import sqlite3
+
+import pytest
+
+from core.db import close_pools
+from core.migrations import run_migrations
+from core.movimientos import AUMENTO_PRIMA, AUMENTO_SUMA, CANCELACION, aplicar_movimientos
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base migrada con tres pólizas: 1 y 2 Activas, 3 Cancelada."""
+    path = str(tmp_path / "movimientos.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        """INSERT INTO polizas (id, numero_poliza, cliente_id, usuario_id, tipo_poliza, cobertura, prima,
+                                prima_neta, suma_asegurada, fecha_inicio, fecha_fin, estado)
+           VALUES (?, ?, 1, 1, 'Individual', 'Total', ?, ?, ?, '2025-01-01', '2026-01-01', ?)""",
+        [
+            (1, "POL-1", "100.00", "100.00", "10000.00", "Activa"),
+            (2, "POL-2", "200.00", "200.00", "20000.00", "Activa"),
+            (3, "POL-3", "300.00", "300.00", "30000.00", "Cancelada"),
+        ],
+    )
+    conn.commit()
+    yield path, conn
+    conn.close()
+    close_pools()
+
+
+def _motivos(resumen):
+    return {posicion: motivo for posicion, _, _, motivo in resumen["rechazados"]}
+
+
+@pytest.mark.parametrize("porcentaje", ["abc", "nan", float("nan"), float("inf"), True])
+def test_porcentaje_invalido_rechaza_solo_esa_fila(db, porcentaje):
+    path, conn = db
+    resumen = aplicar_movimientos(
+        [
+            (1, AUMENTO_SUMA, {"porcentaje_suma": porcentaje}),
+            (2, AUMENTO_SUMA, {"porcentaje_suma": 5}),
+        ],
+        db_file=path,
+    )
+    assert resumen["aplicados"] == 1
+    assert _motivos(resumen) == {0: "porcentaje_suma no es un porcentaje válido"}
+    sumas = dict(conn.execute("SELECT id, suma_asegurada_centavos FROM polizas WHERE id IN (1, 2)"))
+    assert sumas == {1: None, 2: 2100000}
+
+
+def test_rechazos_por_fila(db):
+    path, conn = db
+    resumen = aplicar_movimientos(
+        [
+            (1, AUMENTO_PRIMA, {"porcentaje_prima": "10"}),  # Aplicado: 100.00 -> 110.00
+            (3, AUMENTO_PRIMA, {"porcentaje_prima": "10"}),  # Póliza Cancelada
+            (99, CANCELACION, {}),  # Póliza inexistente
+            (2, AUMENTO_SUMA, {"suma_asegurada": "15000"}),  # Un aumento que baja la suma
+            (2, "Anexo inventado", {}),  # Tipo desconocido
+            (2, AUMENTO_PRIMA, {"prima": "no es monto"}),  # Monto no numérico
+        ],
+        db_file=path,
+    )
+    assert resumen["aplicados"] == 1
+    assert _motivos(resumen) == {
+        1: "La póliza no está Activa",
+        2: "Póliza no encontrada",
+        3: "La nueva suma asegurada no es mayor que la actual (20,000.00)",
+        4: "Tipo de movimiento desconocido: Anexo inventado",
+        5: "prima no es un monto válido",
+    }
+    assert conn.execute("SELECT prima_neta_centavos FROM polizas WHERE id = 1").fetchone()[0] == 11000
+    assert conn.execute("SELECT COUNT(*) FROM movimientos_poliza").fetchone()[0] == 1
+
+
+def test_movimientos_de_una_poliza_se_encadenan(db):
+    path, conn = db
+    resumen = aplicar_movimientos(
+        [
+            (1, AUMENTO_SUMA, {"porcentaje_suma": 10}),  # 10,000.00 -> 11,000.00
+            (1, AUMENTO_SUMA, {"porcentaje_suma": 10}),  # 11,000.00 -> 12,100.00
+            (1, CANCELACION, {}),
+            (1, AUMENTO_SUMA, {"porcentaje_suma": 10}),  # Ya Cancelada
+        ],
+        db_file=path,
+    )
+    assert resumen["aplicados"] == 3
+    assert _motivos(resumen) == {3: "La póliza no está Activa"}
+    fila = conn.execute("SELECT suma_asegurada_centavos, estado FROM polizas WHERE id = 1").fetchone()
+    assert fila == (1210000, "Cancelada")
+
+
+@pytest.mark.parametrize("params,motivo", [
+    (["porcentaje_prima", 10], "Los parámetros del movimiento deben ser un diccionario"),
+    ({"porcentaje_prima": 10, "fecha_documento": "31/12/2025"}, "fecha_documento no es una fecha válida (AAAA-MM-DD)"),
+    ({"porcentaje_prima": 10, "derecho_emision": "abc"}, "derecho_emision no es un monto válido"),
+    ({"porcentaje_prima": 10, "otros_cargos": "-5"}, "otros_cargos no puede ser negativo"),
+])
+def test_parametros_invalidos_no_detienen_el_lote(db, params, motivo):
+    path, conn = db
+    resumen = aplicar_movimientos(
+        [
+            (1, AUMENTO_PRIMA, params),
+            (2, AUMENTO_PRIMA, {"porcentaje_prima": 10, "fecha_documento": "2025-12-31", "derecho_emision": "0.45"}),
+        ],
+        emitir_documentos=True,
+        db_file=path,
+    )
+    assert resumen["aplicados"] == 1
+    assert _motivos(resumen) == {0: motivo}
+    primas = dict(conn.execute("SELECT id, prima_neta_centavos FROM polizas WHERE id IN (1, 2)"))
+    assert primas == {1: None, 2: 22000}
+    factura = conn.execute("SELECT poliza_id, fecha_emision FROM facturas").fetchall()
+    assert factura == [(2, "2025-12-31")]
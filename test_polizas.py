@@ -0,0 +1,68 @@
+# ============================================================================
+# PRUEBAS DEL ALTA DE PÓLIZAS - test_polizas.py
+# ============================================================================
+# core/polizas.create_policy_with_invoice contra una base creada con las
+# migraciones: las columnas que no se indican quedan NULL, el número interno
+# (PRG-n) se toma al guardar y la póliza y su factura se escriben o se
+# revierten juntas.
+#
+# Uso: python -m pytest test_polizas.py
+# ============================================================================
+
+import sqlite3
+
+import pytest
+
+from core.db import close_pools
+from core.migrations import run_migrations
+from core.polizas import create_policy_with_invoice
+
+POLIZA = {
+    "numero_poliza": "POL-1", "cliente_id": 1, "usuario_id": 1, "tipo_poliza": "Individual",
+    "cobertura": "Total", "prima": "100.00", "prima_neta": "100.00", "fecha_inicio": "2025-01-01",
+    "fecha_fin": "2026-01-01", "estado": "Activa",
+}
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "polizas.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    yield path, conn
+    conn.close()
+    close_pools()
+
+
+def test_columnas_ausentes_quedan_null(db):
+    path, conn = db
+    poliza_id, factura_id = create_policy_with_invoice(POLIZA, {"monto_neto": 100, "total": 115}, db_file=path)
+    fila = conn.execute(
+        "SELECT aseguradora_id, ramo_id, suma_asegurada, prima_neta_centavos, numero_factura FROM polizas WHERE id = ?",
+        (poliza_id,),
+    ).fetchone()
+    numero = conn.execute("SELECT numero_factura FROM facturas WHERE id = ?", (factura_id,)).fetchone()[0]
+    assert fila == (None, None, None, 10000, numero)
+    # Un solo grupo "sin aseguradora / sin ramo" en el resumen de cartera
+    assert conn.execute("SELECT aseguradora_id, ramo_id, polizas FROM resumen_cartera").fetchall() == [(0, 0, 1)]
+
+
+def test_numero_repetido_revierte_todo(db):
+    path, conn = db
+    create_policy_with_invoice(POLIZA, {"monto_neto": 100}, db_file=path)
+    with pytest.raises(sqlite3.IntegrityError):
+        create_policy_with_invoice(POLIZA, {"monto_neto": 100}, db_file=path)
+    assert conn.execute("SELECT COUNT(*) FROM polizas").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM facturas").fetchone()[0] == 1
+
+
+def test_numero_interno_se_asigna_al_guardar(db):
+    path, conn = db
+    sin_numero = {**POLIZA, "numero_poliza": "  "}
+    # Un alta que falla no gasta el número interno
+    with pytest.raises(sqlite3.OperationalError):
+        create_policy_with_invoice(sin_numero, {"monto_neto": 100, "columna_inexistente": 1}, db_file=path)
+    poliza_id, _ = create_policy_with_invoice(sin_numero, None, db_file=path)
+    otra_id, _ = create_policy_with_invoice({**POLIZA, "numero_poliza": None}, None, db_file=path)
+    numeros = dict(conn.execute("SELECT id, numero_poliza FROM polizas").fetchall())
+    assert (numeros[poliza_id], numeros[otra_id]) == ("PRG-1", "PRG-2")
@@ -0,0 +1,134 @@
+# ============================================================================
+# PRUEBAS DE PLANES DE CONSULTA - test_query_plans.py
+# ============================================================================
+# Ejecuta EXPLAIN QUERY PLAN sobre las consultas de las rutas calientes
+# (core/consultas.py) contra una base creada con las migraciones, y falla si
+# alguna recorre una tabla completa en lugar de usar un índice.
+#
+# Uso: python -m pytest test_query_plans.py
+# ============================================================================
+
+import re
+import sqlite3
+
+import pytest
+
+from core import consultas
+from core.polizas import consulta_listado
+from core.actividades import consulta_actividades
+from core.comisiones import consulta_resumen
+from core.renovaciones import consulta_lista, consulta_vencimientos
+from core.siniestralidad import consulta_siniestralidad
+from core.db import close_pools
+from core.migrations import (
+    INDICES, INDICES_LISTADO_POLIZAS, INDICES_CLIENTES, INDICES_POLIZAS_CLIENTE, INDICES_RENOVACIONES, INDICES_SINIESTRALIDAD,
+    run_migrations,
+)
+
+# (nombre, consulta, parámetros de ejemplo)
+CONSULTAS = [
+    ("usuario_para_login", consultas.USUARIO_PARA_LOGIN, ("admin",)),
+    ("polizas_por_cliente", consultas.POLIZAS_POR_CLIENTE, (1,)),
+    ("polizas_por_estado", consultas.POLIZAS_POR_ESTADO, ("Activa",)),
+    ("polizas_de_cliente", *consultas.polizas_de_cliente(1)),
+    ("polizas_de_cliente_vehicular", *consultas.polizas_de_cliente(1, "Vehicular")),
+    ("polizas_para_movimiento", consultas.POLIZAS_PARA_MOVIMIENTO, ("[1, 2]",)),
+    ("polizas_por_vencer", consultas.POLIZAS_POR_VENCER, ("2025-01-01", "2025-03-31")),
+    ("totales_cartera_por_estado", consultas.TOTALES_CARTERA_POR_ESTADO, ()),
+    ("documentos_existentes", consultas.DOCUMENTOS_EXISTENTES, ('["1700000000"]',)),
+    ("clientes_por_documento", consultas.CLIENTES_POR_DOCUMENTO, ('["1700000000"]',)),
+    ("aseguradoras_por_identificacion", consultas.ASEGURADORAS_POR_IDENTIFICACION, ('["0990022453001"]',)),
+    ("polizas_por_numero", consultas.POLIZAS_POR_NUMERO, ('["PRG-1"]',)),
+    ("movimientos_por_poliza", consultas.MOVIMIENTOS_POR_POLIZA, (1,)),
+    ("movimientos_recientes", consultas.MOVIMIENTOS_RECIENTES, (200,)),
+    ("facturas_por_poliza", consultas.FACTURAS_POR_POLIZA, (1,)),
+    ("facturas_por_movimiento_o_poliza", consultas.FACTURAS_POR_MOVIMIENTO_O_POLIZA, (1, 1)),
+    ("notas_por_movimiento_o_poliza", consultas.NOTAS_POR_MOVIMIENTO_O_POLIZA, (1, 1)),
+    ("facturas_de_movimientos", consultas.FACTURAS_DE_MOVIMIENTOS, ("[1, 2]",)),
+    ("notas_de_movimientos", consultas.NOTAS_DE_MOVIMIENTOS, ("[1, 2]",)),
+    ("notas_por_movimiento_o_facturas", consultas.notas_por_movimiento_o_facturas(3), (1, 10, 11, 12)),
+    ("sucursales_por_aseguradora", consultas.SUCURSALES_POR_ASEGURADORA, (1,)),
+    ("listado_polizas_primera_pagina", *consulta_listado()),
+    ("listado_polizas_siguiente_pagina", *consulta_listado(despues_de=("2025-01-01", 10))),
+    ("listado_polizas_por_estado", *consulta_listado(estados=["Activa"], despues_de=("2025-01-01", 10))),
+    ("actividades_por_codigo", *consulta_actividades("A0113")),
+    ("actividades_por_seccion", *consulta_actividades("", "C")),
+    ("actividades_por_descripcion", *consulta_actividades("cultivo maiz", "A")),
+    ("vencimientos_por_ejecutivo", *consulta_vencimientos("ejecutivo", "2025-01-01")),
+    ("vencimientos_por_aseguradora", *consulta_vencimientos("aseguradora", "2025-01-01")),
+    ("renovaciones_por_ejecutivo", *consulta_lista(ejecutivo_id=1)),
+    ("renovaciones_por_aseguradora", *consulta_lista(aseguradora_id=1, ventana=30)),
+    ("comisiones_por_aseguradora_del_mes", *consulta_resumen("aseguradora", "2025-01")),
+    ("comisiones_por_ramo_del_mes", *consulta_resumen("ramo", "2025-01")),
+    ("siniestros_por_tipo", *consultas.siniestros_filtrados("Vehicular")),
+    ("siniestros_por_estado", *consultas.siniestros_filtrados(estado="En Proceso")),
+    ("siniestros_por_tipo_y_estado", *consultas.siniestros_filtrados("Vida/Salud", "Pagado")),
+]
+
+
+@pytest.fixture(scope="module")
+def db(tmp_path_factory):
+    """Base de datos vacía con todas las migraciones aplicadas."""
+    path = str(tmp_path_factory.mktemp("planes") / "planes.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+    close_pools()
+
+
+def _plan(conn, query, params):
+    """Retorna las líneas de detalle de EXPLAIN QUERY PLAN."""
+    params = params if isinstance(params, dict) else tuple(params)  # Parámetros con nombre o por posición
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+_FTS_MATCH = re.compile(r"VIRTUAL TABLE INDEX \d+:\S*M")
+
+
+def _full_scans(plan):
+    """Líneas del plan que recorren una tabla completa (SCAN sin índice).
+
+    json_each recorre la lista de parámetros, no una tabla de la base. Las
+    demás tablas virtuales cuentan como recorrido salvo una FTS5 filtrada por
+    MATCH ("VIRTUAL TABLE INDEX 0:M1"), que lee su índice invertido.
+    """
+    return [
+        line for line in plan
+        if line.startswith("SCAN") and "USING" not in line and "CONSTANT ROW" not in line
+        and not line.startswith("SCAN json_each VIRTUAL TABLE")
+        and not _FTS_MATCH.search(line)
+    ]
+
+
+@pytest.mark.parametrize("nombre,query,params", CONSULTAS, ids=[c[0] for c in CONSULTAS])
+def test_consulta_usa_indice(db, nombre, query, params):
+    plan = _plan(db, query, params)
+    assert not _full_scans(plan), f"{nombre} recorre la tabla completa: {plan}"
+
+
+def test_indices_creados(db):
+    existentes = {row[0] for row in db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    todos = INDICES + INDICES_LISTADO_POLIZAS + INDICES_POLIZAS_CLIENTE + INDICES_CLIENTES + INDICES_RENOVACIONES
+    todos += INDICES_SINIESTRALIDAD
+    faltantes = [nombre for nombre, _, _ in todos if nombre not in existentes]
+    assert not faltantes, f"Índices no creados por las migraciones: {faltantes}"
+
+
+def test_siniestralidad_filtra_siniestros_por_fecha(db):
+    # La consulta recorre polizas por diseño (prima devengada de la cartera),
+    # pero los siniestros del rango deben leerse por el índice de fecha
+    plan = _plan(db, *consulta_siniestralidad("aseguradora", "2025-01-01", "2025-12-31"))
+    assert any("idx_siniestros_fecha" in line for line in plan), plan
+
+
+def test_detector_de_scan(db):
+    # Control: una consulta sin filtro indexado debe detectarse como scan completo
+    plan = _plan(db, "SELECT id FROM polizas WHERE numero_factura = ?", ("F-1",))
+    assert _full_scans(plan)
+
+
+def test_detector_de_scan_fts(db):
+    # Una tabla FTS5 leída sin MATCH también es un recorrido completo
+    plan = _plan(db, "SELECT rowid FROM clients_fts WHERE nombres = ?", ("Ana",))
+    assert _full_scans(plan)
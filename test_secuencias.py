@@ -0,0 +1,93 @@
+# ============================================================================
+# PRUEBAS DE SECUENCIAS DE NUMERACIÓN - test_secuencias.py
+# ============================================================================
+# core/secuencias.py contra una base creada con las migraciones: hilos y
+# procesos que piden números a la vez nunca reciben el mismo, la numeración
+# sin bloques no deja huecos y los bloques reservados no se solapan.
+#
+# Uso: python -m pytest test_secuencias.py
+# ============================================================================
+
+import multiprocessing
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from core import secuencias
+from core.db import close_pools, unit_of_work
+from core.migrations import run_migrations
+
+HILOS = 8
+NUMEROS_POR_HILO = 25
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Base migrada con un siniestro SIN-VEH-007 ya emitido."""
+    path = str(tmp_path / "secuencias.db")
+    conn = sqlite3.connect(path)
+    run_migrations(path)
+    conn.execute(
+        """INSERT INTO siniestros (codigo_siniestro, poliza_id, tipo_siniestro, fecha_siniestro)
+           VALUES ('SIN-VEH-007', 1, 'Vehicular', '2025-01-01')"""
+    )
+    conn.commit()
+    conn.close()
+    yield path
+    for nombre in secuencias.ORIGENES:
+        secuencias.configurar_bloque(nombre, 1)
+    close_pools()
+
+
+def _emitir(path, nombre, cantidad):
+    """Pide `cantidad` números seguidos (se ejecuta en hilos y en procesos hijos)."""
+    return [secuencias.siguiente(nombre, path) for _ in range(cantidad)]
+
+
+def _en_paralelo(ejecutor, path, nombre):
+    with ejecutor as pool:
+        tareas = [pool.submit(_emitir, path, nombre, NUMEROS_POR_HILO) for _ in range(HILOS)]
+        return [numero for tarea in tareas for numero in tarea.result()]
+
+
+def test_hilos_sin_huecos_ni_repetidos(db):
+    numeros = _en_paralelo(ThreadPoolExecutor(HILOS), db, secuencias.FACTURA)
+    assert sorted(numeros) == list(range(1, HILOS * NUMEROS_POR_HILO + 1))
+
+
+def test_procesos_sin_huecos_ni_repetidos(db):
+    contexto = multiprocessing.get_context("spawn")
+    numeros = _en_paralelo(ProcessPoolExecutor(4, mp_context=contexto), db, secuencias.NOTA_CREDITO)
+    assert sorted(numeros) == list(range(1, HILOS * NUMEROS_POR_HILO + 1))
+
+
+def test_valor_inicial_y_formatos(db):
+    conn = sqlite3.connect(db)
+    assert secuencias.valor_inicial(conn, secuencias.SINIESTRO_VEHICULAR) == 7
+    assert secuencias.valor_inicial(conn, secuencias.SINIESTRO_SALUD) == 0
+    conn.close()
+    assert secuencias.siguiente_codigo_siniestro("Salud", db) == "SIN-SAL-001"
+    assert secuencias.siguiente_codigo_movimiento(db) == "MOV-000001"
+
+
+def test_transaccion_revertida_no_consume_numero(db):
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db, immediate=True) as conn:
+            assert secuencias.siguiente(secuencias.FACTURA, conn=conn) == 1
+            raise RuntimeError("falla la inserción de la factura")
+    assert secuencias.siguiente(secuencias.FACTURA, db) == 1
+
+
+def test_bloques_no_se_solapan(db):
+    secuencias.configurar_bloque(secuencias.POLIZA, 10)
+    numeros = _en_paralelo(ThreadPoolExecutor(HILOS), db, secuencias.POLIZA)
+    assert len(set(numeros)) == len(numeros) == HILOS * NUMEROS_POR_HILO
+    # Los hilos comparten el bloque del proceso: 200 números son 20 bloques exactos
+    assert sorted(numeros) == list(range(1, HILOS * NUMEROS_POR_HILO + 1))
+
+    # Otra reserva (otro proceso, o el mismo tras reconfigurar) empieza después
+    secuencias.configurar_bloque(secuencias.POLIZA, 10)
+    assert secuencias.siguiente(secuencias.POLIZA, db) == HILOS * NUMEROS_POR_HILO + 1
+    secuencias.configurar_bloque(secuencias.POLIZA, 1)
+    assert secuencias.siguiente(secuencias.POLIZA, db) == HILOS * NUMEROS_POR_HILO + 11
@@ -0,0 +1,68 @@
+# ============================================================================
+# PRUEBAS DE SINIESTRALIDAD - test_siniestralidad.py
+# ============================================================================
+# core/siniestralidad.py contra una base creada con las migraciones: rango
+# por defecto y agrupación por ramo de las pólizas multirramo.
+#
+# Uso: python -m pytest test_siniestralidad.py
+# ============================================================================
+
+import datetime
+import sqlite3
+
+import pytest
+
+from core.db import close_pools
+from core.migrations import run_migrations
+from core.siniestralidad import consulta_siniestralidad, desde_predeterminado
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Base migrada con dos ramos y dos pólizas de 365 días y 365,00 de prima:
+    la 1 de Vehículos (polizas.ramo_id) y la 2 multirramo, sin ramo_id y
+    con Vida como primer ramo de poliza_ramos; un siniestro de 100,00 en cada una.
+    """
+    path = str(tmp_path / "siniestralidad.db")
+    run_migrations(path)
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO ramos_seguros (id, nombre) VALUES (?, ?)", [(1, "Vehículos"), (2, "Vida")])
+    conn.executemany(
+        """INSERT INTO polizas (id, numero_poliza, cliente_id, usuario_id, tipo_poliza, cobertura, prima,
+                                prima_neta_centavos, ramo_id, fecha_inicio, fecha_fin, estado)
+           VALUES (?, ?, 1, 1, 'Individual', 'Total', '365', 36500, ?, '2025-01-01', '2026-01-01', 'Activa')""",
+        [(1, "POL-1", 1), (2, "POL-2", None)],
+    )
+    conn.executemany(
+        "INSERT INTO poliza_ramos (poliza_id, nro_ramo, ramo_id) VALUES (2, ?, ?)", [(1, 2), (2, 1)]
+    )
+    conn.executemany(
+        """INSERT INTO siniestros (codigo_siniestro, poliza_id, tipo_siniestro, fecha_siniestro, monto_estimado)
+           VALUES (?, ?, 'Vehicular', '2025-03-10', 100)""",
+        [("SIN-1", 1), ("SIN-2", 2)],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+    close_pools()
+
+
+@pytest.mark.parametrize("hasta,desde", [
+    (datetime.date(2028, 2, 29), datetime.date(2027, 3, 1)),
+    (datetime.date(2025, 6, 15), datetime.date(2024, 6, 16)),
+    (datetime.date(2025, 1, 1), datetime.date(2024, 1, 2)),
+])
+def test_desde_predeterminado(hasta, desde):
+    assert desde_predeterminado(hasta) == desde
+
+
+def test_consulta_con_hasta_29_de_febrero():
+    _, parametros = consulta_siniestralidad("ramo", hasta="2028-02-29")
+    assert parametros == {"desde": "2027-03-01", "hasta": "2028-03-01"}
+
+
+def test_poliza_multirramo_en_su_primer_ramo(db):
+    filas = db.execute(*consulta_siniestralidad("ramo", "2025-01-01", "2025-12-31", "total")).fetchall()
+    por_ramo = {nombre: (devengada, siniestros, incurrido) for _, nombre, _, devengada, siniestros, incurrido, *_ in filas}
+    assert por_ramo == {"Vehículos": (36500, 1, 10000), "Vida": (36500, 1, 10000)}